@@ -0,0 +1,248 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""Asynchronous SRAM/PSRAM Controller.
+
+Wishbone controller for asynchronous 8/16-bit SRAMs and PSRAMs (used in asynchronous mode):
+
+- 32-bit bus words are packed from data_width beats (4 beats on 8-bit parts, 2 on 16-bit ones), so
+  the full memory capacity is mapped.
+- Byte enables: beats without selected bytes are skipped on writes, 16-bit parts also get lb/ub
+  from sel.
+- Timings are specified in ns by the memory module and converted to sys_clk cycles.
+- Page mode (PSRAMs): beats of a word and reads following a read in the same page (ex L2 cache
+  refills) only pay the page access time (other reads pay tAA). CE# is released when idle, before
+  writes or after tCEM (required for PSRAM refresh).
+
+All outputs to the memory are registered, and data is sampled one cycle after the access time to
+cover IOs delays.
+"""
+
+import math
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect import wishbone
+
+# Memory Modules -----------------------------------------------------------------------------------
+
+class SRAMModule:
+    """Asynchronous SRAM/PSRAM timings (ns)."""
+    tAA       = None # Address access time.
+    tPAA      = None # Page access time (None: no page mode).
+    tWC       = None # Write cycle time.
+    tWP       = None # Write pulse width.
+    tCEM      = None # Max CE# low time (None: unlimited).
+    page_size = None # Page size (words of data_width).
+
+class IS61WV5128BLL(SRAMModule):
+    """ISSI IS61WV5128BLL-10 (512K x 8 SRAM)."""
+    tAA  = 10
+    tWC  = 10
+    tWP  = 8
+
+class MT45W8MW16BGX(SRAMModule):
+    """Micron MT45W8MW16BGX-701 (8M x 16 CellularRAM PSRAM)."""
+    tAA       = 70
+    tPAA      = 20
+    tWC       = 70
+    tWP       = 45
+    tCEM      = 4000
+    page_size = 16
+
+# Async SRAM ---------------------------------------------------------------------------------------
+
+class AsyncSRAM(LiteXModule):
+    """Asynchronous SRAM/PSRAM Controller
+
+    Parameters
+    ----------
+    pads : Record
+        Memory pads: addr, data (or data_o/data_oe/data_i for simulation), cen, wen, oe/oen,
+        optional lb/ub (16-bit parts) and adv/clk/cre (PSRAMs, held for asynchronous mode).
+
+    module : SRAMModule
+        Memory timings.
+
+    sys_clk_freq : float
+        System clock frequency.
+
+    bus_data_width : int
+        Wishbone data width.
+    """
+    def __init__(self, pads, module, sys_clk_freq, bus_data_width=32):
+        data_width = len(pads.data) if hasattr(pads, "data") else len(pads.data_o)
+        addr_width = len(pads.addr)
+        assert bus_data_width % data_width == 0
+        beats      = bus_data_width//data_width
+        beat_bits  = log2_int(beats)
+        self.size  = (2**addr_width)*data_width//8
+        self.bus   = bus = wishbone.Interface(data_width=bus_data_width, adr_width=addr_width - beat_bits)
+
+        # # #
+
+        # Timings (in sys_clk cycles, reads are sampled (t)AA + 1 cycles after setting the address).
+        def ns_to_cycles(t):
+            return max(math.ceil(t*1e-9*sys_clk_freq), 1)
+        page_mode  = module.tPAA is not None
+        aa_cycles  = ns_to_cycles(module.tAA)  + 1
+        paa_cycles = ns_to_cycles(module.tPAA) + 1 if page_mode else aa_cycles
+        wp_cycles  = ns_to_cycles(module.tWP)
+        wr_cycles  = max(ns_to_cycles(module.tWC) - wp_cycles, 1)
+        cem_cycles = ns_to_cycles(module.tCEM) if module.tCEM is not None else None
+        self.timings = dict(read=aa_cycles + 1, page_read=paa_cycles + 1, write=wp_cycles + wr_cycles) # Per beat.
+
+        # Data Tristate.
+        data_o  = Signal(data_width)
+        data_oe = Signal()
+        data_i  = Signal(data_width)
+        if hasattr(pads, "data"):
+            t = TSTriple(data_width)
+            self.specials += t.get_tristate(pads.data)
+            self.comb += [t.o.eq(data_o), t.oe.eq(data_oe), data_i.eq(t.i)]
+        else:
+            self.comb += [pads.data_o.eq(data_o), pads.data_oe.eq(data_oe), data_i.eq(pads.data_i)]
+
+        # Controls (registered, active low).
+        addr_r = Signal(addr_width)
+        cen    = Signal(reset=1)
+        wen    = Signal(reset=1)
+        oen    = Signal(reset=1)
+        lb     = Signal(reset=1)
+        ub     = Signal(reset=1)
+        self.comb += [
+            pads.addr.eq(addr_r),
+            pads.cen.eq(cen),
+            pads.wen.eq(wen),
+            (pads.oen if hasattr(pads, "oen") else pads.oe).eq(oen),
+        ]
+        if hasattr(pads, "lb"):
+            self.comb += [pads.lb.eq(lb), pads.ub.eq(ub)]
+        for name in ["adv", "clk", "cre"]:
+            if hasattr(pads, name):
+                self.comb += getattr(pads, name).eq(0)
+
+        # Beats.
+        beat      = Signal(max=max(beats, 2))
+        addr      = Signal(addr_width)
+        beat_sel  = Signal(data_width//8)
+        beat_dat  = Signal(data_width)
+        dat_r     = Signal(bus_data_width)
+        self.comb += [
+            addr.eq(Cat(beat[:beat_bits], bus.adr) if beats > 1 else bus.adr),
+            beat_sel.eq(Array(bus.sel[i*data_width//8:(i + 1)*data_width//8] for i in range(beats))[beat]),
+            beat_dat.eq(Array(bus.dat_w[i*data_width:(i + 1)*data_width] for i in range(beats))[beat]),
+            bus.dat_r.eq(dat_r),
+        ]
+        last_beat = (beat == (beats - 1))
+
+        # Page.
+        page_open = Signal()
+        page_hit  = Signal()
+        page_full = Signal()
+        page_time = Signal(max=max(cem_cycles or 0, 2) + 1)
+        page_bits = log2_int(module.page_size) if page_mode else 0
+        open_page = Signal(addr_width - page_bits)
+        if page_mode:
+            if cem_cycles is not None:
+                self.comb += page_full.eq(page_time >= (cem_cycles - 2*aa_cycles))
+            self.comb += page_hit.eq(page_open & (addr[page_bits:] == open_page))
+            self.sync += [
+                If(page_open,
+                    page_time.eq(page_time + 1)
+                ).Else(
+                    page_time.eq(0)
+                )
+            ]
+
+        # FSM.
+        count = Signal(max=max(aa_cycles, wp_cycles, wr_cycles) + 1)
+        self.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            NextValue(beat,  0),
+            NextValue(count, 0),
+            NextValue(data_oe, 0),
+            If(bus.cyc & bus.stb,
+                If(page_open & (bus.we | page_full),
+                    # Close page (CE# high for one cycle).
+                    NextValue(cen, 1),
+                    NextValue(oen, 1),
+                    NextValue(page_open, 0),
+                ).Elif(bus.we,
+                    # Release data bus before driving it.
+                    NextValue(oen, 1),
+                    NextState("WRITE")
+                ).Else(
+                    NextState("READ")
+                )
+            ).Else(
+                NextValue(cen, 1),
+                NextValue(oen, 1),
+                NextValue(page_open, 0),
+            )
+        )
+        fsm.act("WRITE",
+            NextValue(addr_r, addr),
+            NextValue(data_o, beat_dat),
+            NextValue(data_oe, 1),
+            NextValue(cen, 0),
+            NextValue(oen, 1),
+            NextValue(lb, ~beat_sel[0]),
+            NextValue(ub, ~beat_sel[-1]),
+            If(beat_sel == 0,
+                # Skip beats without selected bytes.
+                NextValue(wen, 1),
+                NextValue(beat, beat + 1),
+                If(last_beat,
+                    NextState("ACK")
+                )
+            ).Else(
+                NextValue(wen, 0),
+                NextValue(count, count + 1),
+                If(count == (wp_cycles - 1),
+                    NextValue(count, 0),
+                    NextState("WRITE-RECOVERY")
+                )
+            )
+        )
+        fsm.act("WRITE-RECOVERY",
+            NextValue(wen, 1),
+            NextValue(count, count + 1),
+            If(count == (wr_cycles - 1),
+                NextValue(count, 0),
+                NextValue(beat, beat + 1),
+                If(last_beat,
+                    NextValue(cen, 1),
+                    NextState("ACK")
+                ).Else(
+                    NextState("WRITE")
+                )
+            )
+        )
+        fsm.act("READ",
+            NextValue(addr_r, addr),
+            NextValue(cen, 0),
+            NextValue(wen, 1),
+            NextValue(oen, 0),
+            NextValue(lb, 0),
+            NextValue(ub, 0),
+            NextValue(count, count + 1),
+            If(count == Mux((beat != 0) | page_hit, paa_cycles, aa_cycles),
+                NextValue(count, 0),
+                NextValue(page_open, page_mode),
+                NextValue(open_page, addr[page_bits:]),
+                Case(beat, {i: NextValue(dat_r[i*data_width:(i + 1)*data_width], data_i) for i in range(beats)}),
+                NextValue(beat, beat + 1),
+                If(last_beat,
+                    NextState("ACK")
+                )
+            )
+        )
+        fsm.act("ACK",
+            bus.ack.eq(1),
+            NextState("IDLE")
+        )
@@ -0,0 +1,339 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""Bursting AXI DMA reader and writer modules.
+
+Same control interface than LiteX's WishboneDMAReader/WishboneDMAWriter (base, length, enable,
+loop, done, offset) but issuing full AXI bursts, so that a stream can sustain the bandwidth of
+the AXI port (ex Zynq HP ports or hardened DDR controllers AXI targets).
+
+Constraints:
+- base and length must be aligned on the burst size (burst_length*data_width//8 bytes), which
+  also guarantees that bursts never cross a 4KB boundary.
+- offset is expressed in bus words (as for the Wishbone DMAs).
+"""
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect import stream
+from litex.soc.interconnect import axi
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def _max_burst_length(bus):
+    return {"axi3": 16, "axi4": 256}[bus.version]
+
+class _AXIDMACtrl:
+    def add_ctrl(self, default_base=0, default_length=0, default_enable=0, default_loop=0):
+        self.base   = Signal(64, reset=default_base)
+        self.length = Signal(32, reset=default_length)
+        self.enable = Signal(reset=default_enable)
+        self.done   = Signal()
+        self.loop   = Signal(reset=default_loop)
+        self.offset = Signal(32)
+
+    def add_csr(self, default_base=0, default_length=0, default_enable=0, default_loop=0):
+        self._base   = CSRStorage(64, reset=default_base)
+        self._length = CSRStorage(32, reset=default_length)
+        self._enable = CSRStorage(reset=default_enable)
+        self._done   = CSRStatus()
+        self._loop   = CSRStorage(reset=default_loop)
+        self._offset = CSRStatus(32)
+
+        # # #
+
+        self.comb += [
+            # Control.
+            self.base.eq(self._base.storage),
+            self.length.eq(self._length.storage),
+            self.enable.eq(self._enable.storage),
+            self.loop.eq(self._loop.storage),
+            # Status.
+            self._done.status.eq(self.done),
+            self._offset.status.eq(self.offset),
+        ]
+
+# AXIDMAWriter -------------------------------------------------------------------------------------
+
+class AXIDMAWriter(LiteXModule, _AXIDMACtrl):
+    """Write a stream to AXI MMAP memory with bursts.
+
+    Data are buffered until a full burst is available, then the burst is issued. With loop enabled,
+    the [base, base + length] region is used as a ring buffer and offset gives the write pointer.
+    When disabled, the sink is always ready and incoming data are discarded; a burst already
+    requested (AWVALID asserted) is completed and its write response awaited before the writer
+    goes idle.
+
+    Parameters
+    ----------
+    bus : AXIInterface
+        AXI bus to write to.
+
+    burst_length : int
+        Number of beats per burst (up to 16 on AXI3, 256 on AXI4).
+
+    Attributes
+    ----------
+    sink : Record("data")
+        Sink for data to be written.
+    """
+    def __init__(self, bus, burst_length=16, fifo_depth=None, with_csr=False):
+        assert isinstance(bus, axi.AXIInterface)
+        assert burst_length <= _max_burst_length(bus)
+        fifo_depth = 2*burst_length if fifo_depth is None else fifo_depth
+        assert fifo_depth >= burst_length
+        self.bus  = bus
+        self.sink = sink = stream.Endpoint([("data", bus.data_width)])
+        self.add_ctrl()
+
+        # # #
+
+        shift       = log2_int(bus.data_width//8)
+        base        = Signal(64)
+        offset      = Signal(32)
+        length      = Signal(32)
+        beat        = Signal(max=burst_length)
+        outstanding = Signal(8)
+        aw_pending  = Signal()
+        self.comb += length.eq(self.length[shift:])
+        self.comb += self.offset.eq(offset)
+
+        # FSM.
+        self.fsm = fsm = FSM(reset_state="IDLE")
+
+        # Stop (Set on disable, cleared once the writer is back to IDLE).
+        stop = Signal()
+        self.sync += [
+            If(~self.enable,
+                stop.eq(1)
+            ).Elif(fsm.ongoing("IDLE"),
+                stop.eq(0)
+            )
+        ]
+
+        # FIFO (Flushed when idle, data discarded when disabled).
+        self.fifo = fifo = ResetInserter()(stream.SyncFIFO([("data", bus.data_width)], depth=fifo_depth))
+        self.comb += fifo.reset.eq(fsm.ongoing("IDLE"))
+        self.comb += [
+            If(~self.enable,
+                sink.ready.eq(1)
+            ).Elif(~fsm.ongoing("IDLE"),
+                sink.connect(fifo.sink)
+            )
+        ]
+
+        # Write Responses.
+        self.comb += bus.b.ready.eq(1)
+        self.sync += [
+            If(bus.aw.valid & bus.aw.ready,
+                If(~(bus.b.valid & bus.b.ready), outstanding.eq(outstanding + 1))
+            ).Elif(bus.b.valid & bus.b.ready,
+                outstanding.eq(outstanding - 1)
+            )
+        ]
+
+        # Write Bursts.
+        self.comb += [
+            bus.aw.addr.eq(base + (offset << shift)),
+            bus.aw.burst.eq(axi.BURST_INCR),
+            bus.aw.len.eq(burst_length - 1),
+            bus.aw.size.eq(shift),
+            bus.w.data.eq(fifo.source.data),
+            bus.w.strb.eq(2**(bus.data_width//8) - 1),
+            bus.w.last.eq(beat == (burst_length - 1)),
+        ]
+        fsm.act("IDLE",
+            NextValue(base,   self.base),
+            NextValue(offset, 0),
+            # Wait for bursts issued before a disable to be acknowledged.
+            If(self.enable & ~stop & (outstanding == 0),
+                NextState("ADDR")
+            )
+        )
+        # AWVALID is kept asserted until AWREADY once raised, even if disabled in between.
+        fsm.act("ADDR",
+            bus.aw.valid.eq(aw_pending | (self.enable & ~stop & (fifo.level >= burst_length))),
+            If(bus.aw.valid,
+                If(bus.aw.ready,
+                    NextValue(aw_pending, 0),
+                    NextValue(beat, 0),
+                    NextState("DATA"),
+                ).Else(
+                    NextValue(aw_pending, 1)
+                )
+            ).Elif(~self.enable | stop,
+                NextState("IDLE")
+            )
+        )
+        # A requested burst is always completed (AW accepted: the interconnect expects its W beats,
+        # already in the FIFO since the burst is only issued when fully buffered).
+        fsm.act("DATA",
+            bus.w.valid.eq(fifo.source.valid),
+            fifo.source.ready.eq(bus.w.ready),
+            If(bus.w.valid & bus.w.ready,
+                NextValue(beat, beat + 1),
+                If(bus.w.last,
+                    NextValue(offset, offset + burst_length),
+                    NextState("ADDR"),
+                    If((offset + burst_length) >= length,
+                        If(self.loop,
+                            NextValue(offset, 0)
+                        ).Else(
+                            NextState("DONE")
+                        )
+                    ),
+                    If(~self.enable | stop,
+                        NextState("IDLE")
+                    )
+                )
+            )
+        )
+        fsm.act("DONE",
+            self.done.eq(outstanding == 0),
+            If(~self.enable | stop,
+                NextState("IDLE")
+            )
+        )
+
+        # CSRs.
+        if with_csr:
+            self.add_csr()
+
+# AXIDMAReader -------------------------------------------------------------------------------------
+
+class AXIDMAReader(LiteXModule, _AXIDMACtrl):
+    """Read AXI MMAP memory to a stream with bursts.
+
+    A burst is only requested when the FIFO has room for it, so read data are never stalled on the
+    AXI bus and several bursts can be in flight. With loop enabled, [base, base + length] is
+    replayed continuously. When disabled, a burst already requested (ARVALID asserted) is still
+    issued and the FIFO is kept flushed until all the bursts in flight have been received, so that
+    no stale data is presented on source after a re-enable.
+
+    Parameters
+    ----------
+    bus : AXIInterface
+        AXI bus to read from.
+
+    burst_length : int
+        Number of beats per burst (up to 16 on AXI3, 256 on AXI4).
+
+    Attributes
+    ----------
+    source : Record("data")
+        Source for data read from memory.
+    """
+    def __init__(self, bus, burst_length=16, fifo_depth=None, with_csr=False):
+        assert isinstance(bus, axi.AXIInterface)
+        assert burst_length <= _max_burst_length(bus)
+        fifo_depth = 4*burst_length if fifo_depth is None else fifo_depth
+        assert fifo_depth >= burst_length
+        self.bus    = bus
+        self.source = source = stream.Endpoint([("data", bus.data_width)])
+        self.add_ctrl()
+
+        # # #
+
+        shift      = log2_int(bus.data_width//8)
+        base       = Signal(64)
+        offset     = Signal(32)
+        length     = Signal(32)
+        pending    = Signal(max=fifo_depth + 1)
+        ar_pending = Signal()
+        self.comb += length.eq(self.length[shift:])
+        self.comb += self.offset.eq(offset)
+
+        # FSM.
+        self.fsm = fsm = FSM(reset_state="IDLE")
+
+        # Stop (Set on disable, cleared once the reader is back to IDLE).
+        stop = Signal()
+        self.sync += [
+            If(~self.enable,
+                stop.eq(1)
+            ).Elif(fsm.ongoing("IDLE"),
+                stop.eq(0)
+            )
+        ]
+
+        # FIFO (Flushed when disabled and until the bursts in flight are drained).
+        self.fifo = fifo = ResetInserter()(stream.SyncFIFO([("data", bus.data_width)], depth=fifo_depth))
+        self.comb += fifo.reset.eq(~self.enable | stop | fsm.ongoing("IDLE"))
+        self.comb += fifo.source.connect(source)
+
+        # Read Datas (Always accepted: FIFO space is reserved when the burst is issued).
+        self.comb += [
+            fifo.sink.valid.eq(bus.r.valid),
+            fifo.sink.data.eq(bus.r.data),
+            bus.r.ready.eq(1),
+        ]
+
+        # Pending beats tracking.
+        ar_done = Signal()
+        r_done  = Signal()
+        self.comb += ar_done.eq(bus.ar.valid & bus.ar.ready)
+        self.comb += r_done.eq(bus.r.valid & bus.r.ready)
+        self.sync += [
+            If(ar_done & r_done,
+                pending.eq(pending + burst_length - 1)
+            ).Elif(ar_done,
+                pending.eq(pending + burst_length)
+            ).Elif(r_done,
+                pending.eq(pending - 1)
+            )
+        ]
+
+        # Read Bursts.
+        self.comb += [
+            bus.ar.addr.eq(base + (offset << shift)),
+            bus.ar.burst.eq(axi.BURST_INCR),
+            bus.ar.len.eq(burst_length - 1),
+            bus.ar.size.eq(shift),
+        ]
+        fsm.act("IDLE",
+            NextValue(base,   self.base),
+            NextValue(offset, 0),
+            # Wait for bursts issued before a disable to be drained.
+            If(self.enable & ~stop & (pending == 0),
+                NextState("RUN")
+            )
+        )
+        # ARVALID is kept asserted until ARREADY once raised, even if disabled in between.
+        fsm.act("RUN",
+            bus.ar.valid.eq(ar_pending | (self.enable & ~stop & ((fifo.level + pending + burst_length) <= fifo_depth))),
+            If(bus.ar.valid,
+                If(bus.ar.ready,
+                    NextValue(ar_pending, 0),
+                    NextValue(offset, offset + burst_length),
+                    If((offset + burst_length) >= length,
+                        If(self.loop,
+                            NextValue(offset, 0)
+                        ).Else(
+                            NextState("DONE")
+                        )
+                    ),
+                    If(~self.enable | stop,
+                        NextState("IDLE")
+                    )
+                ).Else(
+                    NextValue(ar_pending, 1)
+                )
+            ).Elif(~self.enable | stop,
+                NextState("IDLE")
+            )
+        )
+        fsm.act("DONE",
+            self.done.eq(pending == 0),
+            If(~self.enable | stop,
+                NextState("IDLE")
+            )
+        )
+
+        # CSRs.
+        if with_csr:
+            self.add_csr()
@@ -0,0 +1,145 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""AXI Port Monitor.
+
+Observes an AXI port (ex a port of a hardened DRAM controller) without modifying it and provides:
+
+- Bandwidth counters: read/write data beats, cycles waiting on the read/write address channels
+  (arbitration with the other ports) and elapsed cycles, in the clock domain of the port. The
+  counters are frozen when disabled so they can be read consistently over CSRs.
+- QoS control: ar_qos/aw_qos of the port are passed from the master or overridden from CSRs to
+  change the priority of the port against the other ports at runtime.
+
+The port can be in another clock domain than the CSRs: control is then resynchronized to the port
+domain and counters to sys (counters are read when frozen, so are stable).
+
+The bandwidth of the port is beats*data_width/8/(cycles/clk_freq), data_width/clk_freq being exposed
+as constants by add_axi_port_monitor for litex_boards.tools.axi_port_bench.
+"""
+
+from migen import *
+from migen.genlib.cdc import MultiReg, PulseSynchronizer
+
+from litex.gen import *
+
+from litex.soc.interconnect.csr import *
+
+# AXI Port Monitor ---------------------------------------------------------------------------------
+
+class AXIPortMonitor(LiteXModule):
+    """AXI Port Monitor
+
+    Parameters
+    ----------
+    bus : AXIInterface
+        AXI port to observe.
+
+    clock_domain : str
+        Clock domain of the AXI port.
+
+    qos_width : int
+        Width of the QoS signals of the port (ex 1 on Efinix Titanium DDR targets: high priority).
+
+    counter_width : int
+        Width of the counters (wrapping).
+
+    Attributes
+    ----------
+    ar_qos, aw_qos : Signal(qos_width)
+        QoS to present on the port (from the master or from CSRs when overridden).
+    """
+    def __init__(self, bus, clock_domain="sys", qos_width=4, counter_width=32):
+        self.ar_qos = Signal(qos_width)
+        self.aw_qos = Signal(qos_width)
+
+        # CSRs.
+        self._control = CSRStorage(fields=[
+            CSRField("enable", size=1, offset=0, description="Enable counters (freeze them to read)."),
+            CSRField("clear",  size=1, offset=1, pulse=True, description="Clear counters."),
+        ])
+        self._qos = CSRStorage(fields=[
+            CSRField("override", size=1,         offset=0, description="Override QoS of the master."),
+            CSRField("ar_qos",   size=qos_width, offset=8, description="Read QoS (when overridden)."),
+            CSRField("aw_qos",   size=qos_width, offset=16, description="Write QoS (when overridden)."),
+        ])
+        self._read_beats  = CSRStatus(counter_width, description="Read data beats.")
+        self._write_beats = CSRStatus(counter_width, description="Write data beats.")
+        self._read_wait   = CSRStatus(counter_width, description="Cycles with a read address waiting.")
+        self._write_wait  = CSRStatus(counter_width, description="Cycles with a write address waiting.")
+        self._cycles      = CSRStatus(counter_width, description="Elapsed cycles (while enabled).")
+
+        # # #
+
+        sync = getattr(self.sync, clock_domain)
+
+        # Control (Resynchronized to the port domain).
+        enable   = Signal()
+        clear    = Signal()
+        override = Signal()
+        ar_qos   = Signal(qos_width)
+        aw_qos   = Signal(qos_width)
+        if clock_domain == "sys":
+            self.comb += [
+                enable.eq(self._control.fields.enable),
+                clear.eq(self._control.fields.clear),
+                override.eq(self._qos.fields.override),
+                ar_qos.eq(self._qos.fields.ar_qos),
+                aw_qos.eq(self._qos.fields.aw_qos),
+            ]
+        else:
+            self.clear_ps = PulseSynchronizer("sys", clock_domain)
+            self.comb += self.clear_ps.i.eq(self._control.fields.clear)
+            self.comb += clear.eq(self.clear_ps.o)
+            self.specials += [
+                MultiReg(self._control.fields.enable, enable,   clock_domain),
+                MultiReg(self._qos.fields.override,   override, clock_domain),
+                MultiReg(self._qos.fields.ar_qos,     ar_qos,   clock_domain),
+                MultiReg(self._qos.fields.aw_qos,     aw_qos,   clock_domain),
+            ]
+
+        # QoS.
+        self.comb += [
+            If(override,
+                self.ar_qos.eq(ar_qos),
+                self.aw_qos.eq(aw_qos),
+            ).Else(
+                self.ar_qos.eq(bus.ar.qos),
+                self.aw_qos.eq(bus.aw.qos),
+            )
+        ]
+
+        # Counters.
+        for counter, event in [
+            (self._read_beats,  bus.r.valid  &  bus.r.ready),
+            (self._write_beats, bus.w.valid  &  bus.w.ready),
+            (self._read_wait,   bus.ar.valid & ~bus.ar.ready),
+            (self._write_wait,  bus.aw.valid & ~bus.aw.ready),
+            (self._cycles,      1),
+            ]:
+            value = Signal(counter_width)
+            sync += [
+                If(clear,
+                    value.eq(0)
+                ).Elif(enable & event,
+                    value.eq(value + 1)
+                )
+            ]
+            if clock_domain == "sys":
+                self.comb += counter.status.eq(value)
+            else:
+                self.specials += MultiReg(value, counter.status, "sys")
+
+# SoC Integration ----------------------------------------------------------------------------------
+
+def add_axi_port_monitor(soc, name, bus, clk_freq=None, clock_domain="sys", qos_width=4):
+    """Add an AXIPortMonitor on bus, clk_freq being the frequency of its clock domain (default:
+    sys_clk_freq)."""
+    clk_freq = soc.sys_clk_freq if clk_freq is None else clk_freq
+    monitor  = AXIPortMonitor(bus, clock_domain=clock_domain, qos_width=qos_width)
+    soc.add_module(name=name, module=monitor)
+    soc.add_constant(f"{name}_data_width", bus.data_width)
+    soc.add_constant(f"{name}_clk_freq",   int(clk_freq))
+    return monitor
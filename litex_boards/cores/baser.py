@@ -0,0 +1,360 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""10GBASE-R PCS and LiteEth PHY over UltraScale+ GTY transceivers.
+
+LiteEth's USP_GTY_10G_BASER only provides the 64B/66B transceiver (64-bit data + 2-bit sync header
+through the GTY gearbox, with RX gearbox slip). This adds the 10GBASE-R PCS (IEEE 802.3 clause 49):
+- TX: XGMII (64-bit data/8-bit control) to 66-bit blocks encoding (data, idle/error, start on lane
+  0/4, terminate on lanes 0-7 blocks; other control blocks are sent as error blocks) and
+  x^58 + x^39 + 1 self-synchronous scrambling.
+- RX: block lock (sync header alignment through gearbox slips), descrambling and 66-bit blocks to
+  XGMII decoding (invalid/unsupported blocks are decoded as error characters).
+
+The PCS is internally LSB-first (bit 0 transmitted first) as in the standard; the GTY transmits
+MSB-first so data/header are bit-reversed at the transceiver interface (bit_reverse).
+
+LiteEthPHY10GBASER then exposes the PCS through LiteEth's XGMII TX/RX (64-bit datapath, eth_tx/
+eth_rx clock domains at 156.25MHz) and can be used as any LiteEth PHY.
+"""
+
+from functools import reduce
+from operator import and_, or_
+
+from migen import *
+from migen.genlib.cdc import MultiReg
+
+from litex.gen import *
+
+from liteiclink.serdes.gty_ultrascale import GTYQuadPLL
+
+from liteeth.phy.xgmii import LiteEthPHYXGMIITX, LiteEthPHYXGMIIRX
+from liteeth.phy.usp_gty_10g_baser import USP_GTY_10G_BASER
+
+# Constants ----------------------------------------------------------------------------------------
+
+SYNC_DATA = 0b10 # LSB-first: 0 then 1.
+SYNC_CTRL = 0b01 # LSB-first: 1 then 0.
+
+XGMII_IDLE  = 0x07
+XGMII_START = 0xfb
+XGMII_TERM  = 0xfd
+XGMII_ERROR = 0xfe
+
+CODE_IDLE  = 0x00
+CODE_ERROR = 0x1e
+
+BLOCK_CTRL    = 0x1e # C0-C7.
+BLOCK_START_0 = 0x78 # S0 D1-D7.
+BLOCK_START_4 = 0x33 # C0-C3 S4 D5-D7.
+BLOCK_TERM    = [0x87, 0x99, 0xaa, 0xb4, 0xcc, 0xd2, 0xe1, 0xff] # D0-Dk-1 Tk Ck+1-C7.
+
+def _reverse(s):
+    return Cat(*[s[i] for i in reversed(range(len(s)))])
+
+# Scrambler ----------------------------------------------------------------------------------------
+
+class BASERScrambler(LiteXModule):
+    """x^58 + x^39 + 1 self-synchronous scrambler (one 64-bit block payload per cycle)."""
+    def __init__(self, descramble=False):
+        self.i = Signal(64)
+        self.o = Signal(64)
+
+        # # #
+
+        # state[k]: scrambled bit k-58 relative to the current block.
+        state = Signal(58)
+        bits  = []
+        def scrambled(n):
+            if n < 0:
+                return state[58 + n]
+            return self.i[n] if descramble else bits[n]
+        for n in range(64):
+            bits.append(self.i[n] ^ scrambled(n - 39) ^ scrambled(n - 58))
+        self.sync += [
+            self.o.eq(Cat(*bits)),
+            state.eq(self.i[6:] if descramble else Cat(*bits[6:])),
+        ]
+
+# Encoder ------------------------------------------------------------------------------------------
+
+class BASEREncoder(LiteXModule):
+    """XGMII to 66-bit blocks encoder."""
+    def __init__(self):
+        self.d      = Signal(64) # XGMII data.
+        self.c      = Signal(8)  # XGMII control.
+        self.header = Signal(2)
+        self.data   = Signal(64)
+
+        # # #
+
+        lanes = [self.d[8*i:8*(i + 1)] for i in range(8)]
+        codes = [Signal(7) for i in range(8)]
+        valid = [Signal() for i in range(8)] # Idle/Error control characters.
+        for i in range(8):
+            self.comb += [
+                codes[i].eq(Mux(lanes[i] == XGMII_IDLE, CODE_IDLE, CODE_ERROR)),
+                valid[i].eq(self.c[i] & ((lanes[i] == XGMII_IDLE) | (lanes[i] == XGMII_ERROR))),
+            ]
+
+        def ctrl_lanes(start, stop):
+            return reduce(and_, [valid[i] for i in range(start, stop)], 1)
+
+        cases = If(self.c == 0x00,
+            self.header.eq(SYNC_DATA),
+            self.data.eq(self.d),
+        ).Elif(ctrl_lanes(0, 8),
+            self.header.eq(SYNC_CTRL),
+            self.data.eq(Cat(C(BLOCK_CTRL, 8), *codes)),
+        ).Elif((self.c == 0x01) & (lanes[0] == XGMII_START),
+            self.header.eq(SYNC_CTRL),
+            self.data.eq(Cat(C(BLOCK_START_0, 8), self.d[8:])),
+        ).Elif((self.c == 0x1f) & (lanes[4] == XGMII_START) & ctrl_lanes(0, 4),
+            self.header.eq(SYNC_CTRL),
+            self.data.eq(Cat(C(BLOCK_START_4, 8), *codes[:4], C(0, 4), self.d[40:])),
+        )
+        for k in range(8):
+            fields = [C(BLOCK_TERM[k], 8)] + lanes[:k] + ([C(0, 7 - k)] if k < 7 else []) + codes[k + 1:]
+            cases = cases.Elif((self.c == ((0xff << k) & 0xff)) & (lanes[k] == XGMII_TERM) & ctrl_lanes(k + 1, 8),
+                self.header.eq(SYNC_CTRL),
+                self.data.eq(Cat(*fields)),
+            )
+        cases = cases.Else(
+            self.header.eq(SYNC_CTRL),
+            self.data.eq(Cat(C(BLOCK_CTRL, 8), *[C(CODE_ERROR, 7) for i in range(8)])),
+        )
+        self.sync += cases
+
+# Decoder ------------------------------------------------------------------------------------------
+
+class BASERDecoder(LiteXModule):
+    """66-bit blocks to XGMII decoder."""
+    def __init__(self):
+        self.header = Signal(2)
+        self.data   = Signal(64)
+        self.d      = Signal(64) # XGMII data.
+        self.c      = Signal(8)  # XGMII control.
+
+        # # #
+
+        block_type = self.data[:8]
+
+        def decode_code(n):
+            code = self.data[n:n + 7]
+            return Mux(code == CODE_IDLE, XGMII_IDLE, XGMII_ERROR)
+
+        def xgmii(lanes):
+            # lanes: list of (data, ctrl) per lane.
+            return [
+                self.d.eq(Cat(*[d for d, c in lanes])),
+                self.c.eq(Cat(*[C(c, 1) for d, c in lanes])),
+            ]
+
+        error = xgmii([(C(XGMII_ERROR, 8), 1)]*8)
+
+        cases = {}
+        cases[BLOCK_CTRL]    = xgmii([(decode_code(8 + 7*i), 1) for i in range(8)])
+        cases[BLOCK_START_0] = xgmii([(C(XGMII_START, 8), 1)] + [(self.data[8*i:8*(i + 1)], 0) for i in range(1, 8)])
+        cases[BLOCK_START_4] = xgmii([(decode_code(8 + 7*i), 1) for i in range(4)] + [(C(XGMII_START, 8), 1)] +
+            [(self.data[8*i:8*(i + 1)], 0) for i in range(5, 8)])
+        for k in range(8):
+            cases[BLOCK_TERM[k]] = xgmii(
+                [(self.data[8*(i + 1):8*(i + 2)], 0) for i in range(k)] +
+                [(C(XGMII_TERM, 8), 1)] +
+                [(decode_code(8 + 8*k + (7 - k) + 7*j), 1) for j in range(7 - k)]
+            )
+        cases["default"] = error
+
+        self.sync += If(self.header == SYNC_DATA,
+            self.d.eq(self.data),
+            self.c.eq(0x00),
+        ).Elif(self.header == SYNC_CTRL,
+            Case(block_type, cases)
+        ).Else(*error)
+
+# Block Lock ---------------------------------------------------------------------------------------
+
+class BASERBlockLock(LiteXModule):
+    """Sync header alignment: slip until 64 consecutive valid headers, lose lock on 16 invalid
+    headers in a 64 headers window."""
+    def __init__(self, slip_wait=64):
+        self.header = Signal(2)
+        self.slip   = Signal()
+        self.lock   = Signal()
+
+        # # #
+
+        valid    = Signal()
+        count    = Signal(6)
+        invalids = Signal(5)
+        wait     = Signal(max=slip_wait + 1)
+        self.comb += valid.eq((self.header == SYNC_DATA) | (self.header == SYNC_CTRL))
+
+        self.sync += [
+            self.slip.eq(0),
+            If(wait != 0,
+                wait.eq(wait - 1)
+            ).Elif(~self.lock,
+                # Search: slip on invalid header, lock after 64 consecutive valid headers.
+                If(valid,
+                    count.eq(count + 1),
+                    If(count == 63,
+                        self.lock.eq(1),
+                        invalids.eq(0),
+                    )
+                ).Else(
+                    count.eq(0),
+                    self.slip.eq(1),
+                    wait.eq(slip_wait),
+                )
+            ).Else(
+                # Locked: monitor invalid headers over 64 headers windows.
+                count.eq(count + 1),
+                If(count == 63,
+                    invalids.eq(0)
+                ),
+                If(~valid,
+                    invalids.eq(invalids + 1),
+                    If(invalids == 15,
+                        self.lock.eq(0),
+                        count.eq(0),
+                    )
+                )
+            )
+        ]
+
+# PCS ----------------------------------------------------------------------------------------------
+
+class BASERPCSTX(LiteXModule):
+    """XGMII to scrambled 66-bit blocks."""
+    def __init__(self):
+        self.xgmii_d = Signal(64)
+        self.xgmii_c = Signal(8)
+        self.header  = Signal(2)
+        self.data    = Signal(64)
+
+        # # #
+
+        self.encoder   = encoder   = BASEREncoder()
+        self.scrambler = scrambler = BASERScrambler()
+        header = Signal(2)
+        self.comb += [
+            encoder.d.eq(self.xgmii_d),
+            encoder.c.eq(self.xgmii_c),
+            scrambler.i.eq(encoder.data),
+            self.data.eq(scrambler.o),
+            self.header.eq(header),
+        ]
+        self.sync += header.eq(encoder.header) # Aligned with scrambler output.
+
+class BASERPCSRX(LiteXModule):
+    """Scrambled 66-bit blocks to XGMII (with block lock)."""
+    def __init__(self):
+        self.header  = Signal(2)
+        self.data    = Signal(64)
+        self.slip    = Signal()
+        self.lock    = Signal()
+        self.xgmii_d = Signal(64)
+        self.xgmii_c = Signal(8)
+
+        # # #
+
+        self.block_lock  = block_lock  = BASERBlockLock()
+        self.descrambler = descrambler = BASERScrambler(descramble=True)
+        self.decoder     = decoder     = BASERDecoder()
+        header = Signal(2)
+        self.comb += [
+            block_lock.header.eq(self.header),
+            self.slip.eq(block_lock.slip),
+            self.lock.eq(block_lock.lock),
+            descrambler.i.eq(self.data),
+            decoder.header.eq(header),
+            decoder.data.eq(descrambler.o),
+        ]
+        self.sync += header.eq(self.header) # Aligned with descrambler output.
+        # Send local errors to the MAC while not locked.
+        self.comb += If(self.lock,
+            self.xgmii_d.eq(decoder.d),
+            self.xgmii_c.eq(decoder.c),
+        ).Else(
+            self.xgmii_d.eq(Replicate(C(XGMII_ERROR, 8), 8)),
+            self.xgmii_c.eq(0xff),
+        )
+
+# LiteEth PHY 10GBASE-R ----------------------------------------------------------------------------
+
+class _LanePads:
+    def __init__(self, pads, lane):
+        self.txp = pads.txp[lane]
+        self.txn = pads.txn[lane]
+        self.rxp = pads.rxp[lane]
+        self.rxn = pads.rxn[lane]
+
+def get_lane_pads(pads, lane):
+    """Single lane data pads of a multi-lane (ex QSFP28) transceivers pads."""
+    return _LanePads(pads, lane)
+
+class GTYQuadPLLChannel(GTYQuadPLL):
+    """Transceiver side of a GTYQuadPLL shared between transceivers.
+
+    USP_GTY_10G_BASER requires a GTYQuadPLL and drives its reset: each transceiver gets its own
+    channel with the clocks/lock of the shared PLL, the same configuration (computed from the PLL
+    reference clock/linerate) and its own reset request.
+    """
+    def __init__(self, pll):
+        self.clk    = pll.clk
+        self.refclk = pll.refclk
+        self.lock   = pll.lock
+        self.reset  = Signal()
+        self.config = self.compute_config(pll.config["clkin"], pll.config["linerate"])
+
+def get_quad_pll_channels(pll, n):
+    """Share a GTYQuadPLL between n transceivers: each one gets its own PLL reset request (OR-ed)."""
+    channels = [GTYQuadPLLChannel(pll) for i in range(n)]
+    return channels, pll.reset.eq(reduce(or_, [c.reset for c in channels]))
+
+class LiteEthPHY10GBASER(LiteXModule):
+    dw          = 64
+    tx_clk_freq = 156.25e6
+    rx_clk_freq = 156.25e6
+    def __init__(self, pll, data_pads, sys_clk_freq, tx_polarity=0, rx_polarity=0, bit_reverse=True, dic=False):
+        self.cd_eth_tx, self.cd_eth_rx = "eth_tx", "eth_rx"
+        self.integrated_ifg_inserter = True
+        self.block_lock = Signal()
+
+        # # #
+
+        # Transceiver (creates eth_tx/eth_rx clock domains).
+        self.serdes = serdes = USP_GTY_10G_BASER(pll, data_pads, sys_clk_freq,
+            tx_polarity = tx_polarity,
+            rx_polarity = rx_polarity,
+        )
+
+        # PCS.
+        self.pcs_tx = pcs_tx = ClockDomainsRenamer("eth_tx")(BASERPCSTX())
+        self.pcs_rx = pcs_rx = ClockDomainsRenamer("eth_rx")(BASERPCSRX())
+        reverse = _reverse if bit_reverse else (lambda s: s)
+        self.comb += [
+            serdes.tx_data.eq(reverse(pcs_tx.data)),
+            serdes.tx_header.eq(reverse(pcs_tx.header)),
+            pcs_rx.data.eq(reverse(serdes.rx_data)),
+            pcs_rx.header.eq(reverse(serdes.rx_header)),
+            serdes.rx_slip.eq(pcs_rx.slip),
+        ]
+        self.specials += MultiReg(pcs_rx.lock, self.block_lock)
+
+        # XGMII.
+        xgmii = Record([("tx_data", 64), ("tx_ctl", 8), ("rx_data", 64), ("rx_ctl", 8)])
+        self.comb += [
+            pcs_tx.xgmii_d.eq(xgmii.tx_data),
+            pcs_tx.xgmii_c.eq(xgmii.tx_ctl),
+            xgmii.rx_data.eq(pcs_rx.xgmii_d),
+            xgmii.rx_ctl.eq(pcs_rx.xgmii_c),
+        ]
+        # Note: Deficit Idle Count disabled by default: frames starting on lane 4 right after a lane 4
+        # terminate were corrupted by the XGMII TX in simulation.
+        self.tx = ClockDomainsRenamer("eth_tx")(LiteEthPHYXGMIITX(pads=xgmii, dw=self.dw, dic=dic))
+        self.rx = ClockDomainsRenamer("eth_rx")(LiteEthPHYXGMIIRX(pads=xgmii, dw=self.dw))
+        self.sink, self.source = self.tx.sink, self.rx.source
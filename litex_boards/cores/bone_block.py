@@ -0,0 +1,310 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""UARTBone/JTAGBone Block-Transfer Bridge.
+
+Drop-in replacement of LiteX's UARTBone (Stream2Wishbone), used by UARTBone and JTAGBone, for boards
+using them as the host link (SDRAM/LiteScope dumps). The UARTBone protocol is kept (litex_server
+still works) and extended:
+
+- Block commands: 16-bit length (up to 65536 words) instead of 8-bit, so a few MB are moved with a
+  handful of commands.
+- Pipelining: Wishbone reads are decoupled from the byte stream by a response FIFO, so reads of the
+  next words (and next commands, queued in an RX FIFO) overlap the transmission of the response.
+- Compression: block reads can return Run-Length-Encoded data (repeated words sent once).
+
+Commands (address: words, MSB first; data: MSB first):
+
+    CMD    : [3:0] 0x1: write incr, 0x2: read incr, 0x3: write fixed, 0x4: read fixed.
+             [4]   Block: 16-bit length (else 8-bit).
+             [5]   RLE response (block reads).
+    LENGTH : 1 or 2 bytes (words, 0: 256/65536).
+    ADDRESS: address_width/8 bytes.
+    DATA   : LENGTH words (writes).
+
+RLE responses are made of [count-1 (1 byte)][word (4 bytes)] tokens, count being up to 256 repeats.
+
+The host client/benchmark is litex_boards.tools.bone_block. litex_server (and so LiteScope's
+litescope_cli and the RemoteClient scripts going through it) still uses the single-word UARTBone
+commands and sees no speedup: transfers are only faster through the litex_boards.tools.bone_block
+client (CommUARTBlock).
+"""
+
+from migen import *
+
+from litex.gen import *
+from litex.gen.genlib.misc import WaitTimer
+
+from litex.soc.interconnect import stream
+from litex.soc.interconnect import wishbone
+
+# Constants ----------------------------------------------------------------------------------------
+
+CMD_WRITE_BURST_INCR  = 0x01
+CMD_READ_BURST_INCR   = 0x02
+CMD_WRITE_BURST_FIXED = 0x03
+CMD_READ_BURST_FIXED  = 0x04
+
+CMD_BLOCK = 0x10 # 16-bit length.
+CMD_RLE   = 0x20 # RLE response.
+
+# Stream2Wishbone Block ----------------------------------------------------------------------------
+
+class Stream2WishboneBlock(LiteXModule):
+    """Stream2Wishbone with Block/Pipelined/RLE extensions
+
+    Parameters
+    ----------
+    phy : UARTPHY/JTAGPHY (optional)
+        PHY providing source/sink byte streams (else sink/source are exposed).
+
+    clk_freq : int
+        System clock frequency (command timeout).
+
+    address_width : int
+        Wishbone address width.
+
+    rx_fifo_depth : int
+        RX FIFO depth (bytes): commands queued by the host while a response is sent.
+
+    tx_fifo_depth : int
+        Response FIFO depth (words): Wishbone reads in advance of the transmission.
+    """
+    def __init__(self, phy=None, clk_freq=None, address_width=32, rx_fifo_depth=64, tx_fifo_depth=16):
+        self.sink     = sink   = stream.Endpoint([("data", 8)]) if phy is None else phy.source
+        self.source   = source = stream.Endpoint([("data", 8)]) if phy is None else phy.sink
+        self.wishbone = wishbone.Interface(data_width=32, address_width=address_width, addressing="word")
+
+        # # #
+
+        assert address_width in [8, 16, 32, 64]
+
+        # RX FIFO.
+        self.rx_fifo = rx_fifo = stream.SyncFIFO([("data", 8)], rx_fifo_depth, buffered=True)
+        self.comb += sink.connect(rx_fifo.sink)
+        rx = rx_fifo.source
+
+        # Response FIFO.
+        self.tx_fifo = tx_fifo = ResetInserter()(stream.SyncFIFO([("data", 32), ("rle", 1)], tx_fifo_depth))
+
+        # Command Parser ---------------------------------------------------------------------------
+        cmd              = Signal(8,             reset_less=True)
+        length           = Signal(16,            reset_less=True)
+        address          = Signal(address_width, reset_less=True)
+        data             = Signal(32,            reset_less=True)
+        incr             = Signal(reset_less=True)
+        data_bytes_count = Signal(2,             reset_less=True)
+        addr_bytes_count = Signal(log2_int(address_width//8, need_pow2=False) or 1, reset_less=True)
+        len_bytes_count  = Signal(1,             reset_less=True)
+        words_count      = Signal(16,            reset_less=True)
+
+        block     = cmd[4]
+        rle       = cmd[5]
+        base      = cmd[:4]
+        last_word = (words_count == (length - 1)[:16])
+
+        self.fsm   = fsm   = ResetInserter()(FSM(reset_state="RECEIVE-CMD"))
+        self.timer = timer = WaitTimer(int(100e-3*clk_freq))
+        # Timeout on inactivity only (block transfers can wait on the host for a long time): resets
+        # the command parser and drops the pending response.
+        self.comb += timer.wait.eq(~fsm.ongoing("RECEIVE-CMD") &
+            ~(rx.valid & rx.ready) &
+            ~(source.valid & source.ready) &
+            ~self.wishbone.ack)
+        self.comb += fsm.reset.eq(timer.done)
+        self.comb += tx_fifo.reset.eq(timer.done)
+        fsm.act("RECEIVE-CMD",
+            rx.ready.eq(1),
+            NextValue(data_bytes_count, 0),
+            NextValue(addr_bytes_count, 0),
+            NextValue(len_bytes_count,  0),
+            NextValue(words_count,      0),
+            NextValue(length,           0),
+            If(rx.valid,
+                NextValue(cmd, rx.data),
+                NextState("RECEIVE-LENGTH")
+            )
+        )
+        fsm.act("RECEIVE-LENGTH",
+            rx.ready.eq(1),
+            If(rx.valid,
+                NextValue(length, Cat(rx.data, length)),
+                NextValue(len_bytes_count, len_bytes_count + 1),
+                If(~block | (len_bytes_count == 1),
+                    NextState("RECEIVE-ADDRESS")
+                )
+            )
+        )
+        fsm.act("RECEIVE-ADDRESS",
+            rx.ready.eq(1),
+            If(rx.valid,
+                NextValue(address, Cat(rx.data, address)),
+                NextValue(addr_bytes_count, addr_bytes_count + 1),
+                If(addr_bytes_count == (address_width//8 - 1),
+                    NextValue(incr, (base == CMD_WRITE_BURST_INCR) | (base == CMD_READ_BURST_INCR)),
+                    # 8-bit length: 0 is 256 words.
+                    If(~block & (length == 0),
+                        NextValue(length, 256)
+                    ),
+                    If((base == CMD_WRITE_BURST_INCR) | (base == CMD_WRITE_BURST_FIXED),
+                        NextState("RECEIVE-DATA")
+                    ).Elif((base == CMD_READ_BURST_INCR) | (base == CMD_READ_BURST_FIXED),
+                        NextState("READ-DATA")
+                    ).Else(
+                        NextState("RECEIVE-CMD")
+                    )
+                )
+            )
+        )
+        fsm.act("RECEIVE-DATA",
+            rx.ready.eq(1),
+            If(rx.valid,
+                NextValue(data, Cat(rx.data, data)),
+                NextValue(data_bytes_count, data_bytes_count + 1),
+                If(data_bytes_count == 3,
+                    NextState("WRITE-DATA")
+                )
+            )
+        )
+        self.comb += [
+            self.wishbone.adr.eq(address),
+            self.wishbone.dat_w.eq(data),
+            self.wishbone.sel.eq(0b1111),
+        ]
+        fsm.act("WRITE-DATA",
+            self.wishbone.stb.eq(1),
+            self.wishbone.we.eq(1),
+            self.wishbone.cyc.eq(1),
+            If(self.wishbone.ack,
+                NextValue(words_count, words_count + 1),
+                NextValue(address, address + incr),
+                If(last_word,
+                    NextState("RECEIVE-CMD")
+                ).Else(
+                    NextState("RECEIVE-DATA")
+                )
+            )
+        )
+        # Reads are only issued with room in the Response FIFO (which can't be lost while waiting
+        # for ack: only written here).
+        fsm.act("READ-DATA",
+            self.wishbone.stb.eq(tx_fifo.sink.ready),
+            self.wishbone.we.eq(0),
+            self.wishbone.cyc.eq(tx_fifo.sink.ready),
+            tx_fifo.sink.valid.eq(self.wishbone.ack),
+            tx_fifo.sink.data.eq(self.wishbone.dat_r),
+            tx_fifo.sink.rle.eq(block & rle),
+            tx_fifo.sink.last.eq(last_word),
+            If(self.wishbone.ack,
+                NextValue(words_count, words_count + 1),
+                NextValue(address, address + incr),
+                If(last_word,
+                    NextState("RECEIVE-CMD")
+                )
+            )
+        )
+
+        # Response Encoder/Serializer --------------------------------------------------------------
+        shift       = Signal(40) # Bytes sent from MSB.
+        shift_count = Signal(3)
+        run_valid   = Signal()
+        run_data    = Signal(32)
+        run_count   = Signal(8)
+        run_flush   = Signal()
+
+        self.comb += source.data.eq(shift[32:])
+        self.encoder = encoder = ResetInserter()(FSM(reset_state="IDLE"))
+        self.comb += encoder.reset.eq(timer.done)
+        encoder.act("IDLE",
+            If(run_flush,
+                NextValue(shift, Cat(run_data, run_count)),
+                NextValue(shift_count, 5),
+                NextValue(run_valid, 0),
+                NextValue(run_flush, 0),
+                NextState("SEND")
+            ).Elif(tx_fifo.source.valid,
+                # Raw word.
+                If(~tx_fifo.source.rle,
+                    tx_fifo.source.ready.eq(1),
+                    NextValue(shift, Cat(C(0, 8), tx_fifo.source.data)),
+                    NextValue(shift_count, 4),
+                    NextState("SEND")
+                # RLE: Extend current run.
+                ).Elif(run_valid & (tx_fifo.source.data == run_data) & (run_count != 255),
+                    tx_fifo.source.ready.eq(1),
+                    NextValue(run_count, run_count + 1),
+                    NextValue(run_flush, tx_fifo.source.last),
+                # RLE: Send current run (word kept in FIFO).
+                ).Elif(run_valid,
+                    NextValue(run_flush, 1),
+                # RLE: Start a new run.
+                ).Else(
+                    tx_fifo.source.ready.eq(1),
+                    NextValue(run_valid, 1),
+                    NextValue(run_data,  tx_fifo.source.data),
+                    NextValue(run_count, 0),
+                    NextValue(run_flush, tx_fifo.source.last),
+                )
+            )
+        )
+        encoder.act("SEND",
+            source.valid.eq(1),
+            If(source.ready,
+                NextValue(shift, shift << 8),
+                NextValue(shift_count, shift_count - 1),
+                If(shift_count == 1,
+                    NextState("IDLE")
+                )
+            )
+        )
+
+# UARTBone Block -----------------------------------------------------------------------------------
+
+class UARTBoneBlock(Stream2WishboneBlock):
+    def __init__(self, phy, clk_freq, cd="sys", address_width=32, **kwargs):
+        if cd == "sys":
+            self.phy = phy
+            Stream2WishboneBlock.__init__(self, self.phy, clk_freq=clk_freq, address_width=address_width, **kwargs)
+        else:
+            self.phy = ClockDomainsRenamer(cd)(phy)
+            self.tx_cdc = stream.ClockDomainCrossing([("data", 8)], cd_from="sys", cd_to=cd)
+            self.rx_cdc = stream.ClockDomainCrossing([("data", 8)], cd_from=cd,    cd_to="sys")
+            self.comb += self.phy.source.connect(self.rx_cdc.sink)
+            self.comb += self.tx_cdc.source.connect(self.phy.sink)
+            Stream2WishboneBlock.__init__(self, clk_freq=clk_freq, address_width=address_width, **kwargs)
+            self.comb += self.rx_cdc.source.connect(self.sink)
+            self.comb += self.source.connect(self.tx_cdc.sink)
+
+# SoC Integration ----------------------------------------------------------------------------------
+
+def add_uartbone_block(soc, name="uartbone", uart_name="serial", clk_freq=None, baudrate=115200, cd="sys"):
+    """Add a UARTBone with block-transfer mode (replaces soc.add_uartbone/--with-uartbone)."""
+    from litex.soc.cores.uart import UARTPHY
+    clk_freq = soc.sys_clk_freq if clk_freq is None else clk_freq
+    soc.check_if_exists(name)
+    uartbone_phy = UARTPHY(soc.platform.request(uart_name), clk_freq, baudrate)
+    uartbone     = UARTBoneBlock(
+        phy           = uartbone_phy,
+        clk_freq      = clk_freq,
+        cd            = cd,
+        address_width = soc.bus.address_width)
+    soc.add_module(name=f"{name}_phy", module=uartbone_phy)
+    soc.add_module(name=name,          module=uartbone)
+    soc.bus.add_master(name=name, master=uartbone.wishbone)
+    return uartbone
+
+def add_jtagbone_block(soc, name="jtagbone", chain=1):
+    """Add a JTAGBone with block-transfer mode (replaces soc.add_jtagbone/--with-jtagbone)."""
+    from litex.soc.cores.jtag import JTAGPHY
+    soc.check_if_exists(name)
+    jtagbone_phy = JTAGPHY(device=soc.platform.device, chain=chain, platform=soc.platform)
+    jtagbone     = UARTBoneBlock(
+        phy           = jtagbone_phy,
+        clk_freq      = soc.sys_clk_freq,
+        address_width = soc.bus.address_width)
+    soc.add_module(name=f"{name}_phy", module=jtagbone_phy)
+    soc.add_module(name=name,          module=jtagbone)
+    soc.bus.add_master(name=name, master=jtagbone.wishbone)
+    return jtagbone
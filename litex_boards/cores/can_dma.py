@@ -0,0 +1,354 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""CTU CAN FD RX DMA.
+
+Receives the CAN FD frames of a CTUCANFD core in hardware, instead of the CPU draining every frame
+through register reads:
+
+- The RX engine shares the CTU CAN FD memory interface with the CPU (wishbone arbiter) and drains
+  the RX buffer of the core (RX_STATUS/RX_DATA) as soon as a frame is received. The core's
+  STATUS.DOR (RX buffer overrun) is also polled and cleared (and counted).
+- Frames are timestamped by the core (64-bit sys_clk cycles counter provided to the core,
+  SOF/EOF timestamp selected by RX_SETTINGS.RTSOP).
+- Hardware acceptance filtering: frames are only written when matching one of the enabled
+  id/mask filters (29-bit id and IDE bit; all frames accepted when no filter is enabled).
+- Accepted frames are written to a ring buffer in main RAM through the SoC bus (coherent with the
+  L2 cache): slot n at base + 128*(n % slots) holds the frame as read from the RX buffer
+  (FRAME_FORMAT_W, IDENTIFIER_W, TIMESTAMP_L_W, TIMESTAMP_U_W, data words). write_index is
+  incremented after each frame, software consumes frames up to it and updates read_index. Frames
+  received while the ring is full are dropped and counted (overruns).
+- IRQ coalescing: the rx event is raised after irq_threshold frames or irq_timeout sys_clk cycles
+  after the first pending frame.
+
+The CPU keeps access to the core (configuration, TX), but must not read RX_DATA when the RX DMA is
+enabled.
+"""
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect.csr_eventmanager import *
+from litex.soc.interconnect import wishbone
+
+# CTU CAN FD Registers -----------------------------------------------------------------------------
+
+CTUCANFD_STATUS    = 0x08
+CTUCANFD_COMMAND   = 0x0c
+CTUCANFD_RX_STATUS = 0x68
+CTUCANFD_RX_DATA   = 0x6c
+
+STATUS_DOR   = 1 << 1 # RX buffer data overrun.
+COMMAND_CDO  = 1 << 3 # Clear data overrun.
+
+SLOT_WORDS   = 32     # Ring slot (words), max frame: FRAME_FORMAT_W + 19 words.
+
+# CAN RX DMA ---------------------------------------------------------------------------------------
+
+class CANRXDMA(LiteXModule):
+    """CTU CAN FD RX DMA
+
+    Parameters
+    ----------
+    sys_clk_freq : float
+        System clock frequency (default IRQ timeout: 1ms).
+
+    nfilters : int
+        Number of acceptance filters.
+
+    Attributes
+    ----------
+    ctrl : wishbone.Interface
+        Master to the CTU CAN FD memory interface.
+
+    bus : wishbone.Interface
+        Master to the main RAM (ring buffer).
+
+    timestamp : Signal(64)
+        Timestamp to provide to the CTU CAN FD core.
+    """
+    def __init__(self, sys_clk_freq, nfilters=4):
+        self.ctrl      = ctrl = wishbone.Interface(data_width=32, address_width=32, addressing="word")
+        self.bus       = bus  = wishbone.Interface(data_width=32, address_width=32, addressing="word")
+        self.timestamp = Signal(64)
+
+        # CSRs.
+        self._control       = CSRStorage(fields=[
+            CSRField("enable", size=1, offset=0, description="Enable RX DMA."),
+            CSRField("reset",  size=1, offset=1, pulse=True, description="Reset write_index and counters."),
+        ])
+        self._base          = CSRStorage(32, description="Ring buffer base address (bytes, 128-byte aligned).")
+        self._slots         = CSRStorage(32, reset=64, description="Ring buffer slots (128 bytes each).")
+        self._write_index   = CSRStatus(32,  description="Frames written (free-running, slot: write_index % slots).")
+        self._read_index    = CSRStorage(32, description="Frames consumed by software (free-running).")
+        self._filter_enable = CSRStorage(nfilters, description="Enabled filters (all frames accepted when 0).")
+        for i in range(nfilters):
+            setattr(self, f"_filter{i}_id",   CSRStorage(30, name=f"filter{i}_id",   description=f"Filter {i} id[28:0] (extended id or base id), IDE[29]."))
+            setattr(self, f"_filter{i}_mask", CSRStorage(30, name=f"filter{i}_mask", description=f"Filter {i} id/IDE mask (1: compared)."))
+        self._irq_threshold = CSRStorage(16, reset=16, description="RX IRQ after this number of frames.")
+        self._irq_timeout   = CSRStorage(32, reset=int(sys_clk_freq//1000), description="RX IRQ timeout (sys_clk cycles after the first pending frame).")
+        self._frames        = CSRStatus(32, description="Frames written to the ring buffer.")
+        self._filtered      = CSRStatus(32, description="Frames rejected by the acceptance filters.")
+        self._overruns      = CSRStatus(32, description="Frames dropped (ring buffer full).")
+        self._core_overruns = CSRStatus(32, description="CTU CAN FD RX buffer overruns (STATUS.DOR).")
+
+        # IRQs.
+        self.ev = EventManager()
+        self.ev.rx      = EventSourcePulse(description="Frames received (coalesced).")
+        self.ev.overrun = EventSourcePulse(description="Frame dropped (ring buffer full or core overrun).")
+        self.ev.finalize()
+
+        # # #
+
+        enable = self._control.fields.enable
+        reset  = self._control.fields.reset
+
+        # Timestamp.
+        self.sync += self.timestamp.eq(self.timestamp + 1)
+
+        # Frame.
+        fmt       = Signal(32)
+        ident     = Signal(32)
+        data      = Signal(32)
+        rwcnt     = fmt[11:16] # Words following FRAME_FORMAT_W.
+        ide       = fmt[6]
+        can_id    = Signal(29)
+        count     = Signal(5)
+        offset    = Signal(5)
+        drop      = Signal()
+        self.comb += can_id.eq(Mux(ide, ident[0:29], ident[18:29]))
+
+        # Acceptance Filters.
+        matches = Signal(nfilters)
+        for i in range(nfilters):
+            fid   = getattr(self, f"_filter{i}_id").storage
+            fmask = getattr(self, f"_filter{i}_mask").storage
+            self.comb += matches[i].eq(((Cat(can_id, ide) ^ fid) & fmask) == 0)
+        accept = Signal()
+        self.comb += accept.eq((self._filter_enable.storage == 0) | ((matches & self._filter_enable.storage) != 0))
+
+        # Ring Buffer.
+        write_index = self._write_index.status
+        slot        = Signal(32)
+        full        = Signal()
+        self.comb += full.eq((write_index - self._read_index.storage) >= self._slots.storage)
+
+        # Bus Accesses.
+        def ctrl_access(adr, we=0, dat_w=0):
+            return [
+                ctrl.cyc.eq(1),
+                ctrl.stb.eq(1),
+                ctrl.we.eq(we),
+                ctrl.sel.eq(0b1111),
+                ctrl.adr.eq(adr >> 2),
+                ctrl.dat_w.eq(dat_w),
+            ]
+        def bus_write(dat_w):
+            return [
+                bus.cyc.eq(1),
+                bus.stb.eq(1),
+                bus.we.eq(1),
+                bus.sel.eq(0b1111),
+                bus.adr.eq((self._base.storage >> 2) + slot*SLOT_WORDS + offset),
+                bus.dat_w.eq(dat_w),
+            ]
+
+        # Events.
+        commit   = Signal()
+        filtered = Signal()
+        overrun  = Signal()
+        core_dor = Signal()
+
+        # FSM.
+        self.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            If(enable,
+                NextState("POLL-STATUS")
+            )
+        )
+        fsm.act("POLL-STATUS",
+            ctrl_access(CTUCANFD_STATUS),
+            If(ctrl.ack,
+                If(ctrl.dat_r & STATUS_DOR,
+                    core_dor.eq(1),
+                    NextState("CLEAR-DOR")
+                ).Else(
+                    NextState("POLL-RX")
+                )
+            )
+        )
+        fsm.act("CLEAR-DOR",
+            ctrl_access(CTUCANFD_COMMAND, we=1, dat_w=COMMAND_CDO),
+            If(ctrl.ack,
+                NextState("POLL-RX")
+            )
+        )
+        fsm.act("POLL-RX",
+            ctrl_access(CTUCANFD_RX_STATUS),
+            If(ctrl.ack,
+                If(ctrl.dat_r[4:15] != 0, # RXFRC.
+                    NextState("READ-FORMAT")
+                ).Else(
+                    NextState("IDLE")
+                )
+            )
+        )
+        fsm.act("READ-FORMAT",
+            ctrl_access(CTUCANFD_RX_DATA),
+            If(ctrl.ack,
+                NextValue(fmt, ctrl.dat_r),
+                NextState("READ-ID")
+            )
+        )
+        fsm.act("READ-ID",
+            ctrl_access(CTUCANFD_RX_DATA),
+            If(ctrl.ack,
+                NextValue(ident, ctrl.dat_r),
+                NextValue(count, rwcnt - 1),
+                NextState("ACCEPT")
+            )
+        )
+        fsm.act("ACCEPT",
+            NextValue(offset, 0),
+            NextValue(drop, 0),
+            If(~accept,
+                filtered.eq(1),
+                NextValue(drop, 1),
+            ).Elif(full,
+                overrun.eq(1),
+                NextValue(drop, 1),
+            ),
+            If(~accept | full,
+                If(count == 0,
+                    NextState("IDLE")
+                ).Else(
+                    NextState("READ-DATA")
+                )
+            ).Else(
+                NextState("WRITE-FORMAT")
+            )
+        )
+        fsm.act("WRITE-FORMAT",
+            bus_write(fmt),
+            If(bus.ack,
+                NextValue(offset, 1),
+                NextState("WRITE-ID")
+            )
+        )
+        fsm.act("WRITE-ID",
+            bus_write(ident),
+            If(bus.ack,
+                NextValue(offset, 2),
+                If(count == 0,
+                    NextState("COMMIT")
+                ).Else(
+                    NextState("READ-DATA")
+                )
+            )
+        )
+        fsm.act("READ-DATA",
+            ctrl_access(CTUCANFD_RX_DATA),
+            If(ctrl.ack,
+                NextValue(data,  ctrl.dat_r),
+                NextValue(count, count - 1),
+                If(drop,
+                    If(count == 1,
+                        NextState("IDLE")
+                    )
+                ).Else(
+                    NextState("WRITE-DATA")
+                )
+            )
+        )
+        fsm.act("WRITE-DATA",
+            bus_write(data),
+            If(bus.ack,
+                NextValue(offset, offset + 1),
+                If(count == 0,
+                    NextState("COMMIT")
+                ).Else(
+                    NextState("READ-DATA")
+                )
+            )
+        )
+        fsm.act("COMMIT",
+            commit.eq(1),
+            NextState("IDLE")
+        )
+
+        # Ring Buffer Index / Counters.
+        self.sync += [
+            If(commit,
+                write_index.eq(write_index + 1),
+                slot.eq(slot + 1),
+                If(slot == (self._slots.storage - 1),
+                    slot.eq(0)
+                )
+            ),
+            If(reset,
+                write_index.eq(0),
+                slot.eq(0),
+            )
+        ]
+        for counter, event in [
+            (self._frames,        commit),
+            (self._filtered,      filtered),
+            (self._overruns,      overrun),
+            (self._core_overruns, core_dor),
+            ]:
+            self.sync += [
+                If(reset,
+                    counter.status.eq(0)
+                ).Elif(event,
+                    counter.status.eq(counter.status + 1)
+                )
+            ]
+
+        # IRQ Coalescing.
+        pending = Signal(16)
+        timer   = Signal(32)
+        self.comb += [
+            self.ev.rx.trigger.eq((pending != 0) & (
+                (pending >= self._irq_threshold.storage) |
+                (timer   >= self._irq_timeout.storage))),
+            self.ev.overrun.trigger.eq(overrun | core_dor),
+        ]
+        self.sync += [
+            If(self.ev.rx.trigger | reset,
+                pending.eq(commit),
+                timer.eq(0),
+            ).Else(
+                pending.eq(pending + commit),
+                If(pending != 0,
+                    timer.eq(timer + 1)
+                )
+            )
+        ]
+
+# SoC Integration ----------------------------------------------------------------------------------
+
+def add_can_dma(soc, name, can, region, nfilters=4, rx_buffer_size=1024):
+    """Add a CANRXDMA on a CTUCANFD core (<name>_dma) and add the core to the SoC bus (shared with
+    the RX engine) at region. The core's RX buffer is enlarged to rx_buffer_size words (to absorb
+    the bus latencies of the RX engine) and its timestamp is provided by the RX engine.
+    """
+    dma = CANRXDMA(soc.sys_clk_freq, nfilters=nfilters)
+    soc.add_module(name=f"{name}_dma", module=dma)
+    can.core_params.update(
+        p_rx_buffer_size = rx_buffer_size,
+        i_timestamp      = dma.timestamp,
+    )
+
+    # CTU CAN FD memory interface shared between SoC bus and RX engine.
+    can_bus = wishbone.Interface(data_width=32, address_width=32, addressing="word")
+    soc.submodules += wishbone.Arbiter([can_bus, dma.ctrl], can.bus)
+    soc.bus.add_slave(name, can_bus, region)
+
+    # Ring buffer writes.
+    soc.bus.add_master(name=f"{name}_dma", master=dma.bus)
+    soc.irq.add(f"{name}_dma", use_loc_if_exists=True)
+    return dma
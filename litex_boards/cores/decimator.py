@@ -0,0 +1,156 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""Decimation stages for ADC streams (CIC and Half-Band FIR).
+
+Both stages are designed for free-running ADC streams: sink is always ready and samples are
+signed (two's complement) and carried in the data field of the stream.
+"""
+
+import math
+
+from functools import reduce
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect import stream
+
+# CIC Decimator ------------------------------------------------------------------------------------
+
+class CICDecimator(LiteXModule):
+    """CIC Decimator with runtime decimation rate.
+
+    Decimation rate is set with rate (1 bypasses the filter, up to max_rate). The CIC has a gain of
+    rate**order that has to be compensated by shift (order*log2(rate) for power-of-2 rates).
+    """
+    def __init__(self, data_width=16, order=3, max_rate=1024):
+        self.sink   = sink   = stream.Endpoint([("data", data_width)])
+        self.source = source = stream.Endpoint([("data", data_width)])
+        self.rate   = Signal(max=max_rate + 1, reset=1)
+        self.shift  = Signal(max=order*log2_int(max_rate, need_pow2=False) + 1)
+
+        # # #
+
+        width = data_width + order*math.ceil(math.log2(max_rate))
+
+        # Integrators (at input rate).
+        data        = Signal((data_width, True))
+        integrators = [Signal((width, True)) for _ in range(order)]
+        self.comb += data.eq(sink.data)
+        for n in range(order):
+            _input = data if n == 0 else integrators[n - 1]
+            self.sync += If(sink.valid, integrators[n].eq(integrators[n] + _input))
+
+        # Decimation.
+        count  = Signal(max=max_rate)
+        strobe = Signal()
+        self.sync += [
+            strobe.eq(0),
+            If(sink.valid,
+                count.eq(count + 1),
+                If(count >= (self.rate - 1),
+                    count.eq(0),
+                    strobe.eq(1),
+                )
+            )
+        ]
+
+        # Combs (at output rate).
+        comb_valids = [strobe] + [Signal() for _ in range(order)]
+        comb_datas  = [integrators[-1]] + [Signal((width, True)) for _ in range(order)]
+        for n in range(order):
+            delay = Signal((width, True))
+            self.sync += [
+                comb_valids[n + 1].eq(comb_valids[n]),
+                If(comb_valids[n],
+                    delay.eq(comb_datas[n]),
+                    comb_datas[n + 1].eq(comb_datas[n] - delay),
+                )
+            ]
+
+        # Output (Bypass when rate is 1).
+        self.comb += sink.ready.eq(1)
+        self.sync += [
+            If(self.rate == 1,
+                source.valid.eq(sink.valid),
+                source.data.eq(sink.data),
+            ).Else(
+                source.valid.eq(comb_valids[-1]),
+                source.data.eq(comb_datas[-1] >> self.shift),
+            )
+        ]
+
+# Half-Band Decimator ------------------------------------------------------------------------------
+
+def halfband_coefficients(ntaps=11, coef_width=18):
+    """Windowed-sinc (Hamming) half-band low-pass coefficients, quantized to coef_width bits."""
+    assert (ntaps % 4) == 3
+    coefs = []
+    for n in range(ntaps):
+        k = n - (ntaps - 1)//2
+        h = 0.5 if k == 0 else math.sin(math.pi*k/2)/(math.pi*k)
+        w = 0.54 + 0.46*math.cos(2*math.pi*k/(ntaps - 1))
+        coefs.append(h*w)
+    scale = 2**(coef_width - 2)/sum(coefs)
+    return [int(round(c*scale)) for c in coefs], coef_width - 2
+
+class HalfBandDecimator(LiteXModule):
+    """Decimation by 2 with a Half-Band FIR (Unity DC gain).
+
+    Half of the coefficients of a half-band filter are zero, so only (ntaps + 1)//2 multipliers
+    are generated. Filter can be bypassed at runtime with enable.
+    """
+    def __init__(self, data_width=16, ntaps=11, coef_width=18):
+        self.sink   = sink   = stream.Endpoint([("data", data_width)])
+        self.source = source = stream.Endpoint([("data", data_width)])
+        self.enable = Signal(reset=1)
+
+        # # #
+
+        coefs, frac = halfband_coefficients(ntaps, coef_width)
+
+        # Delay Line.
+        taps = [Signal((data_width, True)) for _ in range(ntaps)]
+        self.sync += If(sink.valid, [taps[0].eq(sink.data)] + [taps[n].eq(taps[n - 1]) for n in range(1, ntaps)])
+
+        # Decimation (Compute one output for two inputs).
+        phase  = Signal()
+        strobe = Signal()
+        self.sync += [
+            strobe.eq(0),
+            If(sink.valid,
+                phase.eq(~phase),
+                strobe.eq(phase),
+            )
+        ]
+
+        # Products (Registered, skipping zero coefficients).
+        products = []
+        for n, coef in enumerate(coefs):
+            if coef == 0:
+                continue
+            product = Signal((data_width + coef_width, True))
+            self.sync += product.eq(taps[n]*coef)
+            products.append(product)
+        products_valid = Signal()
+        self.sync += products_valid.eq(strobe)
+
+        # Sum.
+        accu = Signal((data_width + coef_width + log2_int(len(products), need_pow2=False), True))
+        self.comb += accu.eq(reduce(lambda a, b: a + b, products))
+
+        # Output (Bypass when disabled).
+        self.comb += sink.ready.eq(1)
+        self.sync += [
+            If(~self.enable,
+                source.valid.eq(sink.valid),
+                source.data.eq(sink.data),
+            ).Else(
+                source.valid.eq(products_valid),
+                source.data.eq(accu >> frac),
+            )
+        ]
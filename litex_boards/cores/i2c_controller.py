@@ -0,0 +1,380 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""I2C Controller.
+
+Hardware I2C master, replacing the bitbang I2CMaster (one CSR write per SCL/SDA edge) on buses with
+frequent transactions (sensors polling, SPD reads, clock synthesizers programming):
+
+- Command FIFO: each command is a byte operation with optional (repeated) START before and STOP
+  after (START/WRITE/READ/STOP flags, ACK/NACK for reads). Commands are executed back-to-back,
+  read bytes are pushed to the RX FIFO (SCL is held low when full).
+- Clock stretching: SCL high phases are only timed once SCL is seen high on the bus.
+- NACK on a write: a STOP is generated, the remaining commands of the transaction (up to the next
+  command with STOP) are skipped and the error event is raised.
+- Script mode: commands are stored (up to fifo_depth) instead of executed, and the whole script
+  (multiple transactions) is executed on each run, ex to poll a set of sensors with a single CSR
+  write. The done event is raised at the end of the script (or when the command FIFO is drained in
+  FIFO mode).
+
+Command format (cmd CSR): data[7:0], START[8], WRITE[9], READ[10], STOP[11], NACK[12].
+
+Since the BIOS I2C support (i2c commands, SPD reads) relies on the bitbang I2CMaster, targets keep
+it by default and select this controller with --i2c-controller=hardware.
+"""
+
+from migen import *
+from migen.genlib.cdc import MultiReg
+
+from litex.gen import *
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect.csr_eventmanager import *
+from litex.soc.interconnect import stream
+
+from litex.soc.cores.bitbang import I2CMaster
+
+# Commands -----------------------------------------------------------------------------------------
+
+I2C_CMD_START = 1 << 8
+I2C_CMD_WRITE = 1 << 9
+I2C_CMD_READ  = 1 << 10
+I2C_CMD_STOP  = 1 << 11
+I2C_CMD_NACK  = 1 << 12
+
+# I2C Controller -----------------------------------------------------------------------------------
+
+class I2CController(LiteXModule):
+    """I2C Controller
+
+    Parameters
+    ----------
+    pads : Record
+        I2C pads (scl/sda), None to only expose the scl/sda signals (ex for simulation).
+
+    sys_clk_freq : float
+        System clock frequency.
+
+    i2c_freq : float
+        Default SCL frequency (divider CSR).
+
+    fifo_depth : int
+        Command FIFO/script depth (power of 2).
+
+    rx_fifo_depth : int
+        RX FIFO depth.
+
+    Attributes
+    ----------
+    scl_oe, sda_oe : Signal(), out
+        SCL/SDA driven low (open-drain).
+
+    scl_in, sda_in : Signal(), in
+        SCL/SDA from the bus (synchronized internally).
+    """
+    def __init__(self, pads, sys_clk_freq, i2c_freq=100e3, fifo_depth=64, rx_fifo_depth=64):
+        assert fifo_depth & (fifo_depth - 1) == 0
+        self.scl_oe = Signal()
+        self.sda_oe = Signal()
+        self.scl_in = Signal(reset=1)
+        self.sda_in = Signal(reset=1)
+
+        # CSRs.
+        self._control = CSRStorage(fields=[
+            CSRField("script", size=1, offset=0, description="Script mode (commands stored, executed on run)."),
+            CSRField("run",    size=1, offset=1, pulse=True, description="Run the script."),
+            CSRField("clear",  size=1, offset=2, pulse=True, description="Clear command/RX FIFOs and NACK status."),
+        ])
+        self._divider = CSRStorage(16, reset=int(sys_clk_freq/(4*i2c_freq)), description="SCL quarter period (sys_clk cycles).")
+        self._cmd     = CSRStorage(fields=[
+            CSRField("data",  size=8, offset=0,  description="Byte to write."),
+            CSRField("start", size=1, offset=8,  description="(Repeated) START before the byte."),
+            CSRField("write", size=1, offset=9,  description="Write data byte."),
+            CSRField("read",  size=1, offset=10, description="Read a byte (to the RX FIFO)."),
+            CSRField("stop",  size=1, offset=11, description="STOP after the byte."),
+            CSRField("nack",  size=1, offset=12, description="NACK the read byte (last byte of a read)."),
+        ], description="Command FIFO (write pushes a command).")
+        self._status  = CSRStatus(fields=[
+            CSRField("idle",     size=1, offset=0, description="No command pending/executing."),
+            CSRField("nack",     size=1, offset=1, description="NACK received (sticky, cleared by clear)."),
+            CSRField("cmd_full", size=1, offset=2, description="Command FIFO full."),
+            CSRField("rx_empty", size=1, offset=3, description="RX FIFO empty."),
+        ])
+        self._rx_data = CSRStatus(8, description="RX FIFO (read pops a byte).")
+
+        # IRQs.
+        self.ev = EventManager()
+        self.ev.done  = EventSourcePulse(description="Script done/command FIFO drained.")
+        self.ev.error = EventSourcePulse(description="NACK received.")
+        self.ev.finalize()
+
+        # # #
+
+        script = Signal()
+        run    = Signal()
+        clear  = Signal()
+        self.comb += [
+            script.eq(self._control.storage[0]),
+            run.eq(  self._control.re & self._control.storage[1]),
+            clear.eq(self._control.re & self._control.storage[2]),
+        ]
+
+        # I/Os.
+        if pads is not None:
+            self.scl_t = TSTriple()
+            self.sda_t = TSTriple()
+            self.specials += self.scl_t.get_tristate(pads.scl)
+            self.specials += self.sda_t.get_tristate(pads.sda)
+            self.comb += [
+                self.scl_t.oe.eq(self.scl_oe),
+                self.scl_t.o.eq(0),
+                self.scl_in.eq(self.scl_t.i),
+                self.sda_t.oe.eq(self.sda_oe),
+                self.sda_t.o.eq(0),
+                self.sda_in.eq(self.sda_t.i),
+            ]
+        scl_i = Signal(reset=1)
+        sda_i = Signal(reset=1)
+        self.specials += [
+            MultiReg(self.scl_in, scl_i, reset=1),
+            MultiReg(self.sda_in, sda_i, reset=1),
+        ]
+
+        # Command FIFO / Script.
+        mem    = Memory(13, fifo_depth)
+        wport  = mem.get_port(write_capable=True)
+        rport  = mem.get_port(async_read=True)
+        self.specials += mem, wport, rport
+        wr_ptr  = Signal(log2_int(fifo_depth) + 1)
+        rd_ptr  = Signal(log2_int(fifo_depth) + 1)
+        running = Signal()
+        pending = Signal()
+        fetch   = Signal()
+        done    = Signal()
+        self.comb += [
+            self._status.fields.cmd_full.eq((wr_ptr - rd_ptr) == fifo_depth),
+            wport.adr.eq(wr_ptr),
+            wport.dat_w.eq(self._cmd.storage),
+            wport.we.eq(self._cmd.re & ~self._status.fields.cmd_full),
+            rport.adr.eq(rd_ptr),
+            pending.eq((rd_ptr != wr_ptr) & (~script | running)),
+        ]
+        self.sync += [
+            If(wport.we,
+                wr_ptr.eq(wr_ptr + 1)
+            ),
+            If(fetch,
+                rd_ptr.eq(rd_ptr + 1)
+            ),
+            If(done,
+                running.eq(0)
+            ),
+            If(run,
+                rd_ptr.eq(0),
+                running.eq(1),
+            ),
+            If(clear,
+                wr_ptr.eq(0),
+                rd_ptr.eq(0),
+                running.eq(0),
+            ),
+        ]
+
+        # RX FIFO.
+        self.rx_fifo = rx_fifo = ResetInserter()(stream.SyncFIFO([("data", 8)], rx_fifo_depth))
+        self.comb += [
+            rx_fifo.reset.eq(clear),
+            self._rx_data.status.eq(rx_fifo.source.data),
+            rx_fifo.source.ready.eq(self._rx_data.we),
+            self._status.fields.rx_empty.eq(~rx_fifo.source.valid),
+        ]
+
+        # SCL Timing (quarter periods, held while SCL is stretched).
+        tick    = Signal()
+        counter = Signal(16)
+        scl_o   = Signal(reset=1) # Released.
+        sda_o   = Signal(reset=1) # Released.
+        stretch = Signal()
+        self.comb += [
+            stretch.eq(scl_o & ~scl_i),
+            tick.eq(counter == 0),
+            self.scl_oe.eq(~scl_o),
+            self.sda_oe.eq(~sda_o),
+        ]
+
+        # Command.
+        start = Signal()
+        write = Signal()
+        read  = Signal()
+        stop  = Signal()
+        nack  = Signal()
+        skip  = Signal()
+        error = Signal()
+        tx    = Signal(9) # Data + ACK bit.
+        rx    = Signal(9) # Data + ACK bit.
+        bits  = Signal(4)
+
+        # FSM.
+        scl_next = Signal()
+        sda_next = Signal()
+        self.comb += [
+            scl_next.eq(scl_o),
+            sda_next.eq(sda_o),
+        ]
+        self.fsm = fsm = FSM(reset_state="IDLE")
+        self.sync += [
+            scl_o.eq(scl_next),
+            sda_o.eq(sda_next),
+            If(fsm.ongoing("IDLE") | tick,
+                counter.eq(self._divider.storage)
+            ).Elif(~stretch,
+                counter.eq(counter - 1)
+            )
+        ]
+        fsm.act("IDLE",
+            If(pending,
+                fetch.eq(1),
+                NextValue(start, ~skip & rport.dat_r[8]),
+                NextValue(write, ~skip & rport.dat_r[9]),
+                NextValue(read,  ~skip & rport.dat_r[10]),
+                NextValue(stop,  ~skip & rport.dat_r[11]),
+                NextValue(nack,  rport.dat_r[12]),
+                NextValue(tx,    Cat(C(1, 1), rport.dat_r[0:8])),
+                NextState("DISPATCH")
+            )
+        )
+        fsm.act("DISPATCH",
+            NextValue(bits, 9),
+            If(start,
+                NextState("START0")
+            ).Elif(write,
+                NextState("BIT0")
+            ).Elif(read,
+                NextValue(tx, Cat(nack, C(0xff, 8))),
+                NextState("BIT0")
+            ).Elif(stop,
+                NextState("STOP0")
+            ).Else(
+                done.eq(rd_ptr == wr_ptr),
+                NextState("IDLE")
+            )
+        )
+        # (Repeated) START: SDA falling while SCL high.
+        fsm.act("START0",
+            sda_next.eq(1),
+            If(tick, NextState("START1"))
+        )
+        fsm.act("START1",
+            scl_next.eq(1),
+            If(tick, NextState("START2"))
+        )
+        fsm.act("START2",
+            sda_next.eq(0),
+            If(tick, NextState("START3"))
+        )
+        fsm.act("START3",
+            scl_next.eq(0),
+            If(tick,
+                NextValue(start, 0),
+                NextState("DISPATCH")
+            )
+        )
+        # Byte: 8 data bits + ACK bit, MSB first, SDA changed while SCL low.
+        fsm.act("BIT0",
+            sda_next.eq(tx[8]),
+            If(tick, NextState("BIT1"))
+        )
+        fsm.act("BIT1",
+            scl_next.eq(1),
+            If(tick, NextState("BIT2"))
+        )
+        fsm.act("BIT2",
+            If(tick,
+                NextValue(rx, Cat(sda_i, rx[0:8])),
+                NextState("BIT3")
+            )
+        )
+        fsm.act("BIT3",
+            scl_next.eq(0),
+            If(tick,
+                NextValue(tx,   tx << 1),
+                NextValue(bits, bits - 1),
+                If(bits == 1,
+                    NextState("BYTE-DONE")
+                ).Else(
+                    NextState("BIT0")
+                )
+            )
+        )
+        fsm.act("BYTE-DONE",
+            sda_next.eq(1),
+            If(write,
+                NextValue(write, 0),
+                If(rx[0],
+                    # NACK: STOP and skip the rest of the transaction.
+                    error.eq(1),
+                    NextValue(stop, 1),
+                ),
+                NextState("DISPATCH")
+            ).Else(
+                rx_fifo.sink.valid.eq(1),
+                rx_fifo.sink.data.eq(rx[1:9]),
+                If(rx_fifo.sink.ready,
+                    NextValue(read, 0),
+                    NextState("DISPATCH")
+                )
+            )
+        )
+        # STOP: SDA rising while SCL high.
+        fsm.act("STOP0",
+            sda_next.eq(0),
+            If(tick, NextState("STOP1"))
+        )
+        fsm.act("STOP1",
+            scl_next.eq(1),
+            If(tick, NextState("STOP2"))
+        )
+        fsm.act("STOP2",
+            sda_next.eq(1),
+            If(tick,
+                NextValue(stop, 0),
+                NextState("DISPATCH")
+            )
+        )
+
+        # Status / Events.
+        self.comb += [
+            self._status.fields.idle.eq(fsm.ongoing("IDLE") & ~pending),
+            self.ev.done.trigger.eq(done),
+            self.ev.error.trigger.eq(error),
+        ]
+        self.sync += [
+            If(clear,
+                self._status.fields.nack.eq(0),
+                skip.eq(0),
+            ).Elif(error,
+                self._status.fields.nack.eq(1),
+                skip.eq(~stop),
+            ).Elif(fetch,
+                skip.eq(skip & ~rport.dat_r[11]),
+            )
+        ]
+
+# SoC Integration ----------------------------------------------------------------------------------
+
+def add_i2c(soc, name, pads, controller="bitbang", **kwargs):
+    """Add an I2C master to the SoC: bitbang I2CMaster (default, used by the BIOS) or I2CController
+    (controller="hardware", with IRQ when supported by the CPU)."""
+    if controller == "bitbang":
+        i2c = I2CMaster(pads)
+        soc.add_module(name=name, module=i2c)
+    elif controller == "hardware":
+        i2c = I2CController(pads, soc.sys_clk_freq, **kwargs)
+        soc.add_module(name=name, module=i2c)
+        if soc.irq.enabled:
+            soc.irq.add(name, use_loc_if_exists=True)
+    else:
+        raise ValueError(f"Unsupported I2C controller: {controller}.")
+    return i2c
@@ -0,0 +1,144 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""L2 Cache Statistics.
+
+Observes the L2 cache inserted by add_sdram between the SoC bus and LiteDRAM (a LiteX wishbone.Cache:
+direct-mapped, write-back, one line per LiteDRAM word) without modifying it:
+
+- Read/Write/Miss (line refills)/Eviction (dirty line write-backs) counters and Stall counter (bus
+  cycles waiting on the L2).
+- Optional access trace buffer: the first trace_depth accesses (bus word address + we) following a
+  clear are recorded and can be read back over CSRs (ex with litex_server), to be replayed offline
+  against other L2 sizes/widths by litex_boards.tools.l2_advisor.
+
+The bus access signals are also named l2_trace_valid/we/adr (prefixed with the SoC hierarchy in the
+generated Verilog), to extract traces from simulation waveforms.
+"""
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect.csr import *
+
+# L2 Cache Stats -----------------------------------------------------------------------------------
+
+class L2CacheStats(LiteXModule):
+    """L2 Cache Statistics
+
+    Parameters
+    ----------
+    cache : wishbone.Cache
+        L2 cache (master/slave interfaces and FSM are observed).
+
+    trace_depth : int
+        Depth of the access trace buffer (0: no trace buffer).
+
+    counter_width : int
+        Width of the counters (wrapping).
+    """
+    def __init__(self, cache, trace_depth=0, counter_width=32):
+        master = cache.master
+        self.trace_depth = trace_depth
+
+        # CSRs.
+        self._control   = CSRStorage(fields=[
+            CSRField("enable", size=1, offset=0, reset=1, description="Enable counters/trace."),
+            CSRField("clear",  size=1, offset=1, pulse=True, description="Clear counters and restart trace."),
+        ])
+        self._reads     = CSRStatus(counter_width, description="L2 read accesses.")
+        self._writes    = CSRStatus(counter_width, description="L2 write accesses.")
+        self._misses    = CSRStatus(counter_width, description="L2 misses (line refills).")
+        self._evictions = CSRStatus(counter_width, description="L2 evictions (dirty line write-backs).")
+        self._stalls    = CSRStatus(counter_width, description="Bus cycles waiting on the L2.")
+        if trace_depth:
+            self._trace_count = CSRStatus(32, description="Accesses recorded in the trace buffer.")
+            self._trace_index = CSRStorage(32, description="Trace buffer read index.")
+            self._trace_data  = CSRStatus(len(master.adr) + 1, description="Trace buffer data (adr << 1 | we).")
+
+        # # #
+
+        enable = self._control.fields.enable
+        clear  = self._control.fields.clear
+
+        # Events.
+        self.trace_valid = access = Signal(name="l2_trace_valid")
+        self.trace_we    = Signal(name="l2_trace_we")
+        self.trace_adr   = Signal(len(master.adr), name="l2_trace_adr")
+        stall     = Signal()
+        miss      = Signal()
+        eviction  = Signal()
+        refilling = Signal()
+        evicting  = Signal()
+        self.comb += [
+            access.eq(master.cyc & master.stb & master.ack),
+            self.trace_we.eq(master.we),
+            self.trace_adr.eq(master.adr),
+            stall.eq(master.cyc & master.stb & ~master.ack),
+        ]
+        self.sync += [
+            refilling.eq(cache.fsm.ongoing("REFILL")),
+            evicting.eq(cache.fsm.ongoing("EVICT")),
+        ]
+        self.comb += [
+            miss.eq(    cache.fsm.ongoing("REFILL") & ~refilling),
+            eviction.eq(cache.fsm.ongoing("EVICT")  & ~evicting),
+        ]
+
+        # Counters.
+        for counter, event in [
+            (self._reads,     access & ~master.we),
+            (self._writes,    access &  master.we),
+            (self._misses,    miss),
+            (self._evictions, eviction),
+            (self._stalls,    stall),
+            ]:
+            self.sync += [
+                If(clear,
+                    counter.status.eq(0)
+                ).Elif(enable & event,
+                    counter.status.eq(counter.status + 1)
+                )
+            ]
+
+        # Trace Buffer.
+        if trace_depth:
+            mem   = Memory(len(master.adr) + 1, trace_depth)
+            wport = mem.get_port(write_capable=True)
+            rport = mem.get_port()
+            self.specials += mem, wport, rport
+            count = self._trace_count.status
+            self.comb += [
+                wport.adr.eq(count),
+                wport.dat_w.eq(Cat(master.we, master.adr)),
+                wport.we.eq(enable & access & (count < trace_depth)),
+                rport.adr.eq(self._trace_index.storage),
+                self._trace_data.status.eq(rport.dat_r),
+            ]
+            self.sync += [
+                If(clear,
+                    count.eq(0)
+                ).Elif(wport.we,
+                    count.eq(count + 1)
+                )
+            ]
+
+# SoC Integration ----------------------------------------------------------------------------------
+
+def add_l2_stats(soc, name="l2_stats", trace_depth=0):
+    """Add L2CacheStats on the L2 cache of the SoC (added by add_sdram, when l2_size != 0)."""
+    cache = getattr(soc, "l2_cache", None)
+    if cache is None or not hasattr(cache, "fsm"):
+        soc.logger.warning("No L2 cache, L2 statistics not added.")
+        return None
+    stats = L2CacheStats(cache, trace_depth=trace_depth)
+    soc.add_module(name=name, module=stats)
+    # L2/LiteDRAM port data widths (for litex_boards.tools.l2_advisor).
+    soc.add_constant(f"{name}_data_width",      len(cache.slave.dat_r))
+    soc.add_constant(f"{name}_port_data_width", soc.sdram.crossbar.controller.data_width)
+    if trace_depth:
+        soc.add_constant(f"{name}_trace_depth", trace_depth)
+    return stats
@@ -0,0 +1,59 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""PCIe link/datapath configuration.
+
+Selects the datapath widths of a LitePCIe PHY from the number of lanes and the link speed:
+- pcie_data_width: hard IP (AXI-Stream/TRN) width, sustaining the link bandwidth at the user clock
+  of the hard IP.
+- data_width: core (sys clock domain, DMA) width, sustaining the link bandwidth at sys_clk_freq
+  (the PHY converts between both). When even the largest width can't, the link is limited by
+  sys_clk_freq and a warning gives the required sys_clk_freq.
+
+DMA buffering depth (in bytes) is scaled with data_width to keep the same number of words.
+"""
+
+import logging
+
+# Link bandwidth per lane (bits/s, after line encoding).
+_lane_bandwidth = {
+    "gen1" : 2.5e9*8/10,
+    "gen2" : 5.0e9*8/10,
+    "gen3" : 8.0e9*128/130,
+    "gen4" : 16.0e9*128/130,
+}
+
+# Supported speeds, datapath widths and hard IP user clock (per lanes) of the LitePCIe PHYs.
+_pcie_phys = {
+    "S7PCIEPHY"  : dict(speeds=["gen2"],         widths=[64, 128],       user_clk_freq=lambda nlanes: 250e6 if nlanes == 8 else 125e6),
+    "USPCIEPHY"  : dict(speeds=["gen3"],         widths=[128, 256],      user_clk_freq=lambda nlanes: 250e6),
+    "USPPCIEPHY" : dict(speeds=["gen3", "gen4"], widths=[128, 256, 512], user_clk_freq=lambda nlanes: 250e6),
+}
+
+def get_pcie_datapath(phy_cls, nlanes, speed, sys_clk_freq, dma_buffering_depth=1024):
+    """Return (data_width, pcie_data_width, dma_buffering_depth) of a PCIe link."""
+    phy = _pcie_phys[phy_cls.__name__]
+    if speed not in phy["speeds"]:
+        raise ValueError(f"{phy_cls.__name__}: unsupported speed {speed}, supported: {', '.join(phy['speeds'])}.")
+    bandwidth = nlanes*_lane_bandwidth[speed]
+
+    # Hard IP datapath.
+    pcie_widths = [w for w in phy["widths"] if w*phy["user_clk_freq"](nlanes) >= bandwidth]
+    if not pcie_widths:
+        raise ValueError(f"{phy_cls.__name__}: x{nlanes} {speed} not supported (datapath > {max(phy['widths'])}-bit).")
+    pcie_data_width = min(pcie_widths)
+
+    # Core datapath.
+    widths     = [w for w in phy["widths"] if w*sys_clk_freq >= bandwidth]
+    data_width = min(widths) if widths else max(phy["widths"])
+    if not widths:
+        logging.getLogger("PCIe").warning(
+            f"x{nlanes} {speed} link ({bandwidth/1e9:.1f}Gbps) limited to {data_width*sys_clk_freq/1e9:.1f}Gbps "
+            f"by sys_clk_freq, requires sys_clk_freq >= {bandwidth/data_width/1e6:.1f}MHz.")
+
+    # DMA buffering.
+    dma_buffering_depth = dma_buffering_depth*max(data_width//128, 1)
+
+    return data_width, pcie_data_width, dma_buffering_depth
@@ -0,0 +1,212 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""PCIe <-> USB3 Bridge (PCIe Screamer).
+
+Bridges the LitePCIe DMA streams to the FT601 USB3 FIFO through elastic buffers (DDR3 or BRAM),
+with on each direction:
+
+- A monitor reporting throughput (bytes in/out of the buffer) and buffer latency.
+- A traffic generator/checker: the generator replaces the input of the buffer with an incrementing
+  pattern and the checker consumes/verifies the output of the buffer instead of the output side
+  (PCIe DMA or USB3), allowing to benchmark the bridge without (or with only one side of the) host
+  traffic (see litex_boards.tools.bridge_bench).
+"""
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect import stream
+
+from litedram.frontend.fifo import LiteDRAMFIFO
+
+# Bridge Monitor -----------------------------------------------------------------------------------
+
+class BridgeMonitor(LiteXModule):
+    """Throughput/Latency monitor of one direction of the bridge.
+
+    Counts words entering/leaving the elastic buffer and measures the latency of a sampled word
+    through the buffer (a new word is sampled as soon as the previous one has left the buffer).
+    Counters are latched on update to allow the host to compute rates from coherent snapshots.
+    """
+    def __init__(self, buffer, data_width):
+        self.update      = CSR()
+        self.cycles      = CSRStatus(64, description="Cycles since reset (latched on update).")
+        self.bytes_in    = CSRStatus(64, description="Bytes entering the buffer (latched on update).")
+        self.bytes_out   = CSRStatus(64, description="Bytes leaving the buffer (latched on update).")
+        self.latency     = CSRStatus(32, description="Last sampled buffer latency (in cycles).")
+        self.latency_max = CSRStatus(32, description="Max sampled buffer latency (in cycles).")
+
+        # # #
+
+        shift     = log2_int(data_width//8)
+        cycles    = Signal(64)
+        words_in  = Signal(64)
+        words_out = Signal(64)
+        word_in   = Signal()
+        word_out  = Signal()
+        self.comb += word_in.eq(buffer.sink.valid & buffer.sink.ready)
+        self.comb += word_out.eq(buffer.source.valid & buffer.source.ready)
+        self.sync += [
+            cycles.eq(cycles + 1),
+            If(word_in,  words_in.eq(words_in + 1)),
+            If(word_out, words_out.eq(words_out + 1)),
+        ]
+
+        # Latency sampling.
+        probe_armed = Signal()
+        probe_index = Signal(64)
+        probe_time  = Signal(64)
+        self.sync += [
+            If(probe_armed,
+                If(word_out & (words_out == probe_index),
+                    probe_armed.eq(0),
+                    self.latency.status.eq(cycles - probe_time),
+                    If((cycles - probe_time) > self.latency_max.status,
+                        self.latency_max.status.eq(cycles - probe_time)
+                    )
+                )
+            ).Elif(word_in,
+                probe_armed.eq(1),
+                probe_index.eq(words_in),
+                probe_time.eq(cycles),
+            )
+        ]
+
+        # Snapshot.
+        self.sync += If(self.update.re,
+            self.cycles.status.eq(cycles),
+            self.bytes_in.status.eq(words_in << shift),
+            self.bytes_out.status.eq(words_out << shift),
+        )
+
+# Bridge Traffic -----------------------------------------------------------------------------------
+
+class BridgeTraffic(LiteXModule):
+    """Traffic generator/checker of one direction of the bridge.
+
+    Sits around the elastic buffer: input -> sink/source -> buffer -> buffer_sink/output.
+
+    - Generator: the buffer is fed with an incrementing pattern (as fast as accepted), the input
+      is stalled.
+    - Checker: the buffer output is consumed (always ready) and verified against the incrementing
+      pattern (resynchronized on the first word), the output is idle.
+    """
+    def __init__(self, data_width):
+        self.sink          = stream.Endpoint([("data", data_width)]) # From input.
+        self.source        = stream.Endpoint([("data", data_width)]) # To buffer.
+        self.buffer_sink   = stream.Endpoint([("data", data_width)]) # From buffer.
+        self.buffer_source = stream.Endpoint([("data", data_width)]) # To output.
+
+        self.control = CSRStorage(fields=[
+            CSRField("generator", size=1, description="Feed the buffer with the incrementing pattern."),
+            CSRField("checker",   size=1, description="Consume/verify the buffer output."),
+        ])
+        self.words  = CSRStatus(32, description="Words verified by the checker.")
+        self.errors = CSRStatus(32, description="Words not matching the pattern.")
+
+        # # #
+
+        generator = self.control.fields.generator
+        checker   = self.control.fields.checker
+
+        # Generator.
+        count = Signal(data_width)
+        self.sync += [
+            If(~generator,
+                count.eq(0)
+            ).Elif(self.source.valid & self.source.ready,
+                count.eq(count + 1)
+            )
+        ]
+        self.comb += [
+            If(generator,
+                self.source.valid.eq(1),
+                self.source.data.eq(count),
+            ).Else(
+                self.sink.connect(self.source)
+            )
+        ]
+
+        # Checker.
+        expected = Signal(data_width)
+        synced   = Signal()
+        self.comb += [
+            If(checker,
+                self.buffer_sink.ready.eq(1),
+            ).Else(
+                self.buffer_sink.connect(self.buffer_source)
+            )
+        ]
+        self.sync += [
+            If(~checker,
+                synced.eq(0),
+                self.words.status.eq(0),
+                self.errors.status.eq(0),
+            ).Elif(self.buffer_sink.valid,
+                synced.eq(1),
+                expected.eq(self.buffer_sink.data + 1),
+                self.words.status.eq(self.words.status + 1),
+                If(synced & (self.buffer_sink.data != expected),
+                    self.errors.status.eq(self.errors.status + 1)
+                )
+            )
+        ]
+
+# PCIe <-> USB3 Bridge -----------------------------------------------------------------------------
+
+class PCIeUSBBridge(LiteXModule):
+    """Bridge PCIe DMA streams to the FT601 USB3 FIFO through elastic buffers.
+
+    - h2u: PCIe DMA Reader (Host -> FPGA) -> Buffer -> USB3 FIFO (FPGA -> USB Host).
+    - u2h: USB3 FIFO (USB Host -> FPGA)   -> Buffer -> PCIe DMA Writer (FPGA -> Host).
+
+    Buffers are DDR3 FIFOs (LiteDRAMFIFO, dram_depth bytes per direction from dram_base) when DRAM
+    ports are provided, BRAM FIFOs otherwise.
+    """
+    def __init__(self, pcie_dma, usb_phy, pcie_data_width, dram_ports=None, dram_base=0, dram_depth=0, bram_depth=4096):
+        # # #
+
+        usb_data_width = len(usb_phy.sink.data)
+
+        # Elastic Buffers / Monitors / Traffic Generators-Checkers.
+        for n, name in enumerate(["h2u", "u2h"]):
+            if dram_ports is not None:
+                buffer = LiteDRAMFIFO(
+                    data_width  = pcie_data_width,
+                    base        = dram_base + n*dram_depth,
+                    depth       = dram_depth,
+                    write_port  = dram_ports[2*n + 0],
+                    read_port   = dram_ports[2*n + 1],
+                    with_bypass = True, # Low latency when the buffer is not used.
+                )
+            else:
+                buffer = stream.SyncFIFO([("data", pcie_data_width)], depth=bram_depth, buffered=True)
+            traffic = BridgeTraffic(pcie_data_width)
+            self.add_module(name=f"{name}_buffer",  module=buffer)
+            self.add_module(name=f"{name}_traffic", module=traffic)
+            self.add_module(name=name, module=BridgeMonitor(buffer, pcie_data_width))
+            self.comb += [
+                traffic.source.connect(buffer.sink),
+                buffer.source.connect(traffic.buffer_sink),
+            ]
+
+        # Host -> USB.
+        self.h2u_conv = h2u_conv = stream.Converter(pcie_data_width, usb_data_width)
+        self.comb += [
+            pcie_dma.source.connect(self.h2u_traffic.sink, keep={"valid", "ready", "data"}),
+            self.h2u_traffic.buffer_source.connect(h2u_conv.sink),
+            h2u_conv.source.connect(usb_phy.sink, keep={"valid", "ready", "data"}),
+        ]
+
+        # USB -> Host.
+        self.u2h_conv = u2h_conv = stream.Converter(usb_data_width, pcie_data_width)
+        self.comb += [
+            usb_phy.source.connect(u2h_conv.sink, keep={"valid", "ready", "data"}),
+            u2h_conv.source.connect(self.u2h_traffic.sink),
+            self.u2h_traffic.buffer_source.connect(pcie_dma.sink, keep={"valid", "ready", "data"}),
+        ]
@@ -0,0 +1,420 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""Oscilloscope acquisition: Trigger, DRAM ring buffer recorder and UDP record streamer.
+
+Samples are optionally decimated (timebase) and continuously written to a DRAM ring buffer once
+armed. The trigger is only accepted after pre-trigger words have been captured, capture then
+continues for post-trigger words and the record ([trigger - pre, trigger + post]) stays in the ring
+until re-armed. The record can then be streamed over UDP by the ScopeStreamer in packets of:
+
+    [record id (32-bit)] [byte offset in record (32-bit)] [samples...] (little endian)
+
+All depths/offsets are expressed in DRAM port words (port.data_width//sample_width samples).
+"""
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect import stream
+
+from litedram.frontend.dma import LiteDRAMDMAWriter, LiteDRAMDMAReader
+
+# Constants ----------------------------------------------------------------------------------------
+
+TRIGGER_FORCE   = 0 # Trigger on first armed word (Auto/Roll).
+TRIGGER_RISING  = 1 # Rising edge through level.
+TRIGGER_FALLING = 2 # Falling edge through level.
+TRIGGER_ABOVE   = 3 # Sample above level.
+TRIGGER_BELOW   = 4 # Sample below level.
+
+# Scope Trigger ------------------------------------------------------------------------------------
+
+class ScopeTrigger(LiteXModule):
+    """Edge/Level trigger on a word of nsamples samples.
+
+    Samples are unsigned and interleaved by channel (sample n belongs to channel n % nchannels),
+    match is asserted when one of the samples of the selected channel matches the trigger
+    condition and index gives the first matching sample in the word.
+    """
+    def __init__(self, nsamples, sample_width=8, nchannels=1):
+        assert (nsamples % nchannels) == 0
+        self.data   = Signal(nsamples*sample_width) # Word to evaluate.
+        self.update = Signal()                      # Word is consumed (Previous samples update).
+        self.mode   = Signal(3)
+        self.level  = Signal(sample_width)
+        self.source = Signal(max=max(nchannels, 2))
+        self.match  = Signal()
+        self.index  = Signal(max=max(nsamples, 2))
+
+        # # #
+
+        samples = [self.data[n*sample_width:(n + 1)*sample_width] for n in range(nsamples)]
+        last    = [Signal(sample_width) for _ in range(nchannels)]
+        self.sync += If(self.update, [last[c].eq(samples[nsamples - nchannels + c]) for c in range(nchannels)])
+
+        matches = Signal(nsamples)
+        for n in range(nsamples):
+            curr = samples[n]
+            prev = samples[n - nchannels] if n >= nchannels else last[n]
+            self.comb += If(self.source == (n % nchannels),
+                Case(self.mode, {
+                    TRIGGER_FORCE   : matches[n].eq(1),
+                    TRIGGER_RISING  : matches[n].eq((prev <  self.level) & (curr >= self.level)),
+                    TRIGGER_FALLING : matches[n].eq((prev >= self.level) & (curr <  self.level)),
+                    TRIGGER_ABOVE   : matches[n].eq(curr >= self.level),
+                    TRIGGER_BELOW   : matches[n].eq(curr <  self.level),
+                })
+            )
+        self.comb += self.match.eq(matches != 0)
+        for n in reversed(range(nsamples)):
+            self.comb += If(matches[n], self.index.eq(n))
+
+# Scope Decimator ----------------------------------------------------------------------------------
+
+class ScopeDecimator(LiteXModule):
+    """Power-of-2 decimation of words of nsamples interleaved samples.
+
+    Keeps one sample per channel every 2**rate sample periods (no filtering, rate=0 bypasses) and
+    repacks the kept samples in words of nsamples samples.
+    """
+    def __init__(self, nsamples, sample_width=8, nchannels=1, max_rate=10):
+        assert (nsamples % nchannels) == 0
+        self.sink   = sink   = stream.Endpoint([("data", nsamples*sample_width)])
+        self.source = source = stream.Endpoint([("data", nsamples*sample_width)])
+        self.rate   = Signal(max=max_rate + 1)
+
+        # # #
+
+        nframes      = nsamples//nchannels # Sample periods per word.
+        frame_width  = nchannels*sample_width
+        frames_shift = log2_int(nframes)
+        frames       = [sink.data[n*frame_width:(n + 1)*frame_width] for n in range(nframes)]
+
+        data  = Signal(nsamples*sample_width)
+        fill  = Signal(max=nframes + 1)
+        words = Signal(max(max_rate - frames_shift, 1)) # Input words counter (rate > frames_shift).
+
+        self.comb += sink.ready.eq(~source.valid | source.ready)
+        self.sync += If(source.valid & source.ready, source.valid.eq(0))
+
+        # Per rate: kept frames of the input word are shifted in data (oldest frames at LSBs).
+        cases = {}
+        for rate in range(max_rate + 1):
+            if rate <= frames_shift:
+                kept = [frames[n << rate] for n in range(nframes >> rate)]
+                keep = 1
+            else:
+                kept = [frames[0]]
+                keep = (words[:rate - frames_shift] == 0)
+            older    = [data[len(kept)*frame_width:]] if len(kept) < nframes else []
+            new_data = Signal(nsamples*sample_width)
+            new_fill = Signal(max=nframes + 1)
+            self.comb += [
+                new_data.eq(Cat(*older, *kept)),
+                new_fill.eq(fill + len(kept)),
+            ]
+            cases[rate] = If(keep,
+                If(new_fill == nframes,
+                    source.valid.eq(1),
+                    source.data.eq(new_data),
+                    fill.eq(0),
+                ).Else(
+                    data.eq(new_data),
+                    fill.eq(new_fill),
+                )
+            )
+        self.sync += If(sink.valid & sink.ready,
+            words.eq(words + 1),
+            Case(self.rate, cases)
+        )
+
+# Scope Recorder -----------------------------------------------------------------------------------
+
+class ScopeRecorder(LiteXModule):
+    """Capture samples to a DRAM ring buffer with pre-/post-trigger depth.
+
+    Samples are decimated by 2**decimation (ScopeDecimator) before being captured. The sink is
+    never stalled: samples received when the recorder can't keep up are dropped and counted in
+    overflows.
+    """
+    def __init__(self, port, base, size, sample_width=8, nsamples=8, nchannels=1, fifo_depth=64, max_decimation=10):
+        word_bytes = port.data_width//8
+        assert (port.data_width % (nsamples*sample_width)) == 0
+        assert (size & (size - 1)) == 0
+        self.sink         = sink = stream.Endpoint([("data", nsamples*sample_width)])
+        self.base_words   = base_words = base//word_bytes
+        self.ring_words   = ring_words = size//word_bytes
+        self.word_bytes   = word_bytes
+        self.word_samples = port.data_width//sample_width
+
+        self._arm            = CSR()
+        self._force          = CSR()
+        self._mode           = CSRStorage(3, reset=TRIGGER_RISING, description="Trigger mode (0: Force, 1: Rising, 2: Falling, 3: Above, 4: Below).")
+        self._level          = CSRStorage(sample_width, reset=2**(sample_width - 1), description="Trigger level.")
+        self._source         = CSRStorage(8, description="Trigger channel.")
+        self._pre            = CSRStorage(32, reset=min(ring_words//4, 512), description="Pre-trigger depth (in words).")
+        self._post           = CSRStorage(32, reset=min(ring_words//4, 512), description="Post-trigger depth (in words).")
+        self._decimation     = CSRStorage(bits_for(max_decimation), description="Decimation (log2, keep 1 sample per channel every 2**decimation).")
+        self._status         = CSRStatus(fields=[
+            CSRField("armed",     size=1, description="Recorder capturing and waiting for trigger."),
+            CSRField("triggered", size=1, description="Trigger received, capturing post-trigger."),
+            CSRField("done",      size=1, description="Record available."),
+        ])
+        self._trigger_offset = CSRStatus(32, description="Ring offset of the trigger word.")
+        self._trigger_sample = CSRStatus(8,  description="Trigger sample index in the trigger word.")
+        self._record_start   = CSRStatus(32, description="Ring offset of the first record word.")
+        self._record_length  = CSRStatus(32, description="Record length (in words).")
+        self._overflows      = CSRStatus(32, description="Dropped sink words.")
+
+        self.arm   = Signal() # Arm (in addition to CSR).
+        self.done  = Signal()
+        self.start = Signal(32) # Ring offset of first record word.
+        self.count = Signal(32) # Record length (in words).
+
+        # # #
+
+        running = Signal()
+        offset  = Signal(max=ring_words)
+        count   = Signal(32)
+
+        # Decimation / Input FIFO / Conversion to DRAM words (Flushed when not running).
+        self.decimator = decimator = ResetInserter()(ScopeDecimator(nsamples, sample_width, nchannels, max_decimation))
+        self.fifo      = fifo      = ResetInserter()(stream.SyncFIFO([("data", nsamples*sample_width)], fifo_depth))
+        self.conv      = conv      = ResetInserter()(stream.Converter(nsamples*sample_width, port.data_width))
+        self.comb += [
+            decimator.reset.eq(~running),
+            decimator.rate.eq(self._decimation.storage),
+            fifo.reset.eq(~running),
+            conv.reset.eq(~running),
+            sink.ready.eq(1),
+            decimator.sink.valid.eq(sink.valid & running),
+            decimator.sink.data.eq(sink.data),
+            decimator.source.connect(fifo.sink),
+            fifo.source.connect(conv.sink),
+        ]
+        self.sync += If(decimator.sink.valid & ~decimator.sink.ready,
+            self._overflows.status.eq(self._overflows.status + 1)
+        )
+
+        # DRAM Writer.
+        self.dma = dma = LiteDRAMDMAWriter(port, fifo_depth=16, fifo_buffered=True)
+        write = Signal()
+        self.comb += [
+            dma.sink.valid.eq(conv.source.valid),
+            dma.sink.address.eq(base_words + offset),
+            dma.sink.data.eq(conv.source.data),
+            conv.source.ready.eq(dma.sink.ready),
+            write.eq(dma.sink.valid & dma.sink.ready),
+        ]
+
+        # Trigger.
+        self.trigger = trigger = ScopeTrigger(self.word_samples, sample_width, nchannels)
+        force = Signal()
+        self.comb += [
+            trigger.data.eq(conv.source.data),
+            trigger.update.eq(write),
+            trigger.mode.eq(self._mode.storage),
+            trigger.level.eq(self._level.storage),
+            trigger.source.eq(self._source.storage),
+        ]
+
+        # FSM.
+        self.sync += If(write, offset.eq(offset + 1))
+        self.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            If(self._arm.re | self.arm,
+                NextValue(count, 0),
+                NextValue(force, 0),
+                NextState("PRE")
+            )
+        )
+        fsm.act("PRE",
+            running.eq(1),
+            If(write,
+                NextValue(count, count + 1),
+                If((count + 1) >= self._pre.storage,
+                    NextState("ARMED")
+                )
+            )
+        )
+        fsm.act("ARMED",
+            running.eq(1),
+            self._status.fields.armed.eq(1),
+            If(write & (trigger.match | force),
+                NextValue(self._trigger_offset.status, offset),
+                NextValue(self._trigger_sample.status, Mux(force, 0, trigger.index)),
+                NextValue(count, 0),
+                If(self._post.storage == 0,
+                    NextState("DONE")
+                ).Else(
+                    NextState("POST")
+                )
+            )
+        )
+        fsm.act("POST",
+            running.eq(1),
+            self._status.fields.triggered.eq(1),
+            If(write,
+                NextValue(count, count + 1),
+                If((count + 1) >= self._post.storage,
+                    NextState("DONE")
+                )
+            )
+        )
+        fsm.act("DONE",
+            self.done.eq(1),
+            self._status.fields.done.eq(1),
+            If(self._arm.re | self.arm,
+                NextValue(count, 0),
+                NextValue(force, 0),
+                NextState("PRE")
+            )
+        )
+        self.sync += If(self._force.re, force.eq(1))
+
+        # Record.
+        self.comb += [
+            self.start.eq((self._trigger_offset.status - self._pre.storage) & (ring_words - 1)),
+            self.count.eq(self._pre.storage + self._post.storage + 1),
+            self._record_start.status.eq(self.start),
+            self._record_length.status.eq(self.count),
+        ]
+
+# Scope Streamer -----------------------------------------------------------------------------------
+
+class ScopeStreamer(LiteXModule):
+    """Stream records from the DRAM ring buffer over UDP.
+
+    Records are read from DRAM with a LiteDRAMDMAReader and sent as UDP packets of up to
+    packet_words 32-bit words. A packet is only sent once fully available in the packet FIFO so
+    DRAM read latency never creates gaps in Ethernet frames.
+    """
+    def __init__(self, port, udp_port, base, size, dst_ip="192.168.1.100", dst_port=2000, packet_words=256):
+        from liteeth.common import convert_ip
+        word_bytes = port.data_width//8
+        assert udp_port.sink.data.nbits == 32
+        assert (size & (size - 1)) == 0
+        base_words = base//word_bytes
+        ring_words = size//word_bytes
+        ratio      = port.data_width//32
+
+        self.start  = Signal()   # Start streaming (in addition to CSR).
+        self.offset = Signal(32) # Ring offset of first record word.
+        self.length = Signal(32) # Record length (in words).
+        self.done   = Signal()
+        self.auto   = Signal()
+
+        self._start   = CSR()
+        self._auto    = CSRStorage(description="Continuous mode (Stream records when available and re-arm recorder).")
+        self._ip      = CSRStorage(32, reset=convert_ip(dst_ip), description="Destination IP address.")
+        self._port    = CSRStorage(16, reset=dst_port,           description="Destination UDP port (also used as source port).")
+        self._busy    = CSRStatus(description="Record streaming in progress.")
+        self._records = CSRStatus(32, description="Streamed records.")
+
+        # # #
+
+        self.comb += self.auto.eq(self._auto.storage)
+
+        # Address generation.
+        self.dma = dma = LiteDRAMDMAReader(port, fifo_depth=16, fifo_buffered=True)
+        addr_offset = Signal(32)
+        addr_count  = Signal(32)
+        addr_valid  = Signal()
+        self.comb += [
+            dma.sink.valid.eq(addr_valid),
+            dma.sink.address.eq(base_words + (addr_offset & (ring_words - 1))),
+        ]
+
+        # Packet FIFO.
+        self.conv = conv = stream.Converter(port.data_width, 32)
+        self.fifo = fifo = stream.SyncFIFO([("data", 32)], 2*packet_words, buffered=True)
+        self.comb += dma.source.connect(conv.sink)
+        self.comb += conv.source.connect(fifo.sink)
+
+        # Packets.
+        record    = Signal(32)
+        remaining = Signal(32)   # In 32-bit words.
+        position  = Signal(32)   # In bytes.
+        size      = Signal(max=packet_words + 1)
+        count     = Signal(max=packet_words + 1)
+        sink      = udp_port.sink
+        self.comb += [
+            sink.src_port.eq(self._port.storage),
+            sink.dst_port.eq(self._port.storage),
+            sink.ip_address.eq(self._ip.storage),
+            sink.length.eq(4*(size + 2)),
+            sink.last_be.eq(0b1000),
+        ]
+
+        self.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            If(self._start.re | self.start,
+                NextValue(addr_offset, self.offset),
+                NextValue(addr_count,  0),
+                NextValue(addr_valid,  self.length != 0),
+                NextValue(remaining,   self.length*ratio),
+                NextValue(position,    0),
+                NextState("WAIT")
+            )
+        )
+        fsm.act("WAIT",
+            self._busy.status.eq(1),
+            If(remaining == 0,
+                NextValue(record, record + 1),
+                NextState("DONE")
+            ).Elif((fifo.level >= packet_words) | (fifo.level >= remaining),
+                NextValue(size, Mux(remaining > packet_words, packet_words, remaining)),
+                NextState("HEADER-RECORD")
+            )
+        )
+        fsm.act("HEADER-RECORD",
+            self._busy.status.eq(1),
+            sink.valid.eq(1),
+            sink.data.eq(record),
+            If(sink.ready,
+                NextState("HEADER-POSITION")
+            )
+        )
+        fsm.act("HEADER-POSITION",
+            self._busy.status.eq(1),
+            sink.valid.eq(1),
+            sink.data.eq(position),
+            If(sink.ready,
+                NextValue(count, 0),
+                NextState("DATA")
+            )
+        )
+        fsm.act("DATA",
+            self._busy.status.eq(1),
+            sink.valid.eq(1),
+            sink.last.eq(count == (size - 1)),
+            sink.data.eq(fifo.source.data),
+            fifo.source.ready.eq(sink.ready),
+            If(sink.ready,
+                NextValue(count, count + 1),
+                If(sink.last,
+                    NextValue(remaining, remaining - size),
+                    NextValue(position,  position + 4*size),
+                    NextState("WAIT")
+                )
+            )
+        )
+        fsm.act("DONE",
+            self.done.eq(1),
+            NextState("IDLE")
+        )
+        self.sync += [
+            If(dma.sink.valid & dma.sink.ready,
+                addr_offset.eq(addr_offset + 1),
+                addr_count.eq(addr_count + 1),
+                If((addr_count + 1) >= self.length,
+                    addr_valid.eq(0)
+                )
+            )
+        ]
+        self.comb += self._records.status.eq(record)
@@ -0,0 +1,106 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""SDCard High-Speed benchmark support.
+
+Wraps LiteX's soc.add_sdcard (PHY/Core/DMAs/IRQs and so BIOS/Linux drivers unchanged) with what
+litex_boards.tools.sdcard_bench needs to measure bulk loading from SDCard:
+
+- The High-Speed (SDR25) SDCard clock for the board, exported as <name>_hs_clk_freq. The clock is
+  derived from sys_clk with a power of 2 divider (>= 2), the effective frequency is the highest one
+  below the board limit. This is only used by sdcard_bench: the BIOS (and so boot) keeps its default
+  25MHz since it does not check the CMD6 switch result; the bench only raises the clock once the
+  CMD6 switch status confirms High-Speed.
+- Bytes/cycles counters on each DMA, used by sdcard_bench to report the read/write throughputs.
+  Multi-block transfers (CMD18/CMD25) larger than the buffer are run with the DMA in loop mode
+  (ring buffer), so the card is never stopped.
+"""
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect.csr import *
+
+from litesdcard.frontend.dma import SDBlock2MemDMA
+
+# Helpers ------------------------------------------------------------------------------------------
+
+SDCARD_CLK_FREQ_DEFAULT = 25e6 # Default Speed (initialization, CMD6 switch).
+SDCARD_CLK_FREQ_MAX     = 50e6 # High-Speed (SDR25).
+
+def get_sdcard_clk_freq(sys_clk_freq, clk_freq):
+    """Return the effective SDCard clock frequency below clk_freq (power of 2 divider of sys_clk,
+    from 2 to 256, as selected by the BIOS)."""
+    divider = 2
+    while (divider < 256) and (sys_clk_freq/divider > clk_freq):
+        divider *= 2
+    return sys_clk_freq/divider
+
+# SD DMA Counters ----------------------------------------------------------------------------------
+
+class SDDMACounters(LiteXModule):
+    """SD DMA Counters
+
+    Bytes transferred by a LiteSDCard SDBlock2MemDMA/SDMem2BlockDMA since the DMA has been enabled
+    and cycles between the first and last transfer (so not including the command latency).
+
+    Parameters
+    ----------
+    dma : SDBlock2MemDMA/SDMem2BlockDMA
+        DMA to observe.
+    """
+    def __init__(self, dma, counter_width=32):
+        self._bytes  = CSRStatus(counter_width, description="Bytes transferred since enable.")
+        self._cycles = CSRStatus(counter_width, description="Cycles between first and last transfer since enable.")
+
+        # # #
+
+        # Transfers (Memory writes for Block2Mem, Block bytes for Mem2Block).
+        ce = Signal()
+        if isinstance(dma, SDBlock2MemDMA):
+            bytes_per_ce = dma.bus.data_width//8
+            self.comb += ce.eq(dma.bus.cyc & dma.bus.stb & dma.bus.we & dma.bus.ack)
+        else:
+            bytes_per_ce = 1
+            self.comb += ce.eq(dma.source.valid & dma.source.ready)
+
+        # Counters.
+        started = Signal()
+        cycles  = Signal(counter_width)
+        self.sync += [
+            If(~dma.dma._enable.storage,
+                started.eq(0),
+                cycles.eq(0),
+                self._bytes.status.eq(0),
+                self._cycles.status.eq(0),
+            ).Else(
+                If(started | ce,
+                    cycles.eq(cycles + 1)
+                ),
+                If(ce,
+                    started.eq(1),
+                    self._bytes.status.eq(self._bytes.status + bytes_per_ce),
+                    self._cycles.status.eq(cycles + 1),
+                )
+            )
+        ]
+
+# SoC Integration ----------------------------------------------------------------------------------
+
+def add_sdcard(soc, name="sdcard", sdcard_name="sdcard", mode="read+write", clk_freq=SDCARD_CLK_FREQ_MAX):
+    """Add a LiteSDCard (soc.add_sdcard) with DMA counters and the High-Speed clock of the board (up
+    to clk_freq) for sdcard_bench."""
+    soc.add_sdcard(name=name, sdcard_name=sdcard_name, mode=mode)
+
+    # DMA Counters.
+    for direction, dma_name in [("read", f"{name}_block2mem"), ("write", f"{name}_mem2block")]:
+        if direction in mode:
+            soc.add_module(name=f"{dma_name}_stats", module=SDDMACounters(getattr(soc, dma_name)))
+
+    # High-Speed clock (Applied by sdcard_bench after a successful CMD6 switch, BIOS stays at 25MHz).
+    sdcard_clk_freq = get_sdcard_clk_freq(soc.sys_clk_freq, clk_freq)
+    soc.logger.info("SDCard High-Speed clock (sdcard_bench): {:3.2f}MHz (limit: {:3.2f}MHz).".format(sdcard_clk_freq/1e6, clk_freq/1e6))
+    soc.add_constant(f"{name}_hs_clk_freq", int(sdcard_clk_freq))
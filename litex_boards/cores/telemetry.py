@@ -0,0 +1,373 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""Telemetry.
+
+Autonomous sampling of monitor channels (XADC/SysMon temperature/voltages, fan speed, board
+sensors...) into a ring buffer, so that hosts read the history in bulk instead of polling each
+register:
+
+- Channels are sampled every period sys_clk cycles, 2**decimation samples are reduced into a record
+  with min/max/avg/last values for each channel.
+- Records are written through the SoC bus to a ring buffer (on-chip RAM added by add_telemetry, or
+  a main RAM buffer by reprogramming base/size): record n at base + 4*record_words*(n % nrecords),
+  with word 0 = n and words 1+2*i/2+2*i = min|max << 16, avg|last << 16 of channel i. records is
+  incremented after each record.
+- FanController: closed-loop (PI) fan PWM against the die temperature, with optional tachometer
+  (pulses per second). Fan width/speed can be sampled as telemetry channels.
+
+The history can be read with litex_boards.tools.telemetry.
+"""
+
+import math
+
+from migen import *
+from migen.genlib.cdc import MultiReg
+
+from litex.gen import *
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect import wishbone
+
+from litex.soc.integration.soc import SoCRegion
+from litex.soc.cores.xadc import S7SystemMonitor
+
+# Helpers ------------------------------------------------------------------------------------------
+
+SYSMON_CHANNELS = ["temperature", "vccint", "vccaux", "vccbram", "vccpsintlp", "vccpsintfp", "vccpsaux"]
+
+def get_sysmon_channels(sysmon):
+    """Channels (name, raw value) of a LiteX XADC/SysMon."""
+    return [(name, getattr(sysmon, name).status) for name in SYSMON_CHANNELS if hasattr(sysmon, name)]
+
+def get_sysmon_family(sysmon):
+    return "s7" if isinstance(sysmon, S7SystemMonitor) else "usp"
+
+# Raw temperature = (°C + offset)*2**bits/scale.
+SYSMON_TEMPERATURE = {
+    "s7"  : (12, 503.975,     273.15),
+    "usp" : (10, 507.5921310, 279.42657680),
+}
+
+def sysmon_temperature_raw(family, celsius):
+    bits, scale, offset = SYSMON_TEMPERATURE[family]
+    return int((celsius + offset)*2**bits/scale)
+
+# Telemetry ----------------------------------------------------------------------------------------
+
+class Telemetry(LiteXModule):
+    """Telemetry
+
+    Parameters
+    ----------
+    channels : list of (str, Signal)
+        Channels to sample (unsigned, 16-bit max).
+
+    sys_clk_freq : float
+        System clock frequency.
+
+    base, size : int
+        Default ring buffer base address/size (bytes).
+
+    sample_rate : float
+        Default sample rate (Hz).
+
+    Attributes
+    ----------
+    bus : wishbone.Interface
+        Master to the ring buffer.
+
+    sample : Signal(), out
+        Sample strobe.
+    """
+    def __init__(self, channels, sys_clk_freq, base=0, size=4096, sample_rate=100):
+        self.channels     = channels
+        self.record_words = 2**math.ceil(math.log2(1 + 2*len(channels)))
+        self.bus          = bus = wishbone.Interface(data_width=32, address_width=32, addressing="word")
+        self.sample       = Signal()
+
+        # CSRs.
+        self._control    = CSRStorage(fields=[
+            CSRField("enable", size=1, offset=0, reset=1, description="Enable sampling."),
+            CSRField("reset",  size=1, offset=1, pulse=True, description="Reset records/ring buffer."),
+        ])
+        self._period     = CSRStorage(32, reset=int(sys_clk_freq/sample_rate), description="Sample period (sys_clk cycles).")
+        self._decimation = CSRStorage(4,  reset=4, description="Samples per record (log2).")
+        self._base       = CSRStorage(32, reset=base, description="Ring buffer base address (bytes).")
+        self._size       = CSRStorage(32, reset=size, description=f"Ring buffer size (bytes, multiple of {4*self.record_words}).")
+        self._records    = CSRStatus(32, description="Records written (free-running).")
+        self._overruns   = CSRStatus(32, description="Records dropped (ring buffer write too slow).")
+
+        # # #
+
+        enable = self._control.fields.enable
+        reset  = self._control.fields.reset
+        busy   = Signal()
+        start  = Signal()
+
+        # Sample Timer.
+        timer = Signal(32)
+        self.sync += [
+            timer.eq(timer - 1),
+            If(~enable | (timer == 0),
+                timer.eq(self._period.storage - 1)
+            )
+        ]
+        self.comb += self.sample.eq(enable & (timer == 0))
+
+        # Reductions.
+        count = Signal(16)
+        last  = Signal()
+        self.comb += last.eq(count == ((1 << self._decimation.storage) - 1))
+        self.sync += [
+            If(reset,
+                count.eq(0)
+            ).Elif(self.sample,
+                count.eq(Mux(last, 0, count + 1))
+            )
+        ]
+        self.comb += start.eq(self.sample & last & ~busy)
+        words = [self._records.status]
+        for name, signal in channels:
+            value = Signal(16)
+            vmin  = Signal(16)
+            vmax  = Signal(16)
+            vsum  = Signal(32)
+            nmin  = Signal(16)
+            nmax  = Signal(16)
+            nsum  = Signal(32)
+            rmin  = Signal(16)
+            rmax  = Signal(16)
+            ravg  = Signal(16)
+            rlast = Signal(16)
+            self.comb += [
+                value.eq(signal),
+                nmin.eq(Mux((count == 0) | (value < vmin), value, vmin)),
+                nmax.eq(Mux((count == 0) | (value > vmax), value, vmax)),
+                nsum.eq(Mux(count == 0, value, vsum + value)),
+            ]
+            self.sync += If(self.sample,
+                vmin.eq(nmin),
+                vmax.eq(nmax),
+                vsum.eq(nsum),
+                If(start,
+                    rmin.eq(nmin),
+                    rmax.eq(nmax),
+                    ravg.eq(nsum >> self._decimation.storage),
+                    rlast.eq(value),
+                )
+            )
+            words += [Cat(rmin, rmax), Cat(ravg, rlast)]
+
+        # Ring Buffer.
+        word  = Signal(max=len(words))
+        slot  = Signal(32)
+        shift = log2_int(4*self.record_words)
+        self.comb += [
+            bus.sel.eq(0b1111),
+            bus.we.eq(1),
+            bus.adr.eq((self._base.storage >> 2) + slot*self.record_words + word),
+            bus.dat_w.eq(Array(words)[word]),
+        ]
+        self.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            NextValue(word, 0),
+            If(start,
+                NextState("WRITE")
+            )
+        )
+        fsm.act("WRITE",
+            busy.eq(1),
+            bus.cyc.eq(1),
+            bus.stb.eq(1),
+            If(bus.ack,
+                NextValue(word, word + 1),
+                If(word == (len(words) - 1),
+                    NextState("COMMIT")
+                )
+            )
+        )
+        fsm.act("COMMIT",
+            busy.eq(1),
+            NextState("IDLE")
+        )
+        self.sync += [
+            If(reset,
+                self._records.status.eq(0),
+                self._overruns.status.eq(0),
+                slot.eq(0),
+            ).Else(
+                If(fsm.ongoing("COMMIT"),
+                    self._records.status.eq(self._records.status + 1),
+                    slot.eq(slot + 1),
+                    If(slot == ((self._size.storage >> shift) - 1),
+                        slot.eq(0)
+                    )
+                ),
+                If(self.sample & last & busy,
+                    self._overruns.status.eq(self._overruns.status + 1)
+                )
+            )
+        ]
+
+# Fan Controller -----------------------------------------------------------------------------------
+
+class FanController(LiteXModule):
+    """Fan Controller
+
+    PI control of the width of a PWM (created without CSRs) from the die temperature:
+    width = min_width + (kp*error + integral) >> 8, with error = temperature - target and
+    integral += ki*error (clamped to [0, period << 8]) at each update.
+
+    Parameters
+    ----------
+    pwm : PWM
+        Fan PWM (width driven by the controller, enable/period from its reset values).
+
+    temperature : Signal
+        Raw die temperature.
+
+    sys_clk_freq : float
+        System clock frequency.
+
+    tach : Signal
+        Optional fan tachometer.
+
+    update_rate : float
+        Control loop update rate (Hz).
+
+    Attributes
+    ----------
+    tach_rate : Signal(16), out
+        Fan tachometer (pulses per second).
+    """
+    def __init__(self, pwm, temperature, sys_clk_freq, tach=None, target=0, kp=256, ki=16, min_width=0, update_rate=10):
+        self.tach_rate = Signal(16)
+
+        # CSRs.
+        self._control      = CSRStorage(fields=[
+            CSRField("auto", size=1, offset=0, reset=1, description="Closed-loop control (0: manual_width)."),
+        ])
+        self._target       = CSRStorage(16, reset=target,    description="Target die temperature (raw).")
+        self._kp           = CSRStorage(16, reset=kp,        description="Proportional gain (width/256 per raw unit).")
+        self._ki           = CSRStorage(16, reset=ki,        description="Integral gain (width/256 per raw unit and sample).")
+        self._min_width    = CSRStorage(32, reset=min_width, description="Minimum PWM width.")
+        self._manual_width = CSRStorage(32, reset=pwm.period.reset.value, description="PWM width in manual mode.")
+        self._width        = CSRStatus(32, description="Current PWM width.")
+        if tach is not None:
+            self._tach     = CSRStatus(16, description="Fan tachometer (pulses per second).")
+
+        # # #
+
+        auto   = self._control.fields.auto
+        period = pwm.period
+
+        # Update Timer.
+        update = Signal()
+        timer  = Signal(32)
+        self.sync += [
+            timer.eq(timer - 1),
+            If(update,
+                timer.eq(int(sys_clk_freq/update_rate) - 1)
+            )
+        ]
+        self.comb += update.eq(timer == 0)
+
+        # PI Controller.
+        error    = Signal((18, True))
+        integral = Signal((48, True))
+        integ    = Signal((48, True))
+        output   = Signal((48, True))
+        width    = Signal(32)
+        self.comb += [
+            error.eq(temperature - self._target.storage),
+            integ.eq(integral + error*self._ki.storage),
+            output.eq(self._min_width.storage + ((error*self._kp.storage + integral) >> 8)),
+        ]
+        self.sync += If(update,
+            If(integ < 0,
+                integral.eq(0)
+            ).Elif(integ > (period << 8),
+                integral.eq(period << 8)
+            ).Else(
+                integral.eq(integ)
+            ),
+            If(output < self._min_width.storage,
+                width.eq(self._min_width.storage)
+            ).Elif(output > period,
+                width.eq(period)
+            ).Else(
+                width.eq(output)
+            )
+        )
+        self.comb += [
+            pwm.width.eq(Mux(auto, width, self._manual_width.storage)),
+            self._width.status.eq(pwm.width),
+        ]
+
+        # Tachometer.
+        if tach is not None:
+            tach_i    = Signal()
+            tach_d    = Signal()
+            pulses    = Signal(16)
+            gate      = Signal(32)
+            self.specials += MultiReg(tach, tach_i)
+            self.sync += [
+                tach_d.eq(tach_i),
+                gate.eq(gate + 1),
+                If(tach_i & ~tach_d,
+                    pulses.eq(pulses + 1)
+                ),
+                If(gate == int(sys_clk_freq - 1),
+                    gate.eq(0),
+                    pulses.eq(0),
+                    self._tach.status.eq(pulses),
+                )
+            ]
+            self.comb += self.tach_rate.eq(self._tach.status)
+
+# SoC Integration ----------------------------------------------------------------------------------
+
+def add_telemetry(soc, name="telemetry", sysmon=None, channels=[], sample_rate=100, ram_size=4096):
+    """Add a Telemetry sampling the sysmon (XADC/SysMon) and extra channels, with an on-chip ring
+    buffer of ram_size bytes (<name>_ram)."""
+    channels = (get_sysmon_channels(sysmon) if sysmon is not None else []) + channels
+    sram = wishbone.SRAM(ram_size, read_only=False)
+    soc.add_module(name=f"{name}_ram", module=sram)
+    origin = soc.mem_map.get(f"{name}_ram", None)
+    if origin is None and soc.mem_map.get("csr", None) == 0:
+        # CSR region is only added on finalize (at 0x00000000 without CPU), allocate above it.
+        csr_size = 2**(soc.csr.address_width + 2)
+        origin   = ram_size*math.ceil(csr_size/ram_size)
+    soc.bus.add_slave(name=f"{name}_ram", slave=sram.bus, region=SoCRegion(origin=origin, size=ram_size, cached=False))
+    telemetry = Telemetry(channels, soc.sys_clk_freq,
+        base        = soc.bus.regions[f"{name}_ram"].origin,
+        size        = ram_size - ram_size % (4*2**math.ceil(math.log2(1 + 2*len(channels)))),
+        sample_rate = sample_rate,
+    )
+    soc.add_module(name=name, module=telemetry)
+    soc.bus.add_master(name=name, master=telemetry.bus)
+    soc.add_constant(f"{name}_channels",     ":".join(n for n, _ in channels))
+    soc.add_constant(f"{name}_record_words", telemetry.record_words)
+    if sysmon is not None:
+        soc.add_constant(f"{name}_sysmon", get_sysmon_family(sysmon))
+    return telemetry
+
+def add_fan_controller(soc, name, pwm, sysmon, target=70, full_speed=20, tach=None):
+    """Add a FanController driving pwm from the sysmon die temperature: min_width (pwm default
+    width) at target °C, full speed full_speed °C above (proportional term)."""
+    family    = get_sysmon_family(sysmon)
+    raw_range = sysmon_temperature_raw(family, target + full_speed) - sysmon_temperature_raw(family, target)
+    period    = pwm.period.reset.value
+    kp        = max(int(256*(period - pwm.width.reset.value)/raw_range), 1)
+    fan = FanController(pwm, sysmon.temperature.status, soc.sys_clk_freq,
+        tach      = tach,
+        target    = sysmon_temperature_raw(family, target),
+        kp        = kp,
+        ki        = max(kp//64, 1),
+        min_width = pwm.width.reset.value,
+    )
+    soc.add_module(name=name, module=fan)
+    return fan
@@ -0,0 +1,323 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""UDP capture/replay streamer.
+
+Moves UDP payloads between a LiteEth UDP port and a DMA (LiteDRAM DMA to DDR or LitePCIe DMA to the
+Host) in hardware, without the CPU touching the payload. Packets are exchanged as records:
+
+- 128-bit header (128/dw words): length[15:0] (payload bytes), src_port[31:16], dst_port[47:32],
+  ip_address[79:48] (source IP on capture, destination IP on replay), timestamp[127:80] (sys_clk
+  cycles, capture only).
+- ceil(length/(dw/8)) payload words (last one zero-padded).
+
+Captured records can then be replayed as is (ex from DDR after a capture, with the DMA reader
+length set to the DMA writer offset). Captured packets are dropped (and counted) when the capture
+FIFO can't absorb a full packet, to never backpressure the MAC.
+
+Line-rate counters: packets/bytes/drops totals and bytes/s rates (updated every second).
+"""
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect import stream
+
+# Helpers ------------------------------------------------------------------------------------------
+
+HEADER_BITS = 128
+
+def record_layout(dw):
+    return [("data", dw)]
+
+# UDP Capture --------------------------------------------------------------------------------------
+
+class UDPCapture(LiteXModule):
+    def __init__(self, udp_port, dw=64, fifo_depth=512, max_packet_size=1500):
+        self.source    = stream.Endpoint(record_layout(dw))
+        self.enable    = Signal()
+        self.timestamp = Signal(48)
+        self.packet    = Signal() # Pulse per captured packet.
+        self.drop      = Signal() # Pulse per dropped packet.
+        self.length    = Signal(16)
+
+        # # #
+
+        bytes_per_word = dw//8
+        header_words   = max(HEADER_BITS//dw, 1)
+        max_words      = (max_packet_size + bytes_per_word - 1)//bytes_per_word + header_words
+
+        # FIFO.
+        self.fifo = fifo = stream.SyncFIFO(record_layout(dw), fifo_depth, buffered=True)
+        self.comb += fifo.source.connect(self.source)
+        room = Signal()
+        self.comb += room.eq(fifo.level <= (fifo_depth - max_words))
+
+        # Header.
+        sink      = udp_port.source
+        timestamp = Signal(48)
+        count     = Signal(max=max(header_words, 2))
+        header    = Cat(sink.length, sink.src_port, sink.dst_port, sink.ip_address, timestamp)
+        self.comb += self.length.eq(sink.length)
+
+        # FSM.
+        self.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            NextValue(count, 0),
+            NextValue(timestamp, self.timestamp),
+            If(sink.valid,
+                If(self.enable & room,
+                    NextState("HEADER")
+                ).Else(
+                    self.drop.eq(1),
+                    NextState("DROP")
+                )
+            )
+        )
+        fsm.act("HEADER",
+            fifo.sink.valid.eq(1),
+            fifo.sink.data.eq(Array(header[i*dw:(i + 1)*dw] for i in range(header_words))[count]),
+            If(fifo.sink.ready,
+                NextValue(count, count + 1),
+                If(count == (header_words - 1),
+                    self.packet.eq(1),
+                    NextState("PAYLOAD")
+                )
+            )
+        )
+        fsm.act("PAYLOAD",
+            fifo.sink.valid.eq(sink.valid),
+            fifo.sink.data.eq(sink.data),
+            sink.ready.eq(fifo.sink.ready),
+            If(sink.valid & sink.ready & sink.last,
+                NextState("IDLE")
+            )
+        )
+        fsm.act("DROP",
+            sink.ready.eq(1),
+            If(sink.valid & sink.last,
+                NextState("IDLE")
+            )
+        )
+
+# UDP Replay ---------------------------------------------------------------------------------------
+
+class UDPReplay(LiteXModule):
+    def __init__(self, udp_port, dw=64):
+        self.sink   = stream.Endpoint(record_layout(dw))
+        self.enable = Signal()
+        self.packet = Signal() # Pulse per replayed packet.
+        self.length = Signal(16)
+
+        # # #
+
+        bytes_per_word = dw//8
+        header_words   = max(HEADER_BITS//dw, 1)
+
+        # Header.
+        source    = udp_port.sink
+        header    = Signal(header_words*dw)
+        count     = Signal(max=max(header_words, 2))
+        remaining = Signal(16)
+        self.comb += self.length.eq(header[0:16])
+
+        # FSM.
+        self.fsm = fsm = FSM(reset_state="HEADER")
+        fsm.act("HEADER",
+            self.sink.ready.eq(self.enable),
+            If(self.sink.valid & self.sink.ready,
+                NextValue(header, Cat(header[dw:], self.sink.data)),
+                NextValue(count, count + 1),
+                If(count == (header_words - 1),
+                    NextValue(count, 0),
+                    NextState("START")
+                )
+            )
+        )
+        fsm.act("START",
+            NextValue(remaining, header[0:16]),
+            If(header[0:16] != 0,
+                self.packet.eq(1),
+                NextState("PAYLOAD")
+            ).Else(
+                NextState("HEADER")
+            )
+        )
+        last = Signal()
+        self.comb += last.eq(remaining <= bytes_per_word)
+        fsm.act("PAYLOAD",
+            source.valid.eq(self.sink.valid),
+            source.last.eq(last),
+            source.last_be.eq(Mux(last, 1 << (remaining - 1), 0)),
+            source.data.eq(self.sink.data),
+            source.length.eq(header[0:16]),
+            source.src_port.eq(header[16:32]),
+            source.dst_port.eq(header[32:48]),
+            source.ip_address.eq(header[48:80]),
+            self.sink.ready.eq(source.ready),
+            If(source.valid & source.ready,
+                NextValue(remaining, remaining - bytes_per_word),
+                If(last,
+                    NextState("HEADER")
+                )
+            )
+        )
+
+# Line-Rate Counters -------------------------------------------------------------------------------
+
+class _RateCounter(LiteXModule):
+    """Packets/bytes totals and bytes/s rate of a packet stream."""
+    def __init__(self, tick):
+        self.packet  = Signal()
+        self.length  = Signal(16)
+        self.packets = Signal(32)
+        self.bytes   = Signal(64)
+        self.rate    = Signal(32)
+
+        # # #
+
+        window = Signal(32)
+        self.sync += [
+            If(self.packet,
+                self.packets.eq(self.packets + 1),
+                self.bytes.eq(self.bytes + self.length),
+            ),
+            If(tick,
+                self.rate.eq(window),
+                window.eq(Mux(self.packet, self.length, 0)),
+            ).Elif(self.packet,
+                window.eq(window + self.length),
+            )
+        ]
+
+# UDP Streamer -------------------------------------------------------------------------------------
+
+class UDPStreamer(LiteXModule):
+    """UDP capture (source) / replay (sink) records with line-rate counters and CSRs."""
+    def __init__(self, udp_port, clk_freq, dw=64, fifo_depth=512, link_up=None):
+        self.source = stream.Endpoint(record_layout(dw))
+        self.sink   = stream.Endpoint(record_layout(dw))
+
+        # # #
+
+        # Timestamp / 1s Tick.
+        timestamp = Signal(48)
+        tick      = Signal()
+        tick_cnt  = Signal(32)
+        self.sync += [
+            timestamp.eq(timestamp + 1),
+            tick.eq(tick_cnt == 0),
+            If(tick_cnt == 0,
+                tick_cnt.eq(int(clk_freq) - 1)
+            ).Else(
+                tick_cnt.eq(tick_cnt - 1)
+            )
+        ]
+
+        # Capture / Replay.
+        self.capture = capture = UDPCapture(udp_port, dw=dw, fifo_depth=fifo_depth)
+        self.replay  = replay  = UDPReplay(udp_port, dw=dw)
+        self.comb += [
+            capture.timestamp.eq(timestamp),
+            capture.source.connect(self.source),
+            self.sink.connect(replay.sink),
+        ]
+
+        # Counters.
+        self.rx = rx = _RateCounter(tick)
+        self.tx = tx = _RateCounter(tick)
+        rx_drops = Signal(32)
+        self.comb += [
+            rx.packet.eq(capture.packet),
+            rx.length.eq(capture.length),
+            tx.packet.eq(replay.packet),
+            tx.length.eq(replay.length),
+        ]
+        self.sync += If(capture.drop, rx_drops.eq(rx_drops + 1))
+
+        # CSRs.
+        self._control = CSRStorage(fields=[
+            CSRField("capture", size=1, offset=0, description="Enable UDP capture."),
+            CSRField("replay",  size=1, offset=1, description="Enable UDP replay."),
+        ])
+        self._status = CSRStatus(fields=[
+            CSRField("link_up", size=1, offset=0, description="Link Status."),
+        ])
+        self._rx_packets = CSRStatus(32, description="Captured packets.")
+        self._rx_bytes   = CSRStatus(64, description="Captured payload bytes.")
+        self._rx_drops   = CSRStatus(32, description="Dropped packets (capture disabled or FIFO full).")
+        self._rx_rate    = CSRStatus(32, description="Captured payload bytes/s.")
+        self._tx_packets = CSRStatus(32, description="Replayed packets.")
+        self._tx_bytes   = CSRStatus(64, description="Replayed payload bytes.")
+        self._tx_rate    = CSRStatus(32, description="Replayed payload bytes/s.")
+        self.comb += [
+            capture.enable.eq(self._control.fields.capture),
+            replay.enable.eq(self._control.fields.replay),
+            self._status.fields.link_up.eq(link_up if link_up is not None else 1),
+            self._rx_packets.status.eq(rx.packets),
+            self._rx_bytes.status.eq(rx.bytes),
+            self._rx_drops.status.eq(rx_drops),
+            self._rx_rate.status.eq(rx.rate),
+            self._tx_packets.status.eq(tx.packets),
+            self._tx_bytes.status.eq(tx.bytes),
+            self._tx_rate.status.eq(tx.rate),
+        ]
+
+# SoC Integration ----------------------------------------------------------------------------------
+
+def add_udp_streamer(soc, name, phy, mac_address, ip_address, udp_port=9000, dw=64, dma="dram", dma_index=0, link_up=None):
+    """Add a LiteEth UDP/IP stack on phy with a UDP streamer moving records to/from DDR (LiteDRAM
+    DMAs, through <name>_dma_writer/<name>_dma_reader CSRs) or the Host (pcie_dma<dma_index>).
+
+    Note: The UDP/IP stack runs in sys_clk domain on a dw-bit datapath (LiteEth packetizers don't
+    support datapaths wider than the 64-bit UDP header): a 10G lane requires sys_clk_freq >= 156.25MHz
+    to sustain line rate.
+    """
+    from litedram.frontend.dma import LiteDRAMDMAWriter, LiteDRAMDMAReader
+    from liteeth.core import LiteEthUDPIPCore
+
+    assert dma in ["dram", "pcie"]
+
+    # UDP/IP Stack.
+    ethcore = LiteEthUDPIPCore(phy,
+        mac_address = mac_address,
+        ip_address  = ip_address,
+        clk_freq    = soc.sys_clk_freq,
+        dw          = dw,
+    )
+    ethcore = ClockDomainsRenamer({"eth_tx": f"{name}_tx", "eth_rx": f"{name}_rx"})(ethcore)
+    soc.add_module(name=f"{name}_ethcore", module=ethcore)
+
+    # Streamer.
+    streamer = UDPStreamer(ethcore.udp.crossbar.get_port(udp_port, dw=dw),
+        clk_freq = soc.sys_clk_freq,
+        dw       = dw,
+        link_up  = link_up,
+    )
+    soc.add_module(name=name, module=streamer)
+
+    # DMAs.
+    if dma == "dram":
+        dma_writer = LiteDRAMDMAWriter(soc.sdram.crossbar.get_port("write"), fifo_depth=16, with_csr=True)
+        dma_reader = LiteDRAMDMAReader(soc.sdram.crossbar.get_port("read"),  fifo_depth=16, with_csr=True)
+        soc.add_module(name=f"{name}_dma_writer", module=dma_writer)
+        soc.add_module(name=f"{name}_dma_reader", module=dma_reader)
+        dma_sink, dma_source = dma_writer.sink, dma_reader.source
+    else:
+        pcie_dma = getattr(soc, f"pcie_dma{dma_index}")
+        dma_sink, dma_source = pcie_dma.sink, pcie_dma.source
+    tx_conv = stream.Converter(dw, len(dma_sink.data))
+    rx_conv = stream.Converter(len(dma_source.data), dw)
+    soc.add_module(name=f"{name}_tx_conv", module=tx_conv)
+    soc.add_module(name=f"{name}_rx_conv", module=rx_conv)
+    soc.comb += [
+        streamer.source.connect(tx_conv.sink),
+        tx_conv.source.connect(dma_sink, keep={"valid", "ready", "data"}),
+        dma_source.connect(rx_conv.sink, keep={"valid", "ready", "data"}),
+        rx_conv.source.connect(streamer.sink),
+    ]
+    return ethcore, streamer
@@ -0,0 +1,310 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""Triple-buffered Video FrameBuffer.
+
+Drop-in alternative to LiteX's VideoFrameBuffer (same vtg_sink/source interface) for software/
+gateware renderers that can't be synchronized to the display: three buffers are allocated in DRAM,
+the renderer always draws in a free buffer and commits it when complete, the display switches to
+the last committed buffer at the end of each displayed frame. The renderer never waits for the
+display and the display never shows a partially rendered frame.
+
+Software flow:
+- Read render_base, draw the frame at this address.
+- Write commit, a new render_base is then directly available for the next frame.
+
+Video DMA fetches are issued in bursts of burst_length consecutive words (sized to the memory
+page/row or PSRAM burst) and only when the FIFO has room for the full burst, so that fetches
+don't interleave with other masters' accesses in the middle of a page.
+"""
+
+from migen import *
+from migen.genlib.cdc import PulseSynchronizer, BusSynchronizer
+
+from litex.gen import *
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect import stream
+from litex.soc.cores.video import video_timing_layout, video_data_layout
+
+# Video Burst Fetcher ------------------------------------------------------------------------------
+
+class _VideoBurstFetcher(LiteXModule):
+    def __init__(self, port, burst_length, fifo_depth):
+        assert fifo_depth >= 2*burst_length
+        self.base   = Signal(port.address_width) # In port words.
+        self.length = Signal(port.address_width) # In port words.
+        self.start  = Signal()                   # Flush and restart fetch (from base).
+        self.source = source = stream.Endpoint([("data", port.data_width)]) # first on first word.
+
+        # # #
+
+        offset   = Signal(port.address_width)
+        count    = Signal(max=burst_length)
+        reserved = Signal(max=fifo_depth + 1)
+        first    = Signal()
+
+        # FIFO.
+        self.fifo = fifo = ResetInserter()(stream.SyncFIFO([("data", port.data_width)], fifo_depth, buffered=True))
+        self.comb += fifo.source.connect(source)
+
+        # Read Datas (Always accepted: FIFO space is reserved when the burst is issued).
+        self.comb += [
+            port.rdata.ready.eq(1),
+            fifo.sink.valid.eq(port.rdata.valid),
+            fifo.sink.first.eq(first),
+            fifo.sink.data.eq(port.rdata.data),
+        ]
+
+        # Reserved words tracking.
+        cmd_done   = Signal()
+        rdata_done = Signal()
+        self.comb += cmd_done.eq(port.cmd.valid & port.cmd.ready)
+        self.comb += rdata_done.eq(port.rdata.valid & port.rdata.ready)
+        self.sync += [
+            If(cmd_done & ~rdata_done,
+                reserved.eq(reserved + 1)
+            ).Elif(~cmd_done & rdata_done,
+                reserved.eq(reserved - 1)
+            )
+        ]
+
+        # Read Bursts.
+        self.comb += [
+            port.cmd.we.eq(0),
+            port.cmd.last.eq(count == (burst_length - 1)),
+            port.cmd.addr.eq(self.base + offset),
+        ]
+        self.fsm = fsm = ResetInserter()(FSM(reset_state="FLUSH"))
+        self.comb += fsm.reset.eq(self.start)
+        fsm.act("FLUSH",
+            # Wait for in-flight reads from previous frame and discard them.
+            fifo.reset.eq(1),
+            NextValue(offset, 0),
+            If(reserved == 0,
+                NextState("WAIT")
+            )
+        )
+        fsm.act("WAIT",
+            # Wait for room in the FIFO for a full burst (until end of frame).
+            If((offset < self.length) & ((fifo.level + reserved + burst_length) <= fifo_depth),
+                NextValue(count, 0),
+                NextState("BURST")
+            )
+        )
+        fsm.act("BURST",
+            port.cmd.valid.eq(1),
+            If(port.cmd.ready,
+                NextValue(offset, offset + 1),
+                NextValue(count, count + 1),
+                If(count == (burst_length - 1),
+                    NextState("WAIT")
+                )
+            )
+        )
+        self.sync += [
+            If(fsm.ongoing("FLUSH"),
+                first.eq(1)
+            ).Elif(fifo.sink.valid & fifo.sink.ready,
+                first.eq(0)
+            )
+        ]
+
+# Video Triple Buffer ------------------------------------------------------------------------------
+
+class VideoTripleBuffer(LiteXModule):
+    """Video Triple-Buffered FrameBuffer
+
+    Parameters
+    ----------
+    dram_port : LiteDRAMNativePort
+        DRAM port used to fetch the frames.
+
+    base : int
+        Address of the first buffer (as seen from the SoC bus), buffers are 4KB aligned.
+
+    burst_length : int
+        Number of consecutive port words fetched per burst.
+    """
+    def __init__(self, dram_port, hres=640, vres=480, base=0x00000000, format="rgb565",
+        clock_domain = "sys",
+        burst_length = 32,
+        fifo_depth   = None):
+        self.vtg_sink  = vtg_sink = stream.Endpoint(video_timing_layout)
+        self.source    = source   = stream.Endpoint(video_data_layout)
+        self.underflow = Signal()
+
+        self.depth = depth = {
+            "rgb888" : 32,
+            "rgb565" : 16,
+        }[format]
+
+        # Frame Buffers.
+        word_bytes       = dram_port.data_width//8
+        frame_bytes      = hres*vres*depth//8
+        self.frame_size  = frame_size = (frame_bytes + 0xfff) & ~0xfff
+        self.frame_bases = frame_bases = [base + n*frame_size for n in range(3)]
+        assert (frame_bytes % (burst_length*word_bytes)) == 0
+        assert (frame_size % (burst_length*word_bytes)) == 0
+
+        # CSRs.
+        self._render_base    = CSRStatus(32, description="Base address of the buffer to render to.")
+        self._commit         = CSR() # Commit rendered buffer (write).
+        self._display_base   = CSRStatus(32, description="Base address of the displayed buffer.")
+        self._frames         = CSRStatus(32, description="Displayed frames.")
+        self._frame_time     = CSRStatus(32, description="Last displayed frame period (sys cycles).")
+        self._render_time    = CSRStatus(32, description="Last committed frame period (sys cycles).")
+        self._dropped        = CSRStatus(32, description="Committed frames never displayed (renderer faster than display).")
+        self._repeated       = CSRStatus(32, description="Displayed frames repeated (renderer slower than display).")
+        self._underruns      = CSRStatus(32, description="Displayed frames with DMA underruns.")
+        self._underrun_count = CSRStatus(32, description="Pixels missed during last displayed frame.")
+
+        # # #
+
+        # Buffers Management (sys) -----------------------------------------------------------------
+        frame_end = Signal()
+        commit    = Signal()
+        display   = Signal(2, reset=0)
+        ready     = Signal(2, reset=1)
+        render    = Signal(2, reset=2)
+        pending   = Signal()
+        bases     = Array(Constant(b, 32) for b in frame_bases)
+        self.comb += [
+            self._render_base.status.eq(bases[render]),
+        ]
+
+        cycles        = Signal(32)
+        frame_cycles  = Signal(32)
+        commit_cycles = Signal(32)
+        self.sync += [
+            cycles.eq(cycles + 1),
+            If(frame_end,
+                # Display last committed buffer (or repeat current one).
+                If(pending,
+                    display.eq(ready),
+                    ready.eq(display),
+                    pending.eq(0),
+                ).Else(
+                    self._repeated.status.eq(self._repeated.status + 1)
+                ),
+                self._frames.status.eq(self._frames.status + 1),
+                self._frame_time.status.eq(cycles - frame_cycles),
+                frame_cycles.eq(cycles),
+            ).Elif(commit,
+                # Rendered buffer becomes ready buffer, render to the free one.
+                commit.eq(0),
+                If(pending,
+                    self._dropped.status.eq(self._dropped.status + 1)
+                ),
+                render.eq(ready),
+                ready.eq(render),
+                pending.eq(1),
+                self._render_time.status.eq(cycles - commit_cycles),
+                commit_cycles.eq(cycles),
+            ),
+            If(self._commit.re, commit.eq(1)),
+        ]
+
+        # Video DMA (sys) --------------------------------------------------------------------------
+        if fifo_depth is None:
+            fifo_depth = 4*burst_length
+        shift = log2_int(word_bytes)
+        self.fetcher = fetcher = _VideoBurstFetcher(dram_port, burst_length, fifo_depth)
+        frame_end_d  = Signal()
+        display_base = Signal(32)
+        self.sync += frame_end_d.eq(frame_end)
+        self.comb += [
+            display_base.eq(bases[display]),
+            self._display_base.status.eq(display_base),
+            fetcher.start.eq(frame_end_d), # Restart on the newly displayed buffer.
+            fetcher.base.eq(display_base[shift:]),
+            fetcher.length.eq(frame_bytes//word_bytes),
+        ]
+
+        # Clock Domain Crossing + Data-Width Conversion --------------------------------------------
+        self.cdc = cdc = stream.ClockDomainCrossing([("data", dram_port.data_width)],
+            cd_from = "sys",
+            cd_to   = clock_domain,
+        )
+        self.comb += fetcher.source.connect(cdc.sink)
+        self.conv = conv = ClockDomainsRenamer(clock_domain)(ResetInserter()(
+            stream.Converter(dram_port.data_width, depth)))
+
+        # Video Synchronization/Generation (video) -------------------------------------------------
+        sync_video = getattr(self.sync, clock_domain)
+        pixels     = Signal(max=hres*vres + 1)
+        vblank     = Signal(reset=1)
+        underrun   = Signal()
+        underruns  = Signal(32)
+        frame_last = Signal()
+        self.comb += frame_last.eq(vtg_sink.valid & vtg_sink.de & (pixels == (hres*vres - 1)))
+
+        # Stale datas (from a frame with underruns) are drained during vertical blanking until
+        # the first word of the next frame.
+        active = Signal()
+        drain  = Signal()
+        self.comb += [
+            active.eq(vtg_sink.valid & vtg_sink.de),
+            drain.eq(vblank & ~active),
+            conv.reset.eq(drain),
+            If(drain,
+                cdc.source.ready.eq(~cdc.source.first)
+            ).Else(
+                cdc.source.connect(conv.sink)
+            )
+        ]
+
+        # Timings/Pixels (no backpressure from PHY, black pixels on underrun).
+        self.comb += [
+            vtg_sink.ready.eq(1),
+            vtg_sink.connect(source, keep={"valid", "de", "hsync", "vsync"}),
+            conv.source.ready.eq(active),
+            underrun.eq(active & ~conv.source.valid),
+            self.underflow.eq(underrun),
+        ]
+        if depth == 32:
+            self.comb += If(~underrun,
+                source.r.eq(conv.source.data[ 0: 8]),
+                source.g.eq(conv.source.data[ 8:16]),
+                source.b.eq(conv.source.data[16:24]),
+            )
+        if depth == 16:
+            self.comb += If(~underrun,
+                source.r.eq(Cat(conv.source.data[11:16][2:], conv.source.data[11:16])),
+                source.g.eq(Cat(conv.source.data[ 5:11][4:], conv.source.data[ 5:11])),
+                source.b.eq(Cat(conv.source.data[ 0: 5][2:], conv.source.data[ 0: 5])),
+            )
+
+        sync_video += [
+            If(active,
+                vblank.eq(0),
+                pixels.eq(pixels + 1),
+                If(underrun, underruns.eq(underruns + 1)),
+            ),
+            If(frame_last | (vtg_sink.valid & vtg_sink.last),
+                vblank.eq(1),
+                pixels.eq(0),
+                underruns.eq(0),
+            ),
+        ]
+
+        # Frame End / Statistics to sys ------------------------------------------------------------
+        self.frame_end_ps = PulseSynchronizer(clock_domain, "sys")
+        self.underrun_ps  = PulseSynchronizer(clock_domain, "sys")
+        self.underrun_bs  = BusSynchronizer(32, clock_domain, "sys")
+        frame_underruns   = Signal(32)
+        sync_video += If(frame_last, frame_underruns.eq(underruns + underrun))
+        self.comb += [
+            self.frame_end_ps.i.eq(frame_last),
+            self.underrun_ps.i.eq(frame_last & ((underruns + underrun) != 0)),
+            self.underrun_bs.i.eq(frame_underruns),
+            frame_end.eq(self.frame_end_ps.o),
+        ]
+        self.sync += [
+            If(self.underrun_ps.o,
+                self._underruns.status.eq(self._underruns.status + 1),
+            ),
+            self._underrun_count.status.eq(self.underrun_bs.o),
+        ]
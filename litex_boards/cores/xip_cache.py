@@ -0,0 +1,343 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""Execute-In-Place SPI Flash Cache.
+
+Small SoCs (iCE40/ECP5) without integrated ROM run their BIOS/firmware directly from the memory-
+mapped SPI Flash, where each fetch not following the previous one pays a full SPI command/address
+phase. XIPCache is a read cache inserted between the SoC bus and the SPI Flash MMAP:
+
+- Direct-mapped, size/line configurable, data stored in EBR (Memory) or UP5K SPRAM.
+- Lines are refilled with sequential accesses (SPI bursts are kept open by the MMAP core).
+- Sequential-stream prefetch: the line following the accessed one is prefetched, right after a
+  demand refill (continuing the SPI burst) and when execution enters a new line. A demand miss
+  aborts an in-flight prefetch.
+- Hit/Miss/Prefetch/Stall counters, flush and enable/prefetch controls.
+
+Writes are passed through to the SPI Flash MMAP (the cache must be flushed by software after
+modifying the Flash content).
+"""
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect import wishbone
+
+# XIP Cache Data Memory ----------------------------------------------------------------------------
+
+class _XIPCacheDataMemory(LiteXModule):
+    """Single-port data memory (1 cycle read latency)."""
+    def __init__(self, words, storage="ebr"):
+        self.adr   = Signal(max=words)
+        self.dat_r = Signal(32)
+        self.dat_w = Signal(32)
+        self.we    = Signal()
+
+        # # #
+
+        if storage == "ebr":
+            mem  = Memory(32, words)
+            port = mem.get_port(write_capable=True)
+            self.specials += mem, port
+            self.comb += [
+                port.adr.eq(self.adr),
+                port.dat_w.eq(self.dat_w),
+                port.we.eq(self.we),
+                self.dat_r.eq(port.dat_r),
+            ]
+        elif storage == "spram":
+            # 2 x SB_SPRAM256KA (16K x 16-bit) for 64KB of data.
+            assert words == 16*1024
+            for w in range(2):
+                self.specials += Instance("SB_SPRAM256KA",
+                    i_CLOCK      = ClockSignal("sys"),
+                    i_STANDBY    = 0b0,
+                    i_SLEEP      = 0b0,
+                    i_POWEROFF   = 0b1,
+                    i_ADDRESS    = self.adr,
+                    i_DATAIN     = self.dat_w[16*w:16*(w+1)],
+                    i_MASKWREN   = 0b1111,
+                    i_WREN       = self.we,
+                    i_CHIPSELECT = 0b1,
+                    o_DATAOUT    = self.dat_r[16*w:16*(w+1)],
+                )
+        else:
+            raise ValueError(f"Unsupported XIP Cache storage {storage}.")
+
+# XIP Cache ----------------------------------------------------------------------------------------
+
+class XIPCache(LiteXModule):
+    """Execute-In-Place SPI Flash Cache
+
+    Parameters
+    ----------
+    size : int
+        Cache size (bytes).
+
+    line_bytes : int
+        Cache line size (bytes).
+
+    storage : str
+        Data storage: "ebr" (Memory) or "spram" (UP5K SPRAM, 64KB).
+
+    bus : wishbone.Interface
+        SoC side (slave) interface, 32-bit/word addressing.
+
+    mem_bus : wishbone.Interface
+        SPI Flash MMAP side (master) interface.
+    """
+    def __init__(self, size=4096, line_bytes=32, storage="ebr", prefetch=True):
+        self.bus     = bus     = wishbone.Interface(data_width=32, address_width=32, addressing="word")
+        self.mem_bus = mem_bus = wishbone.Interface(data_width=32, address_width=32, addressing="word")
+
+        line_words = line_bytes//4
+        nlines     = size//line_bytes
+        wbits      = log2_int(line_words)
+        ibits      = log2_int(nlines)
+        tbits      = len(bus.adr) - wbits - ibits
+        lbits      = len(bus.adr) - wbits
+        assert size in [2**n for n in range(8, 24)]
+        assert line_words >= 2
+
+        self.size       = size
+        self.line_bytes = line_bytes
+
+        # CSRs.
+        self._control    = CSRStorage(fields=[
+            CSRField("enable",   size=1, offset=0, reset=1,                  description="Enable cache (bypass when disabled)."),
+            CSRField("prefetch", size=1, offset=1, reset=1 if prefetch else 0, description="Enable sequential-stream prefetch."),
+        ])
+        self._flush      = CSR() # Invalidate all lines (write).
+        self._hits       = CSRStatus(32, description="Read hits.")
+        self._misses     = CSRStatus(32, description="Read misses (demand line refills).")
+        self._prefetches = CSRStatus(32, description="Lines prefetched.")
+        self._stalls     = CSRStatus(32, description="Bus cycles stalled on the SPI Flash.")
+
+        # # #
+
+        # Address Decoding.
+        a_off  = bus.adr[:wbits]
+        a_idx  = bus.adr[wbits:wbits + ibits]
+        a_tag  = bus.adr[wbits + ibits:]
+        a_line = bus.adr[wbits:]
+
+        # Tag Memory (valid + tag): lookup/prefetch read ports, refill write port.
+        tags   = Memory(1 + tbits, nlines)
+        tag_rd = tags.get_port()
+        tag_pf = tags.get_port()
+        tag_wr = tags.get_port(write_capable=True)
+        self.specials += tags, tag_rd, tag_pf, tag_wr
+
+        # Data Memory.
+        self.data = data = _XIPCacheDataMemory(size//4, storage)
+
+        # Refill Engine <-> Lookup.
+        demand_req  = Signal()           # Demand refill request (of a_line).
+        fill_line   = Signal(lbits)      # Line being refilled.
+        fill_demand = Signal()           # Refill is a demand refill.
+        filling     = Signal()           # Refill in progress.
+        fill_done   = Signal()           # Refill done (pulse).
+        fill_we     = Signal()           # Refill data write (has priority over lookup).
+        fill_count  = Signal(wbits)
+        fill_words  = Signal(wbits + 1)  # Words written to Data Memory.
+        pf_req      = Signal()           # Prefetch request.
+        pf_line     = Signal(lbits)      # Line to prefetch.
+        pf_hit      = Signal()           # Prefetch request from lookup (new line entered).
+        pf_fill     = Signal()           # Prefetch request from refill (continue burst).
+        pf_clear    = Signal()
+        flush_req   = Signal()
+        flush_done  = Signal()
+        flush_count = Signal(ibits)
+        last_line   = Signal(lbits)
+
+        self.sync += [
+            If(pf_hit,
+                pf_req.eq(1),
+                pf_line.eq(a_line + 1),
+            ).Elif(pf_fill,
+                pf_req.eq(1),
+                pf_line.eq(fill_line + 1),
+            ).Elif(pf_clear,
+                pf_req.eq(0),
+            ),
+            If(self._flush.re,
+                flush_req.eq(1)
+            ).Elif(flush_done,
+                flush_req.eq(0)
+            )
+        ]
+
+        # Lookup (SoC side) ------------------------------------------------------------------------
+        enable       = self._control.fields.enable
+        hit          = Signal()
+        hit_refill   = Signal()
+        fill_words_d = Signal(wbits + 1)
+        self.sync += fill_words_d.eq(fill_words)
+        self.comb += [
+            tag_rd.adr.eq(a_idx),
+            # Hit under refill: word already written to Data Memory when read (early restart).
+            hit_refill.eq(filling & (fill_line == a_line) & (a_off < fill_words_d)),
+            hit.eq(((tag_rd.dat_r[0] & (tag_rd.dat_r[1:] == a_tag)) | hit_refill) & ~flush_req),
+            If(fill_we,
+                data.adr.eq(Cat(fill_count, fill_line[:ibits])),
+            ).Else(
+                data.adr.eq(Cat(a_off, a_idx)),
+            ),
+        ]
+        self.lookup = lookup = FSM(reset_state="IDLE")
+        self.engine = engine = FSM(reset_state="IDLE")
+        lookup.act("IDLE",
+            If(bus.cyc & bus.stb,
+                If(bus.we | ~enable,
+                    NextState("PASS")
+                # Tag/Data read issued when Data Memory available and Tag not being validated.
+                ).Elif(~fill_we & ~engine.ongoing("FILL-END"),
+                    NextState("CHECK")
+                )
+            )
+        )
+        lookup.act("CHECK",
+            If(hit,
+                bus.ack.eq(1),
+                bus.dat_r.eq(data.dat_r),
+                NextValue(self._hits.status, self._hits.status + 1),
+                # Entering a new line: prefetch the next one.
+                NextValue(last_line, a_line),
+                If(a_line != last_line,
+                    pf_hit.eq(1)
+                ),
+                NextState("IDLE")
+            ).Else(
+                NextState("MISS")
+            )
+        )
+        lookup.act("MISS",
+            If(filling & (fill_line == a_line),
+                # Line already being refilled (prefetch): wait for it.
+                NextState("WAIT")
+            ).Elif(engine.ongoing("IDLE") & ~flush_req,
+                demand_req.eq(1),
+                NextValue(self._misses.status, self._misses.status + 1),
+                NextState("WAIT")
+            )
+        )
+        lookup.act("WAIT",
+            If(fill_done | (filling & (fill_line == a_line) & (a_off < fill_words)),
+                NextState("IDLE") # Lookup again (hit).
+            ).Elif(~filling,
+                NextState("MISS")
+            )
+        )
+        lookup.act("PASS",
+            If(~filling,
+                bus.connect(mem_bus, keep={"adr", "dat_w", "sel", "cyc", "stb", "we", "cti", "bte"}),
+                bus.ack.eq(mem_bus.ack),
+                bus.err.eq(mem_bus.err),
+                bus.dat_r.eq(mem_bus.dat_r),
+                If(mem_bus.ack | mem_bus.err,
+                    NextState("IDLE")
+                )
+            )
+        )
+        self.sync += If(bus.cyc & bus.stb & ~bus.ack, self._stalls.status.eq(self._stalls.status + 1))
+
+        # Refill Engine (SPI Flash side) -----------------------------------------------------------
+        abort = Signal()
+        self.comb += [
+            tag_pf.adr.eq(pf_line[:ibits]),
+            abort.eq(lookup.ongoing("MISS") & (fill_line != a_line)),
+        ]
+        engine.act("IDLE",
+            If(flush_req,
+                NextValue(flush_count, 0),
+                NextState("FLUSH")
+            ).Elif(demand_req,
+                NextValue(fill_line,   a_line),
+                NextValue(fill_words,  0),
+                NextValue(fill_demand, 1),
+                NextState("FILL-START")
+            ).Elif(pf_req & self._control.fields.prefetch & ~lookup.ongoing("PASS"),
+                NextState("PF-CHECK")
+            )
+        )
+        engine.act("PF-CHECK",
+            pf_clear.eq(1),
+            If(lookup.ongoing("MISS") | lookup.ongoing("PASS"),
+                NextState("IDLE") # Demand/Pass-through pending.
+            ).Elif(tag_pf.dat_r[0] & (tag_pf.dat_r[1:] == pf_line[ibits:]),
+                NextState("IDLE") # Line already cached.
+            ).Else(
+                NextValue(fill_line,   pf_line),
+                NextValue(fill_words,  0),
+                NextValue(fill_demand, 0),
+                NextState("FILL-START")
+            )
+        )
+        engine.act("FILL-START",
+            filling.eq(1),
+            # Invalidate line during refill.
+            tag_wr.adr.eq(fill_line[:ibits]),
+            tag_wr.dat_w.eq(0),
+            tag_wr.we.eq(1),
+            NextValue(fill_count, 0),
+            NextState("FILL")
+        )
+        engine.act("FILL",
+            filling.eq(1),
+            mem_bus.cyc.eq(1),
+            mem_bus.stb.eq(1),
+            mem_bus.we.eq(0),
+            mem_bus.sel.eq(0b1111),
+            mem_bus.adr.eq(Cat(fill_count, fill_line)),
+            data.dat_w.eq(mem_bus.dat_r),
+            If(mem_bus.ack,
+                fill_we.eq(1),
+                data.we.eq(1),
+                NextValue(fill_count, fill_count + 1),
+                NextValue(fill_words, fill_words + 1),
+                If(fill_count == (line_words - 1),
+                    NextState("FILL-END")
+                ).Elif(~fill_demand & abort,
+                    NextState("IDLE") # Prefetch aborted (line left invalid).
+                )
+            )
+        )
+        engine.act("FILL-END",
+            filling.eq(1),
+            fill_done.eq(1),
+            tag_wr.adr.eq(fill_line[:ibits]),
+            tag_wr.dat_w.eq(Cat(1, fill_line[ibits:])),
+            tag_wr.we.eq(1),
+            If(fill_demand,
+                pf_fill.eq(1), # Continue the SPI burst with the next line.
+            ).Else(
+                NextValue(self._prefetches.status, self._prefetches.status + 1),
+            ),
+            NextState("IDLE")
+        )
+        engine.act("FLUSH",
+            tag_wr.adr.eq(flush_count),
+            tag_wr.dat_w.eq(0),
+            tag_wr.we.eq(1),
+            NextValue(flush_count, flush_count + 1),
+            If(flush_count == (nlines - 1),
+                flush_done.eq(1),
+                pf_clear.eq(1),
+                NextState("IDLE")
+            )
+        )
+
+# SoC Integration ----------------------------------------------------------------------------------
+
+def add_xip_cache(soc, name="spiflash", size=4096, line_bytes=32, storage="ebr", prefetch=True):
+    """Insert an XIPCache between the SoC bus and the SPI Flash MMAP slave (name)."""
+    assert name in soc.bus.slaves
+    cache = XIPCache(size=size, line_bytes=line_bytes, storage=storage, prefetch=prefetch)
+    soc.add_module(name=f"{name}_cache", module=cache)
+    soc.comb += cache.mem_bus.connect(soc.bus.slaves[name])
+    soc.bus.slaves[name] = cache.bus
+    return cache
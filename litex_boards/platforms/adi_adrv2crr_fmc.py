@@ -8,6 +8,8 @@ from litex.build.generic_platform import *
 from litex.build.xilinx import XilinxUSPPlatform
 from litex.build.openocd import OpenOCD
 
+from litex_boards.tools.xilinx_config import XilinxConfigPlatform
+
 _io = [
     # Clk
     ("clk122m88", 0,
@@ -482,7 +484,7 @@ _connectors = [
 
 # Platform -----------------------------------------------------------------------------------------
 
-class Platform(XilinxUSPPlatform):
+class Platform(XilinxConfigPlatform, XilinxUSPPlatform):
     default_clk_name   = "clk122m88"
     default_clk_period = 1e9/122.88e6
 
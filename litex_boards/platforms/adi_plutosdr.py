@@ -7,6 +7,8 @@
 from litex.build.generic_platform import *
 from litex.build.xilinx import Xilinx7SeriesPlatform, VivadoProgrammer
 
+from litex_boards.tools.xilinx_config import XilinxConfigPlatform
+
 # IOs ----------------------------------------------------------------------------------------------
 
 _io = [
@@ -22,7 +24,7 @@ _connectors = []
 
 # Platform -----------------------------------------------------------------------------------------
 
-class Platform(Xilinx7SeriesPlatform):
+class Platform(XilinxConfigPlatform, Xilinx7SeriesPlatform):
     def __init__(self, toolchain="vivado"):
         Xilinx7SeriesPlatform.__init__(self, "xc7z010clg225-1", _io,  _connectors, toolchain=toolchain)
 
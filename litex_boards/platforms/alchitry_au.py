@@ -13,6 +13,8 @@ from litex.build.generic_platform import *
 from litex.build.xilinx import Xilinx7SeriesPlatform
 from litex.build.openocd import OpenOCD
 
+from litex_boards.tools.xilinx_config import XilinxConfigProfile, XilinxConfigPlatform
+
 # IOs ----------------------------------------------------------------------------------------------
 
 _io = [
@@ -95,9 +97,10 @@ _io = [
 
 # Platform -----------------------------------------------------------------------------------------
 
-class Platform(Xilinx7SeriesPlatform):
+class Platform(XilinxConfigPlatform, Xilinx7SeriesPlatform):
     default_clk_name   = "clk100"
     default_clk_period = 1e9/100e6
+    config_profile     = XilinxConfigProfile(configrate=33, fall_edge=True, compress=True, flash_size=4, fast_spi_width=4)
 
     def __init__(self, variant="au", toolchain="vivado"):
         device = {
@@ -109,17 +112,10 @@ class Platform(Xilinx7SeriesPlatform):
         self.add_platform_command("set_property INTERNAL_VREF 0.675 [get_iobanks 15]")
 
         self.toolchain.bitstream_commands = [
-            "set_property BITSTREAM.GENERAL.COMPRESS TRUE [current_design]",
-            "set_property BITSTREAM.CONFIG.CONFIGRATE 33 [current_design]",
             "set_property CONFIG_VOLTAGE 3.3 [current_design]",
             "set_property CFGBVS VCCO [current_design]",
             "set_property BITSTREAM.CONFIG.SPI_32BIT_ADDR NO [current_design]",
-            "set_property BITSTREAM.CONFIG.SPI_BUSWIDTH 1 [current_design]",
-            "set_property BITSTREAM.CONFIG.SPI_FALL_EDGE YES [current_design]",
         ]
-        self.toolchain.additional_commands = \
-            ["write_cfgmem -force -format bin -interface spix1 -size 4 "
-             "-loadbit \"up 0x0 {build_name}.bit\" -file {build_name}.bin"]
 
     def create_programmer(self):
         return OpenOCD("openocd_xc7_ft2232.cfg", "bscan_spi_xc7a35t.bit")
@@ -12,6 +12,8 @@ from litex.build.generic_platform import *
 from litex.build.xilinx import Xilinx7SeriesPlatform, VivadoProgrammer
 from litex.build.openocd import OpenOCD
 
+from litex_boards.tools.xilinx_config import XilinxConfigProfile, XilinxConfigPlatform
+
 # IOs ----------------------------------------------------------------------------------------------
 
 _io = [
@@ -306,9 +308,10 @@ def raw_j4():
 
 # Platform -----------------------------------------------------------------------------------------
 
-class Platform(Xilinx7SeriesPlatform):
+class Platform(XilinxConfigPlatform, Xilinx7SeriesPlatform):
     default_clk_name   = "clk50"
     default_clk_period = 1e9/50e6
+    config_profile     = XilinxConfigProfile(spi_width=4, configrate=50, flash_size=16)
 
     def __init__(self, toolchain="vivado", variant="a7-35"):
         assert variant in ["a7-35", "a7-100"]
@@ -316,15 +319,10 @@ class Platform(Xilinx7SeriesPlatform):
         self.kgates = kgates
         Xilinx7SeriesPlatform.__init__(self, f"xc7a{kgates}tfgg484-2", _io, _connectors, toolchain=toolchain)
         self.toolchain.bitstream_commands = \
-            ["set_property BITSTREAM.CONFIG.SPI_BUSWIDTH 4 [current_design]",
-             "set_property BITSTREAM.CONFIG.CONFIGRATE 50 [current_design]",
-             "set_property CFGBVS VCCO [current_design]",
+            ["set_property CFGBVS VCCO [current_design]",
              "set_property CONFIG_VOLTAGE 3.3 [current_design]",
              "set_property BITSTREAM.CONFIG.UNUSEDPIN PULLUP [current_design]"
             ]
-        self.toolchain.additional_commands = \
-            ["write_cfgmem -force -format bin -interface spix4 -size 16 "
-             "-loadbit \"up 0x0 {build_name}.bit\" -file {build_name}.bin"]
         self.add_platform_command("set_property INTERNAL_VREF 0.675 [get_iobanks 34]")
         self.add_platform_command("set_property INTERNAL_VREF 0.675 [get_iobanks 35]")
 
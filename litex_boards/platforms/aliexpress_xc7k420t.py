@@ -8,6 +8,8 @@ from litex.build.generic_platform import *
 from litex.build.xilinx import Xilinx7SeriesPlatform, VivadoProgrammer
 from litex.build.openocd import OpenOCD
 
+from litex_boards.tools.xilinx_config import XilinxConfigProfile, XilinxConfigPlatform
+
 # IOs ----------------------------------------------------------------------------------------------
 
 _io = [
@@ -83,9 +85,10 @@ _connectors = [
 
 # Platform -----------------------------------------------------------------------------------------
 
-class Platform(Xilinx7SeriesPlatform):
+class Platform(XilinxConfigPlatform, Xilinx7SeriesPlatform):
     default_clk_name   = "clk100"
     default_clk_period = 1e9/100e6
+    config_profile     = XilinxConfigProfile(fast_spi_width=4)
 
     def __init__(self, toolchain="vivado"):
         Xilinx7SeriesPlatform.__init__(self, "xc7k420tl-ffg901", _io, toolchain=toolchain)
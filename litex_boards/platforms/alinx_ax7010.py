@@ -7,6 +7,8 @@
 from litex.build.generic_platform import *
 from litex.build.xilinx import Xilinx7SeriesPlatform, VivadoProgrammer
 
+from litex_boards.tools.xilinx_config import XilinxConfigPlatform
+
 # IOs ----------------------------------------------------------------------------------------------
 
 _io = [
@@ -82,7 +84,7 @@ _usb_uart_pmod_io = [
 
 # Platform -----------------------------------------------------------------------------------------
 
-class Platform(Xilinx7SeriesPlatform):
+class Platform(XilinxConfigPlatform, Xilinx7SeriesPlatform):
     default_clk_name   = "clk100"
     default_clk_period = 1e9/100e6
 
@@ -8,6 +8,8 @@ from litex.build.generic_platform import *
 from litex.build.xilinx import XilinxUSPPlatform
 from litex.build.openfpgaloader import OpenFPGALoader
 
+from litex_boards.tools.xilinx_config import XilinxConfigProfile, XilinxConfigPlatform
+
 # IOs ----------------------------------------------------------------------------------------------
 
 _io = [
@@ -279,9 +281,10 @@ _connectors = [
 
 # Platform -----------------------------------------------------------------------------------------
 
-class Platform(XilinxUSPPlatform):
+class Platform(XilinxConfigPlatform, XilinxUSPPlatform):
     default_clk_name   = "clk200"
     default_clk_period = 1e9/200e6
+    config_profile     = XilinxConfigProfile(fast_spi_width=4)
 
     def __init__(self, toolchain="vivado"):
         XilinxUSPPlatform.__init__(self, "xcau15p-ffvb676-2-i", _io, _connectors, toolchain=toolchain)
@@ -8,6 +8,8 @@ from litex.build.generic_platform import *
 from litex.build.xilinx import XilinxUSPPlatform
 from litex.build.openfpgaloader import OpenFPGALoader
 
+from litex_boards.tools.xilinx_config import XilinxConfigPlatform
+
 # IOs ----------------------------------------------------------------------------------------------
 
 _io = [
@@ -161,7 +163,7 @@ psu_config = {
 
 # Platform -----------------------------------------------------------------------------------------
 
-class Platform(XilinxUSPPlatform):
+class Platform(XilinxConfigPlatform, XilinxUSPPlatform):
     default_clk_name   = "clk25"
     default_clk_period = 1e9/25e6
 
@@ -2,6 +2,8 @@ from litex.build.generic_platform import *
 from litex.build.xilinx import Xilinx7SeriesPlatform
 from litex.build.openocd import OpenOCD
 
+from litex_boards.tools.xilinx_config import XilinxConfigProfile, XilinxConfigPlatform
+
 # IOs ----------------------------------------------------------------------------------------------
 
 _io = [
@@ -118,9 +120,10 @@ _io = [
 
 # Platform -----------------------------------------------------------------------------------------
 
-class Platform(Xilinx7SeriesPlatform):
+class Platform(XilinxConfigPlatform, Xilinx7SeriesPlatform):
     default_clk_name   = "clk100"
     default_clk_period = 1e9/100e6
+    config_profile     = XilinxConfigProfile()
 
     def __init__(self, device="xc7a100tfgg484-1", toolchain="vivado"):
         Xilinx7SeriesPlatform.__init__(self, device, _io, toolchain=toolchain)
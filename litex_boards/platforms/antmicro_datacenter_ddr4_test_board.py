@@ -8,6 +8,8 @@ from litex.build.generic_platform import *
 from litex.build.xilinx import Xilinx7SeriesPlatform
 from litex.build.openocd import OpenOCD
 
+from litex_boards.tools.xilinx_config import XilinxConfigProfile, XilinxConfigPlatform
+
 # IOs ----------------------------------------------------------------------------------------------
 
 _io = [
@@ -137,17 +139,13 @@ _io = [
 
 # Platform -----------------------------------------------------------------------------------------
 
-class Platform(Xilinx7SeriesPlatform):
+class Platform(XilinxConfigPlatform, Xilinx7SeriesPlatform):
     default_clk_name   = "clk100"
     default_clk_period = 1e9/100e6
+    config_profile     = XilinxConfigProfile(spi_width=4, flash_size=16)
 
     def __init__(self, device="xc7k160tffg676-1", toolchain="vivado"):
         Xilinx7SeriesPlatform.__init__(self, device, _io, toolchain=toolchain)
-        self.toolchain.bitstream_commands = \
-            ["set_property BITSTREAM.CONFIG.SPI_BUSWIDTH 4 [current_design]"]
-        self.toolchain.additional_commands = \
-            ["write_cfgmem -force -format bin -interface spix4 -size 16 "
-             "-loadbit \"up 0x0 {build_name}.bit\" -file {build_name}.bin"]
         self.add_platform_command("set_property INTERNAL_VREF 0.6 [get_iobanks 32]")
         self.add_platform_command("set_property INTERNAL_VREF 0.6 [get_iobanks 33]")
         self.add_platform_command("set_property INTERNAL_VREF 0.6 [get_iobanks 34]")
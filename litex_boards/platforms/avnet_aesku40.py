@@ -7,6 +7,8 @@
 from litex.build.generic_platform import *
 from litex.build.xilinx import XilinxUSPlatform, VivadoProgrammer
 
+from litex_boards.tools.xilinx_config import XilinxConfigProfile, XilinxConfigPlatform
+
 # IOs ----------------------------------------------------------------------------------------------
 
 _io = [
@@ -182,9 +184,10 @@ _numato_sdcard_pmod_io = numato_sdcard_pmod_io("pmod0") # SDCARD PMOD on JD.
 
 # Platform -----------------------------------------------------------------------------------------
 
-class Platform(XilinxUSPlatform):
+class Platform(XilinxConfigPlatform, XilinxUSPlatform):
     default_clk_name   = "clk250"
     default_clk_period = 1e9/250e6
+    config_profile     = XilinxConfigProfile()
 
     def __init__(self):
         XilinxUSPlatform.__init__(self, "xcku040-fbva676-1-c", _io, _connectors, toolchain="vivado")
@@ -21,6 +21,8 @@ from litex.build.generic_platform import *
 from litex.build.xilinx import Xilinx7SeriesPlatform
 from litex.build.openocd import OpenOCD
 
+from litex_boards.tools.xilinx_config import XilinxConfigProfile, XilinxConfigPlatform
+
 # IOs ----------------------------------------------------------------------------------------------
 
 _io = [
@@ -316,18 +318,13 @@ _connectors = [
 
 # Platform -----------------------------------------------------------------------------------------
 
-class Platform(Xilinx7SeriesPlatform):
+class Platform(XilinxConfigPlatform, Xilinx7SeriesPlatform):
     default_clk_name   = "clk125"
     default_clk_period = 1e9 / 125e6
+    config_profile     = XilinxConfigProfile(spi_width=4, flash_size=16)
 
     def __init__(self, toolchain="vivado"):
         Xilinx7SeriesPlatform.__init__(self, "xc7k160t-ffg676-2", _io, _connectors, toolchain=toolchain)
-        self.toolchain.bitstream_commands = [
-            "set_property BITSTREAM.CONFIG.SPI_BUSWIDTH 4 [current_design]"
-        ]
-        self.toolchain.additional_commands = [
-            "write_cfgmem -force -format bin -interface spix4 -size 16 -loadbit \"up 0x0 {build_name}.bit\" -file {build_name}.bin"
-        ]
 
         # from pin_map.csv: This is a frequency source, not a phase source, so having it enter on a non-CC pin is OK.
         self.add_platform_command("set_property CLOCK_DEDICATED_ROUTE FALSE [get_nets clk20_IBUF]")
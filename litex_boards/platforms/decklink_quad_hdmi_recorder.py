@@ -7,6 +7,8 @@
 from litex.build.generic_platform import *
 from litex.build.xilinx import XilinxUSPlatform, VivadoProgrammer
 
+from litex_boards.tools.xilinx_config import XilinxConfigProfile, XilinxConfigPlatform
+
 # IOs ----------------------------------------------------------------------------------------------
 
 _io = [
@@ -164,9 +166,10 @@ _io = [
 
 # Platform -----------------------------------------------------------------------------------------
 
-class Platform(XilinxUSPlatform):
+class Platform(XilinxConfigPlatform, XilinxUSPlatform):
     default_clk_name   = "clk200"
     default_clk_period = 1e9/200e6
+    config_profile     = XilinxConfigProfile()
 
     def __init__(self, toolchain="vivado"):
         XilinxUSPlatform.__init__(self, "xcku040-ffva1156-2-e", _io, toolchain=toolchain)
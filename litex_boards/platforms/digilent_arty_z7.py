@@ -4,6 +4,8 @@
 from litex.build.generic_platform import Pins, IOStandard, Subsignal
 from litex.build.xilinx import Xilinx7SeriesPlatform, VivadoProgrammer
 
+from litex_boards.tools.xilinx_config import XilinxConfigPlatform
+
 # IOs ----------------------------------------------------------------------------------------------
 
 _io = [
@@ -252,7 +254,7 @@ ps7_config = {
 
 # Platform -----------------------------------------------------------------------------------------
 
-class Platform(Xilinx7SeriesPlatform):
+class Platform(XilinxConfigPlatform, Xilinx7SeriesPlatform):
     default_clk_name   = "clk125"
     default_clk_period = 1e9/125e6
 
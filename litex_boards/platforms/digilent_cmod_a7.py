@@ -10,6 +10,8 @@ from litex.build.generic_platform import Pins, Subsignal, IOStandard, Misc
 from litex.build.xilinx import Xilinx7SeriesPlatform
 from litex.build.openocd import OpenOCD
 
+from litex_boards.tools.xilinx_config import XilinxConfigProfile, XilinxConfigPlatform
+
 # IOs ----------------------------------------------------------------------------------------------
 
 _io = [
@@ -78,9 +80,10 @@ _connectors = []
 
 # Platform -----------------------------------------------------------------------------------------
 
-class Platform(Xilinx7SeriesPlatform):
+class Platform(XilinxConfigPlatform, Xilinx7SeriesPlatform):
     default_clk_name   = "clk12"
     default_clk_period = 1e9/12e6
+    config_profile     = XilinxConfigProfile(fast_spi_width=4)
 
     def __init__(self, variant="a7-35", toolchain="vivado"):
         device = {
@@ -7,6 +7,8 @@
 from litex.build.generic_platform import *
 from litex.build.xilinx import XilinxUSPPlatform, VivadoProgrammer
 
+from litex_boards.tools.xilinx_config import XilinxConfigPlatform
+
 # IOs ----------------------------------------------------------------------------------------------
 
 _io = [
@@ -84,7 +86,7 @@ _connectors = []
 
 # Platform -----------------------------------------------------------------------------------------
 
-class Platform(XilinxUSPPlatform):
+class Platform(XilinxConfigPlatform, XilinxUSPPlatform):
     default_clk_name   = "clk100"
     default_clk_period = 1e9/100e6
 
@@ -10,6 +10,8 @@ from litex.build.generic_platform import *
 from litex.build.xilinx import Xilinx7SeriesPlatform
 from litex.build.openfpgaloader import OpenFPGALoader
 
+from litex_boards.tools.xilinx_config import XilinxConfigProfile, XilinxConfigPlatform
+
 # IOs ----------------------------------------------------------------------------------------------
 
 _io = [
@@ -175,9 +177,10 @@ _io = [
 
 # Platform -----------------------------------------------------------------------------------------
 
-class Platform(Xilinx7SeriesPlatform):
+class Platform(XilinxConfigPlatform, Xilinx7SeriesPlatform):
     default_clk_name   = "clk60"
     default_clk_period = 1e9/60e6
+    config_profile     = XilinxConfigProfile(spi_width=4, configrate=66, fall_edge=True, compress=True, flash_size=16)
 
     def __init__(self, variant="xc7a50t", toolchain="vivado"):
         assert variant in ["xc7a35t", "xc7a50t"]
@@ -190,18 +193,10 @@ class Platform(Xilinx7SeriesPlatform):
 
         self.toolchain.bitstream_commands = [
             "set_property BITSTREAM.CONFIG.UNUSEDPIN Pulldown [current_design]",
-            "set_property BITSTREAM.CONFIG.SPI_BUSWIDTH 4 [current_design]",
-            "set_property BITSTREAM.CONFIG.EXTMASTERCCLK_EN Disable [current_design]",
-            "set_property BITSTREAM.CONFIG.CONFIGRATE 66 [current_design]",
-            "set_property BITSTREAM.GENERAL.COMPRESS TRUE [current_design]",
-            "set_property BITSTREAM.CONFIG.SPI_FALL_EDGE YES [current_design]",
             "set_property CFGBVS VCCO [current_design]",
             "set_property CONFIG_VOLTAGE 3.3 [current_design]",
         ]
         self.toolchain.additional_commands = [
-            # Non-Multiboot SPI-Flash bitstream generation.
-            "write_cfgmem -force -format bin -interface spix4 -size 16 -loadbit \"up 0x0 {build_name}.bit\" -file {build_name}.bin",
-
             # Multiboot SPI-Flash Operational bitstream generation.
             "set_property BITSTREAM.CONFIG.TIMER_CFG 0x0001fbd0 [current_design]",
             "set_property BITSTREAM.CONFIG.CONFIGFALLBACK Enable [current_design]",
@@ -12,6 +12,8 @@ from litex.build.generic_platform import *
 from litex.build.xilinx import Xilinx7SeriesPlatform, VivadoProgrammer
 from litex.build.openocd import OpenOCD
 
+from litex_boards.tools.xilinx_config import XilinxConfigProfile, XilinxConfigPlatform
+
 # TODO:
 # - Add the TMDS lanes for the HDMI connector.
 # - Populate the SFPs.
@@ -246,18 +248,13 @@ break_off_pmod = [
 
 # Platform -----------------------------------------------------------------------------------------
 
-class Platform(Xilinx7SeriesPlatform):
+class Platform(XilinxConfigPlatform, Xilinx7SeriesPlatform):
     default_clk_name   = "clk20_vcxo"
     default_clk_period = 1e9/20e6
+    config_profile     = XilinxConfigProfile(spi_width=4, flash_size=16)
 
     def __init__(self, toolchain="vivado"):
         Xilinx7SeriesPlatform.__init__(self, "xc7a100t-2fgg484", _io, _connectors, toolchain=toolchain)
-        self.toolchain.bitstream_commands = [
-            "set_property BITSTREAM.CONFIG.SPI_BUSWIDTH 4 [current_design]"
-        ]
-        self.toolchain.additional_commands = [
-            "write_cfgmem -force -format bin -interface spix4 -size 16 -loadbit \"up 0x0 {build_name}.bit\" -file {build_name}.bin"
-        ]
         self.add_platform_command("set_property INTERNAL_VREF 0.675 [get_iobanks 35]")
         self.add_platform_command("set_property CFGBVS VCCO [current_design]")
         self.add_platform_command("set_property CONFIG_VOLTAGE 3.3 [current_design]")
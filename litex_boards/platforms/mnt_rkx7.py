@@ -9,6 +9,8 @@ from litex.build.generic_platform import *
 from litex.build.xilinx import Xilinx7SeriesPlatform
 from litex.build.openocd import OpenOCD
 
+from litex_boards.tools.xilinx_config import XilinxConfigProfile, XilinxConfigPlatform
+
 # IOs ----------------------------------------------------------------------------------------------
 
 _io = [
@@ -190,19 +192,15 @@ _connectors = []
 
 # Platform -----------------------------------------------------------------------------------------
 
-class Platform(Xilinx7SeriesPlatform):
+class Platform(XilinxConfigPlatform, Xilinx7SeriesPlatform):
     default_clk_name   = "clk100"
     default_clk_period = 1e9/100e6
+    # Bitstream compression, quad SPI and 50MHz rate for quick boot from SPI flash,
+    # see https://github.com/timvideos/litex-buildenv/issues/79
+    config_profile     = XilinxConfigProfile(spi_width=4, configrate=50, compress=True)
 
     def __init__(self, toolchain="vivado"):
         Xilinx7SeriesPlatform.__init__(self, "xc7k325t-ffg676-2", _io, _connectors, toolchain=toolchain)
-        # Enable bitstream compression, quad SPI and 50MHz rate for quick boot from SPI flash
-        # see https://github.com/timvideos/litex-buildenv/issues/79
-        self.toolchain.bitstream_commands = [
-            "set_property BITSTREAM.GENERAL.COMPRESS True [current_design]",
-            "set_property BITSTREAM.CONFIG.SPI_BUSWIDTH 4 [current_design]",
-            "set_property BITSTREAM.CONFIG.CONFIGRATE 50 [current_design]"
-        ]
 
     def create_programmer(self):
         return OpenOCD("openocd_xc7_ft2232.cfg", "bscan_spi_xc7a325t.bit")
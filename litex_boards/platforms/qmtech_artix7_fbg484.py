@@ -8,6 +8,8 @@ from litex.build.generic_platform import Pins, Subsignal, IOStandard, Misc
 from litex.build.xilinx import Xilinx7SeriesPlatform
 from litex.build.openocd import OpenOCD
 
+from litex_boards.tools.xilinx_config import XilinxConfigProfile, XilinxConfigPlatform
+
 # IOs ----------------------------------------------------------------------------------------------
 
 _io = [
@@ -136,10 +138,11 @@ _connectors = [
 
 # Platform -----------------------------------------------------------------------------------------
 
-class Platform(Xilinx7SeriesPlatform):
+class Platform(XilinxConfigPlatform, Xilinx7SeriesPlatform):
     default_clk_name   = "clk50"
     default_clk_period = 1e9/50e6
     kgates             = None
+    config_profile     = XilinxConfigProfile(spi_width=4, compress=True, flash_size=16)
 
     def __init__(self, kgates=200, toolchain="vivado", with_daughterboard=False):
         assert(kgates in [100, 200], "kgates can only be 100 or 200 representing a XC7A7100T, XC7TA200T")
@@ -162,12 +165,6 @@ class Platform(Xilinx7SeriesPlatform):
 
         Xilinx7SeriesPlatform.__init__(self, device, io, connectors, toolchain=toolchain)
 
-        self.toolchain.bitstream_commands = \
-            ["set_property BITSTREAM.CONFIG.SPI_BUSWIDTH 4 [current_design]",
-            "set_property BITSTREAM.GENERAL.COMPRESS TRUE [current_design]"]
-        self.toolchain.additional_commands = \
-            ["write_cfgmem -force -format bin -interface spix4 -size 16 "
-            "-loadbit \"up 0x0 {build_name}.bit\" -file {build_name}.bin"]
 
         self.add_platform_command("set_property INTERNAL_VREF 0.750 [get_iobanks 16]")
         self.add_platform_command("set_property CFGBVS VCCO [current_design]")
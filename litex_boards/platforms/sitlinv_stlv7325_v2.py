@@ -9,6 +9,8 @@ from litex.build.generic_platform import *
 from litex.build.xilinx import Xilinx7SeriesPlatform
 from litex.build.openocd import OpenOCD
 
+from litex_boards.tools.xilinx_config import XilinxConfigProfile, XilinxConfigPlatform
+
 # This board is available here:
 # https://www.aliexpress.com/item/1005001275162791.html
 
@@ -482,9 +484,10 @@ _connectors = [
 ]
 # Platform -----------------------------------------------------------------------------------------
 
-class Platform(Xilinx7SeriesPlatform):
+class Platform(XilinxConfigPlatform, Xilinx7SeriesPlatform):
     default_clk_name   = "clk200"
     default_clk_period = 1e9/200e6
+    config_profile     = XilinxConfigProfile(spi_width=4, compress=True, flash_size=16)
 
     def __init__(self, vccio="3.3V"):
         assert vccio in ["2.5V", "3.3V"]
@@ -492,10 +495,7 @@ class Platform(Xilinx7SeriesPlatform):
         self.add_platform_command("""
 set_property CFGBVS VCCO [current_design]
 set_property CONFIG_VOLTAGE %s [current_design]
-set_property BITSTREAM.GENERAL.COMPRESS TRUE [current_design]
 """ % vccio.replace("V", ""))
-        self.toolchain.bitstream_commands = ["set_property BITSTREAM.CONFIG.SPI_BUSWIDTH 4 [current_design]"]
-        self.toolchain.additional_commands = ["write_cfgmem -force -format bin -interface spix4 -size 16 -loadbit \"up 0x0 {build_name}.bit\" -file {build_name}.bin"]
 
     def create_programmer(self):
         return OpenOCD("openocd_xc7_ft4232.cfg", "bscan_spi_xc7a325t.bit")
@@ -10,6 +10,8 @@
 from litex.build.generic_platform import *
 from litex.build.xilinx import XilinxUSPPlatform, VivadoProgrammer
 
+from litex_boards.tools.xilinx_config import XilinxConfigProfile, XilinxConfigPlatform
+
 # IOs ----------------------------------------------------------------------------------------------
 
 _io = [
@@ -78,9 +80,10 @@ _io = [
 
 # Platform -----------------------------------------------------------------------------------------
 
-class Platform(XilinxUSPPlatform):
+class Platform(XilinxConfigPlatform, XilinxUSPPlatform):
     default_clk_name   = "clk200"
     default_clk_period = 1e9/200e6
+    config_profile     = XilinxConfigProfile(compress=True)
 
     def __init__(self, toolchain="vivado"):
         XilinxUSPPlatform.__init__(self, "xcvu33p-fsvh2104-2L-e", _io, toolchain=toolchain)
@@ -93,5 +96,3 @@ class Platform(XilinxUSPPlatform):
         self.add_period_constraint(self.lookup_request("clk200", loose=True), 1e9/200e6)
         # Shutdown on overheatng
         self.add_platform_command("set_property BITSTREAM.CONFIG.OVERTEMPSHUTDOWN ENABLE [current_design]")
-        # Reduce programming time
-        self.add_platform_command("set_property BITSTREAM.GENERAL.COMPRESS TRUE [current_design]")
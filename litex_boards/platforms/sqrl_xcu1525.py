@@ -8,6 +8,8 @@
 from litex.build.generic_platform import Pins, Subsignal, IOStandard, Misc
 from litex.build.xilinx import XilinxUSPPlatform, VivadoProgrammer
 
+from litex_boards.tools.xilinx_config import XilinxConfigProfile, XilinxConfigPlatform
+
 # IOs ----------------------------------------------------------------------------------------------
 
 _io = [
@@ -364,9 +366,10 @@ _connectors = []
 
 # Platform -----------------------------------------------------------------------------------------
 
-class Platform(XilinxUSPPlatform):
+class Platform(XilinxConfigPlatform, XilinxUSPPlatform):
     default_clk_name   = "clk300"
     default_clk_period = 1e9/300e6
+    config_profile     = XilinxConfigProfile(compress=True)
 
     def __init__(self, toolchain="vivado"):
         XilinxUSPPlatform.__init__(self, "xcvu9p-fsgd2104-2l-e", _io, _connectors, toolchain=toolchain)
@@ -380,9 +383,6 @@ class Platform(XilinxUSPPlatform):
         # For passively cooled boards, overheating is a significant risk if airflow isn't sufficient
         self.add_platform_command("set_property BITSTREAM.CONFIG.OVERTEMPSHUTDOWN ENABLE [current_design]")
 
-        # Reduce programming time
-        self.add_platform_command("set_property BITSTREAM.GENERAL.COMPRESS TRUE [current_design]")
-
         # DDR4 memory channel C0 Clock constraint / Internal Vref
         self.add_period_constraint(self.lookup_request("clk300", 0, loose=True), 1e9/300e6)
         self.add_platform_command("set_property INTERNAL_VREF 0.84 [get_iobanks 40]")
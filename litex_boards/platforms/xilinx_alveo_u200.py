@@ -12,6 +12,8 @@
 from litex.build.generic_platform import Pins, Subsignal, IOStandard, Misc
 from litex.build.xilinx import XilinxUSPPlatform, VivadoProgrammer
 
+from litex_boards.tools.xilinx_config import XilinxConfigProfile, XilinxConfigPlatform
+
 # IOs (initially auto-generated by extract_xdc_pins.py) ---------------------------------------------
 
 _io = [
@@ -329,9 +331,10 @@ _connectors = []
 
 # Platform -----------------------------------------------------------------------------------------
 
-class Platform(XilinxUSPPlatform):
+class Platform(XilinxConfigPlatform, XilinxUSPPlatform):
     default_clk_name   = "clk300"
     default_clk_period = 1e9/300e6
+    config_profile     = XilinxConfigProfile(compress=True)
 
     def __init__(self, toolchain="vivado"):
         XilinxUSPPlatform.__init__(self, "xcu200-fsgd2104-2-e", _io, _connectors, toolchain=toolchain)
@@ -347,8 +350,6 @@ class Platform(XilinxUSPPlatform):
         self.add_period_constraint(self.lookup_request("clk300", 3, loose=True), 1e9/300e6)
         # For passively cooled boards, overheating is a significant risk if airflow isn't sufficient
         self.add_platform_command("set_property BITSTREAM.CONFIG.OVERTEMPSHUTDOWN ENABLE [current_design]")
-        # Reduce programming time
-        self.add_platform_command("set_property BITSTREAM.GENERAL.COMPRESS TRUE [current_design]")
         # DDR4 memory channel C1 Internal Vref
         self.add_platform_command("set_property INTERNAL_VREF 0.84 [get_iobanks 40]")
         self.add_platform_command("set_property INTERNAL_VREF 0.84 [get_iobanks 41]")
@@ -17,6 +17,8 @@ from litex.build.generic_platform import *
 from litex.build.xilinx import Xilinx7SeriesPlatform
 from litex.build.openocd import OpenOCD
 
+from litex_boards.tools.xilinx_config import XilinxConfigProfile, XilinxConfigPlatform
+
 # IOs ----------------------------------------------------------------------------------------------
 
 _io = [
@@ -136,9 +138,10 @@ _connectors = [
 
 # Platform -----------------------------------------------------------------------------------------
 
-class Platform(Xilinx7SeriesPlatform):
+class Platform(XilinxConfigPlatform, Xilinx7SeriesPlatform):
     default_clk_name   = "clk48"
     default_clk_period = 1e9/48e6
+    config_profile     = XilinxConfigProfile(spi_width=2, configrate=66, compress=True)
 
     def __init__(self, variant="ztex2.13a", toolchain="vivado", expansion="debug"):
         device = {
@@ -156,9 +159,6 @@ class Platform(Xilinx7SeriesPlatform):
                 self.add_extension(_sbus_io)
         self.toolchain.bitstream_commands = \
             ["set_property BITSTREAM.CONFIG.SPI_32BIT_ADDR No [current_design]",
-             "set_property BITSTREAM.CONFIG.SPI_BUSWIDTH 2 [current_design]",
-             "set_property BITSTREAM.CONFIG.CONFIGRATE 66 [current_design]",
-             "set_property BITSTREAM.GENERAL.COMPRESS true [current_design]"
              ]
 
     def create_programmer(self):
@@ -23,6 +23,8 @@ from litex.soc.cores.led import LedChaser
 from litex.soc.cores.pwm import PWM
 from litex.soc.cores.xadc import ZynqUSPSystemMonitor
 
+from litex_boards.cores.telemetry import add_telemetry, add_fan_controller
+
 from litedram.modules import MT40A512M16
 from litedram.phy import usddrphy
 
@@ -64,6 +66,7 @@ class BaseSoC(SoCCore):
     def __init__(self, sys_clk_freq=150e6, ddram_channel=0,
         with_led_chaser = True,
         with_pcie       = False,
+        with_telemetry  = False,
         **kwargs):
         platform = adi_adrv2crr_fmc.Platform()
 
@@ -108,30 +111,43 @@ class BaseSoC(SoCCore):
         # Fan --------------------------------------------------------------------------------------
             # Full speed is _really_ loud and with this demo bitstream which is almost
             # empty, we can slow it way down and still keep the FPGA < 10C above ambient
+        fan_pads = platform.request("fan")
         self.fan = PWM(
+            with_csr       = not with_telemetry,
             default_enable =    1,
             default_period = 2500,
             default_width  =  500
         )
 
-        self.comb += platform.request("fan").pwm_n.eq(~self.fan.pwm)
+        self.comb += fan_pads.pwm_n.eq(~self.fan.pwm)
 
         # SYSMON -----------------------------------------------------------------------------------
         self.sysmon = ZynqUSPSystemMonitor()
 
+        # Telemetry --------------------------------------------------------------------------------
+        if with_telemetry:
+            # Fan speed regulated from the die temperature (default width up to 70°C).
+            fan_control = add_fan_controller(self, "fan_control", self.fan, self.sysmon, tach=fan_pads.tach)
+            add_telemetry(self, sysmon=self.sysmon, channels=[
+                ("fan_width", self.fan.width),
+                ("fan_tach",  fan_control.tach_rate),
+            ])
+
 # Build --------------------------------------------------------------------------------------------
 
 def main():
     from litex.build.parser import LiteXArgumentParser
     parser = LiteXArgumentParser(platform=adi_adrv2crr_fmc.Platform, description="LiteX SoC on ADI ADRV2CRR-FMC.")
-    parser.add_target_argument("--sys-clk-freq", default=150e6, type=float, help="System clock frequency.")
-    parser.add_target_argument("--with-pcie",    action="store_true",       help="Enable PCIe support.")
-    parser.add_target_argument("--driver",       action="store_true",       help="Generate PCIe driver.")
+    parser.add_target_argument("--sys-clk-freq",   default=150e6, type=float, help="System clock frequency.")
+    parser.add_target_argument("--with-pcie",      action="store_true",       help="Enable PCIe support.")
+    parser.add_target_argument("--driver",         action="store_true",       help="Generate PCIe driver.")
+    parser.add_target_argument("--with-telemetry", action="store_true",       help="Enable SysMon/fan telemetry history and closed-loop fan control.")
     args = parser.parse_args()
 
     soc = BaseSoC(
-        sys_clk_freq = args.sys_clk_freq,
-        with_pcie    = args.with_pcie,
+        sys_clk_freq   = args.sys_clk_freq,
+        with_pcie      = args.with_pcie,
+        with_telemetry = args.with_telemetry,
         **parser.soc_argdict
     )
 
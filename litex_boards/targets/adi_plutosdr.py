@@ -10,6 +10,8 @@
 # ./adi_plutosdr.py --build --load
 # litex_server --jtag --jtag-config=openocd_xc7_ft232.cfg
 # litex_term crossover
+# With --bone-block (SDRAM/LiteScope dumps):
+# python3 -m litex_boards.tools.bone_block --jtag --jtag-config=openocd_xc7_ft232.cfg bench
 
 from migen import *
 
@@ -22,6 +24,8 @@ from litex.soc.integration.builder import *
 
 from litex.soc.cores.clock import *
 
+from litex_boards.cores.bone_block import add_jtagbone_block
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(LiteXModule):
@@ -57,7 +61,7 @@ class _CRG(LiteXModule):
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=100e6, **kwargs):
+    def __init__(self, sys_clk_freq=100e6, bone_block=False, **kwargs):
         platform = adi_plutosdr.Platform()
 
         # CRG --------------------------------------------------------------------------------------
@@ -65,9 +69,13 @@ class BaseSoC(SoCCore):
 
         # SoCCore ----------------------------------------------------------------------------------
         kwargs["uart_name"]     = "crossover"
-        kwargs["with_jtagbone"] = True
+        kwargs["with_jtagbone"] = not bone_block
         SoCCore.__init__(self, platform, sys_clk_freq, ident="LiteX SoC on Pluto SDR", **kwargs)
 
+        # JTAGBone (Block-Transfer) ----------------------------------------------------------------
+        if bone_block:
+            add_jtagbone_block(self)
+
         # GPIOS ------------------------------------------------------------------------------------
         self.comb += platform.request("gpio", 0).eq(ClockSignal("sys"))
 
@@ -76,11 +84,13 @@ class BaseSoC(SoCCore):
 def main():
     from litex.build.parser import LiteXArgumentParser
     parser = LiteXArgumentParser(platform=adi_plutosdr.Platform, description="LiteX SoC on Pluto SDR")
-    parser.add_target_argument("--sys-clk-freq", default=100e6, type=float, help="System clock frequency.")
+    parser.add_target_argument("--sys-clk-freq", default=100e6, type=float,   help="System clock frequency.")
+    parser.add_target_argument("--bone-block",   action="store_true",         help="Use JTAGBone with block-transfer mode (litex_boards.tools.bone_block).")
     args = parser.parse_args()
 
     soc = BaseSoC(
         sys_clk_freq = args.sys_clk_freq,
+        bone_block   = args.bone_block,
         **parser.soc_argdict
     )
     builder = Builder(soc, **parser.builder_argdict)
@@ -27,6 +27,8 @@ from liteeth.phy.usrgmii import LiteEthPHYRGMII
 from litepcie.phy.usppciephy import USPPCIEPHY
 from litepcie.software import generate_litepcie_software
 
+from litex_boards.cores.sdcard import add_sdcard
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(LiteXModule):
@@ -56,13 +58,14 @@ class _CRG(LiteXModule):
 
 class BaseSoC(SoCCore):
     def __init__(self, sys_clk_freq=int(125e6),
-        with_ethernet   = False,
-        with_etherbone  = False,
-        eth_ip          = "192.168.1.50",
-        remote_ip       = None,
-        with_led_chaser = True,
-        with_pcie       = False, pcie_speed="gen3",
-        with_sdcard     = False,
+        with_ethernet     = False,
+        with_etherbone    = False,
+        eth_ip            = "192.168.1.50",
+        remote_ip         = None,
+        with_led_chaser   = True,
+        with_pcie         = False, pcie_speed="gen3",
+        with_sdcard       = False,
+        sdcard_high_speed = False,
         **kwargs):
         platform = alinx_axau15.Platform()
 
@@ -119,7 +122,10 @@ class BaseSoC(SoCCore):
 
         # SD Card ----------------------------------------------------------------------------------
         if with_sdcard:
-            self.add_sdcard()
+            if sdcard_high_speed:
+                add_sdcard(self, clk_freq=50e6) # On-board slot.
+            else:
+                self.add_sdcard()
 
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
@@ -143,20 +149,22 @@ def main():
     parser.add_target_argument("--pcie-speed",     default="gen3",           help="PCIe speed.", choices=["gen3", "gen4"])
     parser.add_target_argument("--driver",         action="store_true",      help="Generate PCIe driver.")
     parser.add_target_argument("--with-sdcard",    action="store_true",      help="Add SDCard.")
+    parser.add_target_argument("--sdcard-high-speed", action="store_true",   help="SDCard High-Speed clock (50MHz) and DMA counters for sdcard_bench only, BIOS/boot stays at 25MHz (with --with-sdcard).")
     args = parser.parse_args()
 
     assert not (args.with_etherbone and args.eth_dynamic_ip)
 
     soc = BaseSoC(
-        sys_clk_freq   = args.sys_clk_freq,
-        with_ethernet  = args.with_ethernet,
-        with_etherbone = args.with_etherbone,
-        eth_ip         = args.eth_ip,
-        remote_ip      = args.remote_ip,
-        eth_dynamic_ip = args.eth_dynamic_ip,
-        with_pcie      = args.with_pcie,
-        pcie_speed     = args.pcie_speed,
-        with_sdcard    = args.with_sdcard,
+        sys_clk_freq      = args.sys_clk_freq,
+        with_ethernet     = args.with_ethernet,
+        with_etherbone    = args.with_etherbone,
+        eth_ip            = args.eth_ip,
+        remote_ip         = args.remote_ip,
+        eth_dynamic_ip    = args.eth_dynamic_ip,
+        with_pcie         = args.with_pcie,
+        pcie_speed        = args.pcie_speed,
+        with_sdcard       = args.with_sdcard,
+        sdcard_high_speed = args.sdcard_high_speed,
         **parser.soc_argdict
 	)
 
@@ -10,6 +10,10 @@
 
 # ./analog_pocket.py --sdram-rate=1:2 --uart-name=jtag_uart --build --load
 # litex_term jtag --jtag-config=openocd_usb_blaster.cfg
+#
+# Triple-buffered video at 400x360 (Integer 4x scaling by the Pocket's scaler to the 1600x1440 screen,
+# the scaler mode has to be declared in the core's video.json), buffers in the cartridge SDRAM:
+# ./analog_pocket.py --sdram-rate=1:2 --with-video-triple-buffer --video-timings=400x360@60Hz --build
 
 from migen import *
 
@@ -23,14 +27,37 @@ from litex.soc.integration.builder import *
 from litex.build.io import DDROutput
 
 from litex.soc.cores.clock import CycloneVPLL
+from litex.soc.cores.video import video_timings
 
 from litedram.modules import AS4C32M16
 from litedram.phy import GENSDRPHY, HalfRateGENSDRPHY
 
+# Video Timings ------------------------------------------------------------------------------------
+
+pocket_video_timings = {
+    # VGA timings at 25MHz as before --video-timings (25.175MHz would move sys_clk off 50MHz).
+    "640x480@60Hz" : {**video_timings["640x480@60Hz"], "pix_clk": 25e6},
+    # 1/4 of the Pocket's 1600x1440 screen, pixel clock derived from clk74a (74.25MHz/6).
+    "400x360@60Hz" : {
+        "pix_clk"       : 12.375e6,
+        "h_active"      : 400,
+        "h_blanking"    : 128,
+        "h_sync_offset" : 16,
+        "h_sync_width"  : 32,
+        "v_active"      : 360,
+        "v_blanking"    : 30,
+        "v_sync_offset" : 2,
+        "v_sync_width"  : 4,
+    },
+}
+
+def get_video_timings(timings):
+    return pocket_video_timings.get(timings, None) or video_timings[timings]
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(LiteXModule):
-    def __init__(self, platform, sys_clk_freq, sdram_rate="1:1"):
+    def __init__(self, platform, sys_clk_freq, sdram_rate="1:1", video_pix_clk=25e6):
         self.rst         = Signal()
         self.cd_sys      = ClockDomain()
         self.cd_video    = ClockDomain()
@@ -56,8 +83,9 @@ class _CRG(LiteXModule):
             pll.create_clkout(self.cd_sys2x_ps, 2*sys_clk_freq, phase=180)  # Idealy 90° but needs to be increased.
         else:
             pll.create_clkout(self.cd_sys_ps, sys_clk_freq, phase=90)
-        pll.create_clkout(self.cd_video,    25e6)
-        pll.create_clkout(self.cd_video_90, 25e6, phase=90)
+        # Video clocks have to be generated at the pixel clock of the timings (0.1% margin).
+        pll.create_clkout(self.cd_video,    video_pix_clk, margin=1e-3)
+        pll.create_clkout(self.cd_video_90, video_pix_clk, phase=90, margin=1e-3)
 
         # SDRAM clock
         sdram_clk = ClockSignal("sys2x_ps" if sdram_rate == "1:2" else "sys_ps")
@@ -67,14 +95,17 @@ class _CRG(LiteXModule):
 
 class BaseSoC(SoCCore):
     def __init__(self, sys_clk_freq=50e6, sdram_rate="1:1",
-        with_video_terminal    = False,
-        with_video_framebuffer = False,
-        with_video_colorbars   = False,
+        with_video_terminal      = False,
+        with_video_framebuffer   = False,
+        with_video_colorbars     = False,
+        with_video_triple_buffer = False,
+        video_timings            = "640x480@60Hz",
         **kwargs):
         platform = analog_pocket.Platform()
+        vt       = get_video_timings(video_timings)
 
         # CRG --------------------------------------------------------------------------------------
-        self.crg = _CRG(platform, sys_clk_freq, sdram_rate)
+        self.crg = _CRG(platform, sys_clk_freq, sdram_rate, video_pix_clk=vt["pix_clk"])
 
         # SoCCore ----------------------------------------------------------------------------------
         SoCCore.__init__(self, platform, sys_clk_freq, ident="LiteX SoC on Analog Pocket", **kwargs)
@@ -91,7 +122,7 @@ class BaseSoC(SoCCore):
 
         # Video ------------------------------------------------------------------------------------
 
-        if with_video_colorbars or with_video_framebuffer or with_video_terminal:
+        if with_video_colorbars or with_video_framebuffer or with_video_terminal or with_video_triple_buffer:
 
             from litex.soc.interconnect import stream
             from litex.soc.cores.video import video_data_layout
@@ -130,12 +161,69 @@ class BaseSoC(SoCCore):
                         )
 
             self.videophy = VideoDDRPHY(platform.request("video"), clock_domain="video")
+            timings = (video_timings, vt)
             if with_video_colorbars:
-                self.add_video_colorbars(phy=self.videophy, timings="640x480@60Hz", clock_domain="video")
+                self.add_video_colorbars(phy=self.videophy, timings=timings, clock_domain="video")
             if with_video_terminal:
-                self.add_video_terminal(phy=self.videophy, timings="640x480@60Hz", clock_domain="video")
+                self.add_video_terminal(phy=self.videophy, timings=timings, clock_domain="video")
             if with_video_framebuffer:
-                self.add_video_framebuffer(phy=self.videophy, timings="640x480@60Hz", clock_domain="video")
+                self.add_video_framebuffer(phy=self.videophy, timings=timings, clock_domain="video")
+            if with_video_triple_buffer:
+                self.add_video_triple_buffer(phy=self.videophy, timings=timings, clock_domain="video")
+
+    def add_video_triple_buffer(self, name="video_framebuffer", phy=None, timings=None, clock_domain="sys", format="rgb565"):
+        """Triple-buffered video framebuffer in the cartridge SDRAM.
+
+        The buffers are not in the CRAM PSRAMs (cram0/cram1, only declared in the platform's
+        "analog" IO set): they are address/data multiplexed and, in asynchronous mode, each 16-bit
+        access pays the full 70ns access time after the address phase (~13MB/s at 50MHz sys_clk),
+        below the 17.3MB/s of 400x360@60Hz RGB565 before any CPU rendering. Their synchronous
+        burst mode would be needed and is not supported by a LiteX controller. The SDRAM gives
+        100/200MB/s (1:1/1:2 rate) to share between the CPU and the video DMA.
+        """
+        from litex.soc.integration.soc import SoCRegion
+        from litex.soc.cores.video import VideoTimingGenerator
+        from litex_boards.cores.video import VideoTripleBuffer
+
+        # Video Timing Generator.
+        vtg = VideoTimingGenerator(default_video_timings=timings[1])
+        vtg = ClockDomainsRenamer(clock_domain)(vtg)
+        self.add_module(name=f"{name}_vtg", module=vtg)
+
+        # Video Triple Buffer (Bursts of 64 port words, aligned and always within an SDRAM row so
+        # that a burst only pays one activate).
+        self.bus.add_region(name, SoCRegion(
+            origin = self.mem_map.get(name, 0x40c00000),
+            size   = 0x800000,
+            linker = True)
+        )
+        base         = self.bus.regions[name].origin
+        port         = self.sdram.crossbar.get_port()
+        geom         = self.sdram.controller.settings.geom
+        row_words    = 2**geom.colbits*self.sdram.controller.settings.phy.dfi_databits//port.data_width
+        burst_length = 64
+        assert row_words % burst_length == 0
+        vfb = VideoTripleBuffer(port,
+            hres         = vtg.video_timings["h_active"],
+            vres         = vtg.video_timings["v_active"],
+            base         = base,
+            format       = format,
+            clock_domain = clock_domain,
+            burst_length = burst_length,
+        )
+        assert 3*vfb.frame_size <= self.bus.regions[name].size
+        self.add_module(name=name, module=vfb)
+
+        # Connect Video Timing Generator to Video Triple Buffer and Video PHY.
+        self.comb += vtg.source.connect(vfb.vtg_sink)
+        self.comb += vfb.source.connect(phy.sink)
+
+        # Constants.
+        self.add_constant("VIDEO_FRAMEBUFFER_BASE",  base)
+        self.add_constant("VIDEO_FRAMEBUFFER_HRES",  vtg.video_timings["h_active"])
+        self.add_constant("VIDEO_FRAMEBUFFER_VRES",  vtg.video_timings["v_active"])
+        self.add_constant("VIDEO_FRAMEBUFFER_DEPTH", vfb.depth)
+        self.add_constant("VIDEO_FRAMEBUFFER_TRIPLE_BUFFER")
 
 # Build --------------------------------------------------------------------------------------------
 
@@ -145,17 +233,21 @@ def main():
     parser.add_target_argument("--sys-clk-freq", default=50e6, type=float, help="System clock frequency.")
     parser.add_target_argument("--sdram-rate",   default="1:1",            help="SDRAM Rate (1:1 Full Rate or 1:2 Half Rate).")
     viopts = parser.target_group.add_mutually_exclusive_group()
-    viopts.add_argument("--with-video-terminal",    action="store_true", help="Enable Video Terminal.")
-    viopts.add_argument("--with-video-framebuffer", action="store_true", help="Enable Video Framebuffer.")
-    viopts.add_argument("--with-video-colorbars",   action="store_true", help="Enable Video Colorbars.")
+    viopts.add_argument("--with-video-terminal",      action="store_true", help="Enable Video Terminal.")
+    viopts.add_argument("--with-video-framebuffer",   action="store_true", help="Enable Video Framebuffer.")
+    viopts.add_argument("--with-video-colorbars",     action="store_true", help="Enable Video Colorbars.")
+    viopts.add_argument("--with-video-triple-buffer", action="store_true", help="Enable Video Triple-Buffered FrameBuffer (SDRAM).")
+    parser.add_target_argument("--video-timings", default="640x480@60Hz", help="Video Timings (ex 640x480@60Hz or Pocket 400x360@60Hz).")
     args = parser.parse_args()
 
     soc = BaseSoC(
-        sys_clk_freq           = args.sys_clk_freq,
-        sdram_rate             = args.sdram_rate,
-        with_video_terminal    = args.with_video_terminal,
-        with_video_framebuffer = args.with_video_framebuffer,
-        with_video_colorbars   = args.with_video_colorbars,
+        sys_clk_freq             = args.sys_clk_freq,
+        sdram_rate               = args.sdram_rate,
+        with_video_terminal      = args.with_video_terminal,
+        with_video_framebuffer   = args.with_video_framebuffer,
+        with_video_colorbars     = args.with_video_colorbars,
+        with_video_triple_buffer = args.with_video_triple_buffer,
+        video_timings            = args.video_timings,
         **parser.soc_argdict
     )
     builder = Builder(soc, **parser.builder_argdict)
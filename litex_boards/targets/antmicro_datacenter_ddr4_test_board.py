@@ -20,7 +20,8 @@ from litex.soc.integration.soc_core import *
 from litex.soc.integration.soc import SoCRegion
 from litex.soc.integration.builder import *
 from litex.soc.cores.led import LedChaser
-from litex.soc.cores.bitbang import I2CMaster
+from litex_boards.cores.i2c_controller import add_i2c
+from litex_boards.cores.sdcard import add_sdcard
 from litex.soc.cores.video import VideoS7HDMIPHY
 
 from litedram.modules import MTA18ASF2G72PZ
@@ -28,6 +29,7 @@ from litedram.phy.s7ddrphy import A7DDRPHY
 from litedram.init import get_sdram_phy_py_header
 from litedram.core.controller import ControllerSettings
 from litedram.common import PhySettings, GeomSettings, TimingSettings
+from litex_boards.tools.spd_db import get_sdram_module
 
 from liteeth.phy import LiteEthS7PHYRGMII
 from litex.soc.cores.hyperbus import HyperRAM
@@ -85,10 +87,14 @@ class BaseSoC(SoCCore):
             eth_dynamic_ip         = False,
             with_hyperram          = False,
             with_sdcard            = False,
+            sdcard_high_speed      = False,
             with_spi_flash         = False,
             with_led_chaser        = True,
             with_video_terminal    = False,
             with_video_framebuffer = False,
+            spd_dump               = None,
+            spd_db                 = None,
+            i2c_controller         = "bitbang",
             **kwargs):
         platform = antmicro_datacenter_ddr4_test_board.Platform()
 
@@ -109,7 +115,7 @@ class BaseSoC(SoCCore):
             )
             self.add_sdram("sdram",
                 phy                     = self.ddrphy,
-                module                  = MTA18ASF2G72PZ(sys_clk_freq, "1:4"),
+                module                  = get_sdram_module(MTA18ASF2G72PZ(sys_clk_freq, "1:4"), sys_clk_freq, spd_dump, spd_db),
                 l2_cache_size           = kwargs.get("l2_size", 8192),
                 l2_cache_min_data_width = 256,
                 size                    = 0x40000000,
@@ -122,7 +128,10 @@ class BaseSoC(SoCCore):
 
         # SD Card ----------------------------------------------------------------------------------
         if with_sdcard:
-            self.add_sdcard()
+            if sdcard_high_speed:
+                add_sdcard(self, clk_freq=50e6) # On-board slot.
+            else:
+                self.add_sdcard()
 
         # Ethernet / Etherbone ---------------------------------------------------------------------
         if with_ethernet or with_etherbone:
@@ -160,7 +169,7 @@ class BaseSoC(SoCCore):
 
         # System I2C (behing multiplexer) ----------------------------------------------------------
         i2c_pads = platform.request('i2c')
-        self.i2c = I2CMaster(i2c_pads)
+        add_i2c(self, "i2c", i2c_pads, controller=i2c_controller)
 
     def generate_sdram_phy_py_header(self, output_file):
         os.makedirs(os.path.dirname(output_file), exist_ok=True)
@@ -199,9 +208,13 @@ def main():
     parser.add_target_argument("--eth-reset-time",         default="10e-3",        help="Duration of Ethernet PHY reset.")
     parser.add_target_argument("--with-hyperram",          action="store_true",    help="Add HyperRAM.")
     parser.add_target_argument("--with-sdcard",            action="store_true",    help="Add SDCard.")
+    parser.add_target_argument("--sdcard-high-speed",      action="store_true",    help="SDCard High-Speed clock (50MHz) and DMA counters for sdcard_bench only, BIOS/boot stays at 25MHz (with --with-sdcard).")
     parser.add_target_argument("--with-video-terminal",    action="store_true",    help="Enable Video Terminal (HDMI).")
     parser.add_target_argument("--with-video-framebuffer", action="store_true",    help="Enable Video Framebuffer (HDMI).")
     parser.add_target_argument("--with-spi-flash",         action="store_true",    help="Enable SPI Flash (MMAPed).")
+    parser.add_target_argument("--spd-dump",                                       help="DIMM SPD dump (LiteX BIOS spdread output or binary), replaces the default SDRAM module.")
+    parser.add_target_argument("--spd-db",                                         help="DIMM from the SPD library (see litex_boards.tools.spd_db), replaces the default SDRAM module.")
+    parser.add_target_argument("--i2c-controller",                                 default="bitbang", choices=["bitbang", "hardware"], help="I2C controller: bitbang (BIOS I2C/SPD support) or hardware (command FIFO/scripts, IRQs).")
     args = parser.parse_args()
 
     assert not (args.with_etherbone and args.eth_dynamic_ip)
@@ -215,9 +228,13 @@ def main():
         eth_dynamic_ip         = args.eth_dynamic_ip,
         with_hyperram          = args.with_hyperram,
         with_sdcard            = args.with_sdcard,
+        sdcard_high_speed      = args.sdcard_high_speed,
         with_spi_flash         = args.with_spi_flash,
         with_video_terminal    = args.with_video_terminal,
         with_video_framebuffer = args.with_video_framebuffer,
+        spd_dump               = args.spd_dump,
+        spd_db                 = args.spd_db,
+        i2c_controller         = args.i2c_controller,
         **parser.soc_argdict)
     builder = Builder(soc, **parser.builder_argdict)
     if args.build:
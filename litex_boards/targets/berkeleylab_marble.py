@@ -34,10 +34,11 @@ from litex.soc.cores.clock import *
 from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
 from litex.soc.cores.led import LedChaser
-from litex.soc.cores.bitbang import I2CMaster
+from litex_boards.cores.i2c_controller import add_i2c
 
-from litedram.modules import MT8JTF12864, parse_spd_hexdump, SDRAMModule
+from litedram.modules import MT8JTF12864
 from litedram.phy import s7ddrphy
+from litex_boards.tools.spd_db import get_sdram_module
 
 from liteeth.phy.s7rgmii import LiteEthPHYRGMII
 
@@ -75,6 +76,8 @@ class BaseSoC(SoCCore):
         with_rts_reset  = False,
         with_led_chaser = True,
         spd_dump        = None,
+        spd_db          = None,
+        i2c_controller  = "bitbang",
         **kwargs):
         platform = berkeleylab_marble.Platform()
 
@@ -97,18 +100,10 @@ class BaseSoC(SoCCore):
                 sys_clk_freq = sys_clk_freq
             )
 
-            if spd_dump is not None:
-                ram_spd = parse_spd_hexdump(spd_dump)
-                ram_module = SDRAMModule.from_spd_data(ram_spd, sys_clk_freq)
-                print('DDR3: loaded config from', spd_dump)
-            else:
-                ram_module = MT8JTF12864(sys_clk_freq, "1:4")  # KC705 chip, 1 GB
-                print('DDR3: No spd data specified, falling back to MT8JTF12864')
-
             self.add_sdram("sdram",
-                phy    = self.ddrphy,
-                module = ram_module,
-                # size=0x40000000,  # Limit its size to 1 GB
+                phy           = self.ddrphy,
+                module        = get_sdram_module(MT8JTF12864(sys_clk_freq, "1:4"), sys_clk_freq, spd_dump, spd_db),
+                size          = 0x40000000, # Limit its size to 1 GB.
                 l2_cache_size = kwargs.get("l2_size", 8192),
                 with_bist     = kwargs.get("with_bist", False)
             )
@@ -133,7 +128,7 @@ class BaseSoC(SoCCore):
 
         # System I2C (behing multiplexer) ----------------------------------------------------------
         i2c_pads = platform.request('i2c_fpga')
-        self.i2c = I2CMaster(i2c_pads)
+        add_i2c(self, "i2c", i2c_pads, controller=i2c_controller)
 
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
@@ -151,7 +146,9 @@ def main():
     parser.add_target_argument("--with-etherbone", action="store_true",       help="Enable Etherbone support.")
     parser.add_target_argument("--with-rts-reset", action="store_true",       help="Connect UART RTS line to sys_clk reset.")
     parser.add_target_argument("--with-bist",      action="store_true",       help="Add DDR3 BIST Generator/Checker.")
-    parser.add_target_argument("--spd-dump",                                  help="DDR3 configuration file, dumped using the `spdread` command in LiteX BIOS.")
+    parser.add_target_argument("--spd-dump",                                  help="DIMM SPD dump (LiteX BIOS spdread output or binary), replaces the default SDRAM module.")
+    parser.add_target_argument("--spd-db",                                    help="DIMM from the SPD library (see litex_boards.tools.spd_db), replaces the default SDRAM module.")
+    parser.add_target_argument("--i2c-controller",                            default="bitbang", choices=["bitbang", "hardware"], help="I2C controller: bitbang (BIOS I2C/SPD support) or hardware (command FIFO/scripts, IRQs).")
     args = parser.parse_args()
 
     soc = BaseSoC(
@@ -160,6 +157,8 @@ def main():
         with_etherbone = args.with_etherbone,
         with_bist      = args.with_bist,
         spd_dump       = args.spd_dump,
+        spd_db         = args.spd_db,
+        i2c_controller = args.i2c_controller,
         **parser.soc_argdict
     )
     builder = Builder(soc, **parser.builder_argdict)
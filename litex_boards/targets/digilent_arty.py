@@ -27,6 +27,11 @@ from litex.soc.cores.gpio import GPIOIn, GPIOTristate
 from litex.soc.cores.xadc import XADC
 from litex.soc.cores.dna  import DNA
 
+from litex_boards.cores.telemetry import add_telemetry
+from litex_boards.cores.sdcard import add_sdcard
+from litex_boards.cores.l2_stats import add_l2_stats
+from litex_boards.tools.board_sim import add_board_sim_arguments, run_board_sim
+
 from litedram.modules import MT41K128M16
 from litedram.phy import s7ddrphy
 
@@ -72,6 +77,7 @@ class _CRG(LiteXModule):
 class BaseSoC(SoCCore):
     def __init__(self, variant="a7-35", toolchain="vivado", sys_clk_freq=100e6,
         with_xadc       = False,
+        with_telemetry  = False,
         with_dna        = False,
         with_ethernet   = False,
         with_etherbone  = False,
@@ -84,6 +90,9 @@ class BaseSoC(SoCCore):
         with_buttons    = False,
         with_pmod_gpio  = False,
         with_can        = False,
+        with_can_dma    = False,
+        with_l2_stats   = False,
+        l2_stats_trace_depth = 4096,
         **kwargs):
         platform = digilent_arty.Platform(variant=variant, toolchain=toolchain)
 
@@ -95,9 +104,13 @@ class BaseSoC(SoCCore):
         SoCCore.__init__(self, platform, sys_clk_freq, ident="LiteX SoC on Arty A7", **kwargs)
 
         # XADC -------------------------------------------------------------------------------------
-        if with_xadc:
+        if with_xadc or with_telemetry:
             self.xadc = XADC()
 
+        # Telemetry --------------------------------------------------------------------------------
+        if with_telemetry:
+            add_telemetry(self, sysmon=self.xadc)
+
         # DNA --------------------------------------------------------------------------------------
         if with_dna:
             self.dna = DNA()
@@ -114,6 +127,8 @@ class BaseSoC(SoCCore):
                 module        = MT41K128M16(sys_clk_freq, "1:4"),
                 l2_cache_size = kwargs.get("l2_size", 8192)
             )
+            if with_l2_stats:
+                add_l2_stats(self, trace_depth=l2_stats_trace_depth)
 
         # Ethernet / Etherbone ---------------------------------------------------------------------
         if with_ethernet or with_etherbone:
@@ -188,7 +203,12 @@ class BaseSoC(SoCCore):
             from litex.soc.cores.can.ctu_can_fd import CTUCANFD
             self.platform.add_extension(digilent_arty.can_pmod_io("pmodc", 0))
             self.can0 = CTUCANFD(platform, platform.request("can", 0))
-            self.bus.add_slave("can0", self.can0.bus, SoCRegion(origin=0xb0010000, size=0x10000, mode="rw", cached=False))
+            can0_region = SoCRegion(origin=0xb0010000, size=0x10000, mode="rw", cached=False)
+            if with_can_dma:
+                from litex_boards.cores.can_dma import add_can_dma
+                add_can_dma(self, "can0", self.can0, can0_region)
+            else:
+                self.bus.add_slave("can0", self.can0.bus, can0_region)
             self.irq.add("can0")
 
 # Build --------------------------------------------------------------------------------------------
@@ -197,9 +217,11 @@ def main():
     from litex.build.parser import LiteXArgumentParser
     parser = LiteXArgumentParser(platform=digilent_arty.Platform, description="LiteX SoC on Arty A7.")
     parser.add_target_argument("--flash",          action="store_true",       help="Flash bitstream.")
+    parser.add_target_argument("--flash-diff",     default=None, metavar="DEVICE", help="Only rewrite changed SPI Flash sectors (with --flash), DEVICE: board ID (sector cache key, ex board serial).")
     parser.add_target_argument("--variant",        default="a7-35",           help="Board variant (a7-35 or a7-100).")
     parser.add_target_argument("--sys-clk-freq",   default=100e6, type=float, help="System clock frequency.")
     parser.add_target_argument("--with-xadc",      action="store_true",       help="Enable 7-Series XADC.")
+    parser.add_target_argument("--with-telemetry", action="store_true",       help="Enable XADC telemetry history (implies --with-xadc).")
     parser.add_target_argument("--with-dna",       action="store_true",       help="Enable 7-Series DNA.")
     parser.add_target_argument("--with-usb",       action="store_true",       help="Enable USB Host.")
     parser.add_target_argument("--with-ethernet",  action="store_true",       help="Enable Ethernet support.")
@@ -211,18 +233,26 @@ def main():
     sdopts.add_argument("--with-spi-sdcard",       action="store_true",       help="Enable SPI-mode SDCard support.")
     sdopts.add_argument("--with-sdcard",           action="store_true",       help="Enable SDCard support.")
     parser.add_target_argument("--sdcard-adapter",                            help="SDCard PMOD adapter (digilent or numato).")
+    parser.add_target_argument("--sdcard-high-speed", action="store_true",    help="SDCard High-Speed clock and DMA counters for sdcard_bench only, BIOS/boot stays at 25MHz (with --with-sdcard).")
     parser.add_target_argument("--with-spi-flash", action="store_true",       help="Enable SPI Flash (MMAPed).")
     parser.add_target_argument("--with-pmod-gpio", action="store_true",       help="Enable GPIOs through PMOD.") # FIXME: Temporary test.
     parser.add_target_argument("--with-can",       action="store_true",       help="Enable CAN support (Through CTU-CAN-FD Core and SN65HVD230 'PMOD'.")
+    parser.add_target_argument("--with-can-dma",   action="store_true",       help="Enable CAN RX DMA to a main RAM ring buffer with acceptance filtering (with --with-can).")
+    parser.add_target_argument("--with-l2-stats",  action="store_true",       help="Enable L2 cache statistics/access trace (for litex_boards.tools.l2_advisor).")
+    parser.add_target_argument("--l2-stats-trace-depth", default=4096, type=int, help="L2 access trace buffer depth (with --with-l2-stats).")
+    add_board_sim_arguments(parser)
     args = parser.parse_args()
 
     assert not (args.with_etherbone and args.eth_dynamic_ip)
+    if args.with_can_dma and not args.with_can:
+        parser.error("--with-can-dma requires --with-can.")
 
     soc = BaseSoC(
         variant        = args.variant,
         toolchain      = args.toolchain,
         sys_clk_freq   = args.sys_clk_freq,
         with_xadc      = args.with_xadc,
+        with_telemetry = args.with_telemetry,
         with_dna       = args.with_dna,
         with_ethernet  = args.with_ethernet,
         with_etherbone = args.with_etherbone,
@@ -233,6 +263,9 @@ def main():
         with_spi_flash = args.with_spi_flash,
         with_pmod_gpio = args.with_pmod_gpio,
         with_can       = args.with_can,
+        with_can_dma   = args.with_can_dma,
+        with_l2_stats  = args.with_l2_stats,
+        l2_stats_trace_depth = args.l2_stats_trace_depth,
         **parser.soc_argdict
     )
 
@@ -243,7 +276,14 @@ def main():
     if args.with_spi_sdcard:
         soc.add_spi_sdcard()
     if args.with_sdcard:
-        soc.add_sdcard()
+        if args.sdcard_high_speed:
+            add_sdcard(soc, clk_freq=25e6) # Standard PMOD (JD, 200 Ohm series resistors).
+        else:
+            soc.add_sdcard()
+
+    if args.sim:
+        run_board_sim(soc, args, parser.builder_argdict)
+        return
 
     builder = Builder(soc, **parser.builder_argdict)
     if args.build:
@@ -255,6 +295,9 @@ def main():
 
     if args.flash:
         prog = soc.platform.create_programmer()
+        if args.flash_diff is not None:
+            from litex_boards.tools.diff_flash import DiffFlash
+            prog = DiffFlash(prog, device=args.flash_diff)
         prog.flash(0, builder.get_bitstream_filename(mode="flash"))
 
 if __name__ == "__main__":
@@ -31,6 +31,7 @@ from migen import *
 from litex.gen import *
 
 from litex_boards.platforms import digilent_arty_z7
+from litex_boards.tools.artifacts import link_git_repo
 from litex.build import tools
 from litex.build.xilinx import common as xil_common
 from litex.build.tools import write_to_file
@@ -126,9 +127,7 @@ class BaseSoC(SoCCore):
 
         libxil_path = os.path.join(self.builder.software_dir, 'libxil')
         os.makedirs(os.path.realpath(libxil_path), exist_ok=True)
-        lib = os.path.join(libxil_path, 'embeddedsw')
-        if not os.path.exists(lib):
-            os.system("git clone --depth 1 https://github.com/Xilinx/embeddedsw {}".format(lib))
+        lib = link_git_repo("embeddedsw", os.path.join(libxil_path, 'embeddedsw'))
 
         os.makedirs(os.path.realpath(self.builder.include_dir), exist_ok=True)
         for header in [
@@ -19,9 +19,8 @@ from litex.soc.integration.soc_core import *
 from litex.soc.integration.soc import SoCRegion
 from litex.soc.integration.builder import *
 from litex.soc.cores.led import LedChaser
-from litex.soc.interconnect import wishbone
 
-from litex.soc.integration.soc import colorer
+from litex_boards.cores.async_sram import AsyncSRAM, IS61WV5128BLL
 
 # CRG ----------------------------------------------------------------------------------------------
 
@@ -43,63 +42,6 @@ class _CRG(LiteXModule):
         pll.create_clkout(self.cd_sys, sys_clk_freq)
         platform.add_false_path_constraints(self.cd_sys.clk, pll.clkin) # Ignore sys_clk to pll.clkin path created by SoC's rst.
 
-# AsyncSRAM ------------------------------------------------------------------------------------------
-
-class AsyncSRAM(LiteXModule):
-    def __init__(self, platform, size):
-        addr_width = size//8
-        data_width = 8
-        self.bus = wishbone.Interface(data_width=data_width,adr_width=addr_width)
-        issiram = platform.request("issiram")
-        addr = issiram.addr
-        data = issiram.data
-        wen = issiram.wen
-        cen = issiram.cen
-        oe = issiram.oe
-        ########################
-        tristate_data = TSTriple(data_width)
-        self.specials += tristate_data.get_tristate(data)
-        ########################
-        chip_ena = self.bus.cyc & self.bus.stb & self.bus.sel[0]
-        write_ena = (chip_ena & self.bus.we)
-        ########################
-        # external write enable, 
-        # external chip enable, 
-        # internal tristate write enable
-        ########################
-        self.comb += [
-            cen.eq(~chip_ena),
-            wen.eq(~write_ena),
-            tristate_data.oe.eq(write_ena),
-            oe.eq(tristate_data.oe),
-        ]
-        ########################
-        # address and data
-        ########################
-        self.comb += [
-            addr.eq(self.bus.adr[:addr_width]),
-            self.bus.dat_r.eq(tristate_data.i[:data_width]),
-            tristate_data.o.eq(self.bus.dat_w[:data_width])
-        ]
-        ########################
-        # generate ack
-        ########################
-        self.sync += [
-            self.bus.ack.eq(self.bus.cyc & self.bus.stb & ~self.bus.ack),
-        ]
-        ########################
-
-def addAsyncSram(soc, platform, name, origin, size):
-    ram_bus = wishbone.Interface(data_width=soc.bus.data_width)
-    ram     = AsyncSRAM(platform,size)
-    soc.bus.add_slave(name, ram.bus, SoCRegion(origin=origin, size=size, mode="rw"))
-    soc.check_if_exists(name)
-    soc.logger.info("ISSIRAM {} {} {}.".format(
-        colorer(name),
-        colorer("added", color="green"),
-        soc.bus.regions[name]))
-    setattr(soc.submodules, name, ram)
-
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
@@ -119,7 +61,8 @@ class BaseSoC(SoCCore):
         SoCCore.__init__(self, platform, sys_clk_freq, ident="LiteX SoC on Digilent CmodA7", **kwargs)
 
         # Async RAM --------------------------------------------------------------------------------
-        addAsyncSram(self,platform,"main_ram", 0x40000000, 512 * KILOBYTE)
+        self.issiram = AsyncSRAM(platform.request("issiram"), IS61WV5128BLL, sys_clk_freq)
+        self.bus.add_slave("main_ram", self.issiram.bus, SoCRegion(origin=0x40000000, size=self.issiram.size, mode="rw"))
 
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
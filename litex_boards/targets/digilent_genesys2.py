@@ -20,6 +20,8 @@ from litex.soc.cores.led import LedChaser
 
 from litedram.modules import MT41J256M16
 from litedram.phy import s7ddrphy
+from litex_boards.tools.cpu_presets import add_cpu_preset_argument
+from litex_boards.tools.board_sim import add_board_sim_arguments, run_board_sim
 
 from liteeth.phy.s7rgmii import LiteEthPHYRGMII
 
@@ -111,6 +113,8 @@ def main():
     sdopts.add_argument("--with-spi-sdcard", action="store_true", help="Enable SPI-mode SDCard support.")
     sdopts.add_argument("--with-sdcard",     action="store_true", help="Enable SDCard support.")
     parser.add_target_argument("--with-can", action="store_true", help="Enable CAN support (Through CTU-CAN-FD Core and SN65HVD230 'PMOD'.")
+    add_cpu_preset_argument(parser, dram_data_width=256, presets=["smp2", "smp4"]) # K7DDRPHY, 32-bit DDR3.
+    add_board_sim_arguments(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
@@ -125,6 +129,11 @@ def main():
         soc.add_spi_sdcard()
     if args.with_sdcard:
         soc.add_sdcard()
+
+    if args.sim:
+        run_board_sim(soc, args, parser.builder_argdict)
+        return
+
     builder = Builder(soc, **parser.builder_argdict)
     if args.build:
         builder.build(**parser.toolchain_argdict)
@@ -11,6 +11,7 @@ from migen import *
 from litex.gen import *
 
 from litex_boards.platforms import digilent_pynq_z1
+from litex_boards.tools.artifacts import copy_artifact
 
 from litex.soc.interconnect import axi
 from litex.soc.interconnect import wishbone
@@ -73,11 +74,8 @@ class BaseSoC(SoCCore):
 
         # Zynq7000 Integration ---------------------------------------------------------------------
         if kwargs.get("cpu_type", None) == "zynq7000":
-            # Get and set the pre-generated .xci FIXME: change location? add it to the repository?
-            os.system("wget https://github.com/litex-hub/litex-boards/files/8339591/zybo_z7_ps7.txt)")
-            os.makedirs("xci", exist_ok=True)
-            os.system("mv zybo_z7_ps7.txt xci/zybo_z7_ps7.xci")
-            self.cpu.set_ps7_xci("xci/zybo_z7_ps7.xci")
+            # Get and set the pre-generated .xci (from local artifact store).
+            self.cpu.set_ps7_xci(copy_artifact("zybo_z7_ps7.xci", "xci/zybo_z7_ps7.xci"))
 
         # Video ------------------------------------------------------------------------------------
         if with_video_terminal:
@@ -30,6 +30,9 @@ from litex.soc.cores.usb_ohci import USBOHCI
 
 from liteeth.phy.trionrgmii import LiteEthPHYRGMII
 
+from litex_boards.cores.axi_dma import AXIDMAWriter, AXIDMAReader
+from litex_boards.cores.axi_monitor import add_axi_port_monitor
+
 # Full stream debian demo :
 # --cpu-type=vexiiriscv --cpu-variant=debian --update-repo=no --with-jtag-tap --with-sdcard --with-coherent-dma --with-ohci --vexii-video "name=video"
 # --vexii-args="--fetch-l1-hardware-prefetch=nl --fetch-l1-refill-count=2 --fetch-l1-mem-data-width-min=128 --lsu-l1-mem-data-width-min=128 --lsu-software-prefetch --lsu-hardware-prefetch rpt --performance-counters 9 --lsu-l1-store-buffer-ops=32 --lsu-l1-refill-count 4 --lsu-l1-writeback-count 4 --lsu-l1-store-buffer-slots=4 --relaxed-div"
@@ -76,7 +79,7 @@ class BaseSoC(SoCCore):
         "usb_ohci": 0xe0000000,
     }}
 
-    def __init__(self, sys_clk_freq=100e6, cpu_clk_freq=100e6, with_ohci=False, **kwargs):
+    def __init__(self, sys_clk_freq=100e6, cpu_clk_freq=100e6, with_ohci=False, with_dram_dma=False, **kwargs):
         platform = efinix_ti375_c529_dev_kit.Platform()
 
         # CRG --------------------------------------------------------------------------------------
@@ -230,6 +233,9 @@ class BaseSoC(SoCCore):
 
             data_width = 512
             axi_bus = axi.AXIInterface(data_width=data_width, address_width=30, id_width=8) # 256MB.
+            axi_buses = [axi_bus]
+            if with_dram_dma:
+                axi_buses.append(axi.AXIInterface(data_width=data_width, address_width=30, id_width=8))
 
             # self.platform.add_extension(_debug_io)
             # debug_io = platform.request("debug_io")
@@ -243,6 +249,9 @@ class BaseSoC(SoCCore):
             # self.sync += debug_io.p7.eq(axi_bus.b.ready)
 
             axi_clk = self.crg.cd_cpu.clk.name_override
+            # Target1 (DMAs) is clocked from sys, to avoid CDC between the DMAs and their CSRs.
+            axi1_clk    = self.crg.cd_sys.clk.name_override if with_dram_dma else axi_clk
+            axi1_enable = "true" if with_dram_dma else "false"
             class DRAMXMLBlock(InterfaceWriterXMLBlock):
                 @staticmethod
                 def generate(root, namespaces):
@@ -302,9 +311,9 @@ class BaseSoC(SoCCore):
                     et.SubElement(gen_pin_target0, "efxpt:pin", name="ddr0_w_strb",     type_name="WSTRB_0",     is_bus="true")
                     et.SubElement(gen_pin_target0, "efxpt:pin", name="ddr0_resetn",     type_name="ARSTN_0",     is_bus="false")
 
-                    axi_target1 = et.SubElement(ddr, "efxpt:axi_target1",is_axi_width_256="false", is_axi_enable="false")
+                    axi_target1 = et.SubElement(ddr, "efxpt:axi_target1",is_axi_width_256="false", is_axi_enable=axi1_enable)
                     gen_pin_target1 = et.SubElement(axi_target1, "efxpt:gen_pin_axi")
-                    et.SubElement(gen_pin_target1, "efxpt:pin", name=axi_clk,     type_name=f"ACLK_1",   is_bus="false", is_clk="true", is_clk_invert="false")
+                    et.SubElement(gen_pin_target1, "efxpt:pin", name=axi1_clk,    type_name=f"ACLK_1",   is_bus="false", is_clk="true", is_clk_invert="false")
                     et.SubElement(gen_pin_target1, "efxpt:pin", name="ddr1_ar_apcmd", type_name="ARAPCMD_1", is_bus="false")
                     et.SubElement(gen_pin_target1, "efxpt:pin", name="ddr1_ar_ready", type_name="ARREADY_1", is_bus="false")
                     et.SubElement(gen_pin_target1, "efxpt:pin", name="ddr1_ar_valid", type_name="ARVALID_1", is_bus="false")
@@ -499,50 +508,6 @@ class BaseSoC(SoCCore):
 
             platform.toolchain.ifacewriter.xml_blocks.append(DRAMXMLBlock())
 
-            # DRAM AXI-Ports.
-            # --------------
-            ios = [(f"ddr0", 0,
-                Subsignal("ar_valid",   Pins(1)),
-                Subsignal("ar_ready",   Pins(1)),
-                Subsignal("ar_addr",    Pins(33)),
-                Subsignal("ar_id",      Pins(6)),
-                Subsignal("ar_len",     Pins(8)),
-                Subsignal("ar_size",    Pins(3)),
-                Subsignal("ar_burst",   Pins(2)),
-                Subsignal("ar_lock",    Pins(1)),
-                Subsignal("ar_apcmd",   Pins(1)),
-                Subsignal("ar_qos",     Pins(1)),
-                Subsignal("aw_valid",   Pins(1)),
-                Subsignal("aw_ready",   Pins(1)),
-                Subsignal("aw_addr",    Pins(33)),
-                Subsignal("aw_id",      Pins(6)),
-                Subsignal("aw_len",     Pins(8)),
-                Subsignal("aw_size",    Pins(3)),
-                Subsignal("aw_burst",   Pins(2)),
-                Subsignal("aw_lock",    Pins(1)),
-                Subsignal("aw_cache",   Pins(4)),
-                Subsignal("aw_qos",     Pins(1)),
-                Subsignal("aw_allstrb", Pins(1)),
-                Subsignal("aw_apcmd",   Pins(1)),
-                Subsignal("awcobuf",    Pins(1)),
-                Subsignal("w_valid",    Pins(1)),
-                Subsignal("w_ready",    Pins(1)),
-                Subsignal("w_data",     Pins(data_width)),
-                Subsignal("w_strb",     Pins(data_width//8)),
-                Subsignal("w_last",     Pins(1)),
-                Subsignal("b_valid",    Pins(1)),
-                Subsignal("b_ready",    Pins(1)),
-                Subsignal("b_resp",     Pins(1)),
-                Subsignal("b_id",       Pins(6)),
-                Subsignal("r_valid",    Pins(1)),
-                Subsignal("r_ready",    Pins(1)),
-                Subsignal("r_data",     Pins(data_width)),
-                Subsignal("r_id",       Pins(6)),
-                Subsignal("r_resp",     Pins(2)),
-                Subsignal("r_last",     Pins(1)),
-                Subsignal("resetn",     Pins(1)),
-            )]
-
             if hasattr(self.cpu, "add_memory_buses"):
                 self.cpu.add_memory_buses(address_width = 32, data_width = data_width)
 
@@ -550,49 +515,137 @@ class BaseSoC(SoCCore):
                 mbus = self.cpu.memory_buses[0]
                 self.comb +=mbus.connect(axi_bus)
 
-            io   = platform.add_iface_ios(ios)
-            self.comb += [
-                io.ar_valid.eq(axi_bus.ar.valid),
-                axi_bus.ar.ready.eq(io.ar_ready),
-                io.ar_addr.eq(axi_bus.ar.addr),
-                io.ar_id.eq(axi_bus.ar.id),
-                io.ar_len.eq(axi_bus.ar.len),
-                io.ar_size.eq(axi_bus.ar.size),
-                io.ar_burst.eq(axi_bus.ar.burst),
-                io.ar_lock.eq(axi_bus.ar.lock),
-                io.ar_apcmd.eq(0),
-                io.ar_qos.eq(axi_bus.ar.qos),
-                io.aw_valid.eq(axi_bus.aw.valid),
-                axi_bus.aw.ready.eq(io.aw_ready),
-                io.aw_addr.eq(axi_bus.aw.addr),
-                io.aw_id.eq(axi_bus.aw.id),
-                io.aw_len.eq(axi_bus.aw.len),
-                io.aw_size.eq(axi_bus.aw.size),
-                io.aw_burst.eq(axi_bus.aw.burst),
-                io.aw_lock.eq(axi_bus.aw.lock),
-                io.aw_cache.eq(axi_bus.aw.cache),
-                io.aw_qos.eq(axi_bus.aw.qos),
-                io.aw_allstrb.eq(0 if not hasattr(self.cpu, "mBus_awallStrb") else self.cpu.mBus_awallStrb),
-                io.aw_apcmd.eq(0),
-                io.awcobuf.eq(0),
-                io.w_valid.eq(axi_bus.w.valid),
-                axi_bus.w.ready.eq(io.w_ready),
-                io.w_data.eq(axi_bus.w.data),
-                io.w_strb.eq(axi_bus.w.strb),
-                io.w_last.eq(axi_bus.w.last),
-                axi_bus.b.valid.eq(io.b_valid),
-                io.b_ready.eq(axi_bus.b.ready),
-                axi_bus.b.resp.eq(io.b_resp),
-                axi_bus.b.id.eq(io.b_id),
-                axi_bus.r.valid.eq(io.r_valid),
-                io.r_ready.eq(axi_bus.r.ready),
-                axi_bus.r.data.eq(io.r_data),
-                axi_bus.r.id.eq(io.r_id),
-                axi_bus.r.resp.eq(io.r_resp),
-                axi_bus.r.last.eq(io.r_last),
-                io.resetn.eq(~self.crg.cd_sys.rst),
-            ]
-                
+            # DRAM AXI-Ports.
+            # --------------
+            for n, port in enumerate(axi_buses):
+                ios = [(f"ddr{n}", 0,
+                    Subsignal("ar_valid",   Pins(1)),
+                    Subsignal("ar_ready",   Pins(1)),
+                    Subsignal("ar_addr",    Pins(33)),
+                    Subsignal("ar_id",      Pins(6)),
+                    Subsignal("ar_len",     Pins(8)),
+                    Subsignal("ar_size",    Pins(3)),
+                    Subsignal("ar_burst",   Pins(2)),
+                    Subsignal("ar_lock",    Pins(1)),
+                    Subsignal("ar_apcmd",   Pins(1)),
+                    Subsignal("ar_qos",     Pins(1)),
+                    Subsignal("aw_valid",   Pins(1)),
+                    Subsignal("aw_ready",   Pins(1)),
+                    Subsignal("aw_addr",    Pins(33)),
+                    Subsignal("aw_id",      Pins(6)),
+                    Subsignal("aw_len",     Pins(8)),
+                    Subsignal("aw_size",    Pins(3)),
+                    Subsignal("aw_burst",   Pins(2)),
+                    Subsignal("aw_lock",    Pins(1)),
+                    Subsignal("aw_cache",   Pins(4)),
+                    Subsignal("aw_qos",     Pins(1)),
+                    Subsignal("aw_allstrb", Pins(1)),
+                    Subsignal("aw_apcmd",   Pins(1)),
+                    Subsignal("awcobuf",    Pins(1)),
+                    Subsignal("w_valid",    Pins(1)),
+                    Subsignal("w_ready",    Pins(1)),
+                    Subsignal("w_data",     Pins(data_width)),
+                    Subsignal("w_strb",     Pins(data_width//8)),
+                    Subsignal("w_last",     Pins(1)),
+                    Subsignal("b_valid",    Pins(1)),
+                    Subsignal("b_ready",    Pins(1)),
+                    Subsignal("b_resp",     Pins(1)),
+                    Subsignal("b_id",       Pins(6)),
+                    Subsignal("r_valid",    Pins(1)),
+                    Subsignal("r_ready",    Pins(1)),
+                    Subsignal("r_data",     Pins(data_width)),
+                    Subsignal("r_id",       Pins(6)),
+                    Subsignal("r_resp",     Pins(2)),
+                    Subsignal("r_last",     Pins(1)),
+                    Subsignal("resetn",     Pins(1)),
+                )]
+
+                # QoS: From the master or from the port monitor (with DMAs).
+                ar_qos = port.ar.qos
+                aw_qos = port.aw.qos
+                if with_dram_dma:
+                    monitor = add_axi_port_monitor(self, f"ddr{n}_monitor", port,
+                        clk_freq     = [cpu_clk_freq, sys_clk_freq][n],
+                        clock_domain = ["cpu", "sys"][n],
+                        qos_width    = 1,
+                    )
+                    ar_qos = monitor.ar_qos
+                    aw_qos = monitor.aw_qos
+
+                aw_allstrb = 0
+                if (n == 0) and hasattr(self.cpu, "mBus_awallStrb"):
+                    aw_allstrb = self.cpu.mBus_awallStrb
+
+                io   = platform.add_iface_ios(ios)
+                self.comb += [
+                    io.ar_valid.eq(port.ar.valid),
+                    port.ar.ready.eq(io.ar_ready),
+                    io.ar_addr.eq(port.ar.addr),
+                    io.ar_id.eq(port.ar.id),
+                    io.ar_len.eq(port.ar.len),
+                    io.ar_size.eq(port.ar.size),
+                    io.ar_burst.eq(port.ar.burst),
+                    io.ar_lock.eq(port.ar.lock),
+                    io.ar_apcmd.eq(0),
+                    io.ar_qos.eq(ar_qos),
+                    io.aw_valid.eq(port.aw.valid),
+                    port.aw.ready.eq(io.aw_ready),
+                    io.aw_addr.eq(port.aw.addr),
+                    io.aw_id.eq(port.aw.id),
+                    io.aw_len.eq(port.aw.len),
+                    io.aw_size.eq(port.aw.size),
+                    io.aw_burst.eq(port.aw.burst),
+                    io.aw_lock.eq(port.aw.lock),
+                    io.aw_cache.eq(port.aw.cache),
+                    io.aw_qos.eq(aw_qos),
+                    io.aw_allstrb.eq(aw_allstrb),
+                    io.aw_apcmd.eq(0),
+                    io.awcobuf.eq(0),
+                    io.w_valid.eq(port.w.valid),
+                    port.w.ready.eq(io.w_ready),
+                    io.w_data.eq(port.w.data),
+                    io.w_strb.eq(port.w.strb),
+                    io.w_last.eq(port.w.last),
+                    port.b.valid.eq(io.b_valid),
+                    io.b_ready.eq(port.b.ready),
+                    port.b.resp.eq(io.b_resp),
+                    port.b.id.eq(io.b_id),
+                    port.r.valid.eq(io.r_valid),
+                    io.r_ready.eq(port.r.ready),
+                    port.r.data.eq(io.r_data),
+                    port.r.id.eq(io.r_id),
+                    port.r.resp.eq(io.r_resp),
+                    port.r.last.eq(io.r_last),
+                    io.resetn.eq(~self.crg.cd_sys.rst),
+                ]
+
+            # DRAM DMAs.
+            # ----------
+            # Stream-to-Memory/Memory-to-Stream DMAs sharing target1 (Writer: AW/W/B, Reader: AR/R).
+            if with_dram_dma:
+                dma_bus    = axi_buses[1]
+                writer_bus = axi.AXIInterface(data_width=data_width, address_width=30, id_width=8)
+                reader_bus = axi.AXIInterface(data_width=data_width, address_width=30, id_width=8)
+                self.ddr1_dma_writer = AXIDMAWriter(writer_bus, burst_length=16, with_csr=True)
+                self.ddr1_dma_reader = AXIDMAReader(reader_bus, burst_length=16, with_csr=True)
+                self.comb += [
+                    writer_bus.aw.connect(dma_bus.aw),
+                    writer_bus.w.connect(dma_bus.w),
+                    dma_bus.b.connect(writer_bus.b),
+                    reader_bus.ar.connect(dma_bus.ar),
+                    dma_bus.r.connect(reader_bus.r),
+                ]
+
+                # Until a stream (ex Video) is attached: Pattern source on the Writer, Reader always
+                # accepted, for bandwidth measurements (litex_boards.tools.axi_port_bench).
+                pattern = Signal(32)
+                self.sync += If(self.ddr1_dma_writer.sink.ready, pattern.eq(pattern + 1))
+                self.comb += [
+                    self.ddr1_dma_writer.sink.valid.eq(1),
+                    self.ddr1_dma_writer.sink.data.eq(Replicate(pattern, data_width//32)),
+                    self.ddr1_dma_reader.source.ready.eq(1),
+                ]
+
             cfgs = [(f"cfg", 0,
                 Subsignal("start",  Pins(1)),
                 Subsignal("reset",  Pins(1)),
@@ -628,15 +681,17 @@ def main():
     parser.add_target_argument("--sys-clk-freq",  default=100e6, type=float, help="System clock frequency.")
     parser.add_target_argument("--cpu-clk-freq",  default=100e6, type=float, help="System clock frequency.")
     parser.add_target_argument("--with-ohci",     action="store_true",       help="Enable USB OHCI.")
+    parser.add_target_argument("--with-dram-dma", action="store_true",       help="Enable DRAM target1 with DMAs and per-port QoS/Bandwidth counters.")
     sdopts = parser.target_group.add_mutually_exclusive_group()
     sdopts.add_argument("--with-spi-sdcard",      action="store_true", help="Enable SPI-mode SDCard support.")
     sdopts.add_argument("--with-sdcard",          action="store_true", help="Enable SDCard support.")
     args = parser.parse_args()
 
     soc = BaseSoC(
-        sys_clk_freq = args.sys_clk_freq,
-        cpu_clk_freq = args.cpu_clk_freq,
-        with_ohci    = args.with_ohci,
+        sys_clk_freq  = args.sys_clk_freq,
+        cpu_clk_freq  = args.cpu_clk_freq,
+        with_ohci     = args.with_ohci,
+        with_dram_dma = args.with_dram_dma,
         **parser.soc_argdict)
     if args.with_spi_sdcard:
         soc.add_spi_sdcard()
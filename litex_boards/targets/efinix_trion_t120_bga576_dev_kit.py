@@ -57,6 +57,7 @@ class BaseSoC(SoCCore):
         eth_ip          = "192.168.1.50",
         remote_ip       = None,
         with_led_chaser = True,
+        i2c_controller  = "bitbang",
         **kwargs):
         platform = efinix_trion_t120_bga576_dev_kit.Platform()
 
@@ -84,13 +85,13 @@ class BaseSoC(SoCCore):
 
         # Tristate Test ----------------------------------------------------------------------------
         from litex.build.generic_platform import Subsignal, Pins, Misc, IOStandard
-        from litex.soc.cores.bitbang import I2CMaster
+        from litex_boards.cores.i2c_controller import add_i2c
         platform.add_extension([("i2c", 0,
             Subsignal("sda",   Pins("T12")),
             Subsignal("scl",   Pins("V11")),
             IOStandard("3.3_V_LVTTL_/_LVCMOS"),
         )])
-        self.i2c = I2CMaster(pads=platform.request("i2c"))
+        add_i2c(self, "i2c", platform.request("i2c"), controller=i2c_controller)
 
         # Ethernet / Etherbone ---------------------------------------------------------------------
         if with_ethernet or with_etherbone:
@@ -385,6 +386,7 @@ def main():
     parser.add_target_argument("--remote-ip",     default="192.168.1.100", help="Remote IP address of TFTP server.")
     parser.add_target_argument("--eth-rgmii-phy", action="store_true",     help="Uses onboard RGMII Phy instead of RMII PMOD.")
     parser.add_target_argument("--eth-phy",       default=0, type=int,     help="Ethernet PHY: 0 (default) or 1. (Only available with --eth-rgmii-phy")
+    parser.add_target_argument("--i2c-controller", default="bitbang", choices=["bitbang", "hardware"], help="I2C controller: bitbang (BIOS I2C/SPD support) or hardware (command FIFO/scripts, IRQs).")
     args = parser.parse_args()
 
     soc = BaseSoC(
@@ -396,6 +398,7 @@ def main():
         remote_ip      = args.remote_ip,
         eth_phy        = args.eth_phy,
         eth_rgmii_phy  = args.eth_rgmii_phy,
+        i2c_controller = args.i2c_controller,
         **parser.soc_argdict)
     builder = Builder(soc, **parser.builder_argdict)
     if args.build:
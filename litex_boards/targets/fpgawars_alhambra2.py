@@ -47,7 +47,7 @@ class _CRG(LiteXModule):
 
 class BaseSoC(SoCCore):
 
-    def __init__(self, sys_clk_freq=12e6, with_led_chaser=True, bios_flash_offset=0x50000, **kwargs):
+    def __init__(self, sys_clk_freq=12e6, with_led_chaser=True, bios_flash_offset=0x50000, xip_cache_size=0, **kwargs):
 
         platform = fpgawars_alhambra2.Platform()
         kwargs["integrated_rom_size"] = 0
@@ -58,6 +58,9 @@ class BaseSoC(SoCCore):
         from litespi.modules import N25Q032A
         from litespi.opcodes import SpiNorFlashOpCodes as Codes
         self.add_spi_flash(mode='1x', module=N25Q032A(Codes.READ_1_1_1), with_master=False)
+        if xip_cache_size:
+            from litex_boards.cores.xip_cache import add_xip_cache
+            add_xip_cache(self, name="spiflash", size=xip_cache_size)
         self.bus.add_region("rom", SoCRegion(
             origin=self.bus.regions["spiflash"].origin + bios_flash_offset,
             size=32 * KILOBYTE,
@@ -81,11 +84,13 @@ def main():
     parser.add_target_argument("--sys-clk-freq",      default=12e6, type=float, help="System clock frequency.")
     parser.add_target_argument("--bios-flash-offset", default="0x50000",        help="BIOS offset in SPI flash.")
     parser.add_target_argument("--flash",             action="store_true",      help="Flash Bitstream.")
+    parser.add_target_argument("--xip-cache-size",    default=0, type=int,      help="XIP SPI Flash cache size in bytes (0 to disable).")
     args = parser.parse_args()
 
     soc = BaseSoC(
         bios_flash_offset = int(args.bios_flash_offset, 0),
         sys_clk_freq      = args.sys_clk_freq,
+        xip_cache_size    = args.xip_cache_size,
         **parser.soc_argdict
     )
     builder = Builder(soc, **parser.builder_argdict)
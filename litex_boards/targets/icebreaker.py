@@ -32,6 +32,8 @@ from litex.soc.integration.builder import *
 from litex.soc.cores.video import VideoDVIPHY
 from litex.soc.cores.led import LedChaser
 
+from litex_boards.tools.board_sim import add_board_sim_arguments, run_board_sim
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(LiteXModule):
@@ -67,6 +69,7 @@ class BaseSoC(SoCCore):
     def __init__(self, bios_flash_offset, sys_clk_freq=24e6,
         with_led_chaser     = True,
         with_video_terminal = False,
+        xip_cache_size      = 0,
         **kwargs):
         platform = icebreaker.Platform()
         platform.add_extension(icebreaker.break_off_pmod)
@@ -100,6 +103,11 @@ class BaseSoC(SoCCore):
         from litespi.opcodes import SpiNorFlashOpCodes as Codes
         self.add_spi_flash(mode="4x", module=W25Q128JV(Codes.READ_1_1_4), with_master=False)
 
+        # XIP Cache --------------------------------------------------------------------------------
+        if xip_cache_size:
+            from litex_boards.cores.xip_cache import add_xip_cache
+            add_xip_cache(self, name="spiflash", size=xip_cache_size)
+
         # Add ROM linker region --------------------------------------------------------------------
         self.bus.add_region("rom", SoCRegion(
             origin = self.bus.regions["spiflash"].origin + bios_flash_offset,
@@ -122,9 +130,12 @@ class BaseSoC(SoCCore):
 
 # Flash --------------------------------------------------------------------------------------------
 
-def flash(build_dir, build_name, bios_flash_offset):
+def flash(build_dir, build_name, bios_flash_offset, diff_device=None):
     from litex.build.lattice.programmer import IceStormProgrammer
     prog = IceStormProgrammer()
+    if diff_device is not None:
+        from litex_boards.tools.diff_flash import DiffFlash
+        prog = DiffFlash(prog, device=diff_device)
     prog.flash(bios_flash_offset, f"{build_dir}/software/bios/bios.bin")
     prog.flash(0x00000000,        f"{build_dir}/gateware/{build_name}.bin")
 
@@ -134,17 +145,26 @@ def main():
     from litex.build.parser import LiteXArgumentParser
     parser = LiteXArgumentParser(platform=icebreaker.Platform, description="LiteX SoC on iCEBreaker.")
     parser.add_target_argument("--flash",               action="store_true",      help="Flash Bitstream and BIOS.")
+    parser.add_target_argument("--flash-diff",          default=None, metavar="DEVICE", help="Only rewrite changed SPI Flash sectors (with --flash), DEVICE: board ID (sector cache key, ex board serial).")
     parser.add_target_argument("--sys-clk-freq",        default=24e6, type=float, help="System clock frequency.")
     parser.add_target_argument("--bios-flash-offset",   default="0x40000",        help="BIOS offset in SPI Flash.")
     parser.add_target_argument("--with-video-terminal", action="store_true",      help="Enable Video Terminal (with DVI PMOD).")
+    parser.add_target_argument("--xip-cache-size",      default=0, type=int,      help="XIP SPI Flash cache size in bytes (0 to disable).")
+    add_board_sim_arguments(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
         bios_flash_offset   = int(args.bios_flash_offset, 0),
         sys_clk_freq        = args.sys_clk_freq,
+        xip_cache_size      = args.xip_cache_size,
         with_video_terminal = args.with_video_terminal,
         **parser.soc_argdict
     )
+
+    if args.sim:
+        run_board_sim(soc, args, parser.builder_argdict)
+        return
+
     builder = Builder(soc, **parser.builder_argdict)
     if args.build:
         builder.build(**parser.toolchain_argdict)
@@ -154,7 +174,7 @@ def main():
         prog.load_bitstream(builder.get_bitstream_filename(mode="sram", ext=".bin")) # FIXME
 
     if args.flash:
-        flash(builder.output_dir, soc.build_name, args.bios_flash_offset)
+        flash(builder.output_dir, soc.build_name, int(args.bios_flash_offset, 0), args.flash_diff)
 
 if __name__ == "__main__":
     main()
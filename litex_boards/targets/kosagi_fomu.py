@@ -69,6 +69,7 @@ class BaseSoC(SoCCore):
     def __init__(self, bios_flash_offset, sys_clk_freq=12e6,
         spi_flash_module = "AT25SF161",
         with_led_chaser  = True,
+        xip_cache_size   = 0,
         **kwargs):
         platform = kosagi_fomu_pvt.Platform()
 
@@ -111,6 +112,11 @@ class BaseSoC(SoCCore):
         }
         self.add_spi_flash(mode="4x", module=spi_flash_modules[spi_flash_module](), with_master=False)
 
+        # XIP Cache --------------------------------------------------------------------------------
+        if xip_cache_size:
+            from litex_boards.cores.xip_cache import add_xip_cache
+            add_xip_cache(self, name="spiflash", size=xip_cache_size)
+
         # Add ROM linker region --------------------------------------------------------------------
         self.bus.add_region("rom", SoCRegion(
             origin = self.bus.regions["spiflash"].origin + bios_flash_offset,
@@ -161,6 +167,7 @@ def main():
     parser.add_target_argument("--sys-clk-freq",      default=12e6, type=float, help="System clock frequency.")
     parser.add_target_argument("--bios-flash-offset", default="0x20000",        help="BIOS offset in SPI Flash.")
     parser.add_target_argument("--flash",             action="store_true",      help="Flash Bitstream.")
+    parser.add_target_argument("--xip-cache-size",    default=0, type=int,      help="XIP SPI Flash cache size in bytes (0 to disable).")
     args = parser.parse_args()
 
     dfu_flash_offset = 0x40000
@@ -168,6 +175,7 @@ def main():
     soc = BaseSoC(
         bios_flash_offset = dfu_flash_offset + int(args.bios_flash_offset, 0),
         sys_clk_freq      = args.sys_clk_freq,
+        xip_cache_size    = args.xip_cache_size,
         **parser.soc_argdict
     )
     builder = Builder(soc, **parser.builder_argdict)
@@ -14,6 +14,7 @@ from migen import *
 from litex.gen import *
 
 from litex_boards.platforms import krtkl_snickerdoodle
+from litex_boards.tools.artifacts import copy_artifact
 
 from litex.soc.interconnect import axi
 from litex.soc.interconnect import wishbone
@@ -31,8 +32,7 @@ def load_ps7(soc, xci_file):
     file = "snickerdoodle_ps7.xci"
     dst = os.path.join(odir, file)
     if xci_file is None:
-        src = "https://technicaltoys-support.s3.amazonaws.com/xci/" + file
-        os.system("wget " + src + " -O " + dst)
+        copy_artifact(file, dst)
     else:
         os.system("cp -p  " + xci_file + " " + dst)
     soc.cpu.set_ps7_xci(dst)
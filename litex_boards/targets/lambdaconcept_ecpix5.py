@@ -227,6 +227,7 @@ def main():
     parser = LiteXArgumentParser(platform=lambdaconcept_ecpix5.Platform, description="LiteX SoC on ECPIX-5.")
     parser.add_target_argument("--version",         default="r02",            help="board version r0X (0 < X <= 3).")
     parser.add_target_argument("--flash",           action="store_true",      help="Flash bitstream to SPI Flash.")
+    parser.add_target_argument("--flash-diff",      default=None, metavar="DEVICE", help="Only rewrite changed SPI Flash sectors (with --flash), DEVICE: board ID (sector cache key, ex board serial).")
     parser.add_target_argument("--device",          default="85F",            help="ECP5 device (45F or 85F).")
     parser.add_target_argument("--sys-clk-freq",    default=75e6, type=float, help="System clock frequency.")
     parser.add_target_argument("--with-sdcard",     action="store_true",      help="Enable SDCard support.")
@@ -267,6 +268,9 @@ def main():
 
     if args.flash:
         prog = soc.platform.create_programmer(args.version)
+        if args.flash_diff is not None:
+            from litex_boards.tools.diff_flash import DiffFlash
+            prog = DiffFlash(prog, device=args.flash_diff)
         prog.flash(0, builder.get_bitstream_filename(mode="flash"))
 
 if __name__ == "__main__":
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# Copyright (c) 2016-2022 Florent Kermarrec <florent@enjoy-digital.fr>
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Build/Use ----------------------------------------------------------------------------------------
+# Build/Load bitstream with PCIe <-> USB3 bridge:
+# ./lambdaconcept_pcie_screamer.py --variant=r02 --uart-name=crossover --with-bridge --build --driver
+#
+# Stream data between the PCIe DMA (litepcie driver, ex litepcie_util dma_test) and the FT601 USB3
+# FIFO (D3XX) and measure sustained throughput/latency of each direction of the bridge (with the
+# internal traffic generators/checkers by default, see bridge_bench --help):
+# litex_server --pcie --pcie-bar=<bar> &
+# python3 -m litex_boards.tools.bridge_bench --csr-csv=csr.csv
+
+import os
+
+from migen import *
+
+from litex.gen import *
+
+from litex_boards.platforms import lambdaconcept_pcie_screamer
+from litex_boards.platforms import lambdaconcept_pcie_screamer_m2
+from litex_boards.cores.pcie_usb_bridge import PCIeUSBBridge
+
+from litex.soc.integration.soc_core import *
+from litex.soc.integration.builder import *
+
+from litex.soc.cores.clock import *
+from litex.soc.cores.led import LedChaser
+from litex.soc.cores.usb_fifo import FT245PHYSynchronous
+
+from litedram.modules import MT41K128M16
+from litedram.phy import s7ddrphy
+
+from litepcie.phy.s7pciephy import S7PCIEPHY
+from litepcie.software import generate_litepcie_software
+
+# CRG ----------------------------------------------------------------------------------------------
+
+class _CRG(LiteXModule):
+    def __init__(self, platform, sys_clk_freq, with_dram=True, with_usb=False):
+        self.rst    = Signal()
+        self.cd_sys = ClockDomain()
+        if with_dram:
+            self.cd_sys4x     = ClockDomain()
+            self.cd_sys4x_dqs = ClockDomain()
+            self.cd_idelay    = ClockDomain()
+        if with_usb:
+            self.cd_usb = ClockDomain()
+
+        # # #
+
+        # Clk.
+        clk100 = platform.request("clk100")
+
+        # PLL.
+        self.pll = pll = S7PLL(speedgrade=-2)
+        self.comb += pll.reset.eq(self.rst)
+        pll.register_clkin(clk100, 100e6)
+        pll.create_clkout(self.cd_sys, sys_clk_freq)
+        platform.add_false_path_constraints(self.cd_sys.clk, pll.clkin) # Ignore sys_clk to pll.clkin path created by SoC's rst.
+        if with_dram:
+            pll.create_clkout(self.cd_sys4x,     4*sys_clk_freq)
+            pll.create_clkout(self.cd_sys4x_dqs, 4*sys_clk_freq, phase=90)
+            pll.create_clkout(self.cd_idelay,    200e6)
+            self.idelayctrl = S7IDELAYCTRL(self.cd_idelay)
+
+        # USB (100MHz from FT601).
+        if with_usb:
+            self.comb += self.cd_usb.clk.eq(platform.request("usb_fifo_clock"))
+            platform.add_period_constraint(self.cd_usb.clk, 1e9/100e6)
+            platform.add_false_path_constraints(self.cd_sys.clk, self.cd_usb.clk)
+
+# BaseSoC ------------------------------------------------------------------------------------------
+
+class BaseSoC(SoCCore):
+    def __init__(self, variant="r02", sys_clk_freq=100e6,
+        with_led_chaser   = True,
+        with_pcie         = False,
+        with_bridge       = False,
+        bridge_dram_depth = 64*MEGABYTE,
+        **kwargs):
+        platform = {
+            "r02" : lambdaconcept_pcie_screamer,
+            "m2"  : lambdaconcept_pcie_screamer_m2,
+        }[variant].Platform()
+        with_pcie = with_pcie or with_bridge
+        with_dram = (variant == "r02")
+        if not with_dram:
+            kwargs["integrated_main_ram_size"] = kwargs.get("integrated_main_ram_size", 0x2000)
+
+        # CRG --------------------------------------------------------------------------------------
+        self.crg = _CRG(platform, sys_clk_freq, with_dram=with_dram, with_usb=with_bridge)
+
+        # SoCCore ----------------------------------------------------------------------------------
+        SoCCore.__init__(self, platform, sys_clk_freq, ident=f"LiteX SoC on PCIe Screamer {variant.upper()}", **kwargs)
+
+        # DDR3 SDRAM -------------------------------------------------------------------------------
+        if not self.integrated_main_ram_size:
+            self.ddrphy = s7ddrphy.A7DDRPHY(platform.request("ddram"),
+                memtype      = "DDR3",
+                nphases      = 4,
+                sys_clk_freq = sys_clk_freq)
+            sdram_module = MT41K128M16(sys_clk_freq, "1:4")
+            sdram_size   = 2**(sdram_module.geom_settings.bankbits +
+                               sdram_module.geom_settings.rowbits +
+                               sdram_module.geom_settings.colbits)*self.ddrphy.settings.databits//8
+            main_ram_size = sdram_size
+            if with_bridge:
+                # Bridge buffers at the end of the DRAM, reserved from main_ram (CPU keeps at least half).
+                if 2*bridge_dram_depth > sdram_size//2:
+                    raise ValueError(f"Bridge DRAM depth too large ({bridge_dram_depth//MEGABYTE}MB per direction), max is {sdram_size//4//MEGABYTE}MB.")
+                main_ram_size = sdram_size - 2*bridge_dram_depth
+            self.add_sdram("sdram",
+                phy           = self.ddrphy,
+                module        = sdram_module,
+                size          = main_ram_size,
+                l2_cache_size = kwargs.get("l2_size", 8192)
+            )
+
+        # PCIe -------------------------------------------------------------------------------------
+        if with_pcie:
+            self.pcie_phy = S7PCIEPHY(platform, platform.request("pcie_x1"),
+                data_width = 64,
+                bar0_size  = 0x20000)
+            self.add_pcie(phy=self.pcie_phy, ndmas=1, with_dma_loopback=not with_bridge)
+            platform.add_period_constraint(self.crg.cd_sys.clk, 1e9/sys_clk_freq)
+
+        # PCIe <-> USB3 Bridge ---------------------------------------------------------------------
+        if with_bridge:
+            self.usb_phy = FT245PHYSynchronous(
+                pads       = platform.request("usb_fifo"),
+                clk_freq   = sys_clk_freq,
+                fifo_depth = 64,
+                read_time  = 1024,
+                write_time = 1024,
+            )
+            self.comb += self.usb_phy.pads.rst.eq(1)
+            self.comb += self.usb_phy.pads.siwua.eq(1)
+            dram_ports = None
+            if hasattr(self, "sdram"):
+                dram_ports = [self.sdram.crossbar.get_port() for _ in range(4)]
+            self.bridge = PCIeUSBBridge(
+                pcie_dma        = self.pcie_dma0,
+                usb_phy         = self.usb_phy,
+                pcie_data_width = 64,
+                dram_ports      = dram_ports,
+                dram_base       = main_ram_size if dram_ports is not None else 0,
+                dram_depth      = bridge_dram_depth,
+            )
+
+        # Leds -------------------------------------------------------------------------------------
+        if with_led_chaser:
+            self.leds = LedChaser(
+                pads         = platform.request_all("user_led"),
+                sys_clk_freq = sys_clk_freq)
+
+# Build --------------------------------------------------------------------------------------------
+
+def main():
+    from litex.build.parser import LiteXArgumentParser
+    parser = LiteXArgumentParser(platform=lambdaconcept_pcie_screamer.Platform, description="LiteX SoC on PCIe Screamer.")
+    parser.add_target_argument("--variant",      default="r02",             help="Board variant (r02 or m2).")
+    parser.add_target_argument("--sys-clk-freq", default=100e6, type=float, help="System clock frequency.")
+    parser.add_target_argument("--with-pcie",    action="store_true",       help="Enable PCIe support.")
+    parser.add_target_argument("--with-bridge",  action="store_true",       help="Enable PCIe <-> USB3 bridge (DDR3-buffered on R02).")
+    parser.add_target_argument("--bridge-depth", default=64, type=int,      help="Bridge DDR3 buffer depth per direction (in MB).")
+    parser.add_target_argument("--driver",       action="store_true",       help="Generate PCIe driver.")
+    args = parser.parse_args()
+
+    soc = BaseSoC(
+        variant           = args.variant,
+        sys_clk_freq      = args.sys_clk_freq,
+        with_pcie         = args.with_pcie,
+        with_bridge       = args.with_bridge,
+        bridge_dram_depth = args.bridge_depth*MEGABYTE,
+        **parser.soc_argdict
+    )
+    builder  = Builder(soc, **parser.builder_argdict)
+    if args.build:
+        builder.build(**parser.toolchain_argdict)
+
+    if args.driver:
+        generate_litepcie_software(soc, os.path.join(builder.output_dir, "driver"))
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,8 @@
 # ./limesdr_mini_v2.py --csr-csv=csr.csv --build --load
 # litex_server --jtag --jtag-config=openocd_limesdr_mini_v2.cfg
 # litex_term crossover
+# With --bone-block (SDRAM/LiteScope dumps):
+# python3 -m litex_boards.tools.bone_block --jtag --jtag-config=openocd_limesdr_mini_v2.cfg bench
 
 # loading a demo
 # ./limesdr_mini_v2.py --integrated-main-ram-size 0x8000 --load --build --uart-name=jtag_uart
@@ -29,7 +31,8 @@ from litex.soc.integration.builder import *
 from litex.soc.interconnect import stream
 
 from litex.soc.cores.led import LedChaser
-from litex.soc.cores.bitbang import I2CMaster
+from litex_boards.cores.i2c_controller import add_i2c
+from litex_boards.cores.bone_block import add_jtagbone_block
 from litex.soc.cores.usb_fifo import FT245PHYSynchronous
 
 from litescope import LiteScopeAnalyzer
@@ -76,15 +79,22 @@ class BaseSoC(SoCCore):
     def __init__(self, sys_clk_freq=80e6, toolchain="trellis",
         with_usb_fifo   = True, with_usb_fifo_loopback=False,
         with_led_chaser = True,
+        i2c_controller  = "bitbang",
+        bone_block      = False,
         **kwargs):
         platform = limesdr_mini_v2.Platform(toolchain=toolchain)
 
         # SoCCore ----------------------------------------------------------------------------------
-        if kwargs["uart_name"] != "jtag_uart":
+        with_jtagbone = kwargs["uart_name"] != "jtag_uart"
+        if with_jtagbone:
             kwargs["uart_name"]     = "crossover"
-            kwargs["with_jtagbone"] = True
+            kwargs["with_jtagbone"] = not bone_block
         SoCCore.__init__(self, platform, sys_clk_freq, ident="LiteX SoC on LimeSDR-Mini-V2", **kwargs)
 
+        # JTAGBone (Block-Transfer) ----------------------------------------------------------------
+        if with_jtagbone and bone_block:
+            add_jtagbone_block(self)
+
         # CRG --------------------------------------------------------------------------------------
         self.crg = _CRG(platform, sys_clk_freq)
 
@@ -94,7 +104,7 @@ class BaseSoC(SoCCore):
         # I2C Bus ----------------------------------------------------------------------------------
         # - Temperature Sensor (LM72   @ 0x48).
         # - Eeprom             (M24128 @ 0x50) / Not populated.
-        self.i2c = I2CMaster(platform.request("i2c"))
+        add_i2c(self, "i2c", platform.request("i2c"), controller=i2c_controller)
 
         # USB-FIFO ---------------------------------------------------------------------------------
         if with_usb_fifo:
@@ -143,11 +153,15 @@ def main():
     from litex.build.parser import LiteXArgumentParser
     parser = LiteXArgumentParser(platform=limesdr_mini_v2.Platform, description="LiteX SoC on LimeSDR-Mini-V2.")
     parser.add_target_argument("--sys-clk-freq", default=80e6, type=float, help="System clock frequency.")
+    parser.add_target_argument("--i2c-controller", default="bitbang", choices=["bitbang", "hardware"], help="I2C controller: bitbang (BIOS I2C/SPD support) or hardware (command FIFO/scripts, IRQs).")
+    parser.add_target_argument("--bone-block",     action="store_true", help="Use JTAGBone with block-transfer mode (litex_boards.tools.bone_block).")
     args = parser.parse_args()
 
     soc = BaseSoC(
         sys_clk_freq = args.sys_clk_freq,
         toolchain    = args.toolchain,
+        i2c_controller = args.i2c_controller,
+        bone_block     = args.bone_block,
         **parser.soc_argdict
     )
     builder = Builder(soc, **parser.builder_argdict)
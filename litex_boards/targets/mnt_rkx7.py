@@ -23,7 +23,7 @@ from litex.soc.interconnect.axi import *
 from litex.soc.interconnect.wishbone import *
 
 from litex.soc.cores.clock import *
-from litex.soc.cores.bitbang import I2CMaster
+from litex_boards.cores.i2c_controller import add_i2c
 from litex.soc.cores.gpio import GPIOOut
 from litex.soc.cores.video import VideoDVIPHY
 from litex.soc.cores.usb_ohci import USBOHCI
@@ -87,6 +87,7 @@ class BaseSoC(SoCCore):
         with_spi_flash = True,
         with_usb_host  = True,
         with_analyzer  = False,
+        i2c_controller = "bitbang",
         **kwargs):
         platform = mnt_rkx7.Platform()
 
@@ -139,9 +140,9 @@ class BaseSoC(SoCCore):
         self.leds = GPIOOut(gpio_signals)
 
         # Additional I2C Ports ---------------------------------------------------------------------
-        self.i2c0 = I2CMaster(platform.request("i2c", 0))
-        self.i2c1 = I2CMaster(platform.request("i2c", 1))
-        self.i2c2 = I2CMaster(platform.request("i2c", 2))
+        add_i2c(self, "i2c0", platform.request("i2c", 0), controller=i2c_controller)
+        add_i2c(self, "i2c1", platform.request("i2c", 1), controller=i2c_controller)
+        add_i2c(self, "i2c2", platform.request("i2c", 2), controller=i2c_controller)
 
         # Backlight --------------------------------------------------------------------------------
         # Motherboard display connector backlight, currently unused (the new backlight signals
@@ -210,6 +211,7 @@ def main():
     parser.add_target_argument("--sys-clk-freq",    default=100e6,  type=float,         help="System clock frequency.")
     parser.add_target_argument("--with-spi-flash",  action="store_true", default=True,  help="Enable SPI Flash (MMAPed).")
     parser.add_target_argument("--with-usb-host",   action="store_true", default=True, help="Enable USB host support.")
+    parser.add_target_argument("--i2c-controller",  default="bitbang", choices=["bitbang", "hardware"], help="I2C controller: bitbang (BIOS I2C/SPD support) or hardware (command FIFO/scripts, IRQs).")
     sdopts = parser.target_group.add_mutually_exclusive_group()
     sdopts.add_argument("--with-spi-sdcard",     action="store_true",               help="Enable SPI-mode SDCard support.")
     sdopts.add_argument("--with-sdcard",         action="store_true", default=True, help="Enable SDCard support.")
@@ -224,6 +226,7 @@ def main():
         with_etherbone = args.with_etherbone,
         with_spi_flash = args.with_spi_flash,
         with_usb_host  = args.with_usb_host,
+        i2c_controller = args.i2c_controller,
         **parser.soc_argdict
     )
     if args.with_spi_sdcard:
@@ -56,6 +56,7 @@ class BaseSoC(SoCCore):
     def __init__(self, bios_flash_offset, sys_clk_freq=24e6,
         with_led_chaser     = True,
         with_video_terminal = False,
+        xip_cache_size      = 0,
         **kwargs):
         platform = muselab_icesugar.Platform()
 
@@ -80,6 +81,11 @@ class BaseSoC(SoCCore):
         from litespi.opcodes import SpiNorFlashOpCodes as Codes
         self.add_spi_flash(mode="1x", module=W25Q64FV(Codes.READ_1_1_1), with_master=False)
 
+        # XIP Cache --------------------------------------------------------------------------------
+        if xip_cache_size:
+            from litex_boards.cores.xip_cache import add_xip_cache
+            add_xip_cache(self, name="spiflash", size=xip_cache_size)
+
         # Add ROM linker region --------------------------------------------------------------------
         self.bus.add_region("rom", SoCRegion(
             origin = self.bus.regions["spiflash"].origin + bios_flash_offset,
@@ -111,11 +117,13 @@ def main():
     parser.add_target_argument("--flash",             action="store_true",       help="Flash Bitstream.")
     parser.add_target_argument("--sys-clk-freq",      default=24e6,  type=float, help="System clock frequency.")
     parser.add_target_argument("--bios-flash-offset", default="0x40000",         help="BIOS offset in SPI Flash.")
+    parser.add_target_argument("--xip-cache-size",    default=0, type=int,       help="XIP SPI Flash cache size in bytes (0 to disable).")
     args = parser.parse_args()
 
     soc = BaseSoC(
         bios_flash_offset = int(args.bios_flash_offset, 0),
         sys_clk_freq      = args.sys_clk_freq,
+        xip_cache_size    = args.xip_cache_size,
         **parser.soc_argdict
     )
     builder = Builder(soc, **parser.builder_argdict)
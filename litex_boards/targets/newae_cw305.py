@@ -10,6 +10,8 @@
 # ./newae_cw305.py --csr-csr=csr.csv --build --load
 # litex_server --jtag --jtag-config=openocd_xc7_ft232.cfg
 # litex_term crossover
+# With --bone-block (SDRAM/LiteScope dumps):
+# python3 -m litex_boards.tools.bone_block --jtag --jtag-config=openocd_xc7_ft232.cfg bench
 
 from migen import *
 
@@ -23,6 +25,8 @@ from litex.soc.cores.led import LedChaser
 
 from litex.soc.cores.clock import *
 
+from litex_boards.cores.bone_block import add_jtagbone_block
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(LiteXModule):
@@ -58,7 +62,7 @@ class _CRG(LiteXModule):
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=100e6, with_led_chaser=True, **kwargs):
+    def __init__(self, sys_clk_freq=100e6, with_led_chaser=True, bone_block=False, **kwargs):
         platform = newae_cw305.Platform()
 
         # CRG --------------------------------------------------------------------------------------
@@ -66,9 +70,13 @@ class BaseSoC(SoCCore):
 
         # SoCCore ----------------------------------------------------------------------------------
         kwargs["uart_name"]     = "crossover"
-        kwargs["with_jtagbone"] = True
+        kwargs["with_jtagbone"] = not bone_block
         SoCCore.__init__(self, platform, sys_clk_freq, ident="LiteX SoC on NewAE-CW305", **kwargs)
 
+        # JTAGBone (Block-Transfer) ----------------------------------------------------------------
+        if bone_block:
+            add_jtagbone_block(self)
+
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
             self.leds = LedChaser(
@@ -81,11 +89,13 @@ class BaseSoC(SoCCore):
 def main():
     from litex.build.parser import LiteXArgumentParser
     parser = LiteXArgumentParser(platform=newae_cw305.Platform, description="LiteX SoC on NewAE-CW305.")
-    parser.add_target_argument("--sys-clk-freq", default=100e6, type=float, help="System clock frequency.")
+    parser.add_target_argument("--sys-clk-freq", default=100e6, type=float,   help="System clock frequency.")
+    parser.add_target_argument("--bone-block",   action="store_true",         help="Use JTAGBone with block-transfer mode (litex_boards.tools.bone_block).")
     args = parser.parse_args()
 
     soc = BaseSoC(
         sys_clk_freq = args.sys_clk_freq,
+        bone_block   = args.bone_block,
         **parser.soc_argdict
     )
     builder = Builder(soc, **parser.builder_argdict)
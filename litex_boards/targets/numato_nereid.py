@@ -20,13 +20,18 @@ from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
 
 from litex.soc.cores.clock import *
+from litex.soc.cores.pwm import PWM
+from litex.soc.cores.xadc import XADC
 
 from litedram.modules import MT8KTF51264
 from litedram.phy import s7ddrphy
+from litex_boards.tools.spd_db import get_sdram_module
 
 from litepcie.phy.s7pciephy import S7PCIEPHY
 from litepcie.software import generate_litepcie_software
 
+from litex_boards.cores.telemetry import add_telemetry, add_fan_controller
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class CRG(LiteXModule):
@@ -53,7 +58,7 @@ class CRG(LiteXModule):
 # BaseSoC -----------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=100e6, with_pcie=False, **kwargs):
+    def __init__(self, sys_clk_freq=100e6, with_pcie=False, pcie_lanes=4, pcie_speed="gen2", spd_dump=None, spd_db=None, with_telemetry=False, **kwargs):
         platform = numato_nereid.Platform()
 
         # CRG --------------------------------------------------------------------------------------
@@ -71,31 +76,57 @@ class BaseSoC(SoCCore):
                 iodelay_clk_freq = 200e6)
             self.add_sdram("sdram",
                 phy           = self.ddrphy,
-                module        = MT8KTF51264(sys_clk_freq, "1:4", speedgrade="800"),
+                module        = get_sdram_module(MT8KTF51264(sys_clk_freq, "1:4", speedgrade="800"), sys_clk_freq, spd_dump, spd_db),
                 size          = 0x40000000,
                 l2_cache_size = kwargs.get("l2_size", 8192)
             )
 
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
-            self.pcie_phy = S7PCIEPHY(platform, platform.request("pcie_x4"),
-                data_width = 128,
-                bar0_size  = 0x20000)
-            self.add_pcie(phy=self.pcie_phy, ndmas=1)
+            from litex_boards.cores.pcie import get_pcie_datapath
+            data_width, pcie_data_width, dma_buffering_depth = get_pcie_datapath(S7PCIEPHY, pcie_lanes, pcie_speed, sys_clk_freq)
+            self.pcie_phy = S7PCIEPHY(platform, platform.request(f"pcie_x{pcie_lanes}"),
+                data_width      = data_width,
+                pcie_data_width = pcie_data_width,
+                bar0_size       = 0x20000)
+            self.add_pcie(phy=self.pcie_phy, ndmas=1, dma_buffering_depth=dma_buffering_depth)
+
+        # Telemetry --------------------------------------------------------------------------------
+        if with_telemetry:
+            self.xadc = XADC()
+            # Fan speed regulated from the die temperature (half speed up to 70°C).
+            self.fan = PWM(platform.request("fan"),
+                with_csr       = False,
+                default_enable = 1,
+                default_period = 2500,
+                default_width  = 1250,
+            )
+            add_fan_controller(self, "fan_control", self.fan, self.xadc)
+            add_telemetry(self, sysmon=self.xadc, channels=[("fan_width", self.fan.width)])
 
 # Build --------------------------------------------------------------------------------------------
 
 def main():
     from litex.build.parser import LiteXArgumentParser
     parser = LiteXArgumentParser(platform=numato_nereid.Platform, description="LiteX SoC on Nereid.")
-    parser.add_target_argument("--sys-clk-freq", default=100e6,  type=float, help="System clock frequency.")
-    parser.add_target_argument("--with-pcie",    action="store_true",        help="Enable PCIe support.")
-    parser.add_target_argument("--driver",       action="store_true",        help="Generate PCIe driver.")
+    parser.add_target_argument("--sys-clk-freq",   default=100e6,  type=float, help="System clock frequency.")
+    parser.add_target_argument("--with-pcie",      action="store_true",        help="Enable PCIe support.")
+    parser.add_target_argument("--pcie-lanes",     default=4, type=int,        help="PCIe lanes.", choices=[1, 2, 4])
+    parser.add_target_argument("--pcie-speed",     default="gen2",             help="PCIe speed.", choices=["gen2"])
+    parser.add_target_argument("--driver",         action="store_true",        help="Generate PCIe driver.")
+    parser.add_target_argument("--spd-dump",                                   help="DIMM SPD dump (LiteX BIOS spdread output or binary), replaces the default SDRAM module.")
+    parser.add_target_argument("--spd-db",                                     help="DIMM from the SPD library (see litex_boards.tools.spd_db), replaces the default SDRAM module.")
+    parser.add_target_argument("--with-telemetry", action="store_true",        help="Enable XADC telemetry history and closed-loop fan control.")
     args = parser.parse_args()
 
     soc = BaseSoC(
-         sys_clk_freq = args.sys_clk_freq,
-         with_pcie    = args.with_pcie,
+         sys_clk_freq   = args.sys_clk_freq,
+         with_pcie      = args.with_pcie,
+         pcie_lanes     = args.pcie_lanes,
+         pcie_speed     = args.pcie_speed,
+         spd_dump       = args.spd_dump,
+         spd_db         = args.spd_db,
+         with_telemetry = args.with_telemetry,
          **parser.soc_argdict
     )
     builder = Builder(soc, **parser.builder_argdict)
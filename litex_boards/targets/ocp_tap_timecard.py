@@ -47,6 +47,8 @@ from litedram.phy import s7ddrphy
 from litepcie.phy.s7pciephy import S7PCIEPHY
 from litepcie.software import generate_litepcie_software
 
+from litex_boards.cores.telemetry import add_telemetry
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class CRG(LiteXModule):
@@ -79,6 +81,7 @@ class BaseSoC(SoCCore):
         with_led_chaser = True,
         with_pcie       = False,
         with_smas       = False,
+        with_telemetry  = False,
         **kwargs):
         platform = ocp_tap_timecard.Platform()
 
@@ -92,6 +95,10 @@ class BaseSoC(SoCCore):
         # XADC -------------------------------------------------------------------------------------
         self.xadc = XADC()
 
+        # Telemetry --------------------------------------------------------------------------------
+        if with_telemetry:
+            add_telemetry(self, sysmon=self.xadc)
+
         # DNA --------------------------------------------------------------------------------------
         self.dna = DNA()
         self.dna.add_timing_constraints(platform, sys_clk_freq, self.crg.cd_sys.clk)
@@ -197,12 +204,14 @@ def main():
     parser.add_target_argument("--with-pcie",    action="store_true", help="Enable PCIe support.")
     parser.add_target_argument("--with-smas",    action="store_true", help="Enable SMAs support.")
     parser.add_target_argument("--driver",       action="store_true", help="Generate PCIe driver.")
+    parser.add_target_argument("--with-telemetry", action="store_true", help="Enable XADC telemetry history.")
     args = parser.parse_args()
 
     soc = BaseSoC(
-        sys_clk_freq = args.sys_clk_freq,
-        with_pcie    = args.with_pcie,
-        with_smas    = args.with_smas,
+        sys_clk_freq   = args.sys_clk_freq,
+        with_pcie      = args.with_pcie,
+        with_smas      = args.with_smas,
+        with_telemetry = args.with_telemetry,
         **parser.soc_argdict
     )
 
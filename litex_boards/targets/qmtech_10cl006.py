@@ -26,6 +26,8 @@ from litedram.phy import GENSDRPHY, HalfRateGENSDRPHY
 from litex.soc.cores.video import VideoVGAPHY
 from liteeth.phy.mii import LiteEthPHYMII
 
+from litex_boards.cores.bone_block import add_uartbone_block
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(LiteXModule):
@@ -72,6 +74,7 @@ class BaseSoC(SoCCore):
         with_video_terminal    = False,
         with_video_framebuffer = False,
         sdram_rate             = "1:1",
+        bone_block             = False,
         **kwargs):
         platform = qmtech_10cl006.Platform(with_daughterboard=with_daughterboard)
 
@@ -85,11 +88,17 @@ class BaseSoC(SoCCore):
 
         # Interact with the sdram with uartbone by default
         kwargs["uart_name"] = "uartbone"
+        if bone_block:
+            kwargs["with_uart"] = False
         SoCCore.__init__(self, platform, sys_clk_freq,
             ident = "LiteX SoC on QMTECH 10CL006" + (" + Daughterboard" if with_daughterboard else ""),
             **kwargs
         )
 
+        # UARTBone (Block-Transfer) ----------------------------------------------------------------
+        if bone_block:
+            add_uartbone_block(self, baudrate=kwargs["uart_baudrate"])
+
         # SDR SDRAM --------------------------------------------------------------------------------
         if not self.integrated_main_ram_size:
             sdrphy_cls = HalfRateGENSDRPHY if sdram_rate == "1:2" else GENSDRPHY
@@ -118,6 +127,7 @@ def main():
     sdopts.add_argument("--with-spi-sdcard",        action="store_true", help="Enable SPI-mode SDCard support.")
     sdopts.add_argument("--with-sdcard",            action="store_true", help="Enable SDCard support.")
     parser.add_target_argument("--with-spi-flash",  action="store_true", help="Enable SPI Flash (MMAPed).")
+    parser.add_target_argument("--bone-block",      action="store_true", help="Use UARTBone with block-transfer mode (litex_boards.tools.bone_block).")
     args = parser.parse_args()
 
     soc = BaseSoC(
@@ -125,6 +135,7 @@ def main():
         with_daughterboard = args.with_daughterboard,
         with_spi_flash     = args.with_spi_flash,
         sdram_rate         = args.sdram_rate,
+        bone_block         = args.bone_block,
         **parser.soc_argdict
     )
 
@@ -14,6 +14,7 @@ from migen import *
 from litex.gen import *
 
 from litex_boards.platforms import quicklogic_quickfeather
+from litex_boards.tools.artifacts import extract_artifact
 
 from litex.soc.integration.soc import SoCRegion
 from litex.soc.integration.soc_core import *
@@ -99,8 +100,7 @@ def main():
     if args.cpu_type == "eos_s3":
         libeos_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "libeos")
         if not os.path.exists(libeos_path):
-            os.system("wget -nc https://github.com/litex-hub/litex-boards/files/7880350/libeos.zip")
-            os.system(f"unzip libeos.zip -d {libeos_path}")
+            extract_artifact("libeos.zip", libeos_path)
         builder.add_software_package("libeos", src_dir=libeos_path)
         builder.add_software_library("libeos")
     if args.build:
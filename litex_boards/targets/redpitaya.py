@@ -6,15 +6,19 @@
 # Copyright (c) 2020 Gwenhael Goavec-Merou <gwenhael.goavec-merou@trabucayre.com>
 # SPDX-License-Identifier: BSD-2-Clause
 
-import os
-
 from migen import *
+from migen.genlib.cdc import MultiReg, BusSynchronizer
 
 from litex.gen import *
 
 from litex_boards.platforms import redpitaya
+from litex_boards.tools.artifacts import copy_artifact
+
+from litex.build.io import DDROutput
 
+from litex.soc.interconnect.csr import *
 from litex.soc.interconnect import axi
+from litex.soc.interconnect import stream
 from litex.soc.interconnect import wishbone
 
 from litex.soc.cores.clock import *
@@ -23,13 +27,20 @@ from litex.soc.integration.soc import SoCRegion
 from litex.soc.integration.builder import *
 from litex.soc.cores.led import LedChaser
 
+from litex_boards.cores.axi_dma import AXIDMAWriter, AXIDMAReader
+from litex_boards.cores.decimator import CICDecimator, HalfBandDecimator
+
 # CRG ----------------------------------------------------------------------------------------------
 
 
 class _CRG(LiteXModule):
-    def __init__(self, platform, sys_clk_freq, use_ps7_clk=False):
+    def __init__(self, platform, sys_clk_freq, use_ps7_clk=False, with_adc_dac=False):
         self.rst    = Signal()
         self.cd_sys = ClockDomain()
+        if with_adc_dac:
+            self.cd_adc       = ClockDomain()
+            self.cd_dac2x     = ClockDomain()
+            self.cd_dac2x_clk = ClockDomain()
 
         # # #
 
@@ -37,24 +48,189 @@ class _CRG(LiteXModule):
             assert sys_clk_freq == 125e6
             self.comb += ClockSignal("sys").eq(ClockSignal("ps7"))
             self.comb += ResetSignal("sys").eq(ResetSignal("ps7") | self.rst)
-        else:
+
+        if (not use_ps7_clk) or with_adc_dac:
             self.pll = pll = S7PLL(speedgrade=-1)
             self.comb += pll.reset.eq(self.rst)
             pll.register_clkin(platform.request(platform.default_clk_name), platform.default_clk_freq)
-            pll.create_clkout(self.cd_sys,      sys_clk_freq)
-            platform.add_false_path_constraints(self.cd_sys.clk, pll.clkin) # Ignore sys_clk to pll.clkin path created by SoC's rst.
+            if not use_ps7_clk:
+                pll.create_clkout(self.cd_sys,      sys_clk_freq)
+                platform.add_false_path_constraints(self.cd_sys.clk, pll.clkin) # Ignore sys_clk to pll.clkin path created by SoC's rst.
+            if with_adc_dac:
+                # ADC/DAC Clks are derived from the ADC clock (DAC runs at ADC's rate).
+                pll.create_clkout(self.cd_adc,       platform.default_clk_freq)
+                pll.create_clkout(self.cd_dac2x,     2*platform.default_clk_freq)
+                pll.create_clkout(self.cd_dac2x_clk, 2*platform.default_clk_freq, phase=315)
+                platform.add_false_path_constraints(self.cd_sys.clk, self.cd_adc.clk)
+
+# ADC Streamer -------------------------------------------------------------------------------------
+
+class _ADCStreamer(LiteXModule):
+    """Capture both ADC channels to memory.
+
+    ADC samples are converted to signed 16-bit (left-justified), optionally decimated (CIC + Half-Band
+    FIR) and packed as 32-bit words (channel A in the LSBs, channel B in the MSBs) before being written
+    to memory as a ring buffer by the DMA. Samples that can't be accepted while the DMA is enabled are
+    counted in overflows.
+    """
+    def __init__(self, pads, bus, with_decimation=False):
+        self.overflows = CSRStatus(32, description="Number of ADC samples dropped (DMA not keeping up).")
+        if with_decimation:
+            self.cic_rate   = CSRStorage(11, reset=1, description="CIC decimation rate (1: bypass).")
+            self.cic_shift  = CSRStorage(6,           description="CIC gain compensation (order*log2(rate)).")
+            self.fir_enable = CSRStorage(             description="Half-Band FIR decimation by 2 enable.")
+
+        # # #
+
+        # DMA (sys).
+        self.dma = AXIDMAWriter(bus, with_csr=True)
+
+        # Enable (sys -> adc).
+        enable = Signal()
+        self.specials += MultiReg(self.dma.enable, enable, "adc")
+
+        # ADC Capture (adc).
+        self.comb += pads.cdcs.eq(1) # Clock Duty Cycle Stabilizer.
+        adc_width = len(pads.data_a)
+        channels  = []
+        for data in [pads.data_a, pads.data_b]:
+            data_r = Signal(adc_width)
+            sample = stream.Endpoint([("data", 16)])
+            self.sync.adc += data_r.eq(data)
+            # ADC front-end is inverting: Keep sign bit and invert others, then left-justify.
+            self.comb += [
+                sample.valid.eq(1),
+                sample.data[16 - adc_width:].eq(Cat(~data_r[:-1], data_r[-1])),
+            ]
+            channels.append(sample)
+
+        # Decimation (adc).
+        if with_decimation:
+            for n in range(len(channels)):
+                cic = ClockDomainsRenamer("adc")(CICDecimator(data_width=16, order=3, max_rate=1024))
+                fir = ClockDomainsRenamer("adc")(HalfBandDecimator(data_width=16))
+                self.specials += [
+                    MultiReg(self.cic_rate.storage,   cic.rate,   "adc", reset=1),
+                    MultiReg(self.cic_shift.storage,  cic.shift,  "adc"),
+                    MultiReg(self.fir_enable.storage, fir.enable, "adc"),
+                ]
+                self.comb += [
+                    channels[n].connect(cic.sink),
+                    cic.source.connect(fir.sink),
+                ]
+                self.add_module(name=f"cic{n}", module=cic)
+                self.add_module(name=f"fir{n}", module=fir)
+                channels[n] = fir.source
+
+        # Packing + CDC (adc -> sys).
+        self.cdc = cdc = stream.ClockDomainCrossing([("data", 32)], cd_from="adc", cd_to="sys", depth=64)
+        self.comb += [
+            cdc.sink.valid.eq(enable & channels[0].valid),
+            cdc.sink.data.eq(Cat(channels[0].data, channels[1].data)),
+            channels[0].ready.eq(1),
+            channels[1].ready.eq(1),
+        ]
+
+        # Overflows (adc -> sys).
+        overflows = Signal(32)
+        self.sync.adc += If(cdc.sink.valid & ~cdc.sink.ready, overflows.eq(overflows + 1))
+        self.overflows_sync = BusSynchronizer(32, "adc", "sys")
+        self.comb += self.overflows_sync.i.eq(overflows)
+        self.comb += self.overflows.status.eq(self.overflows_sync.o)
+
+        # Up-Conversion + DMA (sys).
+        self.conv = conv = stream.Converter(32, bus.data_width)
+        self.comb += [
+            cdc.source.connect(conv.sink),
+            conv.source.connect(self.dma.sink),
+        ]
+
+# DAC Player ---------------------------------------------------------------------------------------
+
+class _DACPlayer(LiteXModule):
+    """Play both DAC channels from memory.
+
+    The DMA replays the memory buffer (in loop mode for continuous playback) as 32-bit words (same
+    format than the ADC Streamer: channel A in the LSBs, channel B in the MSBs, signed 16-bit). Once
+    playback has started, missing samples are counted in underflows and the DAC is set to mid-scale.
+    """
+    def __init__(self, pads, bus):
+        self.underflows = CSRStatus(32, description="Number of DAC samples missed (DMA not keeping up).")
+
+        # # #
+
+        # DMA (sys).
+        self.dma = AXIDMAReader(bus, with_csr=True)
+
+        # Enable (sys -> adc).
+        enable = Signal()
+        self.specials += MultiReg(self.dma.enable, enable, "adc")
+
+        # Down-Conversion + CDC (sys -> adc).
+        self.conv = conv = stream.Converter(bus.data_width, 32)
+        self.cdc  = cdc  = stream.ClockDomainCrossing([("data", 32)], cd_from="sys", cd_to="adc", depth=64)
+        self.comb += [
+            self.dma.source.connect(conv.sink),
+            conv.source.connect(cdc.sink),
+        ]
+
+        # Playback/Underflows (adc).
+        started    = Signal()
+        samples    = Signal(32)
+        underflows = Signal(32)
+        self.comb += cdc.source.ready.eq(1)
+        self.sync.adc += [
+            If(~enable,
+                started.eq(0),
+                samples.eq(0),
+            ).Elif(cdc.source.valid,
+                started.eq(1),
+                samples.eq(cdc.source.data),
+            ).Elif(started,
+                samples.eq(0),
+                underflows.eq(underflows + 1),
+            )
+        ]
+        self.underflows_sync = BusSynchronizer(32, "adc", "sys")
+        self.comb += self.underflows_sync.i.eq(underflows)
+        self.comb += self.underflows.status.eq(self.underflows_sync.o)
+
+        # DAC Interface (adc/dac2x): Channels are interleaved on the data bus.
+        dac_width = len(pads.data)
+        dac_datas = []
+        for n in range(2):
+            sample = samples[16*n:16*(n + 1)]
+            dac_data = Signal(dac_width)
+            # DAC output is inverting: Keep sign bit and invert others.
+            self.sync.adc += dac_data.eq(Cat(~sample[16 - dac_width:-1], sample[-1]))
+            dac_datas.append(dac_data)
+        for i in range(dac_width):
+            self.specials += DDROutput(i1=dac_datas[1][i], i2=dac_datas[0][i], o=pads.data[i], clk=ClockSignal("adc"))
+        self.specials += [
+            DDROutput(i1=0, i2=1, o=pads.wrt, clk=ClockSignal("dac2x")),
+            DDROutput(i1=1, i2=0, o=pads.sel, clk=ClockSignal("adc")),
+            DDROutput(i1=0, i2=1, o=pads.clk, clk=ClockSignal("dac2x_clk")),
+            DDROutput(i1=ResetSignal("adc"), i2=ResetSignal("adc"), o=pads.rst, clk=ClockSignal("adc")),
+        ]
 
 # BaseSoC ------------------------------------------------------------------------------------------
 
 
 class BaseSoC(SoCCore):
-    def __init__(self, board, sys_clk_freq=100e6, with_led_chaser=True, **kwargs):
+    def __init__(self, board, sys_clk_freq=100e6, with_led_chaser=True,
+        with_adc_stream     = False,
+        with_dac_stream     = False,
+        with_adc_decimation = False,
+        **kwargs):
         platform = redpitaya.Platform(board)
 
         # CRG --------------------------------------------------------------------------------------
         use_ps7_clk  = (kwargs.get("cpu_type", None) == "zynq7000")
         sys_clk_freq = 125e6 if use_ps7_clk else sys_clk_freq
-        self.crg = _CRG(platform, sys_clk_freq, use_ps7_clk)
+        with_adc_dac = with_adc_stream or with_dac_stream
+        if with_adc_dac and not use_ps7_clk:
+            raise ValueError("ADC/DAC streaming requires the Zynq7000 CPU (--cpu-type=zynq7000).")
+        self.crg = _CRG(platform, sys_clk_freq, use_ps7_clk, with_adc_dac)
 
         # SoCCore ----------------------------------------------------------------------------------
         if kwargs["uart_name"] == "serial":
@@ -66,14 +242,36 @@ class BaseSoC(SoCCore):
 
         # Zynq7000 Integration ---------------------------------------------------------------------
         if kwargs.get("cpu_type", None) == "zynq7000":
-            # Get and set the pre-generated .xci FIXME: change location? add it to the repository?
-            os.system("wget https://kmf2.trabucayre.com/redpitaya_ps7.txt")
-            os.makedirs("xci", exist_ok=True)
-            os.system("cp redpitaya_ps7.txt xci/redpitaya_ps7.xci")
-            self.cpu.set_ps7_xci("xci/redpitaya_ps7.xci")
+            # Get and set the pre-generated .xci (from local artifact store).
+            self.cpu.set_ps7_xci(copy_artifact("redpitaya_ps7.xci", "xci/redpitaya_ps7.xci"))
 
             self.bus.add_region("flash",  SoCRegion(origin=0xFC00_0000, size=0x4_0000, mode="rwx"))
 
+            # Enable AXI HP Slaves used by ADC/DAC DMAs in the pre-generated PS7.
+            if with_adc_dac:
+                platform.toolchain.pre_synthesis_commands += [
+                    "set_property -dict [list CONFIG.PCW_USE_S_AXI_HP0 {{1}} CONFIG.PCW_USE_S_AXI_HP1 {{1}}] [get_ips redpitaya_ps7]",
+                    "generate_target all [get_ips redpitaya_ps7]",
+                    "synth_ip [get_ips redpitaya_ps7]",
+                ]
+
+        # ADC Streaming (ADC -> PS DDR through AXI HP0) --------------------------------------------
+        if with_adc_stream:
+            self.adc_stream = _ADCStreamer(
+                pads            = platform.request("adc"),
+                bus             = self.cpu.add_axi_hp_slave(),
+                with_decimation = with_adc_decimation,
+            )
+
+        # DAC Streaming (PS DDR -> DAC through AXI HP1) --------------------------------------------
+        if with_dac_stream:
+            if not with_adc_stream:
+                self.cpu.add_axi_hp_slave() # Keep DAC on HP1.
+            self.dac_stream = _DACPlayer(
+                pads = platform.request("dac"),
+                bus  = self.cpu.add_axi_hp_slave(),
+            )
+
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
             self.leds = LedChaser(
@@ -88,11 +286,17 @@ def main():
     parser = LiteXArgumentParser(platform=redpitaya.Platform, description="LiteX SoC on Zedboard.")
     parser.add_target_argument("--sys-clk-freq", default=100e6, type=float, help="System clock frequency.")
     parser.add_target_argument("--board",        default="redpitaya14",     help="Board type (redpitaya14 or redpitaya16).")
+    parser.add_target_argument("--with-adc-stream",     action="store_true", help="Enable ADC streaming to PS DDR (requires Zynq7000 CPU).")
+    parser.add_target_argument("--with-dac-stream",     action="store_true", help="Enable DAC playback from PS DDR (requires Zynq7000 CPU).")
+    parser.add_target_argument("--with-adc-decimation", action="store_true", help="Enable CIC/Half-Band FIR decimation on ADC stream.")
     args = parser.parse_args()
 
     soc = BaseSoC(
-        board        = args.board,
-        sys_clk_freq = args.sys_clk_freq,
+        board               = args.board,
+        sys_clk_freq        = args.sys_clk_freq,
+        with_adc_stream     = args.with_adc_stream,
+        with_dac_stream     = args.with_dac_stream,
+        with_adc_decimation = args.with_adc_decimation,
         **parser.soc_argdict
     )
     builder = Builder(soc, **parser.builder_argdict)
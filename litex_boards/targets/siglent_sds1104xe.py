@@ -30,6 +30,19 @@
 # Or
 # litex_term crossover # to have access to LiteX bios
 #
+#
+# With Scope Acquisition ---------------------------------------------------------------------------
+# The front-end ADC interface is not described in the platform: the acquisition can only be built
+# with a triangle test pattern as sample source (--scope-test-pattern) to validate the trigger,
+# DDR3 ring buffer and UDP streaming, not to capture the analog inputs.
+#
+# Build/Load bitstream:
+# ./siglent_sds1104xe.py --with-etherbone --with-scope --scope-test-pattern --uart-name=crossover --csr-csv=csr.csv --build --load
+#
+# Capture triggered records (DDR3 ring buffer) and receive them over UDP:
+# litex_server --udp --udp-ip=192.168.1.50 &
+# python3 -m litex_boards.tools.scope_capture --csr-csv=csr.csv --records=100
+#
 # --------------------------------------------------------------------------------------------------
 
 from migen import *
@@ -38,6 +51,7 @@ from litex.gen import *
 
 from litex_boards.platforms import siglent_sds1104xe
 
+from litex.soc.interconnect import stream
 from litex.soc.cores.clock import *
 from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
@@ -77,6 +91,26 @@ class _CRG(LiteXModule):
 
         self.idelayctrl = S7IDELAYCTRL(self.cd_idelay)
 
+# Scope Test Pattern -------------------------------------------------------------------------------
+
+class _ScopeTestPattern(LiteXModule):
+    """Triangle test pattern (nsamples 8-bit samples per cycle), sample source of the Scope
+    Acquisition until the front-end ADC interface is described in the platform."""
+    def __init__(self, nsamples=8, step=1):
+        self.source = source = stream.Endpoint([("data", nsamples*8)])
+
+        # # #
+
+        phase = Signal(10)
+        self.sync += phase.eq(phase + nsamples*step)
+        self.comb += source.valid.eq(1)
+        for n in range(nsamples):
+            p = Signal(10)
+            self.comb += [
+                p.eq(phase + n*step),
+                source.data[8*n:8*(n + 1)].eq(Mux(p[9], ~p[1:9], p[1:9])),
+            ]
+
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
@@ -85,6 +119,9 @@ class BaseSoC(SoCCore):
         eth_ip                 = "192.168.1.50",
         with_video_terminal    = False,
         with_video_framebuffer = False,
+        with_scope             = False,
+        scope_test_pattern     = False,
+        scope_ip               = "192.168.1.100",
         **kwargs):
         platform = siglent_sds1104xe.Platform()
 
@@ -117,15 +154,60 @@ class BaseSoC(SoCCore):
                 pads       = self.platform.request("eth"),
             )
 
-            # Etherbone.
+            # Etherbone (32-bit datapath with Scope's UDP Streamer).
             self.add_etherbone(
                 phy         = self.ethphy,
                 ip_address  = "192.168.1.50",
                 mac_address = 0x10e2d5000000,
-                data_width  = 8,
+                data_width  = 32 if with_scope else 8,
                 with_ethmac = True,
             )
 
+        # Scope Acquisition ------------------------------------------------------------------------
+        if with_scope:
+            from litex_boards.cores.scope import ScopeRecorder, ScopeStreamer
+            if not (with_etherbone and hasattr(self, "sdram")):
+                raise ValueError("Scope Acquisition: requires Etherbone (UDP Streamer) and DDR3 SDRAM (Ring Buffer).")
+            if not scope_test_pattern:
+                raise ValueError("Scope Acquisition: front-end ADC interface not described in platform, "
+                    "only the test pattern sample source (scope_test_pattern) is supported.")
+
+            # Ring Buffer in the upper half of the DRAM, lower half is left to the CPU.
+            ring_base = self.bus.regions["main_ram"].size//2
+            ring_size = self.bus.regions["main_ram"].size//2
+
+            # Sample Source (Test pattern).
+            self.scope_pattern = _ScopeTestPattern(nsamples=8)
+
+            # Recorder (Trigger + DDR3 Ring Buffer).
+            self.scope = ScopeRecorder(self.sdram.crossbar.get_port(mode="write"),
+                base         = ring_base,
+                size         = ring_size,
+                sample_width = 8,
+                nsamples     = 8,
+            )
+            self.comb += self.scope_pattern.source.connect(self.scope.sink)
+            self.add_constant("SCOPE_WORD_BYTES", self.scope.word_bytes)
+
+            # Streamer (Records over UDP).
+            self.scope_streamer = ScopeStreamer(self.sdram.crossbar.get_port(mode="read"),
+                udp_port = self.ethcore_etherbone.udp.crossbar.get_port(2000, dw=32),
+                base     = ring_base,
+                size     = ring_size,
+                dst_ip   = scope_ip,
+                dst_port = 2000,
+            )
+
+            # Continuous Mode: Stream record when done and re-arm when streamed.
+            done_d = Signal()
+            self.sync += done_d.eq(self.scope.done)
+            self.comb += [
+                self.scope_streamer.offset.eq(self.scope.start),
+                self.scope_streamer.length.eq(self.scope.count),
+                self.scope_streamer.start.eq(self.scope_streamer.auto & self.scope.done & ~done_d),
+                self.scope.arm.eq(self.scope_streamer.auto & self.scope_streamer.done),
+            ]
+
         # Video ------------------------------------------------------------------------------------
         video_timings = ("800x480@60Hz", {
             "pix_clk"       : 33.3e6,
@@ -150,20 +232,26 @@ class BaseSoC(SoCCore):
 def main():
     from litex.build.parser import LiteXArgumentParser
     parser = LiteXArgumentParser(platform=siglent_sds1104xe.Platform, description="LiteX SoC on SDS1104X-E.")
-    parser.add_target_argument("--sys-clk-freq",   default=100e6, type=float, help="System clock frequency.")
-    parser.add_target_argument("--with-etherbone", action="store_true",       help="Enable Etherbone support.")
-    parser.add_target_argument("--eth-ip",         default="192.168.1.50",     help="Ethernet/Etherbone IP address.")
+    parser.add_target_argument("--sys-clk-freq",       default=100e6, type=float, help="System clock frequency.")
+    parser.add_target_argument("--with-etherbone",     action="store_true",       help="Enable Etherbone support.")
+    parser.add_target_argument("--eth-ip",             default="192.168.1.50",    help="Ethernet/Etherbone IP address.")
     viopts = parser.target_group.add_mutually_exclusive_group()
     viopts.add_argument("--with-video-terminal",    action="store_true", help="Enable Video Terminal (HDMI).")
     viopts.add_argument("--with-video-framebuffer", action="store_true", help="Enable Video Framebuffer (HDMI).")
+    parser.add_target_argument("--with-scope",         action="store_true",       help="Enable Scope Acquisition (Trigger, DDR3 ring buffer, UDP streamer), test pattern only: does not capture from the ADC (requires --with-etherbone and --scope-test-pattern).")
+    parser.add_target_argument("--scope-test-pattern", action="store_true",       help="Use a test pattern as Scope sample source (required, ADC interface not supported).")
+    parser.add_target_argument("--scope-ip",           default="192.168.1.100",   help="Scope UDP Streamer destination IP address.")
     args = parser.parse_args()
 
     soc = BaseSoC(
-        sys_clk_freq   = args.sys_clk_freq,
-        with_etherbone = args.with_etherbone,
-        eth_ip         = args.eth_ip,
+        sys_clk_freq           = args.sys_clk_freq,
+        with_etherbone         = args.with_etherbone,
+        eth_ip                 = args.eth_ip,
         with_video_terminal    = args.with_video_terminal,
         with_video_framebuffer = args.with_video_framebuffer,
+        with_scope             = args.with_scope,
+        scope_test_pattern     = args.scope_test_pattern,
+        scope_ip               = args.scope_ip,
         **parser.soc_argdict
     )
 
@@ -28,6 +28,8 @@
 # 4) Start litex_server at 1MBps (CH552 does not seem to work at traditional baudrates...):
 # litex_server --uart --uart-port=/dev/ttyUSBX --uart-baudrate=1000000
 # 5) Test UARTBone ex: litex_cli --regs
+# With --bone-block (block-transfer UARTBone, same CH552 patch required):
+# python3 -m litex_boards.tools.bone_block --uart --uart-port=/dev/ttyUSBX --uart-baudrate=1000000 dump --base=<address> --length=<bytes> dump.bin
 
 from migen import *
 
@@ -40,6 +42,8 @@ from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
 from litex.soc.cores.led import LedChaser
 
+from litex_boards.cores.bone_block import add_uartbone_block
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(LiteXModule):
@@ -62,7 +66,7 @@ class _CRG(LiteXModule):
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCMini):
-    def __init__(self, toolchain="gowin", sys_clk_freq=48e6, with_led_chaser=True, **kwargs):
+    def __init__(self, toolchain="gowin", sys_clk_freq=48e6, with_led_chaser=True, bone_block=False, **kwargs):
         platform = sipeed_tang_nano.Platform(toolchain=toolchain)
 
         # CRG --------------------------------------------------------------------------------------
@@ -71,9 +75,13 @@ class BaseSoC(SoCMini):
         # SoCMini ----------------------------------------------------------------------------------
         kwargs["uart_name"]     = "crossover"
         kwargs["uart_baudrate"] = 1e6 # CH552 firmware does not support traditional baudrates.
-        kwargs["with_uartbone"] = True
+        kwargs["with_uartbone"] = not bone_block
         SoCMini.__init__(self, platform, sys_clk_freq, ident="LiteX SoC on Tang Nano", **kwargs)
 
+        # UARTBone (Block-Transfer) ----------------------------------------------------------------
+        if bone_block:
+            add_uartbone_block(self, baudrate=kwargs["uart_baudrate"])
+
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
             self.leds = LedChaser(
@@ -87,11 +95,13 @@ def main():
     parser = LiteXArgumentParser(platform=sipeed_tang_nano.Platform, description="LiteX SoC on Tang Nano.")
     parser.add_target_argument("--flash",       action="store_true",      help="Flash Bitstream.")
     parser.add_target_argument("--sys-clk-freq",default=48e6, type=float, help="System clock frequency.")
+    parser.add_target_argument("--bone-block",  action="store_true",      help="Use UARTBone with block-transfer mode (litex_boards.tools.bone_block).")
     args = parser.parse_args()
 
     soc = BaseSoC(
         toolchain    = args.toolchain,
         sys_clk_freq = args.sys_clk_freq,
+        bone_block   = args.bone_block,
         **parser.soc_argdict
     )
 
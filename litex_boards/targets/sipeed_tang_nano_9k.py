@@ -12,6 +12,7 @@ from migen import *
 from litex.gen import *
 
 from litex_boards.platforms import sipeed_tang_nano_9k
+from litex_boards.tools.artifacts import copy_artifact
 
 from litex.soc.cores.clock.gowin_gw1n import GW1NPLL
 from litex.soc.integration.soc_core import *
@@ -108,8 +109,7 @@ class BaseSoC(SoCCore):
             self.comb += ck_n[0].eq(~hyperram_pads.clk)
             # FIXME: Issue with upstream HyperRAM core, so use old one. Need to investigate.
             if not os.path.exists("hyperbus.py"):
-                os.system("wget https://github.com/litex-hub/litex-boards/files/8831568/hyperbus.py.txt")
-                os.system("mv hyperbus.py.txt hyperbus.py")
+                copy_artifact("hyperbus.py", "hyperbus.py")
             from hyperbus import HyperRAM
             self.hyperram = HyperRAM(hyperram_pads)
             self.bus.add_slave("main_ram", slave=self.hyperram.bus, region=SoCRegion(origin=self.mem_map["main_ram"], size=4 * MEGABYTE, mode="rwx"))
@@ -22,7 +22,7 @@ from litex.soc.cores.clock import *
 from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
 from litex.soc.cores.led import LedChaser
-from litex.soc.cores.bitbang import I2CMaster
+from litex_boards.cores.i2c_controller import add_i2c
 from litex.soc.cores.video   import VideoS7HDMIPHY
 
 from litedram.modules import MT8JTF12864
@@ -80,6 +80,7 @@ class BaseSoC(SoCCore):
         with_video_colorbars   = False,
         with_video_framebuffer = False,
         with_video_terminal    = False,
+        i2c_controller         = "bitbang",
         **kwargs):
         platform = sitlinv_stlv7325_v2.Platform(vccio)
 
@@ -159,7 +160,7 @@ class BaseSoC(SoCCore):
                 sys_clk_freq = sys_clk_freq)
 
         # I2C --------------------------------------------------------------------------------------
-        self.i2c = I2CMaster(platform.request("i2c"))
+        add_i2c(self, "i2c", platform.request("i2c"), controller=i2c_controller)
 
 # Build --------------------------------------------------------------------------------------------
 
@@ -173,6 +174,7 @@ def main():
     parser.add_target_argument("--with-ethernet",   action="store_true",    help="Enable Ethernet support.")
     parser.add_target_argument("--with-sata",       action="store_true",    help="Enable SATA support.")
     parser.add_target_argument("--sata-gen",        default="2",    help="SATA Gen..", choices=["1", "2", "3"])
+    parser.add_target_argument("--i2c-controller",  default="bitbang", choices=["bitbang", "hardware"], help="I2C controller: bitbang (BIOS I2C/SPD support) or hardware (command FIFO/scripts, IRQs).")
     sdopts = parser.target_group.add_mutually_exclusive_group()
     sdopts.add_argument("--with-spi-sdcard", action="store_true", help="Enable SPI-mode SDCard support.")
     sdopts.add_argument("--with-sdcard",     action="store_true", help="Enable SDCard support.")
@@ -192,6 +194,7 @@ def main():
         with_video_colorbars   = args.with_video_colorbars,
         with_video_framebuffer = args.with_video_framebuffer,
         with_video_terminal    = args.with_video_terminal,
+        i2c_controller         = args.i2c_controller,
         **parser.soc_argdict
     )
     if args.with_spi_sdcard:
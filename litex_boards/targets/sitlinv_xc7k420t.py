@@ -25,7 +25,7 @@ from litex.soc.cores.clock import *
 from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
 from litex.soc.cores.led import LedChaser
-from litex.soc.cores.bitbang import I2CMaster
+from litex_boards.cores.i2c_controller import add_i2c
 
 from litedram.phy import s7ddrphy
 from litedram.common import PHYPadsReducer
@@ -70,6 +70,7 @@ class BaseSoC(SoCCore):
         with_led_chaser = True,
         with_pcie       = False,
         with_sata       = False,
+        i2c_controller  = "bitbang",
         **kwargs):
         platform = sitlinv_xc7k420t.Platform(io_voltage)
 
@@ -133,7 +134,7 @@ class BaseSoC(SoCCore):
                 sys_clk_freq = sys_clk_freq)
 
         # I2C --------------------------------------------------------------------------------------
-        self.i2c = I2CMaster(platform.request("i2c"))
+        add_i2c(self, "i2c", platform.request("i2c"), controller=i2c_controller)
 
 # Build --------------------------------------------------------------------------------------------
 
@@ -145,6 +146,7 @@ def main():
     parser.add_target_argument("--with-pcie",       action="store_true",       help="Enable PCIe support.")
     parser.add_target_argument("--driver",          action="store_true",       help="Generate PCIe driver.")
     parser.add_target_argument("--with-sata",       action="store_true",       help="Enable SATA support.")
+    parser.add_target_argument("--i2c-controller",  default="bitbang", choices=["bitbang", "hardware"], help="I2C controller: bitbang (BIOS I2C/SPD support) or hardware (command FIFO/scripts, IRQs).")
     args = parser.parse_args()
 
     soc = BaseSoC(
@@ -152,6 +154,7 @@ def main():
         io_voltage     = args.io_voltage,
         with_pcie      = args.with_pcie,
         with_sata      = args.with_sata,
+        i2c_controller = args.i2c_controller,
         **parser.soc_argdict
     )
     builder = Builder(soc, **parser.builder_argdict)
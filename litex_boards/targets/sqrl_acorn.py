@@ -46,6 +46,8 @@ from litedram.phy import s7ddrphy
 from litepcie.phy.s7pciephy import S7PCIEPHY
 from litepcie.software import generate_litepcie_software
 
+from litex_boards.cores.telemetry import add_telemetry
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class CRG(LiteXModule):
@@ -78,6 +80,7 @@ class BaseSoC(SoCCore):
         with_led_chaser = True,
         with_pcie       = False,
         with_sata       = False,
+        with_telemetry  = False,
         **kwargs):
         platform = sqrl_acorn.Platform(variant=variant)
 
@@ -90,6 +93,10 @@ class BaseSoC(SoCCore):
         # XADC -------------------------------------------------------------------------------------
         self.xadc = XADC()
 
+        # Telemetry --------------------------------------------------------------------------------
+        if with_telemetry:
+            add_telemetry(self, sysmon=self.xadc)
+
         # DNA --------------------------------------------------------------------------------------
         self.dna = DNA()
         self.dna.add_timing_constraints(platform, sys_clk_freq, self.crg.cd_sys.clk)
@@ -174,20 +181,23 @@ def main():
     from litex.build.parser import LiteXArgumentParser
     parser = LiteXArgumentParser(platform=sqrl_acorn.Platform, description="LiteX SoC on Acorn CLE-101/215(+).")
     parser.add_target_argument("--flash",           action="store_true",       help="Flash bitstream.")
+    parser.add_target_argument("--flash-diff",      default=None, metavar="DEVICE", help="Only rewrite changed SPI Flash sectors (with --flash), DEVICE: board ID (sector cache key, ex board serial).")
     parser.add_target_argument("--variant",         default="cle-215+",        help="Board variant (cle-215+, cle-215 or cle-101).")
     parser.add_target_argument("--sys-clk-freq",    default=100e6, type=float, help="System clock frequency.")
     pcieopts = parser.target_group.add_mutually_exclusive_group()
     pcieopts.add_argument("--with-pcie",            action="store_true", help="Enable PCIe support.")
     parser.add_target_argument("--driver",          action="store_true", help="Generate PCIe driver.")
     parser.add_target_argument("--with-spi-sdcard", action="store_true", help="Enable SPI-mode SDCard support (requires SDCard adapter on P2).")
+    parser.add_target_argument("--with-telemetry",  action="store_true", help="Enable XADC telemetry history.")
     pcieopts.add_argument("--with-sata",            action="store_true", help="Enable SATA support (over PCIe2SATA).")
     args = parser.parse_args()
 
     soc = BaseSoC(
-        variant      = args.variant,
-        sys_clk_freq = args.sys_clk_freq,
-        with_pcie    = args.with_pcie,
-        with_sata    = args.with_sata,
+        variant        = args.variant,
+        sys_clk_freq   = args.sys_clk_freq,
+        with_pcie      = args.with_pcie,
+        with_sata      = args.with_sata,
+        with_telemetry = args.with_telemetry,
         **parser.soc_argdict
     )
     if args.with_spi_sdcard:
@@ -206,6 +216,9 @@ def main():
 
     if args.flash:
         prog = soc.platform.create_programmer()
+        if args.flash_diff is not None:
+            from litex_boards.tools.diff_flash import DiffFlash
+            prog = DiffFlash(prog, device=args.flash_diff)
         prog.flash(0, builder.get_bitstream_filename(mode="flash"))
 
 if __name__ == "__main__":
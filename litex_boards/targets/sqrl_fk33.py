@@ -10,6 +10,8 @@
 # python3 -m litex_boards.targets.sqrl_fk33 --with-hbm --sys-clk-freq=250e6 --csr-csv=csr.csv --build --load
 # litex_server --jtag --jtag-config=openocd_xc7_ft2232.cfg --jtag-chain=2
 # litex_term crossover
+# With --bone-block (HBM2/LiteScope dumps):
+# python3 -m litex_boards.tools.bone_block --jtag --jtag-config=openocd_xc7_ft2232.cfg --jtag-chain=2 bench
 
 import os
 
@@ -18,6 +20,8 @@ from migen import *
 from litex.gen import *
 
 from litex_boards.platforms import sqrl_fk33
+from litex_boards.tools.artifacts import copy_artifact
+from litex_boards.cores.bone_block import add_jtagbone_block
 
 from litex.soc.cores.clock import *
 from litex.soc.integration.soc_core import *
@@ -62,6 +66,7 @@ class BaseSoC(SoCCore):
         with_led_chaser = True,
         with_pcie       = False,
         with_hbm        = False,
+        bone_block      = False,
         **kwargs):
         platform = sqrl_fk33.Platform()
         if with_hbm:
@@ -73,19 +78,21 @@ class BaseSoC(SoCCore):
         # SoCCore ----------------------------------------------------------------------------------
         if kwargs.get("uart_name", "serial") == "serial":
             kwargs["uart_name"] = "crossover" # Defaults to Crossover-UART.
-        kwargs["with_jtagbone"]  = True
+        kwargs["with_jtagbone"]  = not bone_block
         kwargs["jtagbone_chain"] = 2 # Chain 1 already used by HBM2 debug probes.
         SoCCore.__init__(self, platform, sys_clk_freq, ident="LiteX SoC on FK33", **kwargs)
 
+        # JTAGBone (Block-Transfer) ----------------------------------------------------------------
+        if bone_block:
+            add_jtagbone_block(self, chain=2)
+
         # HBM --------------------------------------------------------------------------------------
         if with_hbm:
             # Add HBM Core.
             self.hbm = hbm = ClockDomainsRenamer({"axi": "sys"})(USPHBM2(platform))
 
             # Get HBM .xci.
-            os.system("wget https://github.com/litex-hub/litex-boards/files/8178874/hbm_0.xci.txt")
-            os.makedirs("ip/hbm", exist_ok=True)
-            os.system("mv hbm_0.xci.txt ip/hbm/hbm_0.xci")
+            copy_artifact("fk33_hbm_0.xci", "ip/hbm/hbm_0.xci")
 
             # Connect four of the HBM's AXI interfaces to the main bus of the SoC.
             for i in range(4):
@@ -145,12 +152,14 @@ def main():
     parser.add_target_argument("--with-pcie",    action="store_true",       help="Enable PCIe support.")
     parser.add_target_argument("--with-hbm",     action="store_true",       help="Use HBM2.")
     parser.add_target_argument("--driver",       action="store_true",       help="Generate PCIe driver.")
+    parser.add_target_argument("--bone-block",   action="store_true",       help="Use JTAGBone with block-transfer mode (litex_boards.tools.bone_block).")
     args = parser.parse_args()
 
     soc = BaseSoC(
         sys_clk_freq = args.sys_clk_freq,
         with_pcie    = args.with_pcie,
         with_hbm     = args.with_hbm,
+        bone_block   = args.bone_block,
         **parser.soc_argdict
     )
     builder = Builder(soc, **parser.builder_argdict)
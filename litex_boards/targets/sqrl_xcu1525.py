@@ -22,6 +22,9 @@ from litex.soc.cores.led import LedChaser
 
 from litedram.modules import MT40A512M8
 from litedram.phy import usddrphy
+from litex_boards.tools.spd_db import get_sdram_module
+from litex_boards.tools.cpu_presets import add_cpu_preset_argument
+from litex_boards.tools.board_sim import add_board_sim_arguments, run_board_sim
 
 from litepcie.phy.usppciephy import USPPCIEPHY
 from litepcie.software import generate_litepcie_software
@@ -62,6 +65,8 @@ class BaseSoC(SoCCore):
         with_led_chaser = True,
         with_pcie       = False,
         with_sata       = False,
+        spd_dump        = None,
+        spd_db          = None,
         **kwargs):
         platform = sqrl_xcu1525.Platform()
 
@@ -80,7 +85,7 @@ class BaseSoC(SoCCore):
                 iodelay_clk_freq = 500e6)
             self.add_sdram("sdram",
                 phy           = self.ddrphy,
-                module        = MT40A512M8(sys_clk_freq, "1:4"),
+                module        = get_sdram_module(MT40A512M8(sys_clk_freq, "1:4"), sys_clk_freq, spd_dump, spd_db),
                 size          = 0x40000000,
                 l2_cache_size = kwargs.get("l2_size", 8192)
             )
@@ -143,6 +148,10 @@ def main():
     parser.add_target_argument("--with-pcie",     action="store_true",       help="Enable PCIe support.")
     parser.add_target_argument("--driver",        action="store_true",       help="Generate PCIe driver.")
     parser.add_target_argument("--with-sata",     action="store_true",       help="Enable SATA support (over SFP2SATA).")
+    parser.add_target_argument("--spd-dump",                                 help="DIMM SPD dump (LiteX BIOS spdread output or binary), replaces the default SDRAM module.")
+    parser.add_target_argument("--spd-db",                                   help="DIMM from the SPD library (see litex_boards.tools.spd_db), replaces the default SDRAM module.")
+    add_cpu_preset_argument(parser, dram_data_width=512, presets=["smp2", "smp4", "smp8"]) # USPDDRPHY, 64-bit DDR4.
+    add_board_sim_arguments(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
@@ -150,8 +159,15 @@ def main():
         ddram_channel = int(args.ddram_channel, 0),
         with_pcie     = args.with_pcie,
         with_sata     = args.with_sata,
+        spd_dump      = args.spd_dump,
+        spd_db        = args.spd_db,
         **parser.soc_argdict
 	)
+
+    if args.sim:
+        run_board_sim(soc, args, parser.builder_argdict)
+        return
+
     builder = Builder(soc, **parser.builder_argdict)
     if args.build:
         builder.build(**parser.toolchain_argdict)
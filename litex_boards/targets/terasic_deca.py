@@ -23,6 +23,8 @@ from litex.soc.cores.led import LedChaser
 
 from liteeth.phy.mii import LiteEthPHYMII
 
+from litex_boards.cores.bone_block import add_uartbone_block, add_jtagbone_block
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(LiteXModule):
@@ -64,6 +66,7 @@ class BaseSoC(SoCCore):
         with_etherbone      = False,
         eth_ip              = "192.168.1.50",
         eth_dynamic_ip      = False,
+        bone_block          = False,
         **kwargs):
         self.platform = platform = terasic_deca.Platform()
 
@@ -80,8 +83,20 @@ class BaseSoC(SoCCore):
                 kwargs["uart_name"] = "jtag_uart"
         if kwargs["with_uartbone"]:
             kwargs["uart_name"] = "crossover"
+        with_uartbone = kwargs["with_uartbone"]
+        with_jtagbone = kwargs["with_jtagbone"]
+        if bone_block:
+            kwargs["with_uartbone"] = False
+            kwargs["with_jtagbone"] = False
         SoCCore.__init__(self, platform, sys_clk_freq, ident="LiteX SoC on Terasic DECA", **kwargs)
 
+        # UARTBone/JTAGBone (Block-Transfer) -------------------------------------------------------
+        if bone_block:
+            if with_uartbone:
+                add_uartbone_block(self, baudrate=kwargs["uart_baudrate"])
+            if with_jtagbone:
+                add_jtagbone_block(self, chain=kwargs["jtagbone_chain"])
+
         # Ethernet ---------------------------------------------------------------------------------
         if with_ethernet or with_etherbone:
             self.platform.toolchain.additional_sdc_commands += [
@@ -141,6 +156,7 @@ def main():
     parser.add_target_argument("--eth-dynamic-ip",      action="store_true",    help="Enable dynamic Ethernet IP addresses setting.")
     parser.add_target_argument("--with-video-terminal", action="store_true",    help="Enable Video Terminal (VGA).")
     parser.add_target_argument("--with-spi-sdcard",     action="store_true",    help="Enable SPI SD card controller.")
+    parser.add_target_argument("--bone-block",          action="store_true",    help="Use block-transfer mode for --with-uartbone/--with-jtagbone (litex_boards.tools.bone_block).")
     args = parser.parse_args()
 
     soc = BaseSoC(
@@ -151,6 +167,7 @@ def main():
         eth_dynamic_ip      = args.eth_dynamic_ip,
         with_video_terminal = args.with_video_terminal,
         with_spi_sdcard     = args.with_spi_sdcard,
+        bone_block          = args.bone_block,
         **parser.soc_argdict
     )
     builder = Builder(soc, **parser.builder_argdict)
@@ -22,7 +22,7 @@ from litex.soc.cores.led import LedChaser
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, bios_flash_offset, sys_clk_freq=16e6, with_led_chaser=True, **kwargs):
+    def __init__(self, bios_flash_offset, sys_clk_freq=16e6, with_led_chaser=True, xip_cache_size=0, **kwargs):
         platform = tinyfpga_bx.Platform()
 
         # CRG --------------------------------------------------------------------------------------
@@ -38,6 +38,11 @@ class BaseSoC(SoCCore):
         from litespi.opcodes import SpiNorFlashOpCodes as Codes
         self.add_spi_flash(mode="1x", module=AT25SF081(Codes.READ_1_1_1), with_master=False)
 
+        # XIP Cache --------------------------------------------------------------------------------
+        if xip_cache_size:
+            from litex_boards.cores.xip_cache import add_xip_cache
+            add_xip_cache(self, name="spiflash", size=xip_cache_size)
+
         # Add ROM linker region --------------------------------------------------------------------
         self.bus.add_region("rom", SoCRegion(
             origin = self.bus.regions["spiflash"].origin + bios_flash_offset,
@@ -59,11 +64,13 @@ def main():
     parser = LiteXArgumentParser(platform=tinyfpga_bx.Platform, description="LiteX SoC on TinyFPGA BX.")
     parser.add_target_argument("--bios-flash-offset", default="0x50000",         help="BIOS offset in SPI Flash.")
     parser.add_target_argument("--sys-clk-freq",      default=16e6, type=float,  help="System clock frequency.")
+    parser.add_target_argument("--xip-cache-size",    default=0, type=int,       help="XIP SPI Flash cache size in bytes (0 to disable).")
     args = parser.parse_args()
 
     soc = BaseSoC(
          bios_flash_offset = int(args.bios_flash_offset, 0),
          sys_clk_freq      = args.sys_clk_freq,
+         xip_cache_size    = args.xip_cache_size,
          **parser.soc_argdict
     )
     builder = Builder(soc, **parser.builder_argdict)
@@ -24,6 +24,9 @@ from litex.soc.integration.builder import *
 from litex.soc.cores.led import LedChaser
 from litedram.modules import MTA18ASF2G72PZ
 from litedram.phy import usddrphy
+from litex_boards.tools.spd_db import get_sdram_module
+from litex_boards.tools.cpu_presets import add_cpu_preset_argument
+from litex_boards.tools.board_sim import add_board_sim_arguments, run_board_sim
 
 from litepcie.phy.usppciephy import USPPCIEPHY
 from litepcie.software import generate_litepcie_software
@@ -60,7 +63,14 @@ class _CRG(LiteXModule):
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=125e6, with_led_chaser=True, with_pcie=False, **kwargs):
+    def __init__(self, sys_clk_freq=125e6, with_led_chaser=True, with_pcie=False, pcie_lanes=4, pcie_speed="gen3",
+        with_qsfp_ethernet = False,
+        qsfp_cages         = 1,
+        qsfp_ip_address    = "192.168.10.50",
+        qsfp_dma           = "dram",
+        spd_dump           = None,
+        spd_db             = None,
+        **kwargs):
         platform = xilinx_alveo_u250.Platform()
 
         # CRG --------------------------------------------------------------------------------------
@@ -79,7 +89,7 @@ class BaseSoC(SoCCore):
                 is_rdimm         = True)
             self.add_sdram("sdram",
                 phy           = self.ddrphy,
-                module        = MTA18ASF2G72PZ(sys_clk_freq, "1:4"),
+                module        = get_sdram_module(MTA18ASF2G72PZ(sys_clk_freq, "1:4"), sys_clk_freq, spd_dump, spd_db),
                 size          = 0x40000000,
                 l2_cache_size = kwargs.get("l2_size", 8192)
             )
@@ -89,10 +99,64 @@ class BaseSoC(SoCCore):
 
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
-            self.pcie_phy = USPPCIEPHY(platform, platform.request("pcie_x4"),
-                data_width = 128,
-                bar0_size  = 0x20000)
-            self.add_pcie(phy=self.pcie_phy, ndmas=1)
+            from litex_boards.cores.pcie import get_pcie_datapath
+            data_width, pcie_data_width, dma_buffering_depth = get_pcie_datapath(USPPCIEPHY, pcie_lanes, pcie_speed, sys_clk_freq)
+            self.pcie_phy = USPPCIEPHY(platform, platform.request(f"pcie_x{pcie_lanes}"),
+                speed           = pcie_speed,
+                data_width      = data_width,
+                pcie_data_width = pcie_data_width,
+                bar0_size       = 0x20000)
+            ndmas = 4*qsfp_cages if (with_qsfp_ethernet and qsfp_dma == "pcie") else 1
+            self.add_pcie(phy=self.pcie_phy, ndmas=ndmas, dma_buffering_depth=dma_buffering_depth)
+
+        # QSFP28 Ethernet (4x10GBASE-R per cage, UDP capture/replay to DDR4 or PCIe DMA) -----------
+        if with_qsfp_ethernet:
+            from liteiclink.serdes.gty_ultrascale import GTYQuadPLL
+            from litex_boards.cores.baser import LiteEthPHY10GBASER, get_lane_pads, get_quad_pll_channels
+            from litex_boards.cores.udp_streamer import add_udp_streamer
+            assert qsfp_dma == "dram" or with_pcie
+            ip_address = int.from_bytes(bytes(int(b) for b in qsfp_ip_address.split(".")), "big")
+            for cage in range(qsfp_cages):
+                qsfp_pads = platform.request("qsfp28", cage)
+                self.comb += [
+                    qsfp_pads.resetl.eq(1),
+                    qsfp_pads.lpmode.eq(0),
+                    qsfp_pads.modskll.eq(0),
+                    qsfp_pads.refclk_reset.eq(0),
+                    # Reference Clock: 156.25MHz.
+                    qsfp_pads.fs0.eq(0),
+                    qsfp_pads.fs1.eq(1),
+                ]
+
+                # Quad PLL (shared by the 4 lanes).
+                refclk = Signal()
+                self.specials += Instance("IBUFDS_GTE4",
+                    i_CEB = 0,
+                    i_I   = qsfp_pads.clk_p,
+                    i_IB  = qsfp_pads.clk_n,
+                    o_O   = refclk
+                )
+                pll = GTYQuadPLL(refclk, 156.25e6, 10.3125e9)
+                self.add_module(name=f"qsfp{cage}_pll", module=pll)
+                channels, pll_reset = get_quad_pll_channels(pll, 4)
+                self.comb += pll_reset
+
+                # Lanes.
+                for lane in range(4):
+                    name = f"qsfp{cage}_eth{lane}"
+                    phy  = LiteEthPHY10GBASER(channels[lane], get_lane_pads(qsfp_pads, lane), sys_clk_freq)
+                    phy  = ClockDomainsRenamer({"eth_tx": f"{name}_tx", "eth_rx": f"{name}_rx"})(phy)
+                    self.add_module(name=f"{name}_phy", module=phy)
+                    add_udp_streamer(self, name, phy,
+                        mac_address = 0x10e2d5000000 + 4*cage + lane,
+                        ip_address  = ip_address + 4*cage + lane,
+                        dma         = qsfp_dma,
+                        dma_index   = 4*cage + lane,
+                        link_up     = phy.block_lock,
+                    )
+                    platform.add_period_constraint(phy.serdes.txoutclk, 1e9/phy.tx_clk_freq)
+                    platform.add_period_constraint(phy.serdes.rxoutclk, 1e9/phy.rx_clk_freq)
+                    platform.add_false_path_constraints(self.crg.cd_sys.clk, phy.serdes.txoutclk, phy.serdes.rxoutclk)
 
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
@@ -107,14 +171,37 @@ def main():
     parser = LiteXArgumentParser(platform=xilinx_alveo_u250.Platform, description="LiteX SoC on Alveo U250.")
     parser.add_target_argument("--sys-clk-freq", default=125e6, type=float, help="System clock frequency.")
     parser.add_target_argument("--with-pcie",    action="store_true",       help="Enable PCIe support.")
+    parser.add_target_argument("--pcie-lanes",   default=4, type=int,       help="PCIe lanes.", choices=[4, 16])
+    parser.add_target_argument("--pcie-speed",   default="gen3",            help="PCIe speed.", choices=["gen3"])
     parser.add_target_argument("--driver",       action="store_true",       help="Generate PCIe driver.")
+    parser.add_target_argument("--with-qsfp-ethernet", action="store_true",     help="Enable QSFP28 4x10G Ethernet with UDP capture/replay.")
+    parser.add_target_argument("--qsfp-cages",   default=1, type=int,       help="QSFP28 cages.", choices=[1, 2])
+    parser.add_target_argument("--qsfp-ip",      default="192.168.10.50",   help="QSFP28 Ethernet IP address of the first lane (incremented per lane).")
+    parser.add_target_argument("--qsfp-dma",     default="dram",            help="QSFP28 UDP streams DMA.", choices=["dram", "pcie"])
+    parser.add_target_argument("--spd-dump",                                help="DIMM SPD dump (LiteX BIOS spdread output or binary), replaces the default SDRAM module.")
+    parser.add_target_argument("--spd-db",                                  help="DIMM from the SPD library (see litex_boards.tools.spd_db), replaces the default SDRAM module.")
+    add_cpu_preset_argument(parser, dram_data_width=512, presets=["smp2", "smp4", "smp8"]) # USPDDRPHY, 64-bit DDR4.
+    add_board_sim_arguments(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
         sys_clk_freq = args.sys_clk_freq,
         with_pcie    = args.with_pcie,
+        pcie_lanes   = args.pcie_lanes,
+        pcie_speed   = args.pcie_speed,
+        with_qsfp_ethernet = args.with_qsfp_ethernet,
+        qsfp_cages         = args.qsfp_cages,
+        qsfp_ip_address    = args.qsfp_ip,
+        qsfp_dma           = args.qsfp_dma,
+        spd_dump           = args.spd_dump,
+        spd_db             = args.spd_db,
         **parser.soc_argdict
     )
+
+    if args.sim:
+        run_board_sim(soc, args, parser.builder_argdict)
+        return
+
     builder = Builder(soc, **parser.builder_argdict)
     if args.build:
         builder.build(**parser.toolchain_argdict)
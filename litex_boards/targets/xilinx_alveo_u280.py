@@ -20,6 +20,7 @@ from migen.genlib.resetsync import AsyncResetSynchronizer
 from litex.gen import *
 
 from litex_boards.platforms import xilinx_alveo_u280
+from litex_boards.tools.artifacts import copy_artifact
 
 from litex.soc.cores.clock import *
 from litex.soc.integration.soc_core import *
@@ -32,6 +33,9 @@ from litex.soc.cores.ram.xilinx_usp_hbm2 import USPHBM2
 from litex.soc.cores.led import LedChaser
 from litedram.modules import MTA18ASF2G72PZ
 from litedram.phy import usddrphy
+from litex_boards.tools.spd_db import get_sdram_module
+from litex_boards.tools.cpu_presets import add_cpu_preset_argument
+from litex_boards.tools.board_sim import add_board_sim_arguments, run_board_sim
 
 from litepcie.phy.usppciephy import USPPCIEPHY
 from litepcie.software import generate_litepcie_software
@@ -93,6 +97,8 @@ class BaseSoC(SoCCore):
         with_pcie       = False,
         with_led_chaser = False,
         with_hbm        = False,
+        spd_dump        = None,
+        spd_db          = None,
         **kwargs):
         platform = xilinx_alveo_u280.Platform()
         if with_hbm:
@@ -112,9 +118,7 @@ class BaseSoC(SoCCore):
             self.hbm = hbm = ClockDomainsRenamer({"axi": "sys"})(USPHBM2(platform))
 
             # Get HBM .xci.
-            os.system("wget https://github.com/litex-hub/litex-boards/files/6893157/hbm_0.xci.txt")
-            os.makedirs("ip/hbm", exist_ok=True)
-            os.system("mv hbm_0.xci.txt ip/hbm/hbm_0.xci")
+            copy_artifact("hbm_0.xci", "ip/hbm/hbm_0.xci")
 
             # Connect four of the HBM's AXI interfaces to the main bus of the SoC.
             for i in range(4):
@@ -136,7 +140,7 @@ class BaseSoC(SoCCore):
                     is_rdimm         = True)
                 self.add_sdram("sdram",
                     phy           = self.ddrphy,
-                    module        = MTA18ASF2G72PZ(sys_clk_freq, "1:4"),
+                    module        = get_sdram_module(MTA18ASF2G72PZ(sys_clk_freq, "1:4"), sys_clk_freq, spd_dump, spd_db),
                     size          = 0x40000000,
                     l2_cache_size = kwargs.get("l2_size", 8192)
                 )
@@ -169,6 +173,10 @@ def main():
     parser.add_target_argument("--with-hbm",        action="store_true",       help="Use HBM2.")
     parser.add_target_argument("--with-analyzer",   action="store_true",       help="Enable Analyzer.")
     parser.add_target_argument("--with-led-chaser", action="store_true",       help="Enable LED Chaser.")
+    parser.add_target_argument("--spd-dump",                                   help="DIMM SPD dump (LiteX BIOS spdread output or binary), replaces the default SDRAM module.")
+    parser.add_target_argument("--spd-db",                                     help="DIMM from the SPD library (see litex_boards.tools.spd_db), replaces the default SDRAM module.")
+    add_cpu_preset_argument(parser, dram_data_width=512, presets=["smp2", "smp4", "smp8"]) # USPDDRPHY, 64-bit DDR4.
+    add_board_sim_arguments(parser)
     args = parser.parse_args()
 
     if args.with_hbm:
@@ -181,8 +189,15 @@ def main():
         with_led_chaser = args.with_led_chaser,
         with_hbm        = args.with_hbm,
         with_analyzer   = args.with_analyzer,
+        spd_dump        = args.spd_dump,
+        spd_db          = args.spd_db,
         **parser.soc_argdict
 	)
+
+    if args.sim:
+        run_board_sim(soc, args, parser.builder_argdict)
+        return
+
     builder = Builder(soc, **parser.builder_argdict)
     if args.build:
         builder.build(**parser.toolchain_argdict)
@@ -22,12 +22,16 @@ from litex.soc.cores.led import LedChaser
 
 from litedram.modules import EDY4016A
 from litedram.phy import usddrphy
+from litex_boards.tools.cpu_presets import add_cpu_preset_argument
+from litex_boards.tools.board_sim import add_board_sim_arguments, run_board_sim
 
 from liteeth.phy.ku_1000basex import KU_1000BASEX
 
 from litepcie.phy.uspciephy import USPCIEPHY
 from litepcie.software import generate_litepcie_software
 
+from litex_boards.cores.sdcard import add_sdcard
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(LiteXModule):
@@ -63,12 +67,16 @@ class _CRG(LiteXModule):
 
 class BaseSoC(SoCCore):
     def __init__(self, sys_clk_freq=125e6,
-        with_ethernet   = False,
-        with_etherbone  = False,
-        eth_ip          = "192.168.1.50",
-        with_led_chaser = True,
-        with_pcie       = False,
-        with_sata       = False,
+        with_ethernet     = False,
+        with_etherbone    = False,
+        eth_ip            = "192.168.1.50",
+        with_led_chaser   = True,
+        with_pcie         = False,
+        pcie_lanes        = 4,
+        pcie_speed        = "gen3",
+        with_sata         = False,
+        with_sdcard       = False,
+        sdcard_high_speed = False,
         **kwargs):
         platform = xilinx_kcu105.Platform()
 
@@ -105,10 +113,14 @@ class BaseSoC(SoCCore):
 
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
-            self.pcie_phy = USPCIEPHY(platform, platform.request("pcie_x4"),
-                data_width = 128,
-                bar0_size  = 0x20000)
-            self.add_pcie(phy=self.pcie_phy, ndmas=1)
+            from litex_boards.cores.pcie import get_pcie_datapath
+            data_width, pcie_data_width, dma_buffering_depth = get_pcie_datapath(USPCIEPHY, pcie_lanes, pcie_speed, sys_clk_freq)
+            self.pcie_phy = USPCIEPHY(platform, platform.request(f"pcie_x{pcie_lanes}"),
+                speed           = pcie_speed,
+                data_width      = data_width,
+                pcie_data_width = pcie_data_width,
+                bar0_size       = 0x20000)
+            self.add_pcie(phy=self.pcie_phy, ndmas=1, dma_buffering_depth=dma_buffering_depth)
 
         # SATA -------------------------------------------------------------------------------------
         if with_sata:
@@ -144,6 +156,13 @@ class BaseSoC(SoCCore):
             # Core
             self.add_sata(phy=self.sata_phy, mode="read+write")
 
+        # SD Card ----------------------------------------------------------------------------------
+        if with_sdcard:
+            if sdcard_high_speed:
+                add_sdcard(self, clk_freq=50e6) # On-board slot.
+            else:
+                self.add_sdcard()
+
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
             self.leds = LedChaser(
@@ -161,19 +180,34 @@ def main():
     ethopts.add_argument("--with-etherbone",  action="store_true",    help="Enable Etherbone support.")
     parser.add_target_argument("--eth-ip",    default="192.168.1.50", help="Ethernet/Etherbone IP address.")
     parser.add_target_argument("--with-pcie", action="store_true",    help="Enable PCIe support.")
+    parser.add_target_argument("--pcie-lanes", default=4, type=int,  help="PCIe lanes.", choices=[1, 2, 4, 8])
+    parser.add_target_argument("--pcie-speed", default="gen3",       help="PCIe speed.", choices=["gen3"])
     parser.add_target_argument("--driver",    action="store_true",    help="Generate PCIe driver.")
     parser.add_target_argument("--with-sata", action="store_true",    help="Enable SATA support (over SFP2SATA).")
+    parser.add_target_argument("--with-sdcard", action="store_true",  help="Enable SDCard support.")
+    parser.add_target_argument("--sdcard-high-speed", action="store_true", help="SDCard High-Speed clock (50MHz) and DMA counters for sdcard_bench only, BIOS/boot stays at 25MHz (with --with-sdcard).")
+    add_cpu_preset_argument(parser, dram_data_width=512, presets=["smp2", "smp4"]) # USDDRPHY, 64-bit DDR4.
+    add_board_sim_arguments(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
-        sys_clk_freq   = args.sys_clk_freq,
-        with_ethernet  = args.with_ethernet,
-        with_etherbone = args.with_etherbone,
-        eth_ip         = args.eth_ip,
-        with_pcie      = args.with_pcie,
-        with_sata      = args.with_sata,
+        sys_clk_freq      = args.sys_clk_freq,
+        with_ethernet     = args.with_ethernet,
+        with_etherbone    = args.with_etherbone,
+        eth_ip            = args.eth_ip,
+        with_pcie         = args.with_pcie,
+        pcie_lanes        = args.pcie_lanes,
+        pcie_speed        = args.pcie_speed,
+        with_sata         = args.with_sata,
+        with_sdcard       = args.with_sdcard,
+        sdcard_high_speed = args.sdcard_high_speed,
         **parser.soc_argdict
 	)
+
+    if args.sim:
+        run_board_sim(soc, args, parser.builder_argdict)
+        return
+
     builder = Builder(soc, **parser.builder_argdict)
     if args.build:
         builder.build(**parser.toolchain_argdict)
@@ -23,6 +23,7 @@ from migen import *
 from litex.gen import *
 
 from litex_boards.platforms import xilinx_kv260
+from litex_boards.tools.artifacts import link_git_repo
 from litex.build.tools import write_to_file
 
 from litex.soc.interconnect import axi
@@ -143,9 +144,7 @@ class BaseSoC(SoCCore):
 
         libxil_path = os.path.join(self.builder.software_dir, 'libxil')
         os.makedirs(os.path.realpath(libxil_path), exist_ok=True)
-        lib = os.path.join(libxil_path, 'embeddedsw')
-        if not os.path.exists(lib):
-            os.system("git clone --depth 1 https://github.com/Xilinx/embeddedsw {}".format(lib))
+        lib = link_git_repo("embeddedsw", os.path.join(libxil_path, 'embeddedsw'))
 
         os.makedirs(os.path.realpath(self.builder.include_dir), exist_ok=True)
 
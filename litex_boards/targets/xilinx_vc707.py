@@ -20,6 +20,7 @@ from litex.soc.cores.led import LedChaser
 
 from litedram.modules import MT8JTF12864
 from litedram.phy import s7ddrphy
+from litex_boards.tools.spd_db import get_sdram_module
 
 
 from litepcie.phy.s7pciephy import S7PCIEPHY
@@ -49,7 +50,7 @@ class _CRG(LiteXModule):
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=125e6, with_led_chaser=True, with_pcie=False, **kwargs):
+    def __init__(self, sys_clk_freq=125e6, with_led_chaser=True, with_pcie=False, pcie_lanes=4, pcie_speed="gen2", spd_dump=None, spd_db=None, **kwargs):
         platform = xilinx_vc707.Platform()
 
         # CRG --------------------------------------------------------------------------------------
@@ -66,16 +67,20 @@ class BaseSoC(SoCCore):
                 sys_clk_freq = sys_clk_freq)
             self.add_sdram("sdram",
                 phy           = self.ddrphy,
-                module        = MT8JTF12864(sys_clk_freq, "1:4"),
+                module        = get_sdram_module(MT8JTF12864(sys_clk_freq, "1:4"), sys_clk_freq, spd_dump, spd_db),
+                size          = 0x40000000,
                 l2_cache_size = kwargs.get("l2_size", 8192)
             )
 
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
-            self.pcie_phy = S7PCIEPHY(platform, platform.request("pcie_x4"),
-                data_width = 128,
-                bar0_size  = 0x20000)
-            self.add_pcie(phy=self.pcie_phy, ndmas=1)
+            from litex_boards.cores.pcie import get_pcie_datapath
+            data_width, pcie_data_width, dma_buffering_depth = get_pcie_datapath(S7PCIEPHY, pcie_lanes, pcie_speed, sys_clk_freq)
+            self.pcie_phy = S7PCIEPHY(platform, platform.request(f"pcie_x{pcie_lanes}"),
+                data_width      = data_width,
+                pcie_data_width = pcie_data_width,
+                bar0_size       = 0x20000)
+            self.add_pcie(phy=self.pcie_phy, ndmas=1, dma_buffering_depth=dma_buffering_depth)
 
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
@@ -90,12 +95,20 @@ def main():
     parser = LiteXArgumentParser(platform=xilinx_vc707.Platform, description="LiteX SoC on VC707.")
     parser.add_target_argument("--sys-clk-freq", default=125e6, type=float, help="System clock frequency.")
     parser.add_target_argument("--with-pcie",    action="store_true",       help="Enable PCIe support.")
+    parser.add_target_argument("--pcie-lanes",   default=4, type=int,       help="PCIe lanes.", choices=[1, 2, 4, 8])
+    parser.add_target_argument("--pcie-speed",   default="gen2",            help="PCIe speed.", choices=["gen2"])
     parser.add_target_argument("--driver",       action="store_true",       help="Generate PCIe driver.")
+    parser.add_target_argument("--spd-dump",                                help="DIMM SPD dump (LiteX BIOS spdread output or binary), replaces the default SDRAM module.")
+    parser.add_target_argument("--spd-db",                                  help="DIMM from the SPD library (see litex_boards.tools.spd_db), replaces the default SDRAM module.")
     args = parser.parse_args()
 
     soc = BaseSoC(
         sys_clk_freq = args.sys_clk_freq,
-        with_pcie_   = args.with_pcie,
+        with_pcie    = args.with_pcie,
+        pcie_lanes   = args.pcie_lanes,
+        pcie_speed   = args.pcie_speed,
+        spd_dump     = args.spd_dump,
+        spd_db       = args.spd_db,
         **parser.soc_argdict
     )
     builder = Builder(soc, **parser.builder_argdict)
@@ -21,6 +21,9 @@ from litex.soc.cores.led import LedChaser
 
 from litedram.modules import EDY4016A
 from litedram.phy import usddrphy
+from litex_boards.tools.spd_db import get_sdram_module
+from litex_boards.tools.cpu_presets import add_cpu_preset_argument
+from litex_boards.tools.board_sim import add_board_sim_arguments, run_board_sim
 
 # CRG ----------------------------------------------------------------------------------------------
 
@@ -54,7 +57,7 @@ class _CRG(LiteXModule):
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=125e6, with_led_chaser=True, **kwargs):
+    def __init__(self, sys_clk_freq=125e6, with_led_chaser=True, spd_dump=None, spd_db=None, **kwargs):
         platform = xilinx_vcu118.Platform()
 
         # CRG --------------------------------------------------------------------------------------
@@ -71,7 +74,7 @@ class BaseSoC(SoCCore):
                 iodelay_clk_freq = 500e6)
             self.add_sdram("sdram",
                 phy           = self.ddrphy,
-                module        = EDY4016A(sys_clk_freq, "1:4"),
+                module        = get_sdram_module(EDY4016A(sys_clk_freq, "1:4"), sys_clk_freq, spd_dump, spd_db),
                 size          = 0x40000000,
                 l2_cache_size = kwargs.get("l2_size", 8192)
             )
@@ -88,12 +91,23 @@ def main():
     from litex.build.parser import LiteXArgumentParser
     parser = LiteXArgumentParser(platform=xilinx_vcu118.Platform, description="LiteX SoC on VCU118.")
     parser.add_target_argument("--sys-clk-freq", default=125e6, type=float, help="System clock frequency.")
+    parser.add_target_argument("--spd-dump",                                help="DIMM SPD dump (LiteX BIOS spdread output or binary), replaces the default SDRAM module.")
+    parser.add_target_argument("--spd-db",                                  help="DIMM from the SPD library (see litex_boards.tools.spd_db), replaces the default SDRAM module.")
+    add_cpu_preset_argument(parser, dram_data_width=512, presets=["smp2", "smp4", "smp8"]) # USPDDRPHY, 64-bit DDR4.
+    add_board_sim_arguments(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
         sys_clk_freq = args.sys_clk_freq,
+        spd_dump     = args.spd_dump,
+        spd_db       = args.spd_db,
         **parser.soc_argdict
     )
+
+    if args.sim:
+        run_board_sim(soc, args, parser.builder_argdict)
+        return
+
     builder = Builder(soc, **parser.builder_argdict)
     if args.build:
         builder.build(**parser.toolchain_argdict)
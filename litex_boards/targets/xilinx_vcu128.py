@@ -14,6 +14,7 @@ from migen.genlib.resetsync import AsyncResetSynchronizer
 from litex.gen import *
 
 from litex_boards.platforms import xilinx_vcu128
+from litex_boards.tools.artifacts import copy_artifact
 
 from litex.soc.cores.clock import *
 from litex.soc.cores.ram.xilinx_usp_hbm2 import USPHBM2
@@ -83,9 +84,7 @@ class BaseSoC(SoCCore):
             self.hbm = hbm = ClockDomainsRenamer({"axi": "sys"})(USPHBM2(platform))
 
             # Get HBM .xci.
-            os.system("wget https://github.com/litex-hub/litex-boards/files/6893157/hbm_0.xci.txt")
-            os.makedirs("ip/hbm", exist_ok=True)
-            os.system("mv hbm_0.xci.txt ip/hbm/hbm_0.xci")
+            copy_artifact("hbm_0.xci", "ip/hbm/hbm_0.xci")
 
             # Connect four of the HBM's AXI interfaces to the main bus of the SoC.
             for i in range(4):
@@ -43,6 +43,7 @@ from litex.soc.cores.led import LedChaser
 
 from litedram.modules import MT8JTF12864
 from litedram.phy import s7ddrphy
+from litex_boards.tools.spd_db import get_sdram_module
 
 from liteeth.phy.k7_1000basex import K7_1000BASEX
 
@@ -88,6 +89,8 @@ class BaseSoC(SoCCore):
         eth_dynamic_ip  = False,
         with_led_chaser = True,
         with_pcie       = False,
+        spd_dump        = None,
+        spd_db          = None,
         **kwargs):
         platform = xilinx_zc706.Platform()
 
@@ -110,7 +113,8 @@ class BaseSoC(SoCCore):
                 sys_clk_freq = sys_clk_freq)
             self.add_sdram("sdram",
                 phy           = self.ddrphy,
-                module        = MT8JTF12864(sys_clk_freq, "1:4"),
+                module        = get_sdram_module(MT8JTF12864(sys_clk_freq, "1:4"), sys_clk_freq, spd_dump, spd_db),
+                size          = 0x40000000,
                 l2_cache_size = kwargs.get("l2_size", 8192)
             )
 
@@ -156,6 +160,8 @@ def main():
     parser.add_target_argument("--eth-dynamic-ip", action="store_true",       help="Enable dynamic Ethernet IP addresses setting.")
     parser.add_target_argument("--with-pcie",      action="store_true",       help="Enable PCIe support.")
     parser.add_target_argument("--driver",         action="store_true",       help="Generate PCIe driver.")
+    parser.add_target_argument("--spd-dump",                                  help="DIMM SPD dump (LiteX BIOS spdread output or binary), replaces the default SDRAM module.")
+    parser.add_target_argument("--spd-db",                                    help="DIMM from the SPD library (see litex_boards.tools.spd_db), replaces the default SDRAM module.")
     args = parser.parse_args()
 
     soc = BaseSoC(
@@ -166,6 +172,8 @@ def main():
         remote_ip      = args.remote_ip,
         eth_dynamic_ip = args.eth_dynamic_ip,
         with_pcie      = args.with_pcie,
+        spd_dump       = args.spd_dump,
+        spd_db         = args.spd_db,
         **parser.soc_argdict
     )
     builder = Builder(soc, **parser.builder_argdict)
@@ -22,6 +22,7 @@ from litex.soc.cores.bitbang import I2CMaster
 
 from litedram.modules import MTA4ATF51264HZ
 from litedram.phy import usddrphy
+from litex_boards.tools.spd_db import get_sdram_module
 
 # CRG ----------------------------------------------------------------------------------------------
 
@@ -55,7 +56,7 @@ class _CRG(LiteXModule):
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=125e6, with_led_chaser=True, **kwargs):
+    def __init__(self, sys_clk_freq=125e6, with_led_chaser=True, spd_dump=None, spd_db=None, **kwargs):
         platform = xilinx_zcu104.Platform()
 
         # CRG --------------------------------------------------------------------------------------
@@ -72,7 +73,7 @@ class BaseSoC(SoCCore):
                 iodelay_clk_freq = 500e6)
             self.add_sdram("sdram",
                 phy           = self.ddrphy,
-                module        = MTA4ATF51264HZ(sys_clk_freq, "1:4"),
+                module        = get_sdram_module(MTA4ATF51264HZ(sys_clk_freq, "1:4"), sys_clk_freq, spd_dump, spd_db),
                 size          = 0x40000000,
                 l2_cache_size = kwargs.get("l2_size", 8192)
             )
@@ -89,10 +90,14 @@ def main():
     from litex.build.parser import LiteXArgumentParser
     parser = LiteXArgumentParser(platform=xilinx_zcu104.Platform, description="LiteX SoC on ZCU104.")
     parser.add_target_argument("--sys-clk-freq", default=125e6, type=float, help="System clock frequency.")
+    parser.add_target_argument("--spd-dump",                                help="DIMM SPD dump (LiteX BIOS spdread output or binary), replaces the default SDRAM module.")
+    parser.add_target_argument("--spd-db",                                  help="DIMM from the SPD library (see litex_boards.tools.spd_db), replaces the default SDRAM module.")
     args = parser.parse_args()
 
     soc = BaseSoC(
         sys_clk_freq = args.sys_clk_freq,
+        spd_dump     = args.spd_dump,
+        spd_db       = args.spd_db,
         **parser.soc_argdict
     )
     builder = Builder(soc, **parser.builder_argdict)
@@ -12,6 +12,7 @@ from migen import *
 from litex.gen import *
 
 from litex_boards.platforms import digilent_zybo_z7
+from litex_boards.tools.artifacts import copy_artifact, link_git_repo
 
 from litex.soc.interconnect import axi
 from litex.soc.interconnect import wishbone
@@ -63,11 +64,8 @@ class BaseSoC(SoCCore):
         if kwargs.get("cpu_type", None) == "zynq7000":
             self.cpu.use_rom = True
             if variant in ["z7-20", "original"]:
-                # Get and set the pre-generated .xci FIXME: change location? add it to the repository? Make config
-                os.makedirs("xci", exist_ok=True)
-                os.system("wget https://github.com/litex-hub/litex-boards/files/8339591/zybo_z7_ps7.txt")
-                os.system("mv zybo_z7_ps7.txt xci/zybo_z7_ps7.xci")
-                self.cpu.set_ps7_xci("xci/zybo_z7_ps7.xci")
+                # Get and set the pre-generated .xci (from local artifact store). FIXME: Make config
+                self.cpu.set_ps7_xci(copy_artifact("zybo_z7_ps7.xci", "xci/zybo_z7_ps7.xci"))
             else:
                 self.cpu.set_ps7(name="ps", config = platform.ps7_config)
 
@@ -120,9 +118,7 @@ class BaseSoC(SoCCore):
             return
         libxil_path = os.path.join(self.builder.software_dir, 'libxil')
         os.makedirs(os.path.realpath(libxil_path), exist_ok=True)
-        lib = os.path.join(libxil_path, 'embeddedsw')
-        if not os.path.exists(lib):
-            os.system("git clone --depth 1 https://github.com/Xilinx/embeddedsw {}".format(lib))
+        lib = link_git_repo("embeddedsw", os.path.join(libxil_path, 'embeddedsw'))
 
         os.makedirs(os.path.realpath(self.builder.include_dir), exist_ok=True)
         for header in [
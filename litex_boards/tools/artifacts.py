@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""Local content-addressed store for the vendor artifacts some targets need at elaboration.
+
+Some targets need files that are not part of the repository (pre-generated .xci IPs, BSP headers
+from Xilinx's embeddedsw, etc...). Instead of fetching them on each build, they are fetched once
+into a local store shared between targets/build directories and verified against their SHA256:
+
+- Files are stored by content in <cache>/sha256/<digest> with an index.json mapping artifact names
+  to digests. When the registry below does not pin a digest, the digest of the first fetched/seeded
+  copy is pinned in index.json (trust on first use) and verified on each later use.
+- Git repositories are shallow-cloned once in <cache>/git/<name>.
+
+Cache location defaults to ~/.cache/litex_boards and can be changed with LITEX_BOARDS_CACHE (ex to
+share it on a NFS mount). Setting LITEX_BOARDS_OFFLINE=1 forbids any network access: artifacts then
+have to be pre-seeded, ex on an air-gapped build host:
+
+    $ python3 -m litex_boards.tools.artifacts --fetch-all          # On a connected host.
+    $ python3 -m litex_boards.tools.artifacts --export cache.tar   # Transfer cache.tar.
+    $ python3 -m litex_boards.tools.artifacts --import cache.tar   # On the air-gapped host.
+
+or with a local copy of a file:
+
+    $ python3 -m litex_boards.tools.artifacts --seed hbm_0.xci /path/to/hbm_0.xci
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import tarfile
+import zipfile
+import argparse
+import tempfile
+import subprocess
+import urllib.request
+
+# Registry -----------------------------------------------------------------------------------------
+
+# name : (url, sha256 or None to pin on first use). Digests are pinned here once checked against
+# a trusted copy (python3 -m litex_boards.tools.artifacts --list shows the digests pinned on first
+# use in the local store).
+ARTIFACTS = {
+    "hbm_0.xci"             : ("https://github.com/litex-hub/litex-boards/files/6893157/hbm_0.xci.txt", None),
+    "fk33_hbm_0.xci"        : ("https://github.com/litex-hub/litex-boards/files/8178874/hbm_0.xci.txt", None),
+    "redpitaya_ps7.xci"     : ("https://kmf2.trabucayre.com/redpitaya_ps7.txt",                          None),
+    "zybo_z7_ps7.xci"       : ("https://github.com/litex-hub/litex-boards/files/8339591/zybo_z7_ps7.txt", None),
+    "snickerdoodle_ps7.xci" : ("https://technicaltoys-support.s3.amazonaws.com/xci/snickerdoodle_ps7.xci",  None),
+    "hyperbus.py"           : ("https://github.com/litex-hub/litex-boards/files/8831568/hyperbus.py.txt", None),
+    "libeos.zip"            : ("https://github.com/litex-hub/litex-boards/files/7880350/libeos.zip",      None),
+}
+
+# name : (url, ref or None for default branch).
+GIT_REPOS = {
+    "embeddedsw" : ("https://github.com/Xilinx/embeddedsw", None),
+}
+
+# Helpers ------------------------------------------------------------------------------------------
+
+class ArtifactError(Exception):
+    pass
+
+def cache_dir():
+    default = os.path.join(os.path.expanduser("~"), ".cache", "litex_boards")
+    return os.path.abspath(os.environ.get("LITEX_BOARDS_CACHE", default))
+
+def offline():
+    return os.environ.get("LITEX_BOARDS_OFFLINE", "0") not in ["", "0"]
+
+def sha256sum(filename):
+    h = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _index_filename():
+    return os.path.join(cache_dir(), "index.json")
+
+def _read_index():
+    try:
+        with open(_index_filename(), "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def _write_index(index):
+    os.makedirs(cache_dir(), exist_ok=True)
+    tmp = _index_filename() + f".{os.getpid()}"
+    with open(tmp, "w") as f:
+        json.dump(index, f, indent=4, sort_keys=True)
+    os.replace(tmp, _index_filename())
+
+def _blob_filename(digest):
+    return os.path.join(cache_dir(), "sha256", digest)
+
+def _expected_digest(name):
+    if name not in ARTIFACTS:
+        raise ArtifactError(f"Unknown artifact {name}, known artifacts: {', '.join(sorted(ARTIFACTS))}.")
+    digest = ARTIFACTS[name][1]
+    return digest if digest is not None else _read_index().get(name, None)
+
+def _store(name, filename):
+    # Verify against pinned digest, then move to the store (atomically) and update index.
+    digest   = sha256sum(filename)
+    expected = _expected_digest(name)
+    if (expected is not None) and (digest != expected):
+        os.remove(filename)
+        raise ArtifactError(f"Checksum mismatch for {name}: got {digest}, expected {expected}.")
+    os.makedirs(os.path.dirname(_blob_filename(digest)), exist_ok=True)
+    os.replace(filename, _blob_filename(digest))
+    index = _read_index()
+    index[name] = digest
+    _write_index(index)
+    return _blob_filename(digest)
+
+# Files --------------------------------------------------------------------------------------------
+
+def get_artifact(name):
+    """Return path of artifact in the store, fetching it if not already present."""
+    digest = _expected_digest(name)
+    if digest is not None:
+        blob = _blob_filename(digest)
+        if os.path.exists(blob):
+            if sha256sum(blob) != digest:
+                os.remove(blob)
+                raise ArtifactError(f"Corrupted {name} in store (removed), please fetch it again.")
+            return blob
+    if offline():
+        raise ArtifactError(f"{name} not in store {cache_dir()} and offline mode is enabled, "
+            f"seed it with: python3 -m litex_boards.tools.artifacts --seed {name} <file>.")
+    url = ARTIFACTS[name][0]
+    print(f"Fetching {name} from {url}...")
+    os.makedirs(cache_dir(), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=cache_dir())
+    try:
+        with os.fdopen(fd, "wb") as f, urllib.request.urlopen(url) as r:
+            shutil.copyfileobj(r, f)
+        return _store(name, tmp)
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+def copy_artifact(name, dst):
+    """Copy artifact to dst (left untouched when already identical to keep tools' caches valid)."""
+    src = get_artifact(name)
+    if os.path.dirname(dst):
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+    if not (os.path.exists(dst) and sha256sum(dst) == sha256sum(src)):
+        shutil.copyfile(src, dst)
+    return dst
+
+def extract_artifact(name, dst):
+    """Extract (zip) artifact to dst directory (as unzip -d, members have to stay under dst)."""
+    src  = get_artifact(name)
+    root = os.path.abspath(dst)
+    os.makedirs(os.path.dirname(root), exist_ok=True)
+    tmp  = tempfile.mkdtemp(dir=os.path.dirname(root))
+    try:
+        with zipfile.ZipFile(src) as z:
+            for member in z.namelist():
+                path = os.path.realpath(os.path.join(tmp, member))
+                if os.path.commonpath([os.path.realpath(tmp), path]) != os.path.realpath(tmp):
+                    raise ArtifactError(f"Member {member} outside of {dst} in {name}.")
+            z.extractall(tmp)
+        os.chmod(tmp, 0o755)
+        os.replace(tmp, root)
+    except Exception:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return dst
+
+def seed_artifact(name, filename):
+    """Import a local copy of an artifact in the store."""
+    _expected_digest(name)
+    os.makedirs(cache_dir(), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=cache_dir())
+    os.close(fd)
+    shutil.copyfile(filename, tmp)
+    return _store(name, tmp)
+
+# Git Repositories ---------------------------------------------------------------------------------
+
+def get_git_repo(name):
+    """Return path of a shared (shallow) clone of the repository, cloning it if not already present."""
+    if name not in GIT_REPOS:
+        raise ArtifactError(f"Unknown repository {name}, known repositories: {', '.join(sorted(GIT_REPOS))}.")
+    url, ref = GIT_REPOS[name]
+    path = os.path.join(cache_dir(), "git", name)
+    if os.path.exists(path):
+        return path
+    if offline():
+        raise ArtifactError(f"{name} not in store {cache_dir()} and offline mode is enabled.")
+    print(f"Cloning {name} from {url}...")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp  = tempfile.mkdtemp(dir=os.path.dirname(path))
+    args = ["git", "clone", "--depth", "1"] + (["--branch", ref] if ref is not None else []) + [url, tmp]
+    try:
+        subprocess.check_call(args)
+        os.replace(tmp, path)
+    except Exception:
+        shutil.rmtree(tmp, ignore_errors=True)
+        if not os.path.exists(path): # Concurrent clone may have succeeded.
+            raise
+    return path
+
+def link_git_repo(name, dst):
+    """Make the shared clone of the repository available at dst (symlink, or copy when unsupported)."""
+    src = get_git_repo(name)
+    if os.path.lexists(dst):
+        if os.path.realpath(dst) == os.path.realpath(src):
+            return dst
+        if os.path.islink(dst):
+            os.remove(dst)
+        else:
+            return dst # Keep existing (user-provided) directory.
+    os.makedirs(os.path.dirname(os.path.abspath(dst)), exist_ok=True)
+    try:
+        os.symlink(src, dst, target_is_directory=True)
+    except OSError:
+        shutil.copytree(src, dst, symlinks=True)
+    return dst
+
+# Import/Export ------------------------------------------------------------------------------------
+
+def export_store(filename):
+    """Export the store (index, files and repositories) to a tarball."""
+    with tarfile.open(filename, "w") as tar:
+        for entry in ["index.json", "sha256", "git"]:
+            if os.path.exists(os.path.join(cache_dir(), entry)):
+                tar.add(os.path.join(cache_dir(), entry), arcname=entry)
+
+def _check_member(member, root):
+    # Only regular files/directories (and links) staying under root, ex no ../, absolute paths,
+    # devices or links pointing outside of root.
+    path = os.path.realpath(os.path.join(root, member.name))
+    if not (member.isfile() or member.isdir() or member.issym() or member.islnk()):
+        raise ArtifactError(f"Unsupported member {member.name} in store tarball.")
+    if (member.name.split("/")[0] not in ["index.json", "sha256", "git"]) or \
+       (os.path.commonpath([root, path]) != root):
+        raise ArtifactError(f"Member {member.name} outside of store in store tarball.")
+    if member.issym() or member.islnk():
+        target = os.path.join(os.path.dirname(path) if member.issym() else root, member.linkname)
+        if os.path.commonpath([root, os.path.realpath(target)]) != root:
+            raise ArtifactError(f"Link {member.name} pointing outside of store in store tarball.")
+
+def import_store(filename):
+    """Import a store tarball (from export_store): files are verified against their digest and
+    index entries have to match the registry/already pinned digests."""
+    os.makedirs(cache_dir(), exist_ok=True)
+    tmp = tempfile.mkdtemp(dir=cache_dir())
+    try:
+        with tarfile.open(filename, "r") as tar:
+            members = tar.getmembers()
+            for member in members:
+                _check_member(member, os.path.realpath(tmp))
+            if hasattr(tarfile, "data_filter"):
+                tar.extractall(tmp, members=members, filter="data")
+            else:
+                tar.extractall(tmp, members=members)
+
+        # Verify and move files.
+        blobs = os.path.join(tmp, "sha256")
+        for digest in sorted(os.listdir(blobs)) if os.path.isdir(blobs) else []:
+            blob = os.path.join(blobs, digest)
+            if sha256sum(blob) != digest:
+                raise ArtifactError(f"Corrupted file {digest} in store tarball.")
+            os.makedirs(os.path.dirname(_blob_filename(digest)), exist_ok=True)
+            os.replace(blob, _blob_filename(digest))
+
+        # Move repositories (existing ones are kept).
+        repos = os.path.join(tmp, "git")
+        for name in sorted(os.listdir(repos)) if os.path.isdir(repos) else []:
+            path = os.path.join(cache_dir(), "git", name)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(os.path.join(repos, name), path)
+
+        # Merge index.
+        index = _read_index()
+        if os.path.exists(os.path.join(tmp, "index.json")):
+            with open(os.path.join(tmp, "index.json")) as f:
+                imported = json.load(f)
+            for name, digest in sorted(imported.items()):
+                expected = ARTIFACTS[name][1] if name in ARTIFACTS else None
+                expected = expected or index.get(name, digest)
+                if digest != expected:
+                    raise ArtifactError(f"Checksum mismatch for {name} in store tarball: got {digest}, expected {expected}.")
+                index[name] = digest
+        _write_index(index)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards local artifact store.")
+    parser.add_argument("--list",      action="store_true",        help="List artifacts and their status.")
+    parser.add_argument("--fetch",     nargs="+", default=[],      help="Fetch artifact(s)/repositories to the store.")
+    parser.add_argument("--fetch-all", action="store_true",        help="Fetch all artifacts/repositories to the store.")
+    parser.add_argument("--seed",      nargs=2,   metavar=("NAME", "FILE"), help="Import a local copy of an artifact.")
+    parser.add_argument("--export",    metavar="TAR",              help="Export the store to a tarball.")
+    parser.add_argument("--import",    metavar="TAR", dest="_import", help="Import a store tarball.")
+    args = parser.parse_args()
+
+    if args.seed:
+        print(seed_artifact(*args.seed))
+
+    names = list(ARTIFACTS) + list(GIT_REPOS) if args.fetch_all else args.fetch
+    for name in names:
+        print(get_git_repo(name) if name in GIT_REPOS else get_artifact(name))
+
+    if args._import:
+        import_store(args._import)
+
+    if args.export:
+        export_store(args.export)
+
+    if args.list:
+        index = _read_index()
+        print(f"Store: {cache_dir()}{' (offline)' if offline() else ''}")
+        for name in sorted(ARTIFACTS):
+            digest = ARTIFACTS[name][1] or index.get(name, None)
+            status = "present" if (digest is not None and os.path.exists(_blob_filename(digest))) else "missing"
+            pinned = "" if digest is None else "(registry)" if ARTIFACTS[name][1] else "(first use)"
+            print(f"{name:24s} {status:8s} {digest or ''} {pinned}")
+        for name in sorted(GIT_REPOS):
+            status = "present" if os.path.exists(os.path.join(cache_dir(), "git", name)) else "missing"
+            print(f"{name:24s} {status:8s} (git)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""AXI ports bandwidth/QoS benchmark (litex_boards.cores.axi_monitor/axi_dma).
+
+Runs DMA traffic (AXIDMAWriter/AXIDMAReader in loop mode) on a DRAM port while the CPU runs a memory
+workload on another port, through a litex_server (Etherbone, UARTBone, JTAGBone...), and reports the
+bandwidth of each port (from the AXIPortMonitor counters) for each DMA mode/QoS setting. Ex on the
+Efinix Ti375 C529 Dev Kit built with --with-dram-dma (ddr0: CPU, ddr1: DMAs):
+
+    $ litex_server --jtag --jtag-config=... &
+    $ python3 -m litex_boards.tools.axi_port_bench --csr-csv=csr.csv
+    $ python3 -m litex_boards.tools.axi_port_bench --csr-csv=csr.csv --write \\
+        --cpu-console=/dev/ttyUSB1 --cpu-command="while true; do dd if=/dev/zero of=/dev/null bs=16M count=64; done"
+
+The CPU workload is started on the CPU console before the measurements (and stopped with Ctrl-C at
+the end), or can be started manually. DMA writes are destructive: --write overwrites --dma-length
+bytes at --dma-base (Reader: --dma-base + --dma-length), to be reserved when running Linux.
+"""
+
+import time
+import argparse
+
+from litex import RemoteClient
+
+# Helpers ------------------------------------------------------------------------------------------
+
+COUNTERS = ["read_beats", "write_beats", "read_wait", "write_wait", "cycles"]
+
+QOS_SETTINGS = {
+    # Name  : (CPU port QoS, DMA port QoS), None: from the masters.
+    "none" : None,
+    "cpu"  : (1, 0),
+    "dma"  : (0, 1),
+}
+
+def get_port(bus, name):
+    return {
+        "name"       : name,
+        "data_width" : getattr(bus.constants, f"{name}_data_width"),
+        "clk_freq"   : getattr(bus.constants, f"{name}_clk_freq"),
+    }
+
+def set_qos(bus, port, qos=None):
+    control = 0 if qos is None else (1 | (qos << 8) | (qos << 16))
+    getattr(bus.regs, f"{port}_qos").write(control)
+
+def stop_dma(bus, name, timeout=1.0):
+    """Stop the DMAs cleanly: end the current pass (loop=0, wait for done) before disabling."""
+    for engine in ["writer", "reader"]:
+        regs = lambda reg: getattr(bus.regs, f"{name}_{engine}_{reg}")
+        if not regs("enable").read():
+            continue
+        regs("loop").write(0)
+        deadline = time.time() + timeout
+        while not regs("done").read():
+            if time.time() > deadline:
+                print(f"Warning: {name}_{engine} not done after {timeout}s, disabling anyway.")
+                break
+            time.sleep(1e-3)
+        regs("enable").write(0)
+
+def set_dma(bus, name, base, length, enable):
+    stop_dma(bus, name)
+    for engine, offset in [("writer", 0), ("reader", length)]:
+        regs = lambda reg: getattr(bus.regs, f"{name}_{engine}_{reg}")
+        regs("base").write(base + offset)
+        regs("length").write(length)
+        regs("loop").write(1)
+        regs("enable").write(int(engine in enable))
+
+def measure(bus, ports, duration):
+    """Measure the bandwidth of the ports over duration, returns MB/s and address wait ratios."""
+    for port in ports:
+        getattr(bus.regs, f"{port['name']}_control").write(0b10) # Disable + clear.
+    for port in ports:
+        getattr(bus.regs, f"{port['name']}_control").write(0b01) # Enable.
+    time.sleep(duration)
+    for port in ports:
+        getattr(bus.regs, f"{port['name']}_control").write(0b00) # Freeze.
+    results = {}
+    for port in ports:
+        c = {n: getattr(bus.regs, f"{port['name']}_{n}").read() for n in COUNTERS}
+        seconds = max(c["cycles"], 1)/port["clk_freq"]
+        beat    = port["data_width"]//8
+        results[port["name"]] = {
+            "read"       : c["read_beats"]*beat/seconds/1e6,
+            "write"      : c["write_beats"]*beat/seconds/1e6,
+            "read_wait"  : c["read_wait"]/max(c["cycles"], 1),
+            "write_wait" : c["write_wait"]/max(c["cycles"], 1),
+        }
+    return results
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="AXI ports bandwidth/QoS benchmark.")
+    parser.add_argument("--csr-csv",     default="csr.csv",      help="SoC CSV file.")
+    parser.add_argument("--host",        default="localhost",    help="litex_server host.")
+    parser.add_argument("--port",        default=1234,           type=int,   help="litex_server port.")
+    parser.add_argument("--cpu-port",    default="ddr0_monitor", help="CPU port monitor name.")
+    parser.add_argument("--dma-port",    default="ddr1_monitor", help="DMA port monitor name.")
+    parser.add_argument("--dma",         default="ddr1_dma",     help="DMA Writer/Reader name prefix.")
+    parser.add_argument("--dma-base",    default=0x3000_0000,    type=lambda x: int(x, 0), help="DMA buffers base (DRAM offset).")
+    parser.add_argument("--dma-length",  default=0x0100_0000,    type=lambda x: int(x, 0), help="DMA buffer length (bytes).")
+    parser.add_argument("--duration",    default=1.0,            type=float, help="Measurement duration (s).")
+    parser.add_argument("--qos",         default="none,cpu,dma", help="QoS settings to measure (none, cpu, dma).")
+    parser.add_argument("--write",       action="store_true",    help="Also run DMA writes (overwrites DMA buffer).")
+    parser.add_argument("--cpu-console", default=None,           help="CPU console serial port (to start the CPU workload).")
+    parser.add_argument("--cpu-baudrate", default=115200,        type=int,   help="CPU console baudrate.")
+    parser.add_argument("--cpu-command", default=None,           help="CPU workload command.")
+    args = parser.parse_args()
+
+    bus = RemoteClient(host=args.host, port=args.port, csr_csv=args.csr_csv)
+    bus.open()
+
+    ports = [get_port(bus, args.cpu_port), get_port(bus, args.dma_port)]
+    for port in ports:
+        assert args.duration*port["clk_freq"] < 2**32, "Duration too long, counters would wrap."
+    modes = [[], ["reader"]] + ([["writer"], ["writer", "reader"]] if args.write else [])
+
+    # Start CPU workload.
+    console = None
+    if args.cpu_console is not None:
+        import serial
+        console = serial.Serial(args.cpu_console, args.cpu_baudrate)
+        console.write(f"{args.cpu_command}\n".encode())
+        time.sleep(args.duration)
+
+    try:
+        print(f"{'DMA':14s} {'QoS':5s} " + " ".join(f"{p['name'] + ' rd/wr MB/s (wait %)':>34s}" for p in ports))
+        for enable in modes:
+            set_dma(bus, args.dma, args.dma_base, args.dma_length, enable)
+            for qos in args.qos.split(","):
+                setting = QOS_SETTINGS[qos]
+                for n, port in enumerate(ports):
+                    set_qos(bus, port["name"], None if setting is None else setting[n])
+                results = measure(bus, ports, args.duration)
+                line    = f"{'+'.join(enable) or 'off':14s} {qos:5s} "
+                for port in ports:
+                    r = results[port["name"]]
+                    line += f"{r['read']:>9.1f}/{r['write']:<9.1f}({100*r['read_wait']:4.1f}/{100*r['write_wait']:4.1f}%)  "
+                print(line)
+    finally:
+        stop_dma(bus, args.dma)
+        for port in ports:
+            set_qos(bus, port["name"], None)
+        if console is not None:
+            console.write(b"\x03") # Stop CPU workload.
+            console.close()
+        bus.close()
+
+if __name__ == "__main__":
+    main()
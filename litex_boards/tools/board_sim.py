@@ -0,0 +1,396 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""Board-level simulation.
+
+Runs the SoC of a target under Verilator: targets with a --sim argument (add_board_sim_arguments, ex
+digilent_arty, icebreaker, xilinx_kc705) elaborate their SoC as usual, its configuration is then
+read from the elaborated SoC and replayed on a simulation SoC where vendor PHYs and CRG are replaced
+by simulation models:
+
+- SoC parameters (CPU type/variant, integrated ROM/SRAM/MAIN_RAM, bus, ident...), sys_clk_freq,
+  memory map, linker regions and CPU reset address are kept.
+- SDRAM: same geometry/timings and data width, on a SDRAMPHYModel.
+- SPI Flash: same module, on a LiteSPIPHYModel. When the BIOS is executed from the SPI Flash (XIP
+  targets), the BIOS is compiled in a first pass and preloaded at its offset in the Flash.
+- Ethernet/Etherbone: same slots/IP addresses (Etherbone: target's --eth-ip), on a LiteEthPHYModel
+  (connected to a TAP interface, requires root privileges).
+- L2 statistics (--with-l2-stats): same trace depth, for litex_boards.tools.l2_advisor.
+- UART: connected to the console.
+
+Other board peripherals (LEDs, video, SDCard...) are not simulated.
+
+    $ python3 -m litex_boards.targets.digilent_arty --sim --with-ethernet
+    $ python3 -m litex_boards.targets.icebreaker --sim --sim-expect="litex>" --sim-timeout=600
+
+--sim-expect runs the simulation non-interactively until the string is received on the console (or
+--sim-timeout expires, returning an error) and reports the elapsed time, for CI/boot benchmarks.
+The target's builder arguments apply to the simulation build (--output-dir, default:
+build/<platform>_sim, --no-compile...).
+"""
+
+import os
+import sys
+import time
+import selectors
+import subprocess
+
+from migen import *
+
+from litex.build.generic_platform import *
+from litex.build.sim import SimPlatform
+from litex.build.sim.config import SimConfig
+from litex.build.sim.verilator import verilator_build_args, verilator_build_argdict
+
+from litex.soc.integration.common import get_mem_data
+from litex.soc.integration.soc_core import SoCCore
+from litex.soc.integration.soc import SoCRegion
+from litex.soc.integration.builder import Builder
+
+# IOs ----------------------------------------------------------------------------------------------
+
+_io = [
+    # Clk / Rst.
+    ("sys_clk", 0, Pins(1)),
+    ("sys_rst", 0, Pins(1)),
+
+    # Serial.
+    ("serial", 0,
+        Subsignal("source_valid", Pins(1)),
+        Subsignal("source_ready", Pins(1)),
+        Subsignal("source_data",  Pins(8)),
+
+        Subsignal("sink_valid",   Pins(1)),
+        Subsignal("sink_ready",   Pins(1)),
+        Subsignal("sink_data",    Pins(8)),
+    ),
+
+    # Ethernet (Stream Endpoint).
+    ("eth_clocks", 0,
+        Subsignal("tx", Pins(1)),
+        Subsignal("rx", Pins(1)),
+    ),
+    ("eth", 0,
+        Subsignal("source_valid", Pins(1)),
+        Subsignal("source_ready", Pins(1)),
+        Subsignal("source_data",  Pins(8)),
+
+        Subsignal("sink_valid",   Pins(1)),
+        Subsignal("sink_ready",   Pins(1)),
+        Subsignal("sink_data",    Pins(8)),
+    ),
+]
+
+# Board Configuration ------------------------------------------------------------------------------
+
+class BoardConfig:
+    """SoC configuration of a target, read from the target's elaborated SoC."""
+    def __init__(self, target):
+        self.target               = target
+        self.soc_kwargs           = {}
+        self.sdram                = [] # (databits, add_sdram arguments).
+        self.spiflash             = [] # add_spi_flash arguments.
+        self.ethernet             = [] # (method, add_ethernet/add_etherbone arguments).
+        self.sys_clk_freq         = None
+        self.mem_map              = {}
+        self.linker_regions       = {}
+        self.reset_address        = None
+        self.device               = None
+        self.bus_data_width       = None
+        self.sdram_data_width     = None # LiteDRAM port data width of the main SDRAM.
+        self.l2_stats_trace_depth = None # L2 statistics (add_l2_stats, ex --with-l2-stats).
+
+    def __repr__(self):
+        return (f"BoardConfig({self.target}: cpu={self.soc_kwargs.get('cpu_type')}, "
+            f"sys_clk_freq={self.sys_clk_freq/1e6:g}MHz, sdram={[a['module'].memtype for _, a in self.sdram]}, "
+            f"spiflash={[a['module'].name for a in self.spiflash]}, ethernet={[m for m, _ in self.ethernet]})")
+
+    @property
+    def bios_in_spiflash(self):
+        """BIOS executed from the SPI Flash (no integrated ROM)."""
+        if self.soc_kwargs.get("integrated_rom_size", 0) or self.reset_address is None:
+            return False
+        return self.get_spiflash_offset(self.reset_address) is not None
+
+    def get_spiflash_offset(self, address):
+        for args in self.spiflash:
+            origin = self.mem_map[args["name"]]
+            if origin <= address < origin + args["module"].total_size:
+                return address - origin
+        return None
+
+class SDRAMModuleSettings:
+    """Geometry/Timings of an elaborated LiteDRAM core, used as SDRAM module by add_sdram and the
+    SDRAMPHYModel (the timings are already in cycles)."""
+    def __init__(self, memtype, geom_settings, timing_settings):
+        self.memtype         = memtype
+        self.geom_settings   = geom_settings
+        self.timing_settings = timing_settings
+
+def _get_ip_address(soc, prefix):
+    if f"{prefix}1" not in soc.constants:
+        return None
+    return ".".join(str(soc.constants[f"{prefix}{i}"]) for i in range(1, 5))
+
+def get_board_config(soc, eth_ip=None):
+    """Return the configuration of an elaborated SoC (Etherbone IP address: eth_ip, add_etherbone's
+    default when None)."""
+    config = BoardConfig(soc.platform.name)
+
+    # SoC parameters.
+    config.soc_kwargs = dict(
+        cpu_type                 = soc.cpu_type,
+        cpu_variant              = soc.cpu_variant,
+        bus_standard             = soc.bus.standard,
+        bus_data_width           = soc.bus.data_width,
+        bus_address_width        = soc.bus.address_width,
+        bus_bursting             = soc.bus.bursting,
+        bus_interconnect         = soc.bus.interconnect,
+        integrated_rom_size      = soc.integrated_rom_size,
+        integrated_sram_size     = soc.integrated_sram_size,
+        integrated_main_ram_size = soc.integrated_main_ram_size,
+        csr_data_width           = soc.csr_data_width,
+        ident                    = soc.constants.get("CONFIG_IDENTIFIER", ""),
+        with_uart                = hasattr(soc, "uart"),
+        with_timer               = hasattr(soc, "timer0"),
+        with_ctrl                = hasattr(soc, "ctrl"),
+    )
+
+    # SDRAM.
+    if hasattr(soc, "sdram"):
+        settings = soc.sdram.controller.settings
+        region   = soc.bus.regions["main_ram"]
+        config.sdram.append((settings.phy.databits, dict(
+            name                    = "sdram",
+            module                  = SDRAMModuleSettings(settings.phy.memtype, settings.geom, settings.timing),
+            origin                  = region.origin,
+            size                    = region.size,
+            with_bist               = hasattr(soc, "sdram_generator"),
+            l2_cache_size           = soc.constants.get("CONFIG_L2_SIZE", 0),
+            l2_cache_min_data_width = len(soc.l2_cache.slave.dat_r) if hasattr(soc, "l2_cache") else 128,
+        )))
+        config.sdram_data_width = soc.sdram.crossbar.controller.data_width
+
+    # SPI Flash.
+    for name in soc.bus.slaves:
+        phy  = getattr(soc, f"{name}_phy",  None)
+        core = getattr(soc, f"{name}_core", None)
+        if not (hasattr(phy, "flash") and hasattr(core, "mmap")):
+            continue
+        quad = any(f"{name.upper()}_MODULE_{c}_CAPABLE" in soc.constants for c in ["QUAD", "QPI"])
+        config.spiflash.append(dict(
+            name        = name,
+            mode        = "4x" if quad else "1x",
+            clk_freq    = soc.constants[f"{name.upper()}_PHY_FREQUENCY"],
+            module      = phy.flash,
+            with_master = hasattr(core, "master"),
+        ))
+
+    # Ethernet / Etherbone.
+    if hasattr(soc, "etherbone"):
+        args = dict(with_ethmac=hasattr(soc, "ethmac"))
+        if eth_ip is not None:
+            args["ip_address"] = eth_ip
+        if args["with_ethmac"]:
+            args["ethmac_local_ip"]  = _get_ip_address(soc, "LOCALIP")
+            args["ethmac_remote_ip"] = _get_ip_address(soc, "REMOTEIP")
+        config.ethernet.append(("add_etherbone", args))
+    elif hasattr(soc, "ethmac"):
+        config.ethernet.append(("add_ethernet", dict(
+            dynamic_ip = "ETH_DYNAMIC_IP" in soc.constants,
+            nrxslots   = soc.ethmac.rx_slots.constant,
+            ntxslots   = soc.ethmac.tx_slots.constant,
+            local_ip   = _get_ip_address(soc, "LOCALIP"),
+            remote_ip  = _get_ip_address(soc, "REMOTEIP"),
+        )))
+
+    # Clocks/Memory Map/Regions.
+    config.sys_clk_freq   = soc.sys_clk_freq
+    config.mem_map        = {name: region.origin for name, region in soc.bus.regions.items()}
+    config.linker_regions = {name: region for name, region in soc.bus.regions.items()
+        if region.linker and name not in soc.bus.slaves}
+    config.reset_address  = getattr(soc.cpu, "reset_address", None)
+
+    # Device/Data Widths.
+    config.device         = soc.platform.device
+    config.bus_data_width = soc.bus.data_width
+
+    # L2 Statistics.
+    if hasattr(soc, "l2_stats"):
+        config.l2_stats_trace_depth = soc.l2_stats.trace_depth
+    return config
+
+# Board Simulation SoC -----------------------------------------------------------------------------
+
+class BoardSimSoC(SoCCore):
+    def __init__(self, config, with_ethernet=True, ram_init=[], spi_flash_init=[]):
+        # Platform ---------------------------------------------------------------------------------
+        platform = SimPlatform("SIM", _io)
+
+        # CRG --------------------------------------------------------------------------------------
+        self.crg = CRG(platform.request("sys_clk"))
+
+        # SoCCore ----------------------------------------------------------------------------------
+        self.mem_map = dict(config.mem_map)
+        soc_kwargs   = dict(config.soc_kwargs)
+        soc_kwargs["ident"] = f"{soc_kwargs.get('ident', '')} (Simulation)"
+        if soc_kwargs.get("with_uart", True):
+            soc_kwargs["uart_name"] = "sim"
+        if ram_init and soc_kwargs.get("integrated_main_ram_size", 0):
+            soc_kwargs["integrated_main_ram_init"] = ram_init
+        SoCCore.__init__(self, platform, clk_freq=config.sys_clk_freq, **soc_kwargs)
+
+        # SDRAM ------------------------------------------------------------------------------------
+        from litedram.phy.model import SDRAMPHYModel
+        for databits, args in config.sdram:
+            sdrphy = SDRAMPHYModel(
+                module     = args["module"],
+                data_width = databits,
+                clk_freq   = self.sys_clk_freq,
+                init       = ram_init if args["name"] == "sdram" else [])
+            self.add_module(name=f"{args['name']}phy", module=sdrphy)
+            self.add_sdram(phy=sdrphy, **args)
+            # Reduce memtest size for simulation speedup (or skip it to preserve init content).
+            if ram_init:
+                self.add_constant("SDRAM_TEST_DISABLE")
+            else:
+                self.add_constant("MEMTEST_DATA_SIZE", 8*1024)
+                self.add_constant("MEMTEST_ADDR_SIZE", 8*1024)
+
+        # L2 Statistics ----------------------------------------------------------------------------
+        if config.l2_stats_trace_depth is not None:
+            from litex_boards.cores.l2_stats import add_l2_stats
+            add_l2_stats(self, trace_depth=config.l2_stats_trace_depth)
+
+        # SPI Flash --------------------------------------------------------------------------------
+        from litespi.phy.model import LiteSPIPHYModel
+        for args in config.spiflash:
+            spiflash_phy = LiteSPIPHYModel(args["module"], init=spi_flash_init if args["name"] == "spiflash" else [])
+            self.add_module(name=f"{args['name']}_phy", module=spiflash_phy)
+            self.add_spi_flash(phy=spiflash_phy, **args)
+
+        # Ethernet / Etherbone ---------------------------------------------------------------------
+        if with_ethernet and config.ethernet:
+            from liteeth.phy.model import LiteEthPHYModel
+            self.ethphy = LiteEthPHYModel(platform.request("eth", 0))
+            for method, args in config.ethernet:
+                args = dict(args, phy_cd="eth")
+                getattr(self, method)(phy=self.ethphy, **args)
+
+        # Linker Regions ---------------------------------------------------------------------------
+        for name, region in config.linker_regions.items():
+            if name not in self.bus.regions:
+                self.bus.add_region(name, SoCRegion(origin=region.origin, size=region.size, linker=True))
+        if (self.cpu_type is not None) and (config.reset_address is not None):
+            self.cpu.set_reset_address(config.reset_address)
+
+        self.comb += platform.trace.eq(1)
+
+def get_sim_config(soc, tap="tap0", remote_ip="192.168.1.100"):
+    sim_config = SimConfig()
+    sim_config.add_clocker("sys_clk", freq_hz=soc.sys_clk_freq)
+    if hasattr(soc, "uart"):
+        sim_config.add_module("serial2console", "serial")
+    if hasattr(soc, "ethphy"):
+        sim_config.add_module("ethernet", "eth", args={"interface": tap, "ip": remote_ip})
+    return sim_config
+
+# Run ----------------------------------------------------------------------------------------------
+
+def run_until(gateware_dir, expect, timeout):
+    """Compile/Run the simulation until expect is received on the console, return elapsed time (None
+    on timeout) and console output."""
+    subprocess.run(["bash", "build_sim.sh"], cwd=gateware_dir, check=True, stdout=subprocess.DEVNULL)
+    start  = time.time()
+    proc   = subprocess.Popen([os.path.join("obj_dir", "Vsim")],
+        cwd    = gateware_dir,
+        stdin  = subprocess.DEVNULL,
+        stdout = subprocess.PIPE,
+        stderr = subprocess.STDOUT)
+    output = b""
+    sel    = selectors.DefaultSelector()
+    sel.register(proc.stdout, selectors.EVENT_READ)
+    try:
+        while time.time() - start < timeout:
+            if not sel.select(timeout=1):
+                continue
+            data = os.read(proc.stdout.fileno(), 4096)
+            if not data:
+                break
+            sys.stdout.write(data.decode("utf-8", errors="replace"))
+            sys.stdout.flush()
+            output += data
+            if expect.encode() in output:
+                return time.time() - start, output.decode("utf-8", errors="replace")
+    finally:
+        proc.kill()
+        proc.wait()
+    return None, output.decode("utf-8", errors="replace")
+
+def add_board_sim_arguments(parser):
+    """Add --sim and the simulation options to a target's LiteXArgumentParser."""
+    sim_group = parser.add_argument_group(title="Board Simulation options")
+    sim_group.add_argument("--sim",                  action="store_true",     help="Run the SoC in simulation (litex_boards.tools.board_sim) instead of building it.")
+    sim_group.add_argument("--sim-ram-init",         default=None,            help="Firmware preloaded in MAIN_RAM/SDRAM and booted by the BIOS.")
+    sim_group.add_argument("--sim-without-ethernet", action="store_true",     help="Do not simulate Ethernet (no TAP interface/root privileges).")
+    sim_group.add_argument("--sim-tap",              default="tap0",          help="TAP interface for Ethernet.")
+    sim_group.add_argument("--sim-remote-ip",        default="192.168.1.100", help="IP address of TAP interface.")
+    sim_group.add_argument("--sim-non-interactive",  action="store_true",     help="Run simulation without user input.")
+    sim_group.add_argument("--sim-expect",           default=None,            help="Run until string is received on the console.")
+    sim_group.add_argument("--sim-timeout",          default=600, type=float, help="Timeout (s) for --sim-expect.")
+    verilator_build_args(parser)
+
+def run_board_sim(soc, args, builder_kwargs={}):
+    """Simulate the elaborated SoC of a target (args: target arguments with add_board_sim_arguments,
+    builder_kwargs: target's builder arguments)."""
+    config = get_board_config(soc, eth_ip=getattr(args, "eth_ip", None))
+    print(config)
+    builder_kwargs = dict(builder_kwargs)
+    if builder_kwargs.get("output_dir", None) is None:
+        builder_kwargs["output_dir"] = os.path.join("build", f"{config.target}_sim")
+    with_compile = builder_kwargs.get("compile_software", True) and builder_kwargs.get("compile_gateware", True)
+
+    def get_soc(spi_flash_init=[]):
+        ram_init = []
+        if args.sim_ram_init is not None:
+            conf_soc = BoardSimSoC(config, with_ethernet=False)
+            ram_init = get_mem_data(args.sim_ram_init,
+                data_width = conf_soc.bus.data_width,
+                endianness = conf_soc.cpu.endianness,
+                offset     = conf_soc.mem_map["main_ram"])
+        soc = BoardSimSoC(config,
+            with_ethernet  = not args.sim_without_ethernet,
+            ram_init       = ram_init,
+            spi_flash_init = spi_flash_init)
+        if ram_init:
+            soc.add_constant("ROM_BOOT_ADDRESS", soc.mem_map["main_ram"])
+        return soc
+
+    # BIOS executed from SPI Flash: compile it first and preload it in the Flash model.
+    spi_flash_init = []
+    if config.bios_in_spiflash and with_compile:
+        sim_soc = get_soc()
+        builder = Builder(sim_soc, **dict(builder_kwargs, compile_gateware=False))
+        builder.build(build_name="sim", sim_config=get_sim_config(sim_soc))
+        offset  = config.get_spiflash_offset(config.reset_address)
+        spi_flash_init = get_mem_data({builder.get_bios_filename(): f"0x{offset:08x}"}, endianness="big")
+
+    # Build/Run.
+    sim_soc    = get_soc(spi_flash_init)
+    sim_config = get_sim_config(sim_soc, tap=args.sim_tap, remote_ip=args.sim_remote_ip)
+    builder    = Builder(sim_soc, **builder_kwargs)
+    toolchain_kwargs = verilator_build_argdict(args)
+    if args.sim_expect is None:
+        builder.build(build_name="sim", sim_config=sim_config, interactive=not args.sim_non_interactive, **toolchain_kwargs)
+        return
+
+    builder.build(build_name="sim", sim_config=sim_config, run=False, **toolchain_kwargs)
+    if not with_compile:
+        return
+    elapsed, _ = run_until(builder.gateware_dir, args.sim_expect, args.sim_timeout)
+    if elapsed is None:
+        print(f"\n{config.target}: {args.sim_expect!r} not received after {args.sim_timeout:g}s.")
+        sys.exit(1)
+    print(f"\n{config.target}: {args.sim_expect!r} received after {elapsed:.1f}s.")
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""UARTBone/JTAGBone block-transfer client, dump and benchmark (litex_boards.cores.bone_block).
+
+CommUARTBlock is a CommUART (usable as a bus with csr.csv: bus.regs..., LiteScope drivers) using
+the block commands of the bridge: 16-bit lengths, several read commands in flight, optional RLE
+compression of the responses. Run directly on the UART or JTAG link (litex_server not used: it still
+issues single-word UARTBone commands, so LiteScope/RemoteClient through litex_server are not sped up
+by the bridge):
+
+    $ python3 -m litex_boards.tools.bone_block --uart --uart-port=/dev/ttyUSB1 bench --base=0x40000000
+    $ python3 -m litex_boards.tools.bone_block --jtag --jtag-config=openocd_xc7_ft232.cfg --jtag-chain=2 \\
+        dump --base=0x40000000 --length=0x400000 --compress sdram.bin
+
+bench reports the read throughput (bytes/s) of the UARTBone commands (as done by litex_server), of
+the block commands and of the RLE-compressed block commands (--write: also writes, destructive).
+"""
+
+import os
+import time
+import struct
+import argparse
+from collections import deque
+
+from litex.tools.remote.comm_uart import CommUART
+
+# Constants ----------------------------------------------------------------------------------------
+
+CMD_WRITE_BURST_INCR  = 0x01
+CMD_READ_BURST_INCR   = 0x02
+CMD_WRITE_BURST_FIXED = 0x03
+CMD_READ_BURST_FIXED  = 0x04
+
+CMD_BLOCK = 0x10
+CMD_RLE   = 0x20
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def pack_command(cmd, length, addr, addr_bytes=4):
+    """Return the bytes of a block command (length in words, addr in bytes)."""
+    return bytes([cmd | CMD_BLOCK]) + (length % 65536).to_bytes(2, "big") + (addr//4).to_bytes(addr_bytes, "big")
+
+def decode_rle(read, length):
+    """Decode an RLE response of length words, read(n) returning n bytes of the response."""
+    words = []
+    while len(words) < length:
+        token = read(5)
+        words += [int.from_bytes(token[1:], "big")]*(token[0] + 1)
+    return words
+
+# CommUARTBlock ------------------------------------------------------------------------------------
+
+class CommUARTBlock(CommUART):
+    """CommUART using the block commands of litex_boards.cores.bone_block."""
+    def __init__(self, port, baudrate=115200, csr_csv=None, debug=False, addr_width=32,
+        max_length  = 16384,
+        outstanding = 4,
+        compress    = False):
+        CommUART.__init__(self, port, baudrate, csr_csv=csr_csv, debug=debug, addr_width=addr_width)
+        assert 1 <= max_length <= 65536
+        self.max_length  = max_length
+        self.outstanding = outstanding # Read commands in flight (7 bytes each, < RX FIFO of the bridge).
+        self.compress    = compress
+
+    def _read_words(self, length, compress):
+        if compress:
+            return decode_rle(self._read, length)
+        return list(struct.unpack(f">{length}I", self._read(4*length)))
+
+    def read(self, addr, length=None, burst="incr", compress=None):
+        compress   = self.compress if compress is None else compress
+        length_int = 1 if length is None else length
+        cmd        = {"incr": CMD_READ_BURST_INCR, "fixed": CMD_READ_BURST_FIXED}[burst]
+        cmd       |= CMD_RLE if compress else 0
+        self._flush()
+        data    = []
+        pending = deque()
+        for offset in range(0, length_int, self.max_length):
+            size = min(length_int - offset, self.max_length)
+            self._write(pack_command(cmd, size, addr + 4*offset*(burst == "incr"), self.addr_bytes))
+            pending.append(size)
+            if len(pending) == self.outstanding:
+                data += self._read_words(pending.popleft(), compress)
+        while pending:
+            data += self._read_words(pending.popleft(), compress)
+        if self.debug:
+            for i, value in enumerate(data):
+                print("read 0x{:08x} @ 0x{:08x}".format(value, addr + 4*i*(burst == "incr")))
+        return data[0] if length is None else data
+
+    def write(self, addr, data, burst="incr"):
+        data = data if isinstance(data, list) else [data]
+        cmd  = {"incr": CMD_WRITE_BURST_INCR, "fixed": CMD_WRITE_BURST_FIXED}[burst]
+        for offset in range(0, len(data), self.max_length):
+            chunk = data[offset:offset + self.max_length]
+            self._write(pack_command(cmd, len(chunk), addr + 4*offset*(burst == "incr"), self.addr_bytes) +
+                struct.pack(f">{len(chunk)}I", *chunk))
+            if self.debug:
+                for i, value in enumerate(chunk):
+                    print("write 0x{:08x} @ 0x{:08x}".format(value, addr + 4*(offset + i)))
+
+    def read_uartbone(self, addr, length):
+        """Read with the UARTBone commands (255 words per command: CommUART sends the length as is,
+        the 0=256 encoding can't be used)."""
+        data = []
+        for offset in range(0, length, 255):
+            data += CommUART.read(self, addr + 4*offset, min(length - offset, 255))
+        return data
+
+# Run ----------------------------------------------------------------------------------------------
+
+def bench(comm, base, length, write=False):
+    words   = length//4
+    results = []
+    def measure(name, fn):
+        start = time.time()
+        data  = fn()
+        results.append((name, length/(time.time() - start)))
+        return data
+    reference = measure("uartbone read", lambda: comm.read_uartbone(base, words))
+    block     = measure("block read",    lambda: comm.read(base, words, compress=False))
+    rle       = measure("block read (rle)", lambda: comm.read(base, words, compress=True))
+    assert block == reference and rle == reference, "Block read mismatch."
+    if write:
+        measure("uartbone write", lambda: CommUART.write(comm, base, reference))
+        measure("block write",    lambda: comm.write(base, reference))
+        assert comm.read(base, words) == reference, "Block write mismatch."
+    for name, rate in results:
+        print(f"{name:20s}: {rate/1e3:10.2f}KB/s ({rate/results[0][1]:6.1f}x)")
+
+def main():
+    parser = argparse.ArgumentParser(description="UARTBone/JTAGBone block-transfer client.")
+    parser.add_argument("--csr-csv",       default=None,           help="SoC CSV file.")
+    parser.add_argument("--addr-width",    default=32,             type=int, help="Bus address width.")
+    parser.add_argument("--uart",          action="store_true",    help="Select UART interface.")
+    parser.add_argument("--uart-port",     default=None,           help="UART port.")
+    parser.add_argument("--uart-baudrate", default=115200,         type=int, help="UART baudrate.")
+    parser.add_argument("--jtag",          action="store_true",    help="Select JTAG interface.")
+    parser.add_argument("--jtag-config",   default="openocd_xc7_ft232.cfg", help="OpenOCD JTAG configuration file.")
+    parser.add_argument("--jtag-chain",    default=1,              type=int, help="JTAG chain.")
+    parser.add_argument("--outstanding",   default=4,              type=int, help="Read commands in flight.")
+    parser.add_argument("--max-length",    default=16384,          type=int, help="Words per command.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    bench_parser = subparsers.add_parser("bench", help="Read/Write throughput benchmark.")
+    bench_parser.add_argument("--base",   default=0x4000_0000, type=lambda x: int(x, 0), help="Base address.")
+    bench_parser.add_argument("--length", default=0x1_0000,    type=lambda x: int(x, 0), help="Length (bytes).")
+    bench_parser.add_argument("--write",  action="store_true", help="Also benchmark writes (rewrites the data read).")
+
+    dump_parser = subparsers.add_parser("dump", help="Dump memory to a binary file.")
+    dump_parser.add_argument("--base",     default=0x4000_0000, type=lambda x: int(x, 0), help="Base address.")
+    dump_parser.add_argument("--length",   default=0x10_0000,   type=lambda x: int(x, 0), help="Length (bytes).")
+    dump_parser.add_argument("--compress", action="store_true", help="RLE compressed transfer.")
+    dump_parser.add_argument("filename",   help="Output file.")
+    args = parser.parse_args()
+
+    # Link.
+    if args.uart:
+        port = args.uart_port
+    elif args.jtag:
+        from litex.tools.litex_term import JTAGUART
+        jtag_uart = JTAGUART(config=args.jtag_config, chain=args.jtag_chain)
+        jtag_uart.open()
+        port = os.ttyname(jtag_uart.name)
+    else:
+        parser.error("Select an interface: --uart or --jtag.")
+    comm = CommUARTBlock(port, args.uart_baudrate,
+        csr_csv     = args.csr_csv,
+        addr_width  = args.addr_width,
+        max_length  = args.max_length,
+        outstanding = args.outstanding)
+    comm.open()
+
+    try:
+        if args.command == "bench":
+            bench(comm, args.base, args.length, write=args.write)
+        if args.command == "dump":
+            start = time.time()
+            data  = comm.read(args.base, args.length//4, compress=args.compress)
+            with open(args.filename, "wb") as f:
+                f.write(struct.pack(f"<{len(data)}I", *data))
+            print(f"{args.length} bytes dumped to {args.filename} ({args.length/(time.time() - start)/1e3:.2f}KB/s).")
+    finally:
+        comm.close()
+
+if __name__ == "__main__":
+    main()
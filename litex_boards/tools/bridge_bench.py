@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""Throughput/Latency benchmark of the PCIe <-> USB3 bridge of the PCIe Screamer targets.
+
+Generates traffic and reads the bridge monitors through a litex_server (ex litex_server --pcie
+--pcie-bar=<bar>) and reports sustained throughput and buffer latency of each direction. Traffic
+is selected with --traffic:
+
+- loopback (default): the internal generator feeds each buffer with an incrementing pattern and
+  the internal checker consumes/verifies the buffer output, no host traffic is needed (measures
+  the elastic buffers, DDR3 on R02).
+- generator: the internal generator feeds each buffer, the output side (PCIe DMA writer, USB3
+  FIFO) has to be consumed by the host (ex litepcie_util dma_test, D3XX streaming application).
+- host: traffic is generated on both sides of the bridge by the host.
+
+    $ python3 -m litex_boards.tools.bridge_bench --csr-csv=csr.csv --duration=10
+"""
+
+import time
+import argparse
+
+from litex import RemoteClient
+
+# Helpers ------------------------------------------------------------------------------------------
+
+DIRECTIONS = {
+    "h2u" : "PCIe -> USB3",
+    "u2h" : "USB3 -> PCIe",
+}
+
+TRAFFIC_GENERATOR = 0b01
+TRAFFIC_CHECKER   = 0b10
+
+TRAFFIC_MODES = {
+    "host"      : 0,
+    "generator" : TRAFFIC_GENERATOR,
+    "loopback"  : TRAFFIC_GENERATOR | TRAFFIC_CHECKER,
+}
+
+def set_traffic(bus, direction, mode):
+    getattr(bus.regs, f"bridge_{direction}_traffic_control").write(TRAFFIC_MODES[mode])
+
+def snapshot(bus, direction):
+    regs = bus.regs
+    getattr(regs, f"bridge_{direction}_update").write(1)
+    return {
+        "cycles"      : getattr(regs, f"bridge_{direction}_cycles").read(),
+        "bytes_in"    : getattr(regs, f"bridge_{direction}_bytes_in").read(),
+        "bytes_out"   : getattr(regs, f"bridge_{direction}_bytes_out").read(),
+        "latency"     : getattr(regs, f"bridge_{direction}_latency").read(),
+        "latency_max" : getattr(regs, f"bridge_{direction}_latency_max").read(),
+        "words"       : getattr(regs, f"bridge_{direction}_traffic_words").read(),
+        "errors"      : getattr(regs, f"bridge_{direction}_traffic_errors").read(),
+    }
+
+def rates(prev, curr, sys_clk_freq):
+    duration = (curr["cycles"] - prev["cycles"])/sys_clk_freq
+    return {
+        "in"          : (curr["bytes_in"]  - prev["bytes_in"])/duration,
+        "out"         : (curr["bytes_out"] - prev["bytes_out"])/duration,
+        "occupancy"   : curr["bytes_in"] - curr["bytes_out"],
+        "latency"     : curr["latency"]/sys_clk_freq,
+        "latency_max" : curr["latency_max"]/sys_clk_freq,
+    }
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="PCIe Screamer PCIe <-> USB3 bridge benchmark.")
+    parser.add_argument("--csr-csv",  default="csr.csv",   help="SoC CSV file.")
+    parser.add_argument("--host",     default="localhost", help="Host ip address.")
+    parser.add_argument("--port",     default=1234,        type=int,   help="Host bind port.")
+    parser.add_argument("--interval", default=1.0,         type=float, help="Report interval (in s).")
+    parser.add_argument("--duration", default=10.0,        type=float, help="Benchmark duration (in s).")
+    parser.add_argument("--traffic",  default="loopback",  choices=list(TRAFFIC_MODES), help="Traffic source/sink (see module docstring).")
+    args = parser.parse_args()
+
+    bus = RemoteClient(host=args.host, port=args.port, csr_csv=args.csr_csv)
+    bus.open()
+
+    sys_clk_freq = bus.constants.config_clock_frequency
+
+    for d in DIRECTIONS:
+        set_traffic(bus, d, args.traffic)
+
+    first = {d: snapshot(bus, d) for d in DIRECTIONS}
+    prev  = dict(first)
+    start = time.time()
+    try:
+        while (time.time() - start) < args.duration:
+            time.sleep(args.interval)
+            for d, name in DIRECTIONS.items():
+                curr = snapshot(bus, d)
+                r    = rates(prev[d], curr, sys_clk_freq)
+                print(f"{name}: in {r['in']/1e6:8.2f}MB/s out {r['out']/1e6:8.2f}MB/s "
+                      f"buffered {r['occupancy']/1e6:8.2f}MB "
+                      f"latency {r['latency']*1e6:10.2f}us (max {r['latency_max']*1e6:10.2f}us)")
+                prev[d] = curr
+    finally:
+        for d in DIRECTIONS:
+            set_traffic(bus, d, "host")
+
+    # Summary.
+    print("-"*80)
+    for d, name in DIRECTIONS.items():
+        r      = rates(first[d], prev[d], sys_clk_freq)
+        errors = f", {prev[d]['errors']} errors in {prev[d]['words']} words" if args.traffic == "loopback" else ""
+        print(f"{name}: sustained {r['out']/1e6:8.2f}MB/s, max latency {r['latency_max']*1e6:10.2f}us{errors}")
+
+    bus.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""Cross-board utilization/timing database.
+
+Collects utilization, Fmax and slack from the reports of a build (Vivado, nextpnr, Quartus, Efinity,
+Gowin, Radiant/Diamond) into a local SQLite database, keyed by board, commit and build options, and
+provides query/trend commands to spot resource/timing regressions and compare boards.
+
+- collect: parse the reports of an existing build directory.
+- build:   build a target (remaining arguments are passed to the target), save its log (nextpnr
+           only reports to its log) and collect it with the target arguments as options.
+- query:   latest results per board/options.
+- trend:   evolution of a board/options across commits (regressions highlighted).
+
+Build options are the target arguments (normalized), completed with the CPU type/variant and L2
+size from the SoC constants (csr.json). Database location defaults to <cache>/build_db.sqlite
+(<cache> from litex_boards.tools.artifacts).
+
+    $ python3 -m litex_boards.tools.build_db build digilent_arty --cpu-type=vexriscv --with-ethernet
+    $ python3 -m litex_boards.tools.build_db collect build/radiona_ulx3s --options="--device=LFE5U-85F"
+    $ python3 -m litex_boards.tools.build_db query --kind=LUT
+    $ python3 -m litex_boards.tools.build_db trend digilent_arty --metric=fmax
+"""
+
+import os
+import re
+import sys
+import glob
+import json
+import time
+import shlex
+import sqlite3
+import argparse
+import subprocess
+
+from litex_boards.tools.artifacts import cache_dir
+
+# Resource Kinds -----------------------------------------------------------------------------------
+
+# Vendor resource names to common kinds (first match).
+_resource_kinds = [
+    ("BRAM", r"block ram|bram|ramb|dp16kd|ebr|icestorm_ram|memory bits|m9k|m10k|m20k|bsram|lram|large ram"),
+    ("DSP",  r"dsp|mult|multiplier"),
+    ("FF",   r"register|flip|(?:^|_|\s)d?ff\b"),
+    ("LUT",  r"lut|comb|logic element|(?:^|_|\s)alm|icestorm_lc|(?:^|\s)logic\b"),
+    ("IO",   r"(?:^|_|\s)io|bonded|pin"),
+    ("PLL",  r"pll|mmcm|clkdiv"),
+]
+
+def get_resource_kind(name):
+    for kind, pattern in _resource_kinds:
+        if re.search(pattern, name, re.I):
+            return kind
+    return None
+
+# Vivado utilization rows per kind (sub-rows, "LUT as Logic", Slice Logic Distribution, ILOGIC/OLOGIC
+# rows... would double count or be mis-classified). PLL: MMCM/PLL primitives of the Clocking table.
+_vivado_resource_kinds = {
+    "Slice LUTs"      : "LUT",
+    "CLB LUTs"        : "LUT",
+    "Slice Registers" : "FF",
+    "CLB Registers"   : "FF",
+    "Block RAM Tile"  : "BRAM",
+    "DSPs"            : "DSP",
+    "Bonded IOB"      : "IO",
+}
+
+def get_vivado_resource_kind(name):
+    name = name.rstrip("*").strip()
+    if re.fullmatch(r"(MMCM|PLL)(E\d_(ADV|BASE))?", name):
+        return "PLL"
+    return _vivado_resource_kinds.get(name, None)
+
+# Report Parsers -----------------------------------------------------------------------------------
+
+class BuildReport:
+    def __init__(self, toolchain):
+        self.toolchain = toolchain
+        self.device    = None
+        self.resources = {} # name: (used, available).
+        self.kinds     = {} # name: kind (when not derived from the name, see get_resource_kind).
+        self.clocks    = {} # name: (fmax, constraint, slack) in Hz/Hz/ns (None when unknown).
+        self.wns       = None
+        self.tns       = None
+
+    def add_clock(self, name, fmax=None, constraint=None, slack=None):
+        if (slack is None) and (fmax is not None) and constraint:
+            slack = 1e9/constraint - 1e9/fmax
+        if (fmax is None) and (slack is not None) and constraint:
+            fmax = 1e9/(1e9/constraint - slack)
+        self.clocks[name] = (fmax, constraint, slack)
+        slacks = [s for _, _, s in self.clocks.values() if s is not None]
+        if slacks:
+            self.wns = min(slacks)
+
+def _num(s):
+    return float(s.replace(",", ""))
+
+def _vivado_section(content, title):
+    """Content of a report_timing_summary section (up to the next section header)."""
+    r = re.search(r"^\| " + re.escape(title) + r"\n(.*?)(?=^-+\n\| |\Z)", content, re.M | re.S)
+    return r.group(1) if r else ""
+
+def parse_vivado(files):
+    report = BuildReport("vivado")
+    for f in files:
+        content = open(f, errors="replace").read()
+        r = re.search(r"^\|?\s*Device\s*:\s*(\S+)", content, re.M)
+        if r:
+            report.device = r.group(1)
+        # Utilization: | Name | Used | Fixed | (Prohibited |) Available | Util% |
+        if "utilization" in os.path.basename(f) and "hierarchical" not in os.path.basename(f):
+            for line in content.splitlines():
+                # Top-level rows only (sub-rows are indented).
+                if not line.startswith("| ") or line.startswith("|  "):
+                    continue
+                cols = [c.strip() for c in line.strip().strip("|").split("|")]
+                if len(cols) >= 4 and re.fullmatch(r"[\d\.]+", cols[1] or "-") and re.fullmatch(r"[\d\.<]+", cols[-1] or "-"):
+                    name = cols[0].rstrip("*").strip()
+                    kind = get_vivado_resource_kind(name)
+                    # Canonical rows only, first occurrence (Slice Registers is also in section 2).
+                    if kind and name not in report.resources:
+                        report.resources[name] = (_num(cols[1]), _num(cols[-2]))
+                        report.kinds[name]     = kind
+        # Timing Summary.
+        if "timing" in os.path.basename(f):
+            r = re.search(r"WNS\(ns\)\s+TNS\(ns\).*\n\s*-+.*\n\s*(-?[\d\.]+)\s+(-?[\d\.]+)", content)
+            if r:
+                report.wns, report.tns = float(r.group(1)), float(r.group(2))
+            # Clock Summary (periods) and Intra Clock Table (per-clock WNS).
+            periods = {}
+            for m in re.finditer(r"^\s*(\S+)\s+\{[^}]*\}\s+([\d\.]+)\s+([\d\.]+)\s*$", _vivado_section(content, "Clock Summary"), re.M):
+                periods[m.group(1)] = float(m.group(2))
+            for m in re.finditer(r"^(\S+)\s+(-?[\d\.]+)\s+(-?[\d\.]+)", _vivado_section(content, "Intra Clock Table"), re.M):
+                if m.group(1) in periods:
+                    report.add_clock(m.group(1), constraint=1e9/periods[m.group(1)], slack=float(m.group(2)))
+    return report
+
+def parse_nextpnr(files):
+    report = BuildReport("nextpnr")
+    for f in files:
+        content = open(f, errors="replace").read()
+        # JSON report (--report).
+        if content.lstrip().startswith("{"):
+            try:
+                data = json.loads(content)
+            except ValueError:
+                continue
+            for name, u in data.get("utilization", {}).items():
+                report.resources[name] = (u["used"], u["available"])
+            for name, c in data.get("fmax", {}).items():
+                report.add_clock(name, fmax=c["achieved"]*1e6, constraint=c["constraint"]*1e6)
+            continue
+        # Log: keep last utilisation/timing reports (after routing).
+        blocks = re.findall(r"Device utilisation:\n((?:Info:\s+\S+:\s+\d+/\s*\d+.*\n)+)", content)
+        if blocks:
+            for m in re.finditer(r"Info:\s+(\S+):\s+(\d+)/\s*(\d+)", blocks[-1]):
+                report.resources[m.group(1)] = (int(m.group(2)), int(m.group(3)))
+        for m in re.finditer(r"Max frequency for clock\s+'([^']+)':\s+([\d\.]+) MHz \((?:PASS|FAIL) at ([\d\.]+) MHz\)", content):
+            report.add_clock(m.group(1), fmax=float(m.group(2))*1e6, constraint=float(m.group(3))*1e6)
+    return report
+
+def parse_quartus(files):
+    report = BuildReport("quartus")
+    for f in files:
+        content = open(f, errors="replace").read()
+        r = re.search(r"^Device\s*:\s*(\S+)", content, re.M)
+        if r:
+            report.device = r.group(1)
+        # Fit summary: "Total logic elements : 1,234 / 6,272 ( 20 % )".
+        for m in re.finditer(r"^([^:\n;]+?)\s*:\s*([\d,]+)\s*/\s*([\d,]+)", content, re.M):
+            if get_resource_kind(m.group(1)):
+                report.resources[m.group(1).strip()] = (_num(m.group(2)), _num(m.group(3)))
+        # Fmax Summary: "; 123.45 MHz ; 123.45 MHz ; clk ; ;".
+        for m in re.finditer(r";\s*([\d\.]+) MHz\s*;\s*([\d\.]+) MHz\s*;\s*(\S+)\s*;", content):
+            report.add_clock(m.group(3), fmax=float(m.group(2))*1e6)
+        # Setup slack: "Type : Slow 1200mV 85C Model Setup 'clk'" / "Slack : 1.234" / "TNS : 0.000".
+        for m in re.finditer(r"Setup '([^']+)'\s*\nSlack\s*:\s*(-?[\d\.]+)\s*\nTNS\s*:\s*(-?[\d\.]+)", content):
+            fmax, constraint, _ = report.clocks.get(m.group(1), (None, None, None))
+            report.clocks[m.group(1)] = (fmax, constraint, float(m.group(2)))
+            report.wns = float(m.group(2)) if report.wns is None else min(report.wns, float(m.group(2)))
+            report.tns = float(m.group(3)) + (report.tns or 0)
+    return report
+
+def parse_generic(toolchain):
+    """Efinity/Gowin/Radiant/Diamond: "Name: N/M" or "Number of Name: N out of M" utilization and
+    "clk ... <constraint> MHz ... <fmax> MHz" timing lines."""
+    def parse(files):
+        report = BuildReport(toolchain)
+        for f in files:
+            content = open(f, errors="replace").read()
+            r = re.search(r"^\s*(?:Device|Part|Target Device)\s*[:=]\s*(\S+)", content, re.M | re.I)
+            if r and report.device is None:
+                report.device = r.group(1)
+            for m in re.finditer(r"^\s*(?:Number of\s+)?([A-Za-z][\w \-]*?)\s*[:|]\s*([\d,]+)\s*(?:/|out of)\s*([\d,]+)", content, re.M):
+                if get_resource_kind(m.group(1)):
+                    report.resources.setdefault(m.group(1).strip(), (_num(m.group(2)), _num(m.group(3))))
+            for m in re.finditer(r"^\s*\"?(\w[\w\.\[\]/]*)\"?\s*\|?\s*([\d\.]+)\s*\(?MHz\)?\s*\|?\s*([\d\.]+)\s*\(?MHz", content, re.M):
+                report.add_clock(m.group(1), fmax=float(m.group(3))*1e6, constraint=float(m.group(2))*1e6)
+        return report
+    return parse
+
+# Report files per toolchain (glob patterns relative to the gateware directory).
+_report_files = [
+    (["*_utilization_place.rpt", "*_timing.rpt"],                 parse_vivado),
+    (["*.fit.summary", "*.sta.summary", "*.sta.rpt", "*.fit.rpt"], parse_quartus),
+    (["outflow/*.place.rpt", "outflow/*.timing.rpt", "outflow/*.res.csv"], parse_generic("efinity")),
+    (["impl/pnr/*.rpt.txt", "impl/pnr/*.tr"],                     parse_generic("gowin")),
+    (["impl/*.mrp", "impl/*.twr", "*.mrp", "*.twr"],              parse_generic("radiant")),
+    (["*.report", "*_report.json", "../build.log", "build.log"],  parse_nextpnr),
+]
+
+def parse_build(gateware_dir):
+    """Parse the reports of a gateware directory, return a BuildReport (or None)."""
+    for patterns, parser in _report_files:
+        files = sorted(set(f for p in patterns for f in glob.glob(os.path.join(gateware_dir, p))))
+        if files:
+            report = parser(files)
+            if report.resources or report.clocks:
+                return report
+    return None
+
+# Options ------------------------------------------------------------------------------------------
+
+_ignored_options = ["--build", "--load", "--flash", "--no-compile", "--no-compile-software", "--no-compile-gateware"]
+
+def normalize_options(args):
+    """Normalized target options (sorted, without build actions/output directories)."""
+    options = []
+    for arg in shlex.split(args) if isinstance(args, str) else args:
+        if arg.split("=")[0] in _ignored_options or arg.startswith(("--output-dir", "--gateware-dir", "--software-dir")):
+            continue
+        options.append(arg)
+    return " ".join(sorted(options))
+
+def get_soc_config(build_dir):
+    """CPU type/variant and L2 size from the SoC constants (csr.json)."""
+    config = {}
+    csr_json = os.path.join(build_dir, "csr.json")
+    if os.path.exists(csr_json):
+        constants = json.load(open(csr_json)).get("constants", {})
+        for name, value in constants.items():
+            r = re.fullmatch(r"config_cpu_type_(\w+)", name)
+            if r:
+                config["cpu_type"] = r.group(1)
+            r = re.fullmatch(r"config_cpu_variant_(\w+)", name)
+            if r:
+                config["cpu_variant"] = r.group(1)
+        if "config_l2_size" in constants:
+            config["l2_size"] = constants["config_l2_size"]
+        if "config_clock_frequency" in constants:
+            config["sys_clk_freq"] = constants["config_clock_frequency"]
+    return config
+
+def get_commit():
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=root, stderr=subprocess.DEVNULL).decode().strip()
+        dirty  = subprocess.call(["git", "diff", "--quiet", "HEAD"], cwd=root, stderr=subprocess.DEVNULL) != 0
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+# Database -----------------------------------------------------------------------------------------
+
+_schema = """
+CREATE TABLE IF NOT EXISTS builds (
+    id        INTEGER PRIMARY KEY,
+    board     TEXT, commit_id TEXT, options TEXT, config TEXT,
+    toolchain TEXT, device TEXT, timestamp REAL, build_dir TEXT,
+    wns       REAL, tns REAL,
+    UNIQUE(board, commit_id, options)
+);
+CREATE TABLE IF NOT EXISTS resources (
+    build_id INTEGER REFERENCES builds(id) ON DELETE CASCADE,
+    name     TEXT, kind TEXT, used REAL, available REAL
+);
+CREATE TABLE IF NOT EXISTS clocks (
+    build_id   INTEGER REFERENCES builds(id) ON DELETE CASCADE,
+    name       TEXT, fmax REAL, constraint_freq REAL, slack REAL
+);
+"""
+
+class BuildDB:
+    def __init__(self, filename=None):
+        self.filename = filename or os.path.join(cache_dir(), "build_db.sqlite")
+        os.makedirs(os.path.dirname(os.path.abspath(self.filename)), exist_ok=True)
+        self.db = sqlite3.connect(self.filename)
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.executescript(_schema)
+
+    def add(self, board, commit, options, config, report, build_dir):
+        """Add (or replace) results of a board/commit/options build."""
+        with self.db:
+            self.db.execute("DELETE FROM builds WHERE board=? AND commit_id=? AND options=?", (board, commit, options))
+            c = self.db.execute("INSERT INTO builds (board, commit_id, options, config, toolchain, device, "
+                "timestamp, build_dir, wns, tns) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (board, commit, options, json.dumps(config, sort_keys=True), report.toolchain, report.device,
+                time.time(), os.path.abspath(build_dir), report.wns, report.tns))
+            build_id = c.lastrowid
+            self.db.executemany("INSERT INTO resources VALUES (?, ?, ?, ?, ?)",
+                [(build_id, name, report.kinds.get(name) or get_resource_kind(name), used, available)
+                    for name, (used, available) in report.resources.items()])
+            self.db.executemany("INSERT INTO clocks VALUES (?, ?, ?, ?, ?)",
+                [(build_id, name, fmax, constraint, slack) for name, (fmax, constraint, slack) in report.clocks.items()])
+        return build_id
+
+    def get_metrics(self, build_id):
+        """Summary metrics of a build: used resources per kind, min Fmax, WNS.
+
+        Parsers only record primitive/summary rows (never sub-totals of another row), so a kind
+        sums distinct resources (ex MMCM + PLL)."""
+        metrics = {}
+        for kind, used, available in self.db.execute(
+            "SELECT kind, SUM(used), SUM(available) FROM resources WHERE build_id=? AND kind IS NOT NULL GROUP BY kind", (build_id,)):
+            metrics[kind] = used
+        metrics["fmax"] = self.db.execute("SELECT MIN(fmax) FROM clocks WHERE build_id=?", (build_id,)).fetchone()[0]
+        metrics["wns"]  = self.db.execute("SELECT wns FROM builds WHERE id=?", (build_id,)).fetchone()[0]
+        return metrics
+
+    def query(self, board=None, options=None, commit=None):
+        """Latest build per board/options (filtered)."""
+        sql  = "SELECT id, board, commit_id, options, toolchain, device, MAX(timestamp) FROM builds WHERE 1"
+        args = []
+        for column, value in [("board", board), ("options", options), ("commit_id", commit)]:
+            if value is not None:
+                sql  += f" AND {column} LIKE ?"
+                args.append(value)
+        sql += " GROUP BY board, options ORDER BY board, options"
+        return self.db.execute(sql, args).fetchall()
+
+    def trend(self, board, options=None):
+        """Builds of a board/options ordered by time."""
+        sql  = "SELECT id, commit_id, options, timestamp FROM builds WHERE board=?"
+        args = [board]
+        if options is not None:
+            sql  += " AND options=?"
+            args.append(options)
+        return self.db.execute(sql + " ORDER BY options, timestamp", args).fetchall()
+
+# Commands -----------------------------------------------------------------------------------------
+
+_metrics = ["LUT", "FF", "BRAM", "DSP", "fmax", "wns"]
+
+def _fmt(metric, value):
+    if value is None:
+        return "-"
+    if metric == "fmax":
+        return f"{value/1e6:.1f}MHz"
+    if metric == "wns":
+        return f"{value:.3f}ns"
+    return f"{value:g}"
+
+def collect(db, build_dir, board=None, options="", commit=None):
+    gateware_dir = os.path.join(build_dir, "gateware")
+    report = parse_build(gateware_dir if os.path.exists(gateware_dir) else build_dir)
+    if report is None:
+        print(f"{build_dir}: no build report found.")
+        return None
+    board   = board or os.path.basename(os.path.normpath(build_dir))
+    options = normalize_options(options)
+    config  = get_soc_config(build_dir)
+    commit  = commit or get_commit()
+    build_id = db.add(board, commit, options, config, report, build_dir)
+    metrics  = db.get_metrics(build_id)
+    print(f"{board} [{options or 'default'}] @ {commit}: " + ", ".join(f"{m} {_fmt(m, metrics.get(m))}" for m in _metrics))
+    return build_id
+
+def build(db, target, target_args, output_dir=None):
+    output_dir = output_dir or os.path.join("build", target)
+    for arg in target_args:
+        if arg.startswith("--output-dir="):
+            output_dir = arg.split("=", 1)[1]
+    os.makedirs(output_dir, exist_ok=True)
+    cmd = [sys.executable, "-m", f"litex_boards.targets.{target}", "--build", f"--output-dir={output_dir}"] + target_args
+    log = os.path.join(output_dir, "build.log")
+    with open(log, "w") as f:
+        p = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        for line in p.stdout:
+            sys.stdout.write(line.decode(errors="replace"))
+            f.write(line.decode(errors="replace"))
+        if p.wait() != 0:
+            raise OSError(f"{target} build failed, see {log}.")
+    return collect(db, output_dir, board=target, options=target_args)
+
+def print_query(db, rows, kind=None):
+    metrics = [kind] if kind else _metrics
+    print(f"{'Board':<30} {'Options':<40} {'Commit':<14} " + " ".join(f"{m:>10}" for m in metrics))
+    for build_id, board, commit, options, toolchain, device, _ in rows:
+        m = db.get_metrics(build_id)
+        print(f"{board:<30} {(options or 'default')[:40]:<40} {commit:<14} " + " ".join(f"{_fmt(k, m.get(k)):>10}" for k in metrics))
+
+def print_trend(db, rows, metric, threshold=1.0):
+    """Print metric per commit, flagging regressions larger than threshold (%)."""
+    worse_if_higher = metric in ["LUT", "FF", "BRAM", "DSP"]
+    previous = {}
+    print(f"{'Options':<40} {'Commit':<14} {'Date':<20} {metric:>12}")
+    for build_id, commit, options, timestamp in rows:
+        value = db.get_metrics(build_id).get(metric)
+        flag  = ""
+        prev  = previous.get(options)
+        if (value is not None) and (prev is not None) and prev != 0:
+            delta = 100*(value - prev)/abs(prev)
+            if (delta > threshold if worse_if_higher else delta < -threshold):
+                flag = f" REGRESSION ({delta:+.1f}%)"
+            elif delta != 0:
+                flag = f" ({delta:+.1f}%)"
+        if value is not None:
+            previous[options] = value
+        date = time.strftime("%Y-%m-%d %H:%M", time.localtime(timestamp))
+        print(f"{(options or 'default')[:40]:<40} {commit:<14} {date:<20} {_fmt(metric, value):>12}{flag}")
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-board utilization/timing database.")
+    parser.add_argument("--db", default=None, help="Database file (default: <cache>/build_db.sqlite).")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    p = subparsers.add_parser("collect", help="Collect reports of a build directory.")
+    p.add_argument("build_dirs", nargs="+",     help="Build directories (ex build/digilent_arty).")
+    p.add_argument("--board",   default=None,   help="Board name (default: build directory name).")
+    p.add_argument("--options", default="",     help="Target options used for the build.")
+    p.add_argument("--commit",  default=None,   help="Commit (default: current LiteX-Boards commit).")
+
+    p = subparsers.add_parser("build", help="Build a target and collect its reports.")
+    p.add_argument("target",                    help="Target module (ex digilent_arty).")
+
+    p = subparsers.add_parser("query", help="Latest results per board/options.")
+    p.add_argument("--board",   default=None,   help="Board filter (SQL LIKE pattern).")
+    p.add_argument("--options", default=None,   help="Options filter (SQL LIKE pattern).")
+    p.add_argument("--commit",  default=None,   help="Commit filter.")
+    p.add_argument("--kind",    default=None,   choices=_metrics, help="Only show a metric.")
+
+    p = subparsers.add_parser("trend", help="Evolution of a board across commits.")
+    p.add_argument("board",                      help="Board.")
+    p.add_argument("--options",   default=None,  help="Options (normalized, default: all).")
+    p.add_argument("--metric",    default="LUT", choices=_metrics, help="Metric.")
+    p.add_argument("--threshold", default=1.0, type=float, help="Regression threshold (%%).")
+
+    args, target_args = parser.parse_known_args()
+    if target_args and args.command != "build":
+        parser.error(f"unrecognized arguments: {' '.join(target_args)}")
+
+    db = BuildDB(args.db)
+    if args.command == "collect":
+        for build_dir in args.build_dirs:
+            collect(db, build_dir, board=args.board, options=args.options, commit=args.commit)
+    if args.command == "build":
+        build(db, args.target, target_args)
+    if args.command == "query":
+        print_query(db, db.query(args.board, args.options, args.commit), args.kind)
+    if args.command == "trend":
+        options = normalize_options(args.options) if args.options is not None else None
+        print_trend(db, db.trend(args.board, options), args.metric, args.threshold)
+
+if __name__ == "__main__":
+    main()
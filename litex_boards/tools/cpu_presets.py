@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""SMP CPU presets for the boards with wide DRAM native ports.
+
+With 4 phases, the A7/K7/US(P)DDRPHYs give a 256-bit (32-bit DRAM) or 512-bit (64-bit DRAM) LiteDRAM
+native port. A single 32-bit CPU on the SoC bus/L2 cannot saturate it. --cpu-preset selects a
+VexiiRiscv SMP cluster (Linux variant) instead:
+
+- Core count and L1 (I/D, per core) sizes, L2 (shared, coherent) size.
+- L2 memory port directly on a LiteDRAM port at the native width of the PHY (VexiiRiscv memory bus),
+  with L1 refills at a quarter of this width.
+- Coherent DMA port (--with-coherent-dma), for Linux drivers of the SoC's DMAs.
+
+Presets only set defaults: CPU arguments given explicitly (ex --cpu-count, --l2-bytes) take
+precedence (--vexii-args replaces the preset's L1 configuration).
+
+    $ python3 -m litex_boards.targets.xilinx_kc705 --cpu-preset=smp4 --build
+    $ python3 -m litex_boards.tools.cpu_presets --dram-data-width=512
+    $ python3 -m litex_boards.tools.smp_bench xilinx_kc705 --cpu-preset=smp4
+"""
+
+import argparse
+
+# CPU Presets --------------------------------------------------------------------------------------
+
+KB = 1024
+
+CPU_PRESETS = {
+    # Name  : Cores, L1 I/D bytes (per core), L2 bytes.
+    "smp2" : {"cpu_count": 2, "l1_bytes": 16*KB, "l2_bytes": 128*KB},
+    "smp4" : {"cpu_count": 4, "l1_bytes": 16*KB, "l2_bytes": 256*KB},
+    "smp8" : {"cpu_count": 8, "l1_bytes": 32*KB, "l2_bytes": 512*KB},
+}
+
+L1_WAYS = 4
+L1_LINE = 64 # Bytes.
+L2_WAYS = 8
+
+def get_cpu_preset_defaults(preset, dram_data_width):
+    """Return the LiteX arguments defaults of a preset for a DRAM native port of dram_data_width."""
+    p          = CPU_PRESETS[preset]
+    l1_sets    = p["l1_bytes"]//(L1_WAYS*L1_LINE)
+    l1_width   = max(dram_data_width//4, 64)
+    vexii_args = " ".join([
+        f"--fetch-l1-ways={L1_WAYS} --fetch-l1-sets={l1_sets} --fetch-l1-mem-data-width-min={l1_width}",
+        f"--lsu-l1-ways={L1_WAYS} --lsu-l1-sets={l1_sets} --lsu-l1-mem-data-width-min={l1_width}",
+    ])
+    return {
+        "cpu_type"          : "vexiiriscv",
+        "cpu_variant"       : "linux",
+        "cpu_count"         : p["cpu_count"],
+        "l2_bytes"          : p["l2_bytes"],
+        "l2_ways"           : L2_WAYS,
+        "with_coherent_dma" : True,
+        "vexii_args"        : vexii_args,
+    }
+
+def add_cpu_preset_argument(parser, dram_data_width, presets=["smp2", "smp4"]):
+    """Add --cpu-preset to a target's LiteXArgumentParser (presets fitting the FPGA of the board) and
+    apply the selected preset's defaults (to be called before parse_args)."""
+    parser.add_target_argument("--cpu-preset", default=None, choices=presets,
+        help=f"SMP CPU preset ({dram_data_width}-bit DRAM port, see litex_boards.tools.cpu_presets).")
+    preset = parser.get_value_from_key("--cpu-preset")
+    if preset not in presets:
+        return
+    cpu_type = parser.get_value_from_key("--cpu-type", "vexiiriscv")
+    if cpu_type != "vexiiriscv":
+        parser.error(f"--cpu-preset requires --cpu-type=vexiiriscv (not {cpu_type}).")
+    parser.set_defaults(**get_cpu_preset_defaults(preset, dram_data_width))
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="SMP CPU presets.")
+    parser.add_argument("--dram-data-width", default=512, type=int, help="LiteDRAM native port data width.")
+    args = parser.parse_args()
+
+    for name, p in CPU_PRESETS.items():
+        defaults = get_cpu_preset_defaults(name, args.dram_data_width)
+        print(f"{name}: {p['cpu_count']} cores, L1: {p['l1_bytes']//KB}KB I/D, L2: {p['l2_bytes']//KB}KB, "
+            f"memory port: {args.dram_data_width}-bit, coherent DMA.")
+        print(f"  --cpu-type={defaults['cpu_type']} --cpu-variant={defaults['cpu_variant']} "
+            f"--cpu-count={defaults['cpu_count']} --l2-bytes={defaults['l2_bytes']} --l2-ways={defaults['l2_ways']} "
+            f"--with-coherent-dma --vexii-args=\"{defaults['vexii_args']}\"")
+
+if __name__ == "__main__":
+    main()
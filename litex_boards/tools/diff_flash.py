@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""Differential SPI Flash programming.
+
+Programmers erase/rewrite the full image on each --flash, which takes minutes on 16MB parts while
+most re-flashes only change a few KB (firmware next to an unchanged bitstream). DiffFlash wraps the
+programmer returned by create_programmer() and only erases/programs the erase sectors that differ
+from what is on the device:
+
+- Per-sector SHA256 hashes of the device content are cached in <cache>/flash/<device>.json (updated
+  on each programming, <cache> from litex_boards.tools.artifacts) or rebuilt from a read back of
+  the device (readback=True or --readback, for programmers supporting it). <device> identifies the
+  physical board: an explicit ID (board/flash serial, --device) or the serial of the cable when the
+  programmer selects one; never the platform name, shared by all the boards of a type.
+- Changed sectors are coalesced in runs, each run is programmed at its offset (padded with 0xff to
+  the sector size, i.e. the erased value), in a single programmer session when supported.
+- Programmed runs are verified by reading them back and comparing hashes (no full read back).
+
+Sectors have to match (or be a multiple of) the erase granularity of the programmer (64KB by
+default). The cache is only valid if the device is exclusively programmed through DiffFlash: use
+full=True (--full) after programming it by other means.
+
+    $ python3 -m litex_boards.tools.diff_flash --platform=icebreaker --device=icebreaker-0123 \
+        --address=0x40000 build/icebreaker/software/bios/bios.bin
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+import tempfile
+import importlib
+
+from litex_boards.tools.artifacts import cache_dir
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def sector_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+def get_runs(sectors):
+    """Coalesce sorted sector indexes in (first, count) runs."""
+    runs = []
+    for s in sectors:
+        if runs and (runs[-1][0] + runs[-1][1]) == s:
+            runs[-1][1] += 1
+        else:
+            runs.append([s, 1])
+    return [tuple(r) for r in runs]
+
+# Programmer Backends ------------------------------------------------------------------------------
+
+class _GenericBackend:
+    """Programs runs through the programmer's flash() method, no read back."""
+    def __init__(self, prog):
+        self.prog = prog
+
+    def cable_serial(self):
+        """Serial of the cable selected by the programmer (None when not selected/supported)."""
+        return None
+
+    def write(self, runs):
+        for address, filename in runs:
+            self.prog.flash(address, filename)
+
+    def read(self, address, length, filename):
+        raise NotImplementedError(f"Read back not supported with {self.prog.__class__.__name__}.")
+
+class _IceStormBackend(_GenericBackend):
+    def read(self, address, length, filename):
+        self.prog.call(["iceprog", "-o", str(address), "-R", str(length), filename])
+
+class _OpenFPGALoaderBackend(_GenericBackend):
+    def cable_serial(self):
+        if "--ftdi-serial" in self.prog.cmd:
+            return self.prog.cmd[self.prog.cmd.index("--ftdi-serial") + 1]
+        return None
+
+    def read(self, address, length, filename):
+        self.prog.call(self.prog.cmd + ["--dump-flash", "--offset", str(address), "--file-size", str(length), filename])
+
+class _OpenOCDBackend(_GenericBackend):
+    def _run(self, commands):
+        config      = self.prog.find_config()
+        flash_proxy = self.prog.find_flash_proxy()
+        script = "; ".join(["init", f"jtagspi_init 0 {{{flash_proxy}}}"] + commands + ["exit"])
+        self.prog.call(["openocd", "-f", config, "-c", script])
+
+    def write(self, runs):
+        # All runs in a single session (proxy bitstream only loaded once).
+        commands = [f"jtagspi_program {{{filename}}} 0x{address:x}" for address, filename in runs]
+        self._run(commands + ["fpga_program"])
+
+    def read(self, address, length, filename):
+        self._run([f"flash read_bank 0 {{{filename}}} 0x{address:x} 0x{length:x}"])
+
+_backends = {
+    "IceStormProgrammer" : _IceStormBackend,
+    "OpenFPGALoader"     : _OpenFPGALoaderBackend,
+    "OpenOCD"            : _OpenOCDBackend,
+}
+
+# Differential Flash -------------------------------------------------------------------------------
+
+class DiffFlash:
+    """Differential Flash programmer.
+
+    Parameters
+    ----------
+    prog : GenericProgrammer
+        Programmer (from create_programmer()).
+
+    device : str
+        Device ID (cache key), ex board/flash serial. Defaults to the serial of the cable selected by
+        the programmer (ValueError when not available).
+
+    sector_size : int
+        Erase sector size (bytes), should match the programmer's erase granularity.
+    """
+    def __init__(self, prog, device=None, sector_size=0x10000, readback=False, verify=True, full=False):
+        self.prog        = prog
+        self.sector_size = sector_size
+        self.readback    = readback
+        self.verify      = verify
+        self.full        = full
+        self.backend     = _backends.get(prog.__class__.__name__, _GenericBackend)(prog)
+        if device is None:
+            serial = self.backend.cable_serial()
+            if serial is None:
+                raise ValueError("DiffFlash needs a device ID (board/flash serial): the sector cache is per board.")
+            device = f"cable_{serial}"
+        self.device      = device
+        self.cache       = os.path.join(cache_dir(), "flash", re.sub(r"[^\w\-\.]", "_", device) + ".json")
+
+    def _read_cache(self):
+        if self.full or not os.path.exists(self.cache):
+            return {}
+        with open(self.cache) as f:
+            return json.load(f)
+
+    def _write_cache(self, hashes):
+        os.makedirs(os.path.dirname(self.cache), exist_ok=True)
+        with open(self.cache, "w") as f:
+            json.dump(hashes, f, indent=1, sort_keys=True)
+
+    def _read_back(self, tmpdir, address, length):
+        filename = os.path.join(tmpdir, f"read_{address:08x}.bin")
+        self.backend.read(address, length, filename)
+        with open(filename, "rb") as f:
+            return f.read()
+
+    def _sector_hashes(self, data, first):
+        ss = self.sector_size
+        return {str(first + n): sector_hash(data[n*ss:(n + 1)*ss]) for n in range(len(data)//ss)}
+
+    def flash(self, address, data_file):
+        """Program data_file at address, only rewriting changed sectors. Returns written bytes."""
+        ss = self.sector_size
+        if address % ss:
+            raise ValueError(f"Address 0x{address:x} not aligned on sector size (0x{ss:x}).")
+        with open(data_file, "rb") as f:
+            data = f.read()
+        data += b"\xff"*(-len(data) % ss) # Pad with erased value.
+        first    = address//ss
+        nsectors = len(data)//ss
+        hashes   = self._sector_hashes(data, first)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # Get device hashes (cache or read back).
+            cached = self._read_cache()
+            if self.readback:
+                cached.update(self._sector_hashes(self._read_back(tmpdir, address, len(data)), first))
+
+            # Find changed sectors.
+            changed = [s for s in range(first, first + nsectors) if cached.get(str(s)) != hashes[str(s)]]
+            runs    = get_runs(changed)
+            print(f"{self.device}: {len(changed)}/{nsectors} sectors changed ({len(runs)} runs).")
+
+            # Program runs.
+            if runs:
+                files = []
+                for s, count in runs:
+                    filename = os.path.join(tmpdir, f"run_{s*ss:08x}.bin")
+                    offset   = (s - first)*ss
+                    with open(filename, "wb") as f:
+                        f.write(data[offset:offset + count*ss])
+                    files.append((s*ss, filename))
+                # Invalidate programmed sectors until verified (interrupted programming).
+                for s in changed:
+                    cached.pop(str(s), None)
+                self._write_cache(cached)
+                self.backend.write(files)
+
+            # Verify programmed runs (hashes of read back runs).
+            if runs and self.verify:
+                try:
+                    for s, count in runs:
+                        offset   = (s - first)*ss
+                        readback = self._read_back(tmpdir, s*ss, count*ss)
+                        if sector_hash(readback) != sector_hash(data[offset:offset + count*ss]):
+                            raise IOError(f"{self.device}: verify failed at 0x{s*ss:x}.")
+                    print(f"{self.device}: verify OK.")
+                except NotImplementedError as e:
+                    print(f"{self.device}: verify skipped ({e})")
+
+        # Update cache.
+        cached.update(hashes)
+        self._write_cache(cached)
+        return len(changed)*ss
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Differential SPI Flash programming.")
+    parser.add_argument("file",                                    help="Image to program.")
+    parser.add_argument("--platform",    required=True,            help="Platform module (ex icebreaker).")
+    parser.add_argument("--device",      required=True,            help="Device ID (sector cache key, ex board/flash serial).")
+    parser.add_argument("--address",     default="0",              help="Flash address.")
+    parser.add_argument("--sector-size", default="0x10000",        help="Erase sector size.")
+    parser.add_argument("--readback",    action="store_true",      help="Get device hashes from a read back instead of the cache.")
+    parser.add_argument("--full",        action="store_true",      help="Ignore cache and rewrite all sectors.")
+    parser.add_argument("--no-verify",   action="store_true",      help="Disable verification of programmed sectors.")
+    args = parser.parse_args()
+
+    module   = importlib.import_module(f"litex_boards.platforms.{args.platform}")
+    platform = module.Platform()
+    flash    = DiffFlash(platform.create_programmer(),
+        device      = args.device,
+        sector_size = int(args.sector_size, 0),
+        readback    = args.readback,
+        verify      = not args.no_verify,
+        full        = args.full,
+    )
+    try:
+        flash.flash(int(args.address, 0), args.file)
+    except NotImplementedError as e:
+        # Read back unsupported (--readback), raised before any programming.
+        print(f"Error: {e} Program without --readback (sector cache) or with --full.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
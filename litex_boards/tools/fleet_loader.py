@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""Concurrent multi-board loader.
+
+Loads/flashes a fleet of boards (of mixed types) described in a JSON manifest concurrently, using
+the programmer returned by each platform's create_programmer(). Each board is programmed from a
+worker process (programmers are blocking and some of them write files in the working directory)
+with its own working directory and log file; boards sharing a cable are serialized.
+
+Manifest:
+
+    {
+        "retries" : 2,
+        "timeout" : 300,
+        "boards"  : [
+            {
+                "name"      : "arty0",
+                "platform"  : "digilent_arty",
+                "bitstream" : "build/digilent_arty/gateware/digilent_arty.bit",
+                "serial"    : "210319A8C17A"
+            },
+            {
+                "name"            : "ecpix5_0",
+                "platform"        : "lambdaconcept_ecpix5",
+                "platform_args"   : {"device": "85F"},
+                "programmer_args" : {"version": "r03"},
+                "bitstream"       : "build/lambdaconcept_ecpix5/gateware/lambdaconcept_ecpix5.bit",
+                "usb_path"        : "001:012",
+                "action"          : "flash",
+                "address"         : 0
+            }
+        ]
+    }
+
+- serial/usb_path select the cable (FTDI serial, USB bus:device/location) for programmers that
+  support it (see _cable_selection: OpenFPGALoader, OpenOCD, USBBlaster, Vivado for load only).
+  Unsupported selections, platforms or programmers are reported as configuration errors when
+  loading the manifest, before programming any board.
+- Boards sharing a cable (same serial/usb_path) are serialized. A board without selection uses the
+  first cable found by its programmer, so has to be the only board using this programmer.
+- Paths are relative to the manifest.
+
+    $ python3 -m litex_boards.tools.fleet_loader rack0.json --jobs=8
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import importlib
+
+# Manifest -----------------------------------------------------------------------------------------
+
+_board_defaults = {
+    "platform_args"   : {},
+    "programmer_args" : {},
+    "action"          : "load",
+    "address"         : 0,
+    "serial"          : None,
+    "usb_path"        : None,
+}
+
+# Supported cable selections per programmer and action (see select_device).
+_cable_selection = {
+    "OpenFPGALoader"        : {"load": ["serial", "usb_path"], "flash": ["serial", "usb_path"]},
+    "OpenOCD"               : {"load": ["serial", "usb_path"], "flash": ["serial", "usb_path"]},
+    "OpenOCDJTAGProgrammer" : {"load": ["serial", "usb_path"], "flash": ["serial", "usb_path"]},
+    "USBBlaster"            : {"load": ["serial", "usb_path"]},
+    "VivadoProgrammer"      : {"load": ["serial"]},
+}
+
+def create_programmer(board):
+    module   = importlib.import_module(f"litex_boards.platforms.{board['platform']}")
+    platform = module.Platform(**board["platform_args"])
+    return platform.create_programmer(**board["programmer_args"])
+
+def check_programmer(board):
+    """Return the programmer class name of a board, ValueError if its cable selection is not
+    supported."""
+    try:
+        name = create_programmer(board).__class__.__name__
+    except Exception as e:
+        raise ValueError(f"{board['name']}: unable to create {board['platform']} programmer ({e}).") from e
+    selection = [key for key in ["serial", "usb_path"] if board[key] is not None]
+    supported = _cable_selection.get(name, {}).get(board["action"], [])
+    for key in selection:
+        if key not in supported:
+            raise ValueError(f"{board['name']}: {key} selection not supported with {name} ({board['action']}).")
+    return name
+
+def load_manifest(filename):
+    with open(filename) as f:
+        manifest = json.load(f)
+    root   = os.path.dirname(os.path.abspath(filename))
+    boards = []
+    names  = set()
+    for n, entry in enumerate(manifest["boards"]):
+        board = dict(_board_defaults)
+        board.update(entry)
+        board.setdefault("name", f"board{n}")
+        board.setdefault("retries", manifest.get("retries", 0))
+        board.setdefault("timeout", manifest.get("timeout", None))
+        for key in ["platform", "bitstream"]:
+            if key not in board:
+                raise ValueError(f"{board['name']}: missing {key}.")
+        if board["action"] not in ["load", "flash"]:
+            raise ValueError(f"{board['name']}: unknown action {board['action']}.")
+        if board["name"] in names:
+            raise ValueError(f"{board['name']}: duplicate board name.")
+        names.add(board["name"])
+        board["programmer"] = check_programmer(board)
+        board["bitstream"]  = os.path.join(root, board["bitstream"])
+        boards.append(board)
+    return boards
+
+def get_cable_key(board):
+    if board["serial"] is not None:
+        return f"serial:{board['serial']}"
+    if board["usb_path"] is not None:
+        return f"usb:{board['usb_path']}"
+    # No selection: first cable found by the programmer.
+    return f"default:{board['programmer']}"
+
+def get_cable_keys(boards):
+    """Return the cable (lock) key of each board, ValueError when boards without cable selection
+    could use the same cable as another board of the same programmer."""
+    keys = {}
+    for board in boards:
+        keys[board["name"]] = get_cable_key(board)
+    for board in boards:
+        if keys[board["name"]].startswith("default:"):
+            others = [b["name"] for b in boards if b["programmer"] == board["programmer"] and b is not board]
+            if others:
+                raise ValueError(f"{board['name']}: no cable selection (serial/usb_path) while "
+                    f"{', '.join(others)} also use{'s' if len(others) == 1 else ''} {board['programmer']}.")
+    return keys
+
+# Device Selection ---------------------------------------------------------------------------------
+
+def select_device(prog, serial=None, usb_path=None):
+    """Select the cable used by an existing programmer instance."""
+    if (serial is None) and (usb_path is None):
+        return prog
+    name = prog.__class__.__name__
+
+    # OpenFPGALoader: FTDI serial / USB bus:device.
+    if name == "OpenFPGALoader":
+        if serial is not None:
+            prog.cmd += ["--ftdi-serial", serial]
+        if usb_path is not None:
+            prog.cmd += ["--busdev-num", usb_path]
+        return prog
+
+    # OpenOCD: adapter serial/location, after the interface configuration.
+    if name in ["OpenOCD", "OpenOCDJTAGProgrammer"]:
+        select = []
+        if serial is not None:
+            select += ["-c", f"adapter serial {serial}"]
+        if usb_path is not None:
+            select += ["-c", f"adapter usb location {usb_path}"]
+        call = prog.call
+        def select_call(command, **kwargs):
+            n = command.index("-f") + 2
+            return call(command[:n] + select + command[n:], **kwargs)
+        prog.call = select_call
+        return prog
+
+    # USBBlaster: cable name (serial) and USB port (usb_path).
+    if name == "USBBlaster":
+        if serial is not None:
+            prog.cable_name = serial
+        if usb_path is not None:
+            prog.cable_name = f"{prog.cable_name} [{usb_path}]"
+        return prog
+
+    # Vivado: hw_server target (load only, flash() always opens the first target).
+    if name == "VivadoProgrammer" and usb_path is None:
+        load_bitstream = prog.load_bitstream
+        prog.load_bitstream = lambda bitstream_file: load_bitstream(bitstream_file, target=f"*{serial}")
+        return prog
+
+    raise ValueError(f"Cable selection not supported with {name}.")
+
+# Worker -------------------------------------------------------------------------------------------
+
+prog_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "prog")
+
+def run_worker(board):
+    """Program a board (blocking, from the worker process)."""
+    prog = create_programmer(board)
+    prog = select_device(prog, serial=board["serial"], usb_path=board["usb_path"])
+    # Use configurations from litex_boards/prog (worker runs from its own working directory).
+    config = getattr(prog, "config", None)
+    if isinstance(config, str) and os.path.exists(os.path.join(prog_dir, config)):
+        prog.config = os.path.join(prog_dir, config)
+    if board["action"] == "load":
+        prog.load_bitstream(board["bitstream"])
+    else:
+        prog.flash(board["address"], board["bitstream"])
+
+# Async Programmer ---------------------------------------------------------------------------------
+
+class AsyncProgrammer:
+    """Async interface to a board's programmer (runs create_programmer()'s programmer in a worker
+    process, with its own working directory and log)."""
+    def __init__(self, board, log_dir):
+        self.board   = board
+        self.workdir = os.path.abspath(os.path.join(log_dir, board["name"]))
+        self.log     = os.path.join(self.workdir, "program.log")
+        os.makedirs(self.workdir, exist_ok=True)
+
+    async def run(self, action=None, timeout=None):
+        board = dict(self.board)
+        if action is not None:
+            board["action"] = action
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(p for p in sys.path if p) # Same modules in worker.
+        with open(self.log, "a") as log:
+            log.write(f"# {time.strftime('%Y-%m-%d %H:%M:%S')} {board['action']} {board['bitstream']}\n")
+            log.flush()
+            proc = await asyncio.create_subprocess_exec(
+                sys.executable, "-u", "-m", "litex_boards.tools.fleet_loader",
+                "--worker", json.dumps(board),
+                cwd    = self.workdir,
+                env    = env,
+                stdout = log,
+                stderr = asyncio.subprocess.STDOUT,
+            )
+            try:
+                returncode = await asyncio.wait_for(proc.wait(), timeout)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                log.write(f"# Timeout after {timeout}s.\n")
+                return False
+            log.write(f"# Exit code {returncode}.\n")
+        return returncode == 0
+
+    async def load_bitstream(self, timeout=None):
+        return await self.run("load", timeout)
+
+    async def flash(self, timeout=None):
+        return await self.run("flash", timeout)
+
+# Fleet --------------------------------------------------------------------------------------------
+
+async def program_board(board, log_dir, jobs, lock):
+    prog   = AsyncProgrammer(board, log_dir)
+    result = {"name": board["name"], "platform": board["platform"], "log": prog.log, "attempts": 0}
+    start  = time.time()
+    async with lock, jobs:
+        for attempt in range(1 + board["retries"]):
+            result["attempts"] += 1
+            if await prog.run(timeout=board["timeout"]):
+                result["status"] = "OK"
+                break
+            print(f"{board['name']}: attempt {attempt + 1} failed, see {prog.log}.")
+        else:
+            result["status"] = "FAILED"
+    result["duration"] = time.time() - start
+    print(f"{board['name']}: {result['status']} ({result['duration']:.1f}s).")
+    return result
+
+async def program_fleet(boards, log_dir="fleet", jobs=8):
+    semaphore = asyncio.Semaphore(jobs)
+    keys      = get_cable_keys(boards)
+    locks     = {key: asyncio.Lock() for key in keys.values()}
+    return await asyncio.gather(*[program_board(board, log_dir, semaphore, locks[keys[board["name"]]])
+        for board in boards])
+
+def print_summary(results):
+    print("-"*80)
+    print(f"{'Board':<20} {'Platform':<30} {'Status':<8} {'Attempts':>8} {'Time':>8}")
+    for r in results:
+        print(f"{r['name']:<20} {r['platform']:<30} {r['status']:<8} {r['attempts']:>8} {r['duration']:>7.1f}s")
+    failed = [r for r in results if r["status"] != "OK"]
+    print("-"*80)
+    print(f"{len(results) - len(failed)}/{len(results)} boards programmed.")
+    for r in failed:
+        print(f"{r['name']}: {r['log']}")
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent multi-board loader.")
+    parser.add_argument("manifest", nargs="?",                     help="Fleet manifest (JSON).")
+    parser.add_argument("--jobs",    default=8,     type=int,      help="Max number of boards programmed concurrently.")
+    parser.add_argument("--log-dir", default="fleet",              help="Per-board working/log directories.")
+    parser.add_argument("--retries", default=None,  type=int,      help="Override retries of all boards.")
+    parser.add_argument("--only",    default=None,                 help="Comma-separated list of boards to program.")
+    parser.add_argument("--worker",  default=None,                 help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Worker mode.
+    if args.worker is not None:
+        run_worker(json.loads(args.worker))
+        return
+
+    if args.manifest is None:
+        parser.error("manifest required.")
+    try:
+        boards = load_manifest(args.manifest)
+        if args.only is not None:
+            only   = args.only.split(",")
+            boards = [b for b in boards if b["name"] in only]
+        get_cable_keys(boards)
+    except ValueError as e:
+        print(f"Configuration error: {e}")
+        sys.exit(2)
+    if args.retries is not None:
+        for board in boards:
+            board["retries"] = args.retries
+
+    results = asyncio.run(program_fleet(boards, log_dir=args.log_dir, jobs=args.jobs))
+    print_summary(results)
+    sys.exit(0 if all(r["status"] == "OK" for r in results) else 1)
+
+if __name__ == "__main__":
+    main()
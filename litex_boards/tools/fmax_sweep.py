@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""Fmax sweep/seed exploration for Yosys/nextpnr targets.
+
+Builds targets (ECP5/iCE40/Nexus/Gowin with an open-source toolchain) over a grid of sys_clk_freq
+and nextpnr seeds in a pool of build processes, parses the nextpnr timing results (final "Max
+frequency for clock" lines) and reports the highest closing frequency per target/configuration.
+
+- Each build runs the target with --build --sys-clk-freq=<freq> --nextpnr-seed=<seed> in its own
+  output directory (software compilation disabled) and logs to build.log.
+- A frequency is closing when all clocks meet their constraint for at least one seed; remaining
+  seeds of a closing frequency are skipped (unless --all-seeds).
+- Results (per build) are written to a JSON file.
+
+    $ python3 -m litex_boards.tools.fmax_sweep radiona_ulx3s colorlight_i5 --freqs=50e6:100e6:5e6 --seeds=4 --jobs=8
+    $ python3 -m litex_boards.tools.fmax_sweep icebreaker --config="" --config="--with-video-terminal" --freqs=12e6,18e6,24e6,30e6
+"""
+
+import os
+import re
+import sys
+import json
+import shlex
+import argparse
+import subprocess
+from shutil import which
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Timing Report ------------------------------------------------------------------------------------
+
+_fmax_re = re.compile(r"Max frequency for clock\s+'([^']+)':\s+([\d\.]+) MHz \((PASS|FAIL) at ([\d\.]+) MHz\)")
+
+def parse_nextpnr_timing(log):
+    """Return {clock: (fmax, constraint, passed)} from the last timing report of a nextpnr log."""
+    clocks = {}
+    for line in log.splitlines():
+        r = _fmax_re.search(line)
+        if r:
+            # Reports are printed after placement then after routing: keep the last one.
+            name, fmax, status, constraint = r.groups()
+            clocks[name] = (float(fmax)*1e6, float(constraint)*1e6, status == "PASS")
+    return clocks
+
+# Sweep --------------------------------------------------------------------------------------------
+
+def parse_freqs(freqs):
+    """Frequencies from a start:stop:step range or a comma-separated list."""
+    if ":" in freqs:
+        start, stop, step = [float(f) for f in freqs.split(":")]
+        n = int(round((stop - start)/step))
+        return [start + i*step for i in range(n + 1)]
+    return [float(f) for f in freqs.split(",")]
+
+def get_build_dir(output_dir, target, config, freq, seed):
+    config_name = re.sub(r"[^\w]+", "_", config).strip("_") or "default"
+    return os.path.join(output_dir, target, config_name, f"{freq/1e6:g}MHz_seed{seed}")
+
+def run_build(target, config, freq, seed, build_dir):
+    """Build a target at freq/seed (from a pool process) and return its timing results."""
+    os.makedirs(build_dir, exist_ok=True)
+    cmd = [sys.executable, "-m", f"litex_boards.targets.{target}",
+        "--build",
+        "--no-compile-software",
+        f"--sys-clk-freq={freq}",
+        f"--nextpnr-seed={seed}",
+        f"--output-dir={build_dir}",
+    ] + shlex.split(config)
+    log_file = os.path.join(build_dir, "build.log")
+    with open(log_file, "w") as log:
+        r = subprocess.run(cmd, stdout=log, stderr=subprocess.STDOUT)
+    with open(log_file) as log:
+        clocks = parse_nextpnr_timing(log.read())
+    return {
+        "target" : target,
+        "config" : config,
+        "freq"   : freq,
+        "seed"   : seed,
+        "clocks" : clocks,
+        "passed" : (r.returncode == 0) and bool(clocks) and all(p for _, _, p in clocks.values()),
+        "error"  : r.returncode != 0,
+        "log"    : log_file,
+    }
+
+def sweep(targets, configs, freqs, seeds, output_dir="build/fmax_sweep", jobs=4, all_seeds=False):
+    """Run builds over targets x configs x freqs x seeds, return the list of build results."""
+    results = []
+    passed  = set()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {}
+        for target in targets:
+            for config in configs:
+                for freq in freqs:
+                    for seed in seeds:
+                        build_dir = get_build_dir(output_dir, target, config, freq, seed)
+                        future    = pool.submit(run_build, target, config, freq, seed, build_dir)
+                        futures[future] = (target, config, freq)
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            result = future.result()
+            results.append(result)
+            status = "PASS" if result["passed"] else ("ERROR" if result["error"] else "FAIL")
+            fmax   = min((f for f, _, _ in result["clocks"].values()), default=0)
+            print(f"{result['target']} [{result['config'] or 'default'}] {result['freq']/1e6:g}MHz "
+                f"seed {result['seed']}: {status} (min Fmax {fmax/1e6:.2f}MHz).")
+            # Skip remaining seeds of a closing frequency.
+            key = futures[future]
+            if result["passed"] and not all_seeds and key not in passed:
+                passed.add(key)
+                for f, k in futures.items():
+                    if k == key:
+                        f.cancel()
+    return results
+
+def summarize(results):
+    """Highest closing frequency (and best seed) per target/configuration."""
+    summary = {}
+    for r in results:
+        s = summary.setdefault((r["target"], r["config"]), {"freq": None, "seed": None, "fmax": 0, "builds": 0})
+        s["builds"] += 1
+        fmax = min((f for f, _, _ in r["clocks"].values()), default=0)
+        if r["passed"] and (s["freq"] is None or r["freq"] > s["freq"] or (r["freq"] == s["freq"] and fmax > s["fmax"])):
+            s.update(freq=r["freq"], seed=r["seed"], fmax=fmax)
+    return summary
+
+def print_summary(summary):
+    print("-"*100)
+    print(f"{'Target':<30} {'Config':<30} {'Fmax closing':>12} {'Seed':>6} {'Est. Fmax':>10} {'Builds':>7}")
+    for (target, config), s in sorted(summary.items()):
+        freq = f"{s['freq']/1e6:g}MHz" if s["freq"] is not None else "none"
+        seed = str(s["seed"]) if s["seed"] is not None else "-"
+        fmax = f"{s['fmax']/1e6:.2f}MHz" if s["freq"] is not None else "-"
+        print(f"{target:<30} {config or 'default':<30} {freq:>12} {seed:>6} {fmax:>10} {s['builds']:>7}")
+    print("-"*100)
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Fmax sweep/seed exploration for Yosys/nextpnr targets.")
+    parser.add_argument("targets", nargs="+",                          help="Target modules (ex radiona_ulx3s).")
+    parser.add_argument("--config",     action="append", default=None, help="Target arguments of a configuration (can be repeated).")
+    parser.add_argument("--freqs",      required=True,                 help="Frequencies: start:stop:step or comma-separated list (Hz).")
+    parser.add_argument("--seeds",      default=1, type=int,           help="Number of nextpnr seeds per frequency.")
+    parser.add_argument("--jobs",       default=os.cpu_count(), type=int, help="Number of parallel builds.")
+    parser.add_argument("--all-seeds",  action="store_true",           help="Build all seeds of closing frequencies.")
+    parser.add_argument("--output-dir", default="build/fmax_sweep",    help="Base build directory.")
+    parser.add_argument("--results",    default=None,                  help="Results JSON file (default: <output-dir>/results.json).")
+    args = parser.parse_args()
+
+    if which("yosys") is None:
+        raise OSError("Unable to find Yosys, please install the Yosys/nextpnr toolchain.")
+
+    results = sweep(
+        targets    = args.targets,
+        configs    = args.config or [""],
+        freqs      = parse_freqs(args.freqs),
+        seeds      = list(range(1, args.seeds + 1)),
+        output_dir = args.output_dir,
+        jobs       = args.jobs,
+        all_seeds  = args.all_seeds,
+    )
+    summary = summarize(results)
+    print_summary(summary)
+
+    results_file = args.results or os.path.join(args.output_dir, "results.json")
+    os.makedirs(os.path.dirname(os.path.abspath(results_file)), exist_ok=True)
+    with open(results_file, "w") as f:
+        json.dump({
+            "builds"  : results,
+            "summary" : [dict(target=t, config=c, **s) for (t, c), s in summary.items()],
+        }, f, indent=1)
+    print(f"Results written to {results_file}.")
+
+if __name__ == "__main__":
+    main()
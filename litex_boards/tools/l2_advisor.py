@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""L2 cache sizing advisor.
+
+DRAM targets insert a L2 cache (add_sdram: l2_cache_size/--l2-size, l2_cache_min_data_width,
+l2_cache_full_memory_we) between the SoC bus and LiteDRAM. This tool captures the L2 accesses of a
+workload and replays them offline against candidate L2 sizes/widths, to spend Block RAMs where they
+help throughput:
+
+- The target is built (or simulated with --sim, litex_boards.tools.board_sim) with --with-l2-stats,
+  adding L2 statistics (litex_boards.cores.l2_stats: hit/miss/eviction counters and access trace
+  buffer) to its L2 (ex digilent_arty).
+- capture: read the counters and trace buffer of the hardware through a litex_server (repeated
+  --segments times while the workload runs, segments are concatenated).
+- advise: replay a trace (capture output or simulation VCD with the l2_trace_* signals) on a model
+  of the LiteX L2 cache and report hit rate, estimated cycles/access and Block RAMs for each
+  candidate, then recommend the cheapest configuration within --tolerance of the best one. The
+  port/bus data widths and current L2 are read from the csr.csv of the build (--csr-csv), the Block
+  RAM family from --bram or --device.
+
+    $ python3 -m litex_boards.targets.digilent_arty --with-l2-stats --build --load
+    $ python3 -m litex_boards.tools.l2_advisor capture --csr-csv=build/digilent_arty/csr.csv --segments=16 -o arty.trace
+    $ python3 -m litex_boards.tools.l2_advisor advise arty.trace --csr-csv=build/digilent_arty/csr.csv --device=xc7a35t
+
+    $ python3 -m litex_boards.targets.digilent_arty --with-l2-stats --sim --trace --sim-ram-init=app.bin
+    $ python3 -m litex_boards.tools.l2_advisor advise build/digilent_arty_sim/gateware/sim.vcd --csr-csv=build/digilent_arty_sim/csr.csv
+
+Cycles/access are estimated from the L2 state machine and --read-latency/--write-latency (LiteDRAM
+latencies seen by the L2, in sys_clk cycles); they can be calibrated against the measured stall
+counter reported by capture/advise. Block RAMs are counted per memory (data/tag, byte-wide data
+memories with l2_cache_full_memory_we) for the --bram family; small memories mapped to LUTs by the
+synthesis tools are not accounted for.
+"""
+
+import re
+import math
+import time
+import argparse
+
+# Trace --------------------------------------------------------------------------------------------
+
+# Trace: list of (we, byte address) of the bus accesses to the L2.
+
+def load_trace(filename, bus_data_width=32):
+    """Load a trace (text trace or simulation VCD)."""
+    with open(filename) as f:
+        content = f.read()
+    if content.lstrip().startswith("$"):
+        return load_vcd_trace(content, bus_data_width)
+    trace = []
+    for line in content.splitlines():
+        line = line.split("#")[0].strip()
+        if line:
+            op, addr = line.split()
+            trace.append((op.upper() == "W", int(addr, 0)))
+    return trace
+
+def load_trace_counters(filename):
+    """Hardware counters recorded in a trace header (# name=value)."""
+    counters = {}
+    with open(filename) as f:
+        for line in f:
+            if not line.startswith("#"):
+                break
+            for name, value in re.findall(r"(\w+)=(\d+)", line):
+                counters[name] = int(value)
+    return counters
+
+def load_csr_constants(filename):
+    """Constants of a SoC CSV file (csr.csv)."""
+    constants = {}
+    with open(filename) as f:
+        for line in f:
+            fields = line.strip().split(",")
+            if fields[0] == "constant":
+                constants[fields[1]] = int(fields[2]) if fields[2].isdigit() else fields[2]
+    return constants
+
+def write_trace(filename, trace, counters={}):
+    with open(filename, "w") as f:
+        if counters:
+            f.write("# " + " ".join(f"{k}={v}" for k, v in counters.items()) + "\n")
+        for we, addr in trace:
+            f.write(f"{'W' if we else 'R'} 0x{addr:08x}\n")
+
+def load_vcd_trace(content, bus_data_width=32):
+    """Extract the accesses from a simulation VCD (l2_trace_valid/we/adr sampled on sys_clk)."""
+    names = ["sys_clk", "l2_trace_valid", "l2_trace_we", "l2_trace_adr"]
+    ids   = {}
+    header, _, body = content.partition("$enddefinitions")
+    for m in re.finditer(r"\$var\s+\w+\s+\d+\s+(\S+)\s+(\w+)", header):
+        ident, signal = m.groups()
+        for name in names:
+            # Trace signals are prefixed with the SoC hierarchy (ex main_l2_stats_l2_trace_valid).
+            match = (signal == name) if name == "sys_clk" else signal.endswith(name)
+            if match and name not in ids.values():
+                ids[ident] = name
+    if set(ids.values()) != set(names):
+        raise ValueError(f"VCD: missing signals ({', '.join(sorted(set(names) - set(ids.values())))}).")
+    values = {name: 0 for name in names}
+    trace  = []
+    def apply(changes):
+        if changes.get("sys_clk", 0) and not values["sys_clk"] and values["l2_trace_valid"]:
+            trace.append((bool(values["l2_trace_we"]), values["l2_trace_adr"]*bus_data_width//8))
+        values.update(changes)
+    changes = {}
+    for line in body.splitlines()[1:]:
+        tokens = line.split()
+        if not tokens:
+            continue
+        if tokens[0][0] == "#" and tokens[0][1:].isdigit():
+            # Timestamp.
+            apply(changes)
+            changes = {}
+            continue
+        if tokens[0][0] in "bB" and len(tokens) == 2:
+            value, ident = tokens[0][1:], tokens[1]      # Vector.
+        elif tokens[0][0] in "01xzXZ":
+            value, ident = tokens[0][0], tokens[0][1:]   # Scalar.
+        else:
+            continue
+        if ident in ids:
+            changes[ids[ident]] = int(re.sub(r"[xzXZ]", "0", value), 2)
+    apply(changes)
+    return trace
+
+# L2 Cache Model -----------------------------------------------------------------------------------
+
+def get_l2_params(size, port_data_width, min_data_width=128):
+    """L2 size/data width as adjusted by add_sdram (0: no L2)."""
+    if size == 0:
+        return 0, port_data_width
+    size = max(size, 2*port_data_width//8)
+    return 2**int(math.log2(size)), max(port_data_width, min_data_width)
+
+class L2CacheModel:
+    """Model of the LiteX L2 cache (wishbone.Cache): direct-mapped, write-back/write-allocate, one
+    line per slave word, tags reset to 0 (clean)."""
+    def __init__(self, size, data_width, bus_data_width=32):
+        offset_words    = max(data_width//bus_data_width, 1)
+        self.nlines     = (size//4)//offset_words
+        self.line_bytes = max(data_width, bus_data_width)//8
+        self.tags       = [0]*self.nlines
+        self.dirty      = [False]*self.nlines
+        self.reads      = 0
+        self.writes     = 0
+        self.misses     = 0
+        self.evictions  = 0
+
+    def access(self, we, addr):
+        line  = addr//self.line_bytes
+        index = line % self.nlines
+        tag   = line//self.nlines
+        if self.tags[index] != tag:
+            self.misses += 1
+            if self.dirty[index]:
+                self.evictions += 1
+            self.tags[index]  = tag
+            self.dirty[index] = False
+        if we:
+            self.writes += 1
+            self.dirty[index] = True
+        else:
+            self.reads += 1
+
+def estimate_cycles(stats, size, data_width, port_data_width, bus_data_width=32, read_latency=20, write_latency=8):
+    """Estimated bus cycles of the accesses (hits: 2 cycles, misses: + refill/eviction)."""
+    accesses = stats["reads"] + stats["writes"]
+    if size == 0:
+        # Wishbone to LiteDRAM converter, one LiteDRAM access per bus access.
+        return stats["reads"]*(read_latency + 1) + stats["writes"]*(write_latency + 1)
+    beats = max(max(data_width, bus_data_width)//port_data_width, 1)
+    return (2*accesses +
+        stats["misses"]*(read_latency + beats) +
+        stats["evictions"]*(write_latency + beats))
+
+# Block RAMs ---------------------------------------------------------------------------------------
+
+# Block RAM families: (bits, max width, min depth).
+_bram_families = {
+    "xilinx" : (18432, 36, 512), # RAMB18 (SDP).
+    "ecp5"   : (18432, 36, 512), # EBR (DP16KD/PDPW16KD).
+    "nexus"  : (18432, 36, 512), # EBR.
+    "ice40"  : (4096,  16, 256), # SB_RAM40_4K.
+    "gowin"  : (18432, 36, 512), # BSRAM.
+    "efinix" : (10240, 20, 512), # RAM 10K (Titanium).
+}
+
+def get_bram_family(device):
+    device = device.lower()
+    for prefix, family in [("xc", "xilinx"), ("lfe5", "ecp5"), ("lifcl", "nexus"), ("ice40", "ice40"),
+        ("gw", "gowin"), ("t", "efinix")]:
+        if device.startswith(prefix):
+            return family
+    return "xilinx"
+
+def bram_blocks(depth, width, family="xilinx"):
+    """Block RAMs of a depth x width memory."""
+    bits, max_width, min_depth = _bram_families[family]
+    depth = max(2**math.ceil(math.log2(max(depth, 1))), min_depth)
+    block_width = min(max_width, max(bits//depth, 1))
+    return math.ceil(width/block_width)*math.ceil(depth*block_width/bits)
+
+def l2_bram_blocks(size, data_width, bus_data_width=32, full_memory_we=True, family="xilinx"):
+    """Block RAMs of the L2 cache (data + tag memories)."""
+    if size == 0:
+        return 0
+    offset_words = max(data_width//bus_data_width, 1)
+    nlines       = (size//4)//offset_words
+    line_width   = max(data_width, bus_data_width)
+    tag_width    = (32 - int(math.log2(bus_data_width//8))) - int(math.log2(nlines)) + 1
+    if full_memory_we:
+        data = (line_width//8)*bram_blocks(nlines, 8, family)
+    else:
+        data = bram_blocks(nlines, line_width, family)
+    return data + bram_blocks(nlines, tag_width, family)
+
+# Advisor ------------------------------------------------------------------------------------------
+
+def evaluate(trace, sizes, widths, port_data_width, bus_data_width=32, full_memory_we=[True],
+    family="xilinx", read_latency=20, write_latency=8):
+    """Replay the trace on each candidate L2 configuration."""
+    results = []
+    configs = set()
+    for size in sizes:
+        for width in widths:
+            l2_size, l2_width = get_l2_params(size, port_data_width, width)
+            for fmwe in (full_memory_we if l2_size else [True]):
+                configs.add((l2_size, l2_width if l2_size else 0, fmwe))
+    for l2_size, l2_width, fmwe in sorted(configs):
+        if l2_size:
+            model = L2CacheModel(l2_size, l2_width, bus_data_width)
+            for we, addr in trace:
+                model.access(we, addr)
+            stats = dict(reads=model.reads, writes=model.writes, misses=model.misses, evictions=model.evictions)
+        else:
+            stats = dict(
+                reads     = sum(1 for we, _ in trace if not we),
+                writes    = sum(1 for we, _ in trace if we),
+                misses    = len(trace),
+                evictions = 0)
+        cycles = estimate_cycles(stats, l2_size, l2_width, port_data_width, bus_data_width, read_latency, write_latency)
+        results.append(dict(stats,
+            size           = l2_size,
+            data_width     = l2_width,
+            full_memory_we = fmwe,
+            hit_rate       = 1 - stats["misses"]/max(len(trace), 1),
+            cycles         = cycles/max(len(trace), 1),
+            brams          = l2_bram_blocks(l2_size, l2_width, bus_data_width, fmwe, family)))
+    return results
+
+def recommend(results, tolerance=0.05, bram_budget=None):
+    """Cheapest configuration (Block RAMs, then size) within tolerance of the best cycles/access."""
+    candidates = [r for r in results if bram_budget is None or r["brams"] <= bram_budget]
+    if not candidates:
+        return None
+    best = min(r["cycles"] for r in candidates)
+    return min((r for r in candidates if r["cycles"] <= best*(1 + tolerance)),
+        key=lambda r: (r["brams"], r["size"], r["data_width"]))
+
+def format_config(r):
+    if r["size"] == 0:
+        return "no L2"
+    return f"{r['size']//1024}KB x {r['data_width']}-bit{'' if r['full_memory_we'] else ' (no full_memory_we)'}"
+
+# Capture ------------------------------------------------------------------------------------------
+
+def capture(bus, segments=1, timeout=10.0):
+    """Capture the trace buffer/counters of the hardware (concatenating segments)."""
+    names     = ["reads", "writes", "misses", "evictions", "stalls"]
+    counters  = {name: 0 for name in names}
+    trace     = []
+    depth     = int(bus.constants.l2_stats_trace_depth)
+    bus_bytes = int(bus.constants.config_bus_data_width)//8
+    for segment in range(segments):
+        # Clear/Enable and wait for the trace buffer to fill.
+        bus.regs.l2_stats_control.write(0b11)
+        start = time.time()
+        while bus.regs.l2_stats_trace_count.read() < depth and (time.time() - start) < timeout:
+            time.sleep(0.1)
+        # Freeze and read counters/trace buffer.
+        bus.regs.l2_stats_control.write(0b00)
+        for name in names:
+            counters[name] += getattr(bus.regs, f"l2_stats_{name}").read()
+        for i in range(bus.regs.l2_stats_trace_count.read()):
+            bus.regs.l2_stats_trace_index.write(i)
+            data = bus.regs.l2_stats_trace_data.read()
+            trace.append((bool(data & 0b1), (data >> 1)*bus_bytes))
+    bus.regs.l2_stats_control.write(0b01)
+    return trace, counters
+
+# Run ----------------------------------------------------------------------------------------------
+
+def parse_sizes(s):
+    return [int(v, 0) for v in s.split(",")]
+
+def main():
+    parser = argparse.ArgumentParser(description="L2 cache sizing advisor.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    p = subparsers.add_parser("capture", help="Capture counters/trace of the hardware (through litex_server).")
+    p.add_argument("--csr-csv",     default="csr.csv",              help="SoC CSV file.")
+    p.add_argument("--host",        default="localhost",            help="litex_server host.")
+    p.add_argument("--port",        default=1234, type=int,         help="litex_server port.")
+    p.add_argument("--segments",    default=1,    type=int,         help="Trace segments to capture.")
+    p.add_argument("--timeout",     default=10.0, type=float,       help="Max time (s) to fill the trace buffer (per segment).")
+    p.add_argument("-o", "--output", default="l2.trace",            help="Output trace file.")
+
+    p = subparsers.add_parser("advise", help="Replay a trace against candidate L2 configurations.")
+    p.add_argument("trace",                                         help="Trace (capture output or simulation VCD).")
+    p.add_argument("--csr-csv",        default=None,                help="SoC CSV file of the build with --with-l2-stats (port/bus data width, current L2).")
+    p.add_argument("--port-data-width", default=128, type=int,      help="LiteDRAM port data width (without --csr-csv).")
+    p.add_argument("--bus-data-width", default=32,   type=int,      help="SoC bus data width (without --csr-csv).")
+    p.add_argument("--device",         default=None,                help="FPGA device (Block RAM family, ex xc7a35t).")
+    p.add_argument("--bram",           default=None,                help="Block RAM family (default: from --device, else xilinx).", choices=list(_bram_families))
+    p.add_argument("--sizes",          default="0,1024,2048,4096,8192,16384,32768,65536", help="Candidate L2 sizes (bytes).")
+    p.add_argument("--widths",         default="128,256,512",       help="Candidate L2 min data widths (bits).")
+    p.add_argument("--full-memory-we", default="true",              help="Candidate l2_cache_full_memory_we.", choices=["true", "false", "both"])
+    p.add_argument("--read-latency",   default=20, type=int,        help="LiteDRAM read latency (sys_clk cycles).")
+    p.add_argument("--write-latency",  default=8,  type=int,        help="LiteDRAM write latency (sys_clk cycles).")
+    p.add_argument("--tolerance",      default=0.05, type=float,    help="Accepted cycles/access loss vs the best configuration.")
+    p.add_argument("--bram-budget",    default=None, type=int,      help="Max Block RAMs for the L2.")
+
+    args = parser.parse_args()
+
+    # Capture.
+    if args.command == "capture":
+        from litex import RemoteClient
+        bus = RemoteClient(host=args.host, port=args.port, csr_csv=args.csr_csv)
+        bus.open()
+        trace, counters = capture(bus, segments=args.segments, timeout=args.timeout)
+        bus.close()
+        write_trace(args.output, trace, counters)
+        accesses = counters["reads"] + counters["writes"]
+        print(f"{len(trace)} accesses captured to {args.output}.")
+        print(f"Hardware: {accesses} accesses, {1 - counters['misses']/max(accesses, 1):.1%} hits, "
+            f"{counters['evictions']} evictions, {(counters['stalls'] + accesses)/max(accesses, 1):.2f} cycles/access.")
+        return
+
+    # Advise.
+    port_data_width = args.port_data_width
+    bus_data_width  = args.bus_data_width
+    family          = args.bram or (get_bram_family(args.device) if args.device else "xilinx")
+    current         = None
+    if args.csr_csv is not None:
+        constants = load_csr_constants(args.csr_csv)
+        if "l2_stats_port_data_width" not in constants:
+            parser.error(f"{args.csr_csv}: no L2 statistics (build with --with-l2-stats).")
+        port_data_width = constants["l2_stats_port_data_width"]
+        bus_data_width  = constants["config_bus_data_width"]
+        # Current L2 (add_sdram's default l2_cache_full_memory_we assumed).
+        current = (constants["config_l2_size"], constants["l2_stats_data_width"], True)
+    trace = load_trace(args.trace, bus_data_width)
+    if not trace:
+        parser.error(f"{args.trace}: empty trace.")
+    full_memory_we = {"true": [True], "false": [False], "both": [True, False]}[args.full_memory_we]
+    if current is not None and current[2] not in full_memory_we:
+        full_memory_we = full_memory_we + [current[2]]
+    results = evaluate(trace,
+        sizes           = sorted(set(parse_sizes(args.sizes) + ([current[0]] if current else []))),
+        widths          = sorted(set(parse_sizes(args.widths) + ([current[1]] if current and current[0] else []))),
+        port_data_width = port_data_width,
+        bus_data_width  = bus_data_width,
+        full_memory_we  = full_memory_we,
+        family          = family,
+        read_latency    = args.read_latency,
+        write_latency   = args.write_latency)
+
+    print(f"{len(trace)} accesses ({sum(1 for we, _ in trace if we)} writes), port: {port_data_width}-bit, bus: {bus_data_width}-bit, Block RAMs: {family}.")
+    counters = load_trace_counters(args.trace) if not args.trace.endswith(".vcd") else {}
+    if "stalls" in counters:
+        accesses = counters["reads"] + counters["writes"]
+        print(f"Hardware (measured): {1 - counters['misses']/max(accesses, 1):.1%} hits, {(counters['stalls'] + accesses)/max(accesses, 1):.2f} cycles/access.")
+    print(f"{'L2':40s} {'Hits':>8s} {'Evictions':>10s} {'Cycles/Access':>14s} {'BRAMs':>6s}")
+    for r in results:
+        mark = " (current)" if current == (r["size"], r["data_width"], r["full_memory_we"]) else ""
+        print(f"{format_config(r) + mark:40s} {r['hit_rate']:8.1%} {r['evictions']:10d} {r['cycles']:14.2f} {r['brams']:6d}")
+    r = recommend(results, tolerance=args.tolerance, bram_budget=args.bram_budget)
+    if r is None:
+        print("No configuration within the Block RAM budget.")
+        return
+    print(f"Recommended: {format_config(r)}: {r['hit_rate']:.1%} hits, {r['cycles']:.2f} cycles/access, {r['brams']} Block RAMs.")
+    print(f"  --l2-size={r['size']}" + (f" (add_sdram: l2_cache_min_data_width={r['data_width']}, "
+        f"l2_cache_full_memory_we={r['full_memory_we']})" if r["size"] else ""))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""Capture records from the Scope Acquisition (litex_boards.cores.scope) over UDP.
+
+Configures the trigger/record depth through a litex_server (Etherbone), enables the continuous
+mode (hardware re-arm/stream) and receives records streamed over UDP, reporting the waveform update
+rate. Records can be saved as raw 8-bit samples (one file per record).
+
+    $ litex_server --udp --udp-ip=192.168.1.50 &
+    $ python3 -m litex_boards.tools.scope_capture --csr-csv=csr.csv --mode=rising --level=128 --records=100
+"""
+
+import os
+import time
+import socket
+import struct
+import argparse
+
+from litex import RemoteClient
+
+# Helpers ------------------------------------------------------------------------------------------
+
+TRIGGER_MODES = {
+    "force"   : 0,
+    "rising"  : 1,
+    "falling" : 2,
+    "above"   : 3,
+    "below"   : 4,
+}
+
+def receive_record(sock, record_bytes):
+    """Reassemble a record from UDP packets ([record id][byte offset][samples...])."""
+    record = bytearray(record_bytes)
+    received = 0
+    record_id = None
+    while received < record_bytes:
+        packet, _ = sock.recvfrom(65536)
+        rid, offset = struct.unpack("<II", packet[:8])
+        if record_id is None:
+            if offset != 0:
+                continue # Wait for start of a record.
+            record_id = rid
+        if rid != record_id:
+            raise IOError(f"Record {record_id} incomplete ({received}/{record_bytes} bytes).")
+        payload = packet[8:]
+        record[offset:offset + len(payload)] = payload
+        received += len(payload)
+    return record_id, bytes(record)
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Scope Acquisition UDP capture.")
+    parser.add_argument("--csr-csv",   default="csr.csv",   help="SoC CSV file.")
+    parser.add_argument("--host",      default="localhost", help="litex_server host.")
+    parser.add_argument("--port",      default=1234,     type=int, help="litex_server port.")
+    parser.add_argument("--udp-port",  default=2000,     type=int, help="Local UDP port to receive records on.")
+    parser.add_argument("--mode",      default="rising", choices=list(TRIGGER_MODES), help="Trigger mode.")
+    parser.add_argument("--level",     default=128,      type=int, help="Trigger level.")
+    parser.add_argument("--source",    default=0,        type=int, help="Trigger channel.")
+    parser.add_argument("--pre",       default=512,      type=int, help="Pre-trigger depth (in DRAM words).")
+    parser.add_argument("--post",      default=512,      type=int, help="Post-trigger depth (in DRAM words).")
+    parser.add_argument("--decimation", default=0,       type=int, help="Decimation (log2, keep 1 sample every 2**decimation).")
+    parser.add_argument("--records",   default=10,       type=int, help="Number of records to capture.")
+    parser.add_argument("--output",    default=None,               help="Output directory for raw records.")
+    args = parser.parse_args()
+
+    bus = RemoteClient(host=args.host, port=args.port, csr_csv=args.csr_csv)
+    bus.open()
+
+    # Stop continuous mode and wait for streamer to be idle.
+    bus.regs.scope_streamer_auto.write(0)
+    while bus.regs.scope_streamer_busy.read():
+        pass
+
+    # Receive socket.
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 16*1024*1024)
+    sock.bind(("", args.udp_port))
+    sock.settimeout(5.0)
+
+    # Configure.
+    bus.regs.scope_streamer_port.write(args.udp_port)
+    bus.regs.scope_mode.write(TRIGGER_MODES[args.mode])
+    bus.regs.scope_level.write(args.level)
+    bus.regs.scope_source.write(args.source)
+    bus.regs.scope_pre.write(args.pre)
+    bus.regs.scope_post.write(args.post)
+    bus.regs.scope_decimation.write(args.decimation)
+
+    # Start continuous mode (first arm from software, then re-armed by hardware).
+    bus.regs.scope_streamer_auto.write(1)
+    bus.regs.scope_arm.write(1)
+
+    record_bytes = (args.pre + args.post + 1)*bus.constants.scope_word_bytes
+    start = time.time()
+    count = 0
+    try:
+        while count < args.records:
+            record_id, record = receive_record(sock, record_bytes)
+            if args.output is not None:
+                os.makedirs(args.output, exist_ok=True)
+                with open(os.path.join(args.output, f"record_{record_id:08d}.bin"), "wb") as f:
+                    f.write(record)
+            count += 1
+    finally:
+        bus.regs.scope_streamer_auto.write(0)
+    duration = time.time() - start
+
+    print(f"{count} records of {record_bytes} bytes in {duration:.2f}s: {count/duration:.1f} waveforms/s.")
+    print(f"Overflows: {bus.regs.scope_overflows.read()}.")
+
+    bus.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""SDCard read/write throughput benchmark (litex_boards.cores.sdcard).
+
+Initializes the SDCard (4-bit, High-Speed) through a litex_server (Etherbone, UARTBone, JTAGBone...)
+and runs multi-block transfers (CMD18/CMD25) between the card and a ring buffer in main RAM (DMA in
+loop mode). Throughputs are computed from the hardware DMA counters (bytes/cycles), so are not
+affected by the litex_server link:
+
+    $ litex_server --udp --udp-ip=192.168.1.50 &
+    $ python3 -m litex_boards.tools.sdcard_bench --csr-csv=csr.csv --size=64
+    $ python3 -m litex_boards.tools.sdcard_bench --csr-csv=csr.csv --size=64 --write --block=2097152
+
+The card is initialized at 25MHz and the clock is only raised to the High-Speed frequency (SoC
+<name>_hs_clk_freq or --clk-freq) once the CMD6 switch status confirms High-Speed. The BIOS does not
+do this switch: boot stays at 25MHz.
+
+Writes are destructive: --write overwrites --size MB of the card from --block.
+"""
+
+import time
+import argparse
+
+from litex import RemoteClient
+
+# Constants ----------------------------------------------------------------------------------------
+
+BLOCK_SIZE = 512
+
+RESPONSE_NONE       = 0
+RESPONSE_SHORT      = 1
+RESPONSE_LONG       = 2
+RESPONSE_SHORT_BUSY = 3
+
+TRANSFER_READ  = 1
+TRANSFER_WRITE = 2
+
+EVENT_DONE     = 0x1
+EVENT_TIMEOUT  = 0x4
+EVENT_CRCERROR = 0x8
+
+SDCARD_CLK_FREQ_DEFAULT = 25e6 # Default Speed (initialization, CMD6 switch).
+
+SWITCH_STATUS_LENGTH = 64
+
+class SDCardError(Exception):
+    pass
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def parse_switch_status(status):
+    """Return the function selected in group 1 (access mode, 1: High-Speed) from the 64-byte CMD6
+    status (MSB first, bits 379:376), 0xf when the switch failed."""
+    assert len(status) == SWITCH_STATUS_LENGTH
+    if (status[0] << 8 | status[1]) == 0: # Maximum current consumption (0: error).
+        return 0xf
+    return status[16] & 0xf
+
+# SDCard -------------------------------------------------------------------------------------------
+
+class SDCard:
+    def __init__(self, bus, name="sdcard"):
+        self.bus  = bus
+        self.name = name
+
+    def reg(self, name):
+        return getattr(self.bus.regs, f"{self.name}_{name}")
+
+    def set_clk_freq(self, clk_freq):
+        sys_clk_freq = self.bus.constants.config_clock_frequency
+        divider      = 2
+        while (divider < 256) and (sys_clk_freq/divider > clk_freq):
+            divider *= 2
+        self.reg("phy_clocker_divider").write(divider)
+        return sys_clk_freq/divider
+
+    def wait_event(self, event, timeout=1.0):
+        start = time.time()
+        while True:
+            value = self.reg(f"core_{event}_event").read()
+            if value & EVENT_DONE:
+                break
+            if (time.time() - start) > timeout:
+                raise SDCardError(f"{event} timeout")
+        if value & EVENT_TIMEOUT:
+            raise SDCardError(f"{event} timeout")
+        if value & EVENT_CRCERROR:
+            raise SDCardError(f"{event} CRC error")
+
+    def command(self, cmd, arg=0, response=RESPONSE_SHORT, transfer=0, retries=1):
+        for retry in range(retries):
+            self.reg("core_cmd_argument").write(arg)
+            self.reg("core_cmd_command").write((cmd << 8) | (transfer << 5) | response)
+            self.reg("core_cmd_send").write(1)
+            try:
+                self.wait_event("cmd")
+                break
+            except SDCardError:
+                if retry == (retries - 1):
+                    raise
+        return self.reg("core_cmd_response").read()
+
+    def app_command(self, cmd, arg=0, response=RESPONSE_SHORT):
+        self.command(55, self.rca << 16)
+        return self.command(cmd, arg, response)
+
+    def read_switch_status(self, buffer, arg):
+        """CMD6 (SWITCH_FUNC), 64-byte status received by the Block2Mem DMA in buffer."""
+        self.reg("block2mem_dma_enable").write(0)
+        self.reg("block2mem_dma_base").write(buffer)
+        self.reg("block2mem_dma_length").write(SWITCH_STATUS_LENGTH)
+        self.reg("block2mem_dma_loop").write(0)
+        self.reg("block2mem_dma_enable").write(1)
+        self.data_command(6, arg, SWITCH_STATUS_LENGTH)
+        while not self.reg("block2mem_dma_done").read():
+            pass
+        self.reg("block2mem_dma_enable").write(0)
+        words = self.bus.read(buffer, SWITCH_STATUS_LENGTH//4)
+        return b"".join(w.to_bytes(4, "little") for w in words)
+
+    def init(self, clk_freq, buffer):
+        """Initialize the card at SDCARD_CLK_FREQ_DEFAULT, switch to High-Speed and raise the clock
+        to clk_freq when the switch is confirmed (else stays at Default Speed)."""
+        self.rca = 0
+        self.set_clk_freq(400e3)
+        for i in range(1000):
+            self.reg("phy_init_initialize").write(1)
+            try:
+                self.command(0, response=RESPONSE_NONE) # GO_IDLE.
+                break
+            except SDCardError:
+                pass
+        self.command(8, 0x000001aa)                     # SEND_EXT_CSD.
+        self.set_clk_freq(min(clk_freq, SDCARD_CLK_FREQ_DEFAULT))
+        for i in range(1000):
+            response = self.app_command(41, 0x10ff8000 | 0x60000000, RESPONSE_SHORT_BUSY) # APP_SEND_OP_COND.
+            if response & 0x80000000:
+                break
+        else:
+            raise SDCardError("Card not ready")
+        self.command(2, response=RESPONSE_LONG)         # ALL_SEND_CID.
+        self.command(3)                                 # SET_RELATIVE_ADDRESS.
+        self.rca = (self.reg("core_cmd_response").read() >> 16) & 0xffff
+        self.command(9, self.rca << 16, RESPONSE_LONG)  # SEND_CSD.
+        self.command(7, self.rca << 16, RESPONSE_SHORT_BUSY) # SELECT_CARD.
+        self.app_command(6, 2)                          # SET_BUS_WIDTH (4-bit).
+        status = self.read_switch_status(buffer, 0x80fffff1) # SWITCH_FUNC (High-Speed).
+        if parse_switch_status(status) == 1:
+            clk_freq = self.set_clk_freq(clk_freq)
+        else:
+            print("SDCard High-Speed switch failed, staying at Default Speed.")
+            clk_freq = self.set_clk_freq(min(clk_freq, SDCARD_CLK_FREQ_DEFAULT))
+        self.command(16, BLOCK_SIZE)                    # SET_BLOCKLEN.
+        return clk_freq
+
+    def data_command(self, cmd, arg, block_length, block_count=1, transfer=TRANSFER_READ, wait=True):
+        self.reg("core_block_length").write(block_length)
+        self.reg("core_block_count").write(block_count)
+        self.command(cmd, arg, transfer=transfer, retries=8)
+        if wait:
+            self.wait_event("data")
+
+    def transfer(self, direction, block, nblocks, buffer, buffer_size):
+        """Transfer nblocks from/to block through a ring of buffer_size bytes in buffer."""
+        dma  = {"read": "block2mem", "write": "mem2block"}[direction]
+        size = nblocks*BLOCK_SIZE
+
+        # Enable DMA (loop mode when the transfer is larger than the ring).
+        self.reg(f"{dma}_dma_enable").write(0)
+        self.reg(f"{dma}_dma_base").write(buffer)
+        self.reg(f"{dma}_dma_length").write(min(size, buffer_size))
+        self.reg(f"{dma}_dma_loop").write(int(size > buffer_size))
+        self.reg(f"{dma}_dma_enable").write(1)
+
+        # Multi-block transfer.
+        start = time.time()
+        cmd   = {"read": 18, "write": 25}[direction]
+        self.data_command(cmd, block, BLOCK_SIZE, nblocks,
+            transfer = {"read": TRANSFER_READ, "write": TRANSFER_WRITE}[direction],
+            wait     = False)
+        self.wait_event("data", timeout=max(10.0, size/1e6))
+        self.command(12, response=RESPONSE_SHORT_BUSY) # STOP_TRANSMISSION.
+        while self.reg(f"{dma}_stats_bytes").read() < size: # Wait DMA FIFO drained.
+            if (time.time() - start) > max(10.0, size/1e6):
+                raise SDCardError(f"{direction} DMA timeout")
+        duration = time.time() - start
+
+        r = {
+            "bytes"    : self.reg(f"{dma}_stats_bytes").read(),
+            "cycles"   : self.reg(f"{dma}_stats_cycles").read(),
+            "duration" : duration,
+        }
+        self.reg(f"{dma}_dma_enable").write(0)
+        return r
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="SDCard read/write throughput benchmark.")
+    parser.add_argument("--csr-csv",  default="csr.csv",   help="SoC CSV file.")
+    parser.add_argument("--host",     default="localhost", help="litex_server host.")
+    parser.add_argument("--port",     default=1234,        type=int,   help="litex_server port.")
+    parser.add_argument("--name",     default="sdcard",    help="SDCard module name.")
+    parser.add_argument("--clk-freq", default=None,        type=float, help="SDCard High-Speed clock frequency (default: SoC <name>_hs_clk_freq).")
+    parser.add_argument("--size",     default=16,          type=int,   help="Transfer size (MB).")
+    parser.add_argument("--block",    default=0,           type=int,   help="First block.")
+    parser.add_argument("--buffer",   default=None,        type=lambda x: int(x, 0), help="Buffer address (default: main_ram).")
+    parser.add_argument("--buffer-size", default=0x100000, type=lambda x: int(x, 0), help="Ring buffer size (bytes).")
+    parser.add_argument("--write",    action="store_true", help="Also run the write benchmark (overwrites the card).")
+    args = parser.parse_args()
+
+    bus = RemoteClient(host=args.host, port=args.port, csr_csv=args.csr_csv)
+    bus.open()
+
+    sys_clk_freq = bus.constants.config_clock_frequency
+    clk_freq     = args.clk_freq if args.clk_freq is not None else getattr(bus.constants, f"{args.name}_hs_clk_freq")
+    buffer       = args.buffer   if args.buffer   is not None else bus.mems.main_ram.base
+    assert args.buffer_size % BLOCK_SIZE == 0
+
+    try:
+        sdcard   = SDCard(bus, args.name)
+        clk_freq = sdcard.init(clk_freq, buffer)
+        print(f"SDCard initialized: 4-bit, {clk_freq/1e6:.2f}MHz (max {clk_freq*4/8/1e6:.2f}MB/s).")
+        nblocks = args.size*1024*1024//BLOCK_SIZE
+        for direction in ["read"] + (["write"] if args.write else []):
+            r = sdcard.transfer(direction, args.block, nblocks, buffer, args.buffer_size)
+            throughput = r["bytes"]/(r["cycles"]/sys_clk_freq)
+            print(f"{direction.capitalize():5s}: {r['bytes']/1e6:.2f}MB in {r['cycles']/sys_clk_freq:.3f}s: "
+                f"{throughput/1e6:.2f}MB/s (host: {r['duration']:.3f}s).")
+    finally:
+        bus.close()
+
+if __name__ == "__main__":
+    main()
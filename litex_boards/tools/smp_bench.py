@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""SMP CPU per-core memory throughput benchmark (simulation).
+
+Simulates the SoC of a target (--sim, litex_boards.tools.board_sim: same CPU configuration, SDRAM
+geometry/timings and LiteDRAM port width) with a bare-metal benchmark preloaded in main RAM and
+started on all the cores by the BIOS. Each core writes/reads/copies its own buffer, first alone then
+with all the cores running concurrently, and the per-core throughputs (from the cycle counter of
+each core) are reported:
+
+    $ python3 -m litex_boards.tools.smp_bench xilinx_kc705 --cpu-preset=smp4
+    $ python3 -m litex_boards.tools.smp_bench digilent_genesys2 --cpu-preset=smp2 --size=0x80000
+
+Buffers larger than the L2 (--size per core) measure the DRAM path. Any CPU reporting CPU_COUNT in
+soc.h (VexiiRiscv, VexRiscvSMP, NaxRiscv) can be benchmarked, on targets with --sim (the target is
+run twice: SoC software build, then simulation with the benchmark).
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+import subprocess
+
+# Firmware -----------------------------------------------------------------------------------------
+
+TESTS = ["write", "read", "copy"]
+MODES = ["solo", "all"]
+
+_crt0 = """
+.section .text.start, "ax"
+.global _start
+_start:
+    csrr a0, mhartid
+    la   sp, _fstack
+    slli t0, a0, 14 /* 16KB stack per core. */
+    sub  sp, sp, t0
+    call bench_main
+1:
+    j 1b
+"""
+
+_main = """
+#include <stdio.h>
+#include <string.h>
+
+#include <irq.h>
+#include <generated/soc.h>
+#include <generated/mem.h>
+
+#define NCORES  CONFIG_CPU_COUNT
+#define BUFFERS (MAIN_RAM_BASE + BENCH_OFFSET)
+#define WORDS   (BENCH_SIZE/sizeof(unsigned long))
+
+static const char *tests[] = {"", "write", "read", "copy"};
+
+/* Shared with the other cores (in .data: not cleared by the BSS initialization). */
+static volatile int           bss_done        __attribute__((section(".data")));
+static volatile int           command[NCORES] __attribute__((section(".data")));
+static volatile unsigned long cycles[NCORES]  __attribute__((section(".data")));
+
+static inline unsigned long rdcycle(void) {
+    unsigned long c;
+    __asm__ volatile ("csrr %0, mcycle" : "=r"(c));
+    return c;
+}
+
+static void run(int core, int test) {
+    volatile unsigned long *src = (unsigned long *)(BUFFERS + 2*core*BENCH_SIZE);
+    volatile unsigned long *dst = src + WORDS;
+    unsigned long start, i, v;
+    start = rdcycle();
+    switch (test) {
+    case 1: for (i = 0; i < WORDS; i++) src[i] = i;      break;
+    case 2: for (i = 0; i < WORDS; i++) v = src[i];      break;
+    case 3: for (i = 0; i < WORDS; i++) dst[i] = src[i]; break;
+    }
+    cycles[core] = rdcycle() - start;
+    (void)v;
+}
+
+static void worker(int core) {
+    int test;
+    while (1) {
+        while ((test = command[core]) == 0);
+        run(core, test);
+        __asm__ volatile ("fence" ::: "memory");
+        command[core] = 0;
+    }
+}
+
+static void bench(int test, int first, int last) {
+    int core;
+    for (core = first; core <= last; core++)
+        if (core != 0)
+            command[core] = test;
+    if (first == 0)
+        run(0, test);
+    for (core = first; core <= last; core++)
+        while ((core != 0) && command[core]);
+}
+
+void bench_main(int core) {
+    extern char _fbss[], _ebss[];
+    int test, c;
+
+    if (core != 0) {
+        while (!bss_done);
+        worker(core);
+    }
+    memset(_fbss, 0, _ebss - _fbss);
+    bss_done = 1;
+    irq_setie(0); /* Polled UART (BIOS ISR still installed). */
+
+    printf("smp_bench: cores=%d size=%d\\n", NCORES, BENCH_SIZE);
+    for (test = 1; test <= 3; test++) {
+        for (c = 0; c < NCORES; c++) {
+            bench(test, c, c);
+            printf("smp_bench: solo %s %d %lu\\n", tests[test], c, cycles[c]);
+        }
+        bench(test, 0, NCORES - 1);
+        for (c = 0; c < NCORES; c++)
+            printf("smp_bench: all %s %d %lu\\n", tests[test], c, cycles[c]);
+    }
+    printf("smp_bench: done\\n");
+    while (1);
+}
+"""
+
+_linker = """
+INCLUDE generated/output_format.ld
+ENTRY(_start)
+
+__DYNAMIC = 0;
+
+INCLUDE generated/regions.ld
+
+SECTIONS
+{
+    .text : {
+        KEEP(*(.text.start))
+        *(.text .stub .text.* .gnu.linkonce.t.*)
+    } > main_ram
+    .rodata : {
+        . = ALIGN(8);
+        *(.rodata .rodata.* .gnu.linkonce.r.*)
+        *(.srodata .srodata.*)
+    } > main_ram
+    .data : {
+        . = ALIGN(8);
+        *(.data .data.* .gnu.linkonce.d.*)
+        *(.sdata .sdata.*)
+    } > main_ram
+    .bss : {
+        . = ALIGN(8);
+        _fbss = .;
+        *(.sbss .sbss.* .bss .bss.* COMMON)
+        . = ALIGN(8);
+        _ebss = .;
+    } > main_ram
+    .stack (NOLOAD) : {
+        . = ALIGN(16);
+        . += 16*16384;
+        _fstack = .;
+    } > main_ram
+}
+"""
+
+_makefile = """
+include $(BUILD_DIR)/software/include/generated/variables.mak
+include $(SOC_DIRECTORY)/software/common.mak
+
+CFLAGS += -O2 -DBENCH_SIZE=$(BENCH_SIZE) -DBENCH_OFFSET=$(BENCH_OFFSET)
+
+OBJECTS = crt0.o main.o
+
+all: smp_bench.bin
+
+%.bin: %.elf
+\t$(OBJCOPY) -O binary $< $@
+
+smp_bench.elf: $(OBJECTS)
+\t$(CC) $(LDFLAGS) -T linker.ld -N -o $@ $(OBJECTS) \\
+\t\t$(PACKAGES:%=-L$(BUILD_DIR)/software/%) \\
+\t\t-Wl,--gc-sections \\
+\t\t$(LIBS:lib%=-l%)
+
+%.o: %.c
+\t$(compile)
+
+%.o: %.S
+\t$(assemble)
+"""
+
+def build_firmware(build_dir, firmware_dir, size, offset):
+    """Compile the benchmark firmware against the software of the SoC built in build_dir."""
+    os.makedirs(firmware_dir, exist_ok=True)
+    for filename, content in [("crt0.S", _crt0), ("main.c", _main), ("linker.ld", _linker), ("Makefile", _makefile)]:
+        with open(os.path.join(firmware_dir, filename), "w") as f:
+            f.write(content.lstrip())
+    subprocess.run(["make",
+        f"BUILD_DIR={os.path.abspath(build_dir)}",
+        f"BENCH_SIZE={size}",
+        f"BENCH_OFFSET={offset}"],
+        cwd=firmware_dir, check=True)
+    return os.path.join(firmware_dir, "smp_bench.bin")
+
+# Results ------------------------------------------------------------------------------------------
+
+def parse_results(output, clk_freq):
+    """Return the per-core throughputs (MB/s) of each mode/test from the console output."""
+    m = re.search(r"smp_bench: cores=(\d+) size=(\d+)", output)
+    if m is None:
+        return None
+    cores   = int(m.group(1))
+    size    = int(m.group(2))
+    results = {(mode, test): [None]*cores for mode in MODES for test in TESTS}
+    for mode, test, core, cycles in re.findall(r"smp_bench: (solo|all) (\w+) (\d+) (\d+)", output):
+        results[(mode, test)][int(core)] = size*clk_freq/max(int(cycles), 1)/1e6
+    return results
+
+def format_results(results):
+    """Return the per-core (solo/all cores running) and aggregate throughputs as a table."""
+    cores = len(results[("solo", TESTS[0])])
+    lines = [f"{'Core':6s}" + "".join(f"{test.capitalize() + ' MB/s (solo/all)':>26s}" for test in TESTS)]
+    for core in range(cores):
+        line = f"{core:<6d}"
+        for test in TESTS:
+            solo, concurrent = results[("solo", test)][core], results[("all", test)][core]
+            line += f"{'':>8s}{solo:>8.1f} / {concurrent:<7.1f}"
+        lines.append(line)
+    line = f"{'Total':6s}"
+    for test in TESTS:
+        line += f"{'':>8s}{'':>8s}   {sum(results[('all', test)]):<7.1f}"
+    lines.append(line)
+    return "\n".join(lines)
+
+# Run ----------------------------------------------------------------------------------------------
+
+def run_target(target, target_args, output_dir, sim_args=[]):
+    """Run the simulation of a target (--sim), return its exit code and console output."""
+    cmd = [sys.executable, "-m", f"litex_boards.targets.{target}", "--sim", "--sim-without-ethernet",
+        f"--output-dir={output_dir}"] + sim_args + target_args
+    proc   = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    output = b""
+    for data in iter(lambda: proc.stdout.read1(4096), b""):
+        sys.stdout.write(data.decode("utf-8", errors="replace"))
+        sys.stdout.flush()
+        output += data
+    return proc.wait(), output.decode("utf-8", errors="replace")
+
+def main():
+    parser = argparse.ArgumentParser(description="SMP CPU per-core memory throughput benchmark (remaining arguments are passed to the target).")
+    parser.add_argument("target",                                              help="Target module with --sim (ex xilinx_kc705).")
+    parser.add_argument("--output-dir", default=None,                          help="Build directory (default: build/<target>_smp_bench).")
+    parser.add_argument("--size",       default=0x40000,    type=lambda x: int(x, 0), help="Buffer size per core (bytes).")
+    parser.add_argument("--offset",     default=0x0100_0000, type=lambda x: int(x, 0), help="Buffers offset in main RAM.")
+    parser.add_argument("--timeout",    default=3600,       type=float,        help="Simulation timeout (s).")
+    args, target_args = parser.parse_known_args()
+    output_dir = args.output_dir or os.path.join("build", f"{args.target}_smp_bench")
+
+    # SoC software, then firmware compiled against it.
+    code, _ = run_target(args.target, target_args, output_dir, ["--no-compile-gateware"])
+    if code:
+        raise SystemExit(code)
+    with open(os.path.join(output_dir, "csr.json")) as f:
+        csr = json.load(f)
+    if "main_ram" not in csr["memories"]:
+        parser.error(f"{args.target}: no main RAM.")
+    cores    = csr["constants"].get("config_cpu_count", 1)
+    clk_freq = csr["constants"]["config_clock_frequency"]
+    assert args.offset + 2*cores*args.size <= csr["memories"]["main_ram"]["size"], "Buffers exceed main RAM."
+    firmware = build_firmware(output_dir, os.path.join(output_dir, "smp_bench"), args.size, args.offset)
+
+    # Simulation with the firmware preloaded/booted from main RAM.
+    code, output = run_target(args.target, target_args, output_dir, [
+        f"--sim-ram-init={firmware}",
+        "--sim-expect=smp_bench: done",
+        f"--sim-timeout={args.timeout}"])
+    m       = re.search(r"received after ([\d.]+)s", output)
+    results = parse_results(output, clk_freq)
+    if code or m is None or results is None:
+        print(f"\n{args.target}: benchmark not completed after {args.timeout:g}s.")
+        raise SystemExit(1)
+    print(f"\n{args.target}: {cores} core(s), {args.size//1024}KB per core, {clk_freq/1e6:g}MHz "
+        f"(simulated in {float(m.group(1)):.1f}s).")
+    print(format_results(results))
+
+if __name__ == "__main__":
+    main()
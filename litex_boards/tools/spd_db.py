@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""SPD library of the DDR3/DDR4 DIMMs (SO-DIMM/UDIMM/RDIMM) used on DIMM-socket boards.
+
+Targets with a DIMM socket default to a conservative hardcoded module. With --spd-dump (SPD dump
+file) or --spd-db (name of a DIMM from the local SPD library), the geometry, speedgrade and timings
+of the SDRAM module are instead taken from the SPD of the installed DIMM (and the SPD is embedded
+in the SoC, so the BIOS can verify it against the actual DIMM).
+
+SPD dumps are either the output of the `spdread` command of the LiteX BIOS or raw binary EEPROM
+dumps (ex from Linux's eeprom/ee1004 drivers). The library is a directory of dumps named after the
+DIMMs (<cache>/spd by default, <cache> from litex_boards.tools.artifacts, LITEX_BOARDS_SPD_DB to
+override):
+
+    $ python3 -m litex_boards.tools.spd_db add spdread.txt --name=kc705-dimm0
+    $ python3 -m litex_boards.tools.spd_db list
+    $ python3 -m litex_boards.tools.spd_db show kc705-dimm0
+    $ python3 -m litex_boards.targets.xilinx_kc705 --spd-db=kc705-dimm0 --build
+"""
+
+import os
+import re
+import logging
+import argparse
+
+from litedram.modules import parse_spd_hexdump
+from litedram.modules import DDR3Module, DDR3RegisteredModule, DDR4Module, DDR4RegisteredModule
+from litedram.modules import DDR3SPDData, DDR4SPDData
+
+from litex_boards.tools.artifacts import cache_dir
+
+# SPD ----------------------------------------------------------------------------------------------
+
+# Module types (byte 3, bits 3:0).
+_ddr3_module_types = {0x1: "RDIMM", 0x2: "UDIMM", 0x3: "SO-DIMM", 0x4: "Micro-DIMM", 0x5: "Mini-RDIMM",
+    0x6: "Mini-UDIMM", 0x8: "72b-SO-RDIMM", 0x9: "72b-SO-UDIMM", 0xb: "LRDIMM"}
+_ddr4_module_types = {0x1: "RDIMM", 0x2: "UDIMM", 0x3: "SO-DIMM", 0x4: "LRDIMM", 0x5: "Mini-RDIMM",
+    0x6: "Mini-UDIMM", 0x8: "72b-SO-RDIMM", 0x9: "72b-SO-UDIMM"}
+_registered_module_types = ["RDIMM", "Mini-RDIMM", "72b-SO-RDIMM", "LRDIMM"]
+
+def load_spd(filename):
+    """Load an SPD dump (LiteX BIOS spdread output or raw binary)."""
+    with open(filename, "rb") as f:
+        content = f.read()
+    is_hexdump = re.search(rb"^0x[0-9a-fA-F]+\s", content, re.MULTILINE) is not None
+    data       = parse_spd_hexdump(filename) if is_hexdump else list(content)
+    if len(data) < 128 or data[2] not in [0x0b, 0x0c]:
+        raise ValueError(f"{filename}: not a DDR3/DDR4 SPD dump.")
+    return data
+
+def write_spd_hexdump(filename, data):
+    """Write an SPD dump in LiteX BIOS spdread format."""
+    with open(filename, "w") as f:
+        f.write("Memory dump:\n")
+        for addr in range(0, len(data), 16):
+            line  = data[addr:addr + 16]
+            ascii = "".join(chr(b) if 32 <= b < 127 else "." for b in line)
+            f.write(f"0x{addr:08x}  {' '.join(f'{b:02x}' for b in line)}  {ascii}\n")
+
+def get_spd_info(data):
+    """Decode memory type, module type, size and geometry/speedgrade of an SPD."""
+    if data[2] == 0x0b:
+        memtype      = "DDR3"
+        spd          = DDR3SPDData(data)
+        module_type  = _ddr3_module_types.get(data[3] & 0xf, "Unknown")
+        capacity     = 256*2**(data[4] & 0xf)           # Mbits per device.
+        device_width = 4*2**(data[7] & 0x7)
+        ranks        = ((data[7] >> 3) & 0x7) + 1
+        bus_width    = 8*2**(data[8] & 0x7)
+        ecc          = ((data[8] >> 3) & 0x3) == 1
+        part_number  = bytes(data[128:146])
+    else:
+        memtype      = "DDR4"
+        spd          = DDR4SPDData(data)
+        module_type  = _ddr4_module_types.get(data[3] & 0xf, "Unknown")
+        capacity     = 256*2**(data[4] & 0xf)
+        device_width = 4*2**(data[12] & 0x7)
+        ranks        = ((data[12] >> 3) & 0x7) + 1
+        bus_width    = 8*2**(data[13] & 0x7)
+        ecc          = ((data[13] >> 3) & 0x3) == 1
+        part_number  = bytes(data[329:349]) if len(data) >= 349 else b""
+    return {
+        "memtype"     : memtype,
+        "module_type" : module_type,
+        "registered"  : module_type in _registered_module_types,
+        "size"        : capacity*2**20//8*(bus_width//device_width)*ranks,
+        "ranks"       : ranks,
+        "bus_width"   : bus_width + (8 if ecc else 0),
+        "device"      : f"{capacity}Mb x{device_width}",
+        "speedgrade"  : spd.speedgrade,
+        "nbanks"      : spd.nbanks,
+        "nrows"       : spd.nrows,
+        "ncols"       : spd.ncols,
+        "part_number" : part_number.decode("ascii", errors="replace").strip(" \x00"),
+    }
+
+def format_spd_info(info):
+    return (f"{info['part_number'] or '?'}: {info['memtype']}-{info['speedgrade']} {info['module_type']}, "
+        f"{info['size']//2**20}MB ({info['ranks']} rank(s) of {info['device']}, {info['bus_width']}-bit), "
+        f"{info['nbanks']} banks, {info['nrows']} rows, {info['ncols']} cols")
+
+# SPD Library --------------------------------------------------------------------------------------
+
+class SPDDatabase:
+    def __init__(self, path=None):
+        default   = os.path.join(cache_dir(), "spd")
+        self.path = os.path.abspath(path or os.environ.get("LITEX_BOARDS_SPD_DB", default))
+
+    def _filename(self, name):
+        return os.path.join(self.path, f"{name}.txt")
+
+    def names(self):
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(f[:-len(".txt")] for f in os.listdir(self.path) if f.endswith(".txt"))
+
+    def get(self, name):
+        if name not in self.names():
+            raise ValueError(f"SPD {name} not found in {self.path} (available: {', '.join(self.names()) or 'none'}).")
+        return load_spd(self._filename(name))
+
+    def add(self, filename, name=None):
+        data = load_spd(filename)
+        if name is None:
+            name = get_spd_info(data)["part_number"] or os.path.splitext(os.path.basename(filename))[0]
+        name = re.sub(r"[^\w.-]", "_", name)
+        os.makedirs(self.path, exist_ok=True)
+        write_spd_hexdump(self._filename(name), data)
+        return name
+
+    def remove(self, name):
+        os.remove(self._filename(name))
+
+# SDRAM Module -------------------------------------------------------------------------------------
+
+def get_sdram_module(module, sys_clk_freq, spd_dump=None, spd_db=None):
+    """Return the SDRAM module of a DIMM: module (default) or from an SPD dump/SPD library entry."""
+    if spd_dump is None and spd_db is None:
+        return module
+    if spd_dump is not None and spd_db is not None:
+        raise ValueError("--spd-dump and --spd-db are mutually exclusive.")
+    logger = logging.getLogger("SPD")
+
+    # Load SPD.
+    data = load_spd(spd_dump) if spd_dump is not None else SPDDatabase().get(spd_db)
+    info = get_spd_info(data)
+    if info["memtype"] != module.memtype:
+        raise ValueError(f"{info['memtype']} SPD on a {module.memtype} board.")
+    if info["registered"] != getattr(module, "registered", False):
+        logger.warning(f"{info['module_type']} SPD on a {'RDIMM' if module.registered else 'UDIMM/SO-DIMM'} board.")
+
+    # Create SDRAM module from SPD.
+    base = {
+        ("DDR3", False) : DDR3Module,
+        ("DDR3", True)  : DDR3RegisteredModule,
+        ("DDR4", False) : DDR4Module,
+        ("DDR4", True)  : DDR4RegisteredModule,
+    }[info["memtype"], info["registered"]]
+    sdram_module = base.from_spd_data(data, sys_clk_freq)
+    if info["memtype"] == "DDR4":
+        spd = DDR4SPDData(data)
+        sdram_module.ngroups     = spd.ngroups
+        sdram_module.ngroupbanks = spd.ngroupbanks
+    logger.info(f"Using {format_spd_info(info)}.")
+    return sdram_module
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="SPD library of the DDR3/DDR4 DIMMs.")
+    parser.add_argument("--db", default=None, help="SPD library directory (default: <cache>/spd).")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    p = subparsers.add_parser("add", help="Add SPD dump(s) to the library.")
+    p.add_argument("dumps", nargs="+",       help="SPD dumps (LiteX BIOS spdread output or binary).")
+    p.add_argument("--name", default=None,   help="DIMM name (default: part number).")
+
+    p = subparsers.add_parser("list", help="List DIMMs of the library.")
+
+    p = subparsers.add_parser("show", help="Decode an SPD (library DIMM name or dump file).")
+    p.add_argument("spd",                    help="DIMM name or SPD dump.")
+
+    p = subparsers.add_parser("remove", help="Remove a DIMM from the library.")
+    p.add_argument("name",                   help="DIMM name.")
+
+    args = parser.parse_args()
+
+    db = SPDDatabase(args.db)
+    if args.command == "add":
+        if args.name is not None and len(args.dumps) > 1:
+            parser.error("--name requires a single SPD dump.")
+        for dump in args.dumps:
+            name = db.add(dump, args.name)
+            print(f"{name}: {format_spd_info(get_spd_info(db.get(name)))}")
+    if args.command == "list":
+        for name in db.names():
+            print(f"{name:24s} {format_spd_info(get_spd_info(db.get(name)))}")
+    if args.command == "show":
+        data = load_spd(args.spd) if os.path.exists(args.spd) else db.get(args.spd)
+        for k, v in get_spd_info(data).items():
+            print(f"{k:12s}: {v}")
+    if args.command == "remove":
+        db.remove(args.name)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""Stage-level cache for Yosys/nextpnr builds.
+
+Each build reruns Yosys and nextpnr even when their inputs did not change (only pin constraints,
+nextpnr options or packing options changed, or rebuild of an unchanged design). The stage cache runs
+the build script generated by any Yosys/nextpnr toolchain (trellis, icestorm, oxide, apicula) with
+its synthesis and place & route stages through the cache:
+
+- synth: keyed on the Yosys script, RTL sources and memory initialization files, Yosys version.
+- pnr:   keyed on the synthesized netlist, constraints/pre-pack scripts, nextpnr command line
+  (options, seed) and nextpnr version.
+
+On a hit, the stage outputs are restored from <cache>/stages/<stage>/<key> (<cache> from
+litex_boards.tools.artifacts) instead of running the tool; packing is always run. Hits/misses (and
+what changed on a miss) are reported at the end of the build.
+
+Memory contents (integrated ROM/BIOS, identifier with build time) are part of the synthesized
+netlist and thus of the synth key: use --no-ident-version for identical rebuilds to hit.
+
+    $ python3 -m litex_boards.targets.radiona_ulx3s --build --no-compile-gateware
+    $ python3 -m litex_boards.tools.stage_cache --build build/radiona_ulx3s/gateware
+    $ python3 -m litex_boards.tools.stage_cache --stats
+"""
+
+import os
+import re
+import sys
+import glob
+import json
+import shlex
+import shutil
+import hashlib
+import argparse
+import tempfile
+import subprocess
+
+from litex_boards.tools.artifacts import cache_dir
+
+# Helpers ------------------------------------------------------------------------------------------
+
+_tool_versions = {}
+
+def get_tool_version(tool):
+    if tool not in _tool_versions:
+        try:
+            r = subprocess.run([tool, "--version"], stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+            _tool_versions[tool] = r.stdout.decode(errors="replace").strip()
+        except OSError:
+            _tool_versions[tool] = ""
+    return _tool_versions[tool]
+
+def hash_input(filename):
+    """SHA256 of an input file, ignoring generation date and build directory (generated files)."""
+    with open(filename, "rb") as f:
+        data = f.read()
+    data = re.sub(rb"^// Date\s*:.*$",                   b"", data, flags=re.M)
+    data = re.sub(rb"^//\s*Auto-Generated by LiteX on .*$", b"", data, flags=re.M)
+    data = data.replace(os.getcwd().encode(), b".")
+    return hashlib.sha256(data).hexdigest()
+
+def stages_dir():
+    return os.path.join(cache_dir(), "stages")
+
+def get_stage_key(command, inputs):
+    """Return stage key and the items it was computed from."""
+    items = {
+        "command" : " ".join(command),
+        "tool"    : get_tool_version(command[0]),
+    }
+    for filename in sorted(inputs):
+        # Files of the build directory are keyed on their name (build directory independent).
+        name = os.path.relpath(filename) if not os.path.relpath(filename).startswith("..") else filename
+        items[f"file:{name}"] = hash_input(filename)
+    key = hashlib.sha256(json.dumps(items, sort_keys=True).encode()).hexdigest()
+    return key, items
+
+# Stage Runner -------------------------------------------------------------------------------------
+
+def run_stage(manifest_file, stage, command):
+    """Run a stage of the build script through the cache (from the build directory)."""
+    with open(manifest_file) as f:
+        manifest = json.load(f)
+    inputs  = manifest["stages"][stage]["inputs"]
+    outputs = manifest["stages"][stage]["outputs"]
+    key, items = get_stage_key(command, inputs)
+    entry = os.path.join(stages_dir(), stage, key)
+
+    # Hit: restore outputs.
+    if os.path.exists(os.path.join(entry, "items.json")):
+        for output in outputs:
+            shutil.copyfile(os.path.join(entry, os.path.basename(output)), output)
+        status = "hit"
+    # Miss: run stage and store outputs.
+    else:
+        r = subprocess.call(command)
+        if r != 0:
+            return r
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=os.path.dirname(entry))
+        for output in outputs:
+            shutil.copyfile(output, os.path.join(tmp, os.path.basename(output)))
+        with open(os.path.join(tmp, "items.json"), "w") as f:
+            json.dump(items, f, indent=1, sort_keys=True)
+        try:
+            os.replace(tmp, entry)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True) # Concurrent build stored the same entry.
+        status = "miss"
+
+    # Record result (and what changed since previous run of the stage in this build directory).
+    previous = manifest["results"].get(stage, {}).get("items", {})
+    changed  = sorted(k for k in set(items) | set(previous) if items.get(k) != previous.get(k))
+    manifest["results"][stage] = {"status": status, "key": key, "items": items, "changed": changed if previous else []}
+    with open(manifest_file, "w") as f:
+        json.dump(manifest, f, indent=1)
+    return 0
+
+# Build Script -------------------------------------------------------------------------------------
+
+_root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_stage_tools = {
+    "synth" : re.compile(r"yosys\s"),
+    "pnr"   : re.compile(r"nextpnr-\S+\s"),
+}
+
+_pnr_inputs  = ["--json", "--lpf", "--pcf", "--pdc", "--pre-pack"]
+_pnr_outputs = ["--textcfg", "--asc", "--fasm", "--write", "--report", "--sdf"]
+
+def get_stage_calls(script):
+    """Yosys/nextpnr calls of a build script (also when already run through the cache)."""
+    calls = {}
+    for line in script.splitlines():
+        call = line.split(" -- ", 1)[1] if " -m litex_boards.tools.stage_cache --run " in line else line
+        for stage, tool in _stage_tools.items():
+            if tool.match(call):
+                calls[stage] = (line, call)
+    return calls
+
+def get_stages(synth_call, pnr_call):
+    """Inputs/Outputs of the synth/pnr stages from their calls (from the build directory)."""
+    # Synth: Yosys script, sources it reads and memory initialization files.
+    synth_args    = shlex.split(synth_call)
+    ys            = synth_args[-1]
+    synth_inputs  = [ys] + glob.glob("*.init")
+    synth_outputs = [synth_args[synth_args.index("-l") + 1]] if "-l" in synth_args else []
+    with open(ys) as f:
+        for line in f:
+            if line.startswith("read_"):
+                synth_inputs.append(line.split()[-1])
+            if line.startswith("write_"):
+                synth_outputs.insert(0, line.split()[-1])
+
+    # PnR: netlist, constraints/pre-pack scripts.
+    pnr_args    = shlex.split(pnr_call)
+    pnr_inputs  = []
+    pnr_outputs = []
+    for option, value in zip(pnr_args, pnr_args[1:]):
+        if option in _pnr_inputs:
+            pnr_inputs.append(value)
+        if option == "--vopt" and value.startswith("cst="):
+            pnr_inputs.append(value[len("cst="):])
+        if option in _pnr_outputs:
+            pnr_outputs.append(value)
+    return {
+        "synth" : {"inputs" : sorted(set(synth_inputs)), "outputs" : synth_outputs},
+        "pnr"   : {"inputs" : pnr_inputs,                "outputs" : pnr_outputs},
+    }
+
+def add_stage_cache(build_dir, build_name):
+    """Run the synth/pnr stages of a Yosys/nextpnr build script through the stage cache."""
+    cwd = os.getcwd()
+    os.chdir(build_dir)
+    try:
+        script = f"build_{build_name}.sh"
+        with open(script) as f:
+            contents = f.read()
+        calls = get_stage_calls(contents)
+        if set(calls) != set(_stage_tools):
+            raise ValueError(f"{os.path.join(build_dir, script)} is not a Yosys/nextpnr build script.")
+        manifest = f"{build_name}_stage_cache.json"
+        results  = {}
+        if os.path.exists(manifest):
+            with open(manifest) as f:
+                results = json.load(f).get("results", {})
+        with open(manifest, "w") as f:
+            json.dump({"stages": get_stages(calls["synth"][1], calls["pnr"][1]), "results": results}, f, indent=1)
+        runner = f"PYTHONPATH={shlex.quote(_root_dir)}:$PYTHONPATH {shlex.quote(sys.executable)} -m litex_boards.tools.stage_cache --run {manifest}"
+        for stage, (line, call) in calls.items():
+            contents = contents.replace(line, f"{runner} {stage} -- {call}", 1)
+        with open(script, "w") as f:
+            f.write(contents)
+    finally:
+        os.chdir(cwd)
+    return os.path.join(build_dir, script)
+
+def get_build_name(build_dir):
+    scripts = glob.glob(os.path.join(build_dir, "build_*.sh"))
+    if len(scripts) != 1:
+        raise ValueError(f"No (or several) build script in {build_dir}, please specify --build-name.")
+    return os.path.basename(scripts[0])[len("build_"):-len(".sh")]
+
+def build(build_dir, build_name=None):
+    """Run a generated Yosys/nextpnr build script with its synth/pnr stages through the cache."""
+    build_name = build_name or get_build_name(build_dir)
+    script     = add_stage_cache(build_dir, build_name)
+    r = subprocess.call(["bash", os.path.basename(script)], cwd=build_dir)
+    print(report(get_results(build_dir, build_name)))
+    return r
+
+def get_results(build_dir, build_name):
+    manifest = os.path.join(build_dir, f"{build_name}_stage_cache.json")
+    if not os.path.exists(manifest):
+        return {}
+    with open(manifest) as f:
+        return json.load(f)["results"]
+
+def report(results):
+    lines = []
+    for stage in ["synth", "pnr"]:
+        if stage in results:
+            r    = results[stage]
+            line = f"Stage cache: {stage:<5} {r['status']}"
+            if r["status"] == "miss" and r["changed"]:
+                line += f" ({', '.join(r['changed'])} changed)"
+            lines.append(line + ".")
+    return "\n".join(lines)
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Stage-level cache for Yosys/nextpnr builds.")
+    parser.add_argument("--build",      metavar="BUILD_DIR",                      help="Run the generated build script of BUILD_DIR (gateware directory) through the cache.")
+    parser.add_argument("--build-name",                                           help="Build name (default: from the build script of BUILD_DIR).")
+    parser.add_argument("--run",        nargs=2, metavar=("MANIFEST", "STAGE"),   help="Run a build stage through the cache (from build scripts).")
+    parser.add_argument("--stats",      action="store_true",                      help="Show cache statistics.")
+    parser.add_argument("--clear",      action="store_true",                      help="Clear the cache.")
+    parser.add_argument("command",      nargs=argparse.REMAINDER,                 help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        command = args.command[1:] if args.command[:1] == ["--"] else args.command
+        sys.exit(run_stage(*args.run, command))
+
+    if args.build:
+        sys.exit(build(args.build, args.build_name))
+
+    if args.clear:
+        shutil.rmtree(stages_dir(), ignore_errors=True)
+
+    if args.stats:
+        print(f"Stage cache: {stages_dir()}")
+        for stage in ["synth", "pnr"]:
+            entries = glob.glob(os.path.join(stages_dir(), stage, "*", "items.json"))
+            size    = sum(os.path.getsize(f) for e in entries for f in glob.glob(os.path.join(os.path.dirname(e), "*")))
+            print(f"{stage:<5}: {len(entries)} entries, {size/1e6:.1f}MB.")
+
+if __name__ == "__main__":
+    main()
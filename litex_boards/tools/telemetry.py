@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""Read the Telemetry history (litex_boards.cores.telemetry).
+
+The ring buffer is read in bursts through a litex_server (Etherbone, UARTBone, JTAGBone...)
+instead of polling each monitor register, records are decoded (min/max/avg/last of
+each channel, converted to °C/V for XADC/SysMon channels) and written as CSV or JSON:
+
+    $ litex_server --udp --udp-ip=192.168.1.50 &
+    $ python3 -m litex_boards.tools.telemetry --csr-csv=csr.csv --format=csv --output=telemetry.csv
+    $ python3 -m litex_boards.tools.telemetry --csr-csv=csr.csv --sample-rate=1000 --decimation=8 --follow
+"""
+
+import sys
+import csv
+import json
+import time
+import argparse
+
+from litex import RemoteClient
+
+from litex_boards.cores.telemetry import SYSMON_TEMPERATURE
+
+# Helpers ------------------------------------------------------------------------------------------
+
+REDUCTIONS  = ["min", "max", "avg", "last"]
+BURST_WORDS = 255 # Max reads per Etherbone record.
+
+def convert(name, value, sysmon=None):
+    """Convert XADC/SysMon raw values to °C/V."""
+    if sysmon is None:
+        return value
+    bits, scale, offset = SYSMON_TEMPERATURE[sysmon]
+    if name == "temperature":
+        return round(value*scale/2**bits - offset, 2)
+    if name.startswith("vcc"):
+        return round(value*3/2**bits, 4)
+    return value
+
+def decode_records(words, channels, record_words, records, sysmon=None):
+    """Decode the ring buffer words (oldest record first), records overwritten while reading are
+    skipped."""
+    nrecords = len(words)//record_words
+    history  = []
+    for n in range(max(records - nrecords, 0), records):
+        slot   = n % nrecords
+        record = words[slot*record_words:(slot + 1)*record_words]
+        if record[0] != n:
+            continue
+        entry = {"record": n}
+        for i, name in enumerate(channels):
+            w0, w1 = record[1 + 2*i], record[2 + 2*i]
+            values = [w0 & 0xffff, w0 >> 16, w1 & 0xffff, w1 >> 16]
+            for reduction, value in zip(REDUCTIONS, values):
+                entry[f"{name}_{reduction}"] = convert(name, value, sysmon)
+        history.append(entry)
+    return history
+
+def get_config(bus, name="telemetry"):
+    constants = bus.constants.d
+    return {
+        "channels"     : constants[f"{name}_channels"].split(":"),
+        "record_words" : constants[f"{name}_record_words"],
+        "sysmon"       : constants.get(f"{name}_sysmon", None),
+    }
+
+def read_history(bus, name="telemetry", config=None):
+    """Read and decode the Telemetry ring buffer."""
+    config   = get_config(bus, name) if config is None else config
+    regs     = bus.regs
+    base     = getattr(regs, f"{name}_base").read()
+    size     = getattr(regs, f"{name}_size").read()
+    records  = getattr(regs, f"{name}_records").read()
+    nrecords = size//(4*config["record_words"])
+    nwords   = min(records, nrecords)*config["record_words"]
+    words    = []
+    for offset in range(0, nwords, BURST_WORDS):
+        words += bus.read(base + 4*offset, length=min(BURST_WORDS, nwords - offset))
+    words   += [0]*(nrecords*config["record_words"] - nwords) # Not yet written.
+    return decode_records(words, config["channels"], config["record_words"], records, config["sysmon"])
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Telemetry history reader.")
+    parser.add_argument("--csr-csv",     default="csr.csv",   help="SoC CSV file.")
+    parser.add_argument("--host",        default="localhost", help="litex_server host.")
+    parser.add_argument("--port",        default=1234,        type=int, help="litex_server port.")
+    parser.add_argument("--name",        default="telemetry", help="Telemetry module name.")
+    parser.add_argument("--sample-rate", default=None,        type=float, help="Set sample rate (Hz).")
+    parser.add_argument("--decimation",  default=None,        type=int,   help="Set samples per record (log2).")
+    parser.add_argument("--format",      default="csv",       choices=["csv", "json"], help="Output format.")
+    parser.add_argument("--output",      default=None,        help="Output file (default: stdout).")
+    parser.add_argument("--follow",      action="store_true", help="Keep reading new records.")
+    parser.add_argument("--interval",    default=1.0,         type=float, help="Read interval with --follow (s).")
+    args = parser.parse_args()
+
+    bus = RemoteClient(host=args.host, port=args.port, csr_csv=args.csr_csv)
+    bus.open()
+    regs = bus.regs
+
+    # Configuration.
+    if args.sample_rate is not None or args.decimation is not None:
+        if args.sample_rate is not None:
+            getattr(regs, f"{args.name}_period").write(int(bus.constants.config_clock_frequency/args.sample_rate))
+        if args.decimation is not None:
+            getattr(regs, f"{args.name}_decimation").write(args.decimation)
+        getattr(regs, f"{args.name}_control").write(0b11) # Enable + reset.
+
+    # Read.
+    config = get_config(bus, args.name)
+    output = sys.stdout if args.output is None else open(args.output, "w")
+    writer = None
+    last   = -1
+    try:
+        while True:
+            history = [entry for entry in read_history(bus, args.name, config) if entry["record"] > last]
+            if history:
+                last = history[-1]["record"]
+            if args.format == "json":
+                for entry in history:
+                    output.write(json.dumps(entry) + "\n")
+            else:
+                for entry in history:
+                    if writer is None:
+                        writer = csv.DictWriter(output, fieldnames=list(entry.keys()))
+                        writer.writeheader()
+                    writer.writerow(entry)
+            output.flush()
+            if not args.follow:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        bus.close()
+        if args.output is not None:
+            output.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""Xilinx configuration profile and boot-time estimator.
+
+Configuration settings (SPI width, CCLK rate, external CCLK, compression, write_cfgmem interface)
+are declared by each Xilinx platform with a XilinxConfigProfile (config_profile class attribute)
+and XilinxConfigPlatform (platform mixin) uses it to:
+- Generate the configuration properties and the write_cfgmem command of the build.
+- Add a --fast-boot build option that switches to the fast variant of the profile (widest SPI
+  bus wired on the board, faster CCLK, compression) with a write_cfgmem interface matching the
+  SPI width.
+- Report the estimated configuration time (from the generated bitstream size, or from the nominal
+  device bitstream size when not built).
+
+The estimator can also be used standalone:
+
+    $ python3 -m litex_boards.tools.xilinx_config --platform=digilent_arty --fast-boot
+    $ python3 -m litex_boards.tools.xilinx_config --platform=digilent_arty --bitstream=build/digilent_arty/gateware/digilent_arty.bit
+"""
+
+import os
+import re
+import copy
+import argparse
+import importlib
+
+from migen import Module
+
+# Nominal Bitstream Sizes (uncompressed, in bits, UG470) -------------------------------------------
+
+bitstream_sizes = {
+    "xc7s15"    :   4_310_752,
+    "xc7s25"    :   9_934_432,
+    "xc7s50"    :  17_536_096,
+    "xc7a15t"   :  17_536_096,
+    "xc7a35t"   :  17_536_096,
+    "xc7a50t"   :  17_536_096,
+    "xc7a75t"   :  30_606_304,
+    "xc7a100t"  :  30_606_304,
+    "xc7a200t"  :  77_845_216,
+    "xc7k70t"   :  24_090_592,
+    "xc7k160t"  :  53_540_576,
+    "xc7k325t"  :  91_548_896,
+    "xc7k420t"  : 149_880_032,
+    "xc7vx485t" : 162_187_488,
+}
+
+def get_bitstream_size(device):
+    for name, size in bitstream_sizes.items():
+        if device.lower().startswith(name):
+            return size
+    return None
+
+# Xilinx Configuration Profile ---------------------------------------------------------------------
+
+# Properties handled by the profile (other BITSTREAM.* properties are left untouched).
+_profile_properties = [
+    "BITSTREAM.CONFIG.SPI_BUSWIDTH",
+    "BITSTREAM.CONFIG.CONFIGRATE",
+    "BITSTREAM.CONFIG.EXTMASTERCCLK_EN",
+    "BITSTREAM.CONFIG.SPI_FALL_EDGE",
+    "BITSTREAM.GENERAL.COMPRESS",
+]
+
+class XilinxConfigProfile:
+    """Xilinx Master SPI configuration profile.
+
+    Parameters
+    ----------
+    spi_width : int
+        SPI bus width used for configuration (1, 2, 4 or 8 for dual-quad).
+
+    configrate : float or None
+        Internal CCLK rate (MHz), None for device default (3MHz on 7-Series).
+
+    ext_cclk : float or None
+        External master CCLK (EMCCLK) frequency (MHz), None when not used/unknown.
+
+    ext_cclk_div : int or None
+        EMCCLK divider (BITSTREAM.CONFIG.EXTMASTERCCLK_EN div-N), None when EMCCLK is not used.
+
+    compress : bool
+        Bitstream compression.
+
+    flash_size : int or None
+        SPI Flash size (MB) for write_cfgmem, None when no Flash image is generated.
+
+    cfgmem_format : str
+        Flash image format generated by write_cfgmem ("bin" or "mcs").
+
+    fall_edge : bool
+        Sample SPI data on CCLK falling edge (required for high CCLK rates on some boards).
+
+    fast_spi_width/fast_configrate : int/float or None
+        Values used by the fast variant of the profile (widest bus wired on the board, fastest CCLK
+        validated on the board).
+    """
+    def __init__(self, spi_width=1, configrate=None, ext_cclk=None, compress=False, flash_size=None,
+        ext_cclk_div    = None,
+        fall_edge       = False,
+        cfgmem_format   = "bin",
+        fast_spi_width  = None,
+        fast_configrate = None):
+        assert spi_width in [1, 2, 4, 8]
+        assert cfgmem_format in ["bin", "mcs"]
+        self.spi_width       = spi_width
+        self.configrate      = configrate
+        self.ext_cclk        = ext_cclk
+        self.ext_cclk_div    = 1 if (ext_cclk is not None and ext_cclk_div is None) else ext_cclk_div
+        self.compress        = compress
+        self.flash_size      = flash_size
+        self.fall_edge       = fall_edge
+        self.cfgmem_format   = cfgmem_format
+        self.fast_spi_width  = fast_spi_width
+        self.fast_configrate = fast_configrate
+
+    def __repr__(self):
+        return (f"XilinxConfigProfile(spi_width={self.spi_width}, configrate={self.configrate}, "
+            f"ext_cclk={self.ext_cclk}, ext_cclk_div={self.ext_cclk_div}, compress={self.compress}, flash_size={self.flash_size})")
+
+    @classmethod
+    def from_commands(cls, commands):
+        """Derive profile from existing Vivado commands (platforms without config_profile)."""
+        profile = cls()
+        for command in commands:
+            r = re.search(r"BITSTREAM\.CONFIG\.SPI_BUSWIDTH\s+(\d+)", command)
+            if r:
+                profile.spi_width = int(r.group(1))
+            r = re.search(r"BITSTREAM\.CONFIG\.CONFIGRATE\s+([\d\.]+)", command)
+            if r:
+                profile.configrate = float(r.group(1))
+            r = re.search(r"BITSTREAM\.CONFIG\.EXTMASTERCCLK_EN\s+([\w-]+)", command)
+            if r:
+                d = re.match(r"div-(\d+)", r.group(1).lower())
+                profile.ext_cclk_div = int(d.group(1)) if d else None
+            r = re.search(r"BITSTREAM\.GENERAL\.COMPRESS\s+(\w+)", command)
+            if r:
+                profile.compress = r.group(1).upper() == "TRUE"
+            r = re.search(r"BITSTREAM\.CONFIG\.SPI_FALL_EDGE\s+(\w+)", command)
+            if r:
+                profile.fall_edge = r.group(1).upper() == "YES"
+            r = re.search(r"write_cfgmem.*-size\s+(\d+)", command)
+            if r:
+                profile.flash_size = int(r.group(1))
+            r = re.search(r"write_cfgmem.*-format\s+(\w+)", command)
+            if r:
+                profile.cfgmem_format = r.group(1).lower()
+        return profile
+
+    def fast(self):
+        """Return fast variant of the profile."""
+        configrate = self.configrate
+        if self.fast_configrate is not None:
+            configrate = max(configrate or 0, self.fast_configrate)
+        return XilinxConfigProfile(
+            spi_width     = max(self.spi_width, self.fast_spi_width or 0),
+            configrate    = configrate,
+            ext_cclk      = self.ext_cclk,
+            ext_cclk_div  = self.ext_cclk_div,
+            compress      = True,
+            flash_size    = self.flash_size,
+            fall_edge     = self.fall_edge,
+            cfgmem_format = self.cfgmem_format,
+        )
+
+    @property
+    def cfgmem_interface(self):
+        return {1: "spix1", 2: "spix2", 4: "spix4", 8: "spix8"}[self.spi_width]
+
+    def bitstream_commands(self):
+        commands = [f"set_property BITSTREAM.CONFIG.SPI_BUSWIDTH {self.spi_width} [current_design]"]
+        if self.ext_cclk_div is not None:
+            commands.append(f"set_property BITSTREAM.CONFIG.EXTMASTERCCLK_EN div-{self.ext_cclk_div} [current_design]")
+        elif self.configrate is not None:
+            commands.append(f"set_property BITSTREAM.CONFIG.CONFIGRATE {self.configrate:g} [current_design]")
+        if self.fall_edge:
+            commands.append("set_property BITSTREAM.CONFIG.SPI_FALL_EDGE YES [current_design]")
+        if self.compress:
+            commands.append("set_property BITSTREAM.GENERAL.COMPRESS TRUE [current_design]")
+        return commands
+
+    def cfgmem_command(self, build_name="{build_name}"):
+        return (f"write_cfgmem -force -format {self.cfgmem_format} -interface {self.cfgmem_interface} -size {self.flash_size} "
+            f"-loadbit \"up 0x0 {build_name}.bit\" -file {build_name}.{self.cfgmem_format}")
+
+    @property
+    def cclk_freq(self):
+        """Effective CCLK frequency (Hz), None when EMCCLK is used with an unknown frequency."""
+        if self.ext_cclk_div is not None:
+            return None if self.ext_cclk is None else self.ext_cclk*1e6/self.ext_cclk_div
+        return (self.configrate or 3)*1e6
+
+    def estimate_config_time(self, bitstream_bits):
+        """Estimated configuration time (s) of a bitstream loaded from the SPI Flash."""
+        return bitstream_bits/(self.spi_width*self.cclk_freq)
+
+    def apply(self, platform):
+        """Generate configuration properties and write_cfgmem command of the platform from the profile.
+
+        Configuration properties still set by the platform (or a target) are replaced, other
+        write_cfgmem commands (ex Multiboot images) get the interface of the profile.
+        """
+        def is_profile_command(command):
+            return any(re.search(rf"{p}\b", command) for p in _profile_properties)
+        def is_main_cfgmem_command(command):
+            return re.search(r"write_cfgmem.*-loadbit\s+\"up\s+0x0\s+\{build_name\}\.bit\"", command) is not None
+        toolchain = platform.toolchain
+        toolchain.bitstream_commands = [c for c in toolchain.bitstream_commands if not is_profile_command(c)]
+        toolchain.bitstream_commands = self.bitstream_commands() + toolchain.bitstream_commands
+        platform.constraint_manager.platform_commands = [(c, s) for c, s in platform.constraint_manager.platform_commands if not is_profile_command(c)]
+        additional_commands = [re.sub(r"-interface\s+spix\d", f"-interface {self.cfgmem_interface}", c)
+            for c in toolchain.additional_commands if not is_main_cfgmem_command(c)]
+        if self.flash_size is not None:
+            additional_commands.insert(0, self.cfgmem_command())
+        toolchain.additional_commands = additional_commands
+
+    def report(self, device, bitstream=None):
+        """Return configuration time estimate as a printable string."""
+        bits   = None
+        source = f"nominal {device} size"
+        if self.compress:
+            source += ", upper bound with compression"
+        if bitstream is not None and os.path.exists(bitstream):
+            bits   = os.path.getsize(bitstream)*8
+            source = os.path.basename(bitstream)
+        if bits is None:
+            bits = get_bitstream_size(device)
+        if bits is None:
+            return f"Configuration time: unknown bitstream size for {device}."
+        if self.cclk_freq is None:
+            return f"Configuration time: unknown EMCCLK frequency (div-{self.ext_cclk_div})."
+        clk = f"EMCCLK {self.cclk_freq/1e6:g}MHz" if self.ext_cclk_div is not None else f"CCLK {self.cclk_freq/1e6:g}MHz"
+        return (f"Configuration time: {self.estimate_config_time(bits)*1e3:.1f}ms "
+            f"(SPI x{self.spi_width} @ {clk}, {bits/8e6:.2f}MB, {source}).")
+
+# Xilinx Configuration Platform --------------------------------------------------------------------
+
+class XilinxConfigPlatform:
+    """Platform mixin adding configuration profile, --fast-boot and boot-time report.
+
+    The profile is declared by the platform with config_profile and applied once the platform is
+    finalized. The fast variant uses the default_fast_configrate (when the device accepts it)
+    unless declared in the profile.
+
+    Platforms without config_profile (ex out-of-tree platforms) fall back to a profile derived
+    from their configuration commands and to the widest SPI bus found in their IOs (spiflash4x).
+    """
+    config_profile          = None
+    default_fast_configrate = 33 # MHz, valid on all 7-Series devices/SPI Flashes.
+
+    @classmethod
+    def fill_args(cls, toolchain, parser):
+        super().fill_args(toolchain, parser)
+        if toolchain == "vivado":
+            parser.add_argument("--fast-boot", action="store_true", help="Use fast configuration profile (SPI width, CCLK, compression).")
+
+    @classmethod
+    def get_argdict(cls, toolchain, args):
+        argdict = super().get_argdict(toolchain, args)
+        if toolchain == "vivado":
+            argdict["fast_boot"] = args.fast_boot
+        return argdict
+
+    def is_ps_configured(self):
+        return self.device.lower().startswith(("xc7z", "xczu", "xck26"))
+
+    def get_config_profile(self, fast_boot=False):
+        if self.config_profile is not None:
+            profile = copy.copy(self.config_profile)
+        else:
+            commands  = self.toolchain.bitstream_commands + self.toolchain.additional_commands
+            commands += [c for c, _ in self.constraint_manager.platform_commands]
+            profile = XilinxConfigProfile.from_commands(commands)
+            if any(name == "spiflash4x" for name, *_ in self.constraint_manager.available):
+                profile.fast_spi_width = 4
+        if (profile.fast_configrate is None) and self.device.lower().startswith("xc7"):
+            profile.fast_configrate = self.default_fast_configrate
+        return profile.fast() if fast_boot else profile
+
+    def finalize(self, fragment, *args, **kwargs):
+        super().finalize(fragment, *args, **kwargs)
+        if self.is_ps_configured():
+            return
+        fast_boot = getattr(self, "_fast_boot", False)
+        self._finalized_config_profile = self.get_config_profile(fast_boot)
+        self._finalized_config_profile.apply(self)
+
+    def build(self, *args, fast_boot=False, **kwargs):
+        if self.is_ps_configured():
+            return super().build(*args, **kwargs)
+        self._fast_boot = fast_boot
+        r = super().build(*args, **kwargs)
+        build_dir  = kwargs.get("build_dir", "build")
+        build_name = kwargs.get("build_name", "top")
+        print(self._finalized_config_profile.report(self.device, os.path.join(build_dir, build_name + ".bit")))
+        return r
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Xilinx configuration profile/boot-time estimator.")
+    parser.add_argument("--platform",  required=True,       help="Platform module (ex digilent_arty).")
+    parser.add_argument("--fast-boot", action="store_true", help="Use fast configuration profile.")
+    parser.add_argument("--bitstream", default=None,        help="Bitstream to estimate configuration time of.")
+    args = parser.parse_args()
+
+    module   = importlib.import_module(f"litex_boards.platforms.{args.platform}")
+    platform = module.Platform()
+    if not hasattr(platform, "get_config_profile"):
+        raise ValueError(f"{args.platform} has no configuration profile.")
+    if platform.is_ps_configured():
+        raise ValueError(f"{args.platform} is configured by the Processing System.")
+    platform.finalize(Module().get_fragment()) # Configuration commands added in do_finalize.
+    profile = platform.get_config_profile(fast_boot=args.fast_boot)
+    print(profile)
+    for command in profile.bitstream_commands():
+        print(command)
+    if profile.flash_size is not None:
+        print(profile.cfgmem_command(platform.name))
+    print(profile.report(platform.device, args.bitstream))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import io
+import os
+import json
+import hashlib
+import tarfile
+import zipfile
+import tempfile
+import unittest
+from unittest import mock
+
+from litex_boards.tools import artifacts
+from litex_boards.tools.artifacts import ArtifactError
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+def add_file(tar, name, data):
+    info      = tarfile.TarInfo(name)
+    info.size = len(data)
+    tar.addfile(info, io.BytesIO(data))
+
+def add_symlink(tar, name, target):
+    info          = tarfile.TarInfo(name)
+    info.type     = tarfile.SYMTYPE
+    info.linkname = target
+    tar.addfile(info)
+
+# Test Artifacts -----------------------------------------------------------------------------------
+
+class TestArtifacts(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.set_cache("cache")
+        patcher = mock.patch.dict(artifacts.ARTIFACTS, {
+            "tofu.xci"   : ("https://example.com/tofu.xci",   None),
+            "pinned.xci" : ("https://example.com/pinned.xci", sha256(b"pinned")),
+            "lib.zip"    : ("https://example.com/lib.zip",    None),
+        })
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def set_cache(self, name):
+        patcher = mock.patch.dict(os.environ, {
+            "LITEX_BOARDS_CACHE"   : os.path.join(self.tmpdir.name, name),
+            "LITEX_BOARDS_OFFLINE" : "1",
+        })
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def file(self, name, data):
+        filename = os.path.join(self.tmpdir.name, name)
+        with open(filename, "wb") as f:
+            f.write(data)
+        return filename
+
+    def tarball(self, members):
+        filename = os.path.join(self.tmpdir.name, "store.tar")
+        with tarfile.open(filename, "w") as tar:
+            for add, name, arg in members:
+                add(tar, name, arg)
+        return filename
+
+    def test_store(self):
+        # Pinned on first use, then verified.
+        blob = artifacts.seed_artifact("tofu.xci", self.file("a.xci", b"first"))
+        self.assertEqual(blob, os.path.join(artifacts.cache_dir(), "sha256", sha256(b"first")))
+        self.assertEqual(artifacts.get_artifact("tofu.xci"), blob)
+        with self.assertRaises(ArtifactError):
+            artifacts.seed_artifact("tofu.xci", self.file("b.xci", b"second"))
+        # Pinned in registry.
+        with self.assertRaises(ArtifactError):
+            artifacts.seed_artifact("pinned.xci", self.file("c.xci", b"other"))
+        artifacts.seed_artifact("pinned.xci", self.file("c.xci", b"pinned"))
+        # Unknown artifact.
+        with self.assertRaises(ArtifactError):
+            artifacts.seed_artifact("unknown.xci", self.file("d.xci", b"unknown"))
+
+    def test_verify(self):
+        blob = artifacts.seed_artifact("pinned.xci", self.file("a.xci", b"pinned"))
+        # Copy left untouched when identical.
+        dst = os.path.join(self.tmpdir.name, "build", "pinned.xci")
+        artifacts.copy_artifact("pinned.xci", dst)
+        os.utime(dst, (0, 0))
+        artifacts.copy_artifact("pinned.xci", dst)
+        self.assertEqual(os.stat(dst).st_mtime, 0)
+        # Corrupted file removed from store, not fetched again when offline.
+        with open(blob, "wb") as f:
+            f.write(b"corrupted")
+        with self.assertRaises(ArtifactError):
+            artifacts.get_artifact("pinned.xci")
+        self.assertFalse(os.path.exists(blob))
+        with self.assertRaises(ArtifactError):
+            artifacts.get_artifact("pinned.xci")
+
+    def test_extract(self):
+        def zip_file(members):
+            filename = os.path.join(self.tmpdir.name, "lib.zip")
+            with zipfile.ZipFile(filename, "w") as z:
+                for name, data in members:
+                    z.writestr(name, data)
+            return filename
+        artifacts.seed_artifact("lib.zip", zip_file([("lib/lib.h", b"header"), ("Makefile", b"all:")]))
+        dst = os.path.join(self.tmpdir.name, "build", "lib")
+        artifacts.extract_artifact("lib.zip", dst)
+        with open(os.path.join(dst, "lib", "lib.h"), "rb") as f:
+            self.assertEqual(f.read(), b"header")
+        self.assertTrue(os.path.exists(os.path.join(dst, "Makefile")))
+        # Members outside of destination.
+        self.set_cache("unsafe")
+        artifacts.seed_artifact("lib.zip", zip_file([("../evil", b"evil")]))
+        with self.assertRaises(ArtifactError):
+            artifacts.extract_artifact("lib.zip", os.path.join(self.tmpdir.name, "build", "unsafe"))
+        self.assertFalse(os.path.exists(os.path.join(self.tmpdir.name, "build", "evil")))
+        self.assertEqual(os.listdir(os.path.join(self.tmpdir.name, "build")), ["lib"])
+
+    def test_export_import(self):
+        artifacts.seed_artifact("tofu.xci",   self.file("a.xci", b"first"))
+        artifacts.seed_artifact("pinned.xci", self.file("b.xci", b"pinned"))
+        os.makedirs(os.path.join(artifacts.cache_dir(), "git", "embeddedsw"))
+        tarball = os.path.join(self.tmpdir.name, "export.tar")
+        artifacts.export_store(tarball)
+        self.set_cache("imported")
+        artifacts.import_store(tarball)
+        with open(artifacts.get_artifact("tofu.xci"), "rb") as f:
+            self.assertEqual(f.read(), b"first")
+        with open(artifacts.get_artifact("pinned.xci"), "rb") as f:
+            self.assertEqual(f.read(), b"pinned")
+        self.assertTrue(os.path.isdir(os.path.join(artifacts.cache_dir(), "git", "embeddedsw")))
+        self.assertEqual(sorted(os.listdir(artifacts.cache_dir())), ["git", "index.json", "sha256"])
+
+    def test_import_unsafe(self):
+        cases = [
+            [(add_file,    "../evil", b"evil")],
+            [(add_file,    "/tmp/evil", b"evil")],
+            [(add_file,    "bin/evil", b"evil")],
+            [(add_symlink, "git/evil", "/etc")],
+            [(add_symlink, "git/evil", "../../evil")],
+        ]
+        for members in cases:
+            with self.assertRaises(ArtifactError):
+                artifacts.import_store(self.tarball(members))
+        self.assertFalse(os.path.exists(os.path.join(self.tmpdir.name, "evil")))
+        self.assertEqual(os.listdir(artifacts.cache_dir()), [])
+
+    def test_import_verify(self):
+        # File not matching its digest.
+        with self.assertRaises(ArtifactError):
+            artifacts.import_store(self.tarball([(add_file, f"sha256/{sha256(b'pinned')}", b"other")]))
+        # Index not matching the registry.
+        index = json.dumps({"pinned.xci": sha256(b"other")}).encode()
+        with self.assertRaises(ArtifactError):
+            artifacts.import_store(self.tarball([
+                (add_file, f"sha256/{sha256(b'other')}", b"other"),
+                (add_file, "index.json", index),
+            ]))
+        with self.assertRaises(ArtifactError):
+            artifacts.get_artifact("pinned.xci")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import math
+import random
+import unittest
+
+from migen import *
+
+from litex_boards.cores.async_sram import AsyncSRAM, IS61WV5128BLL, MT45W8MW16BGX
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def sram_pads(addr_width, data_width, with_byte_enables):
+    layout = [("addr", addr_width), ("data_o", data_width), ("data_oe", 1), ("data_i", data_width),
+        ("cen", 1), ("wen", 1), ("oen", 1)]
+    if with_byte_enables:
+        layout += [("lb", 1), ("ub", 1)]
+    return Record(layout)
+
+@passive
+def sram_model(pads, module, sys_clk_freq, mem, errors):
+    """Asynchronous SRAM/PSRAM model: read data is only valid after tAA (tPAA within an open page)
+    and writes require a tWP WE# pulse."""
+    def cycles(t):
+        return math.ceil(t*1e-9*sys_clk_freq)
+    data_width = len(pads.data_o)
+    page_bits  = log2_int(module.page_size) if module.tPAA is not None else None
+    last_addr  = None
+    stable     = 0
+    open_page  = None
+    wen_low    = 0
+    while True:
+        addr = (yield pads.addr)
+        cen  = (yield pads.cen)
+        wen  = (yield pads.wen)
+        oen  = (yield pads.oen)
+        lb   = (yield pads.lb) if hasattr(pads, "lb") else 0
+        ub   = (yield pads.ub) if hasattr(pads, "ub") else 0
+        # Reads.
+        stable    = (stable + 1) if (addr == last_addr) else 1
+        last_addr = addr
+        if cen:
+            open_page = None
+        need = cycles(module.tAA)
+        if page_bits is not None and open_page == (addr >> page_bits):
+            need = cycles(module.tPAA)
+        if not cen and not oen and wen and stable >= need:
+            yield pads.data_i.eq(mem.get(addr, 0))
+            if page_bits is not None:
+                open_page = addr >> page_bits
+        else:
+            yield pads.data_i.eq(random.randrange(2**data_width))
+        # Writes (committed on WE# rising edge).
+        if not cen and not wen:
+            if (yield pads.data_oe) == 0:
+                errors.append(f"write to 0x{addr:x} without driving data")
+            wen_low  += 1
+            wen_data  = (yield pads.data_o)
+            wen_addr  = addr
+            wen_mask  = (0 if lb else 0x00ff) | (0 if ub else 0xff00)
+        elif wen_low:
+            if wen_low < cycles(module.tWP):
+                errors.append(f"write to 0x{wen_addr:x}: WE# pulse too short ({wen_low} cycles)")
+            if not hasattr(pads, "lb"):
+                wen_mask = 2**data_width - 1
+            mem[wen_addr] = (mem.get(wen_addr, 0) & ~wen_mask) | (wen_data & wen_mask)
+            wen_low = 0
+        yield
+
+def burst_read(bus, adr, length, datas):
+    """Sequential reads keeping cyc/stb asserted (ex L2 cache refill)."""
+    yield bus.cyc.eq(1)
+    yield bus.stb.eq(1)
+    yield bus.we.eq(0)
+    for i in range(length):
+        yield bus.adr.eq(adr + i)
+        yield
+        while not (yield bus.ack):
+            yield
+        datas.append((yield bus.dat_r))
+    yield bus.cyc.eq(0)
+    yield bus.stb.eq(0)
+    yield
+
+def burst_write(bus, adr, datas, sel=0b1111):
+    """Sequential writes keeping cyc/stb asserted (ex L2 cache writeback)."""
+    yield bus.cyc.eq(1)
+    yield bus.stb.eq(1)
+    yield bus.we.eq(1)
+    yield bus.sel.eq(sel)
+    for i, data in enumerate(datas):
+        yield bus.adr.eq(adr + i)
+        yield bus.dat_w.eq(data)
+        yield
+        while not (yield bus.ack):
+            yield
+    yield bus.cyc.eq(0)
+    yield bus.stb.eq(0)
+    yield
+
+# Test Async SRAM ----------------------------------------------------------------------------------
+
+class TestAsyncSRAM(unittest.TestCase):
+    def run_dut(self, module, data_width, with_byte_enables, generator, sys_clk_freq=100e6):
+        pads   = sram_pads(12, data_width, with_byte_enables)
+        dut    = AsyncSRAM(pads, module, sys_clk_freq)
+        errors = []
+        run_simulation(dut, [sram_model(pads, module, sys_clk_freq, {}, errors), generator(dut)])
+        self.assertEqual(errors, [])
+
+    def check_byte_enables(self, module, data_width, with_byte_enables):
+        random.seed(data_width)
+        ref  = {}
+        read = {}
+        def generator(dut):
+            for i in range(64):
+                adr  = random.randrange(32)
+                data = random.randrange(2**32)
+                sel  = random.choice([0b1111, 0b0001, 0b0010, 0b0100, 0b1000, 0b0011, 0b1100, 0b0110])
+                yield from burst_write(dut.bus, adr, [data], sel=sel)
+                mask = sum(0xff << 8*b for b in range(4) if (sel >> b) & 1)
+                ref[adr] = (ref.get(adr, 0) & ~mask) | (data & mask)
+            for adr in ref:
+                datas = []
+                yield from burst_read(dut.bus, adr, 1, datas)
+                read[adr] = datas[0]
+        self.run_dut(module, data_width, with_byte_enables, generator)
+        self.assertEqual(read, ref)
+
+    def test_sram_8bit(self):
+        # 32-bit words packed from 4 byte beats, sel handled by skipping beats.
+        self.check_byte_enables(IS61WV5128BLL, data_width=8, with_byte_enables=False)
+
+    def test_psram_16bit(self):
+        # 32-bit words packed from 2 halfword beats, sel handled with lb/ub.
+        self.check_byte_enables(MT45W8MW16BGX, data_width=16, with_byte_enables=True)
+
+    def test_psram_bursts(self):
+        random.seed(1)
+        datas = [random.randrange(2**32) for _ in range(64)]
+        read  = []
+        def generator(dut):
+            yield from burst_write(dut.bus, 0x10, datas)
+            yield from burst_read(dut.bus,  0x10, len(datas), read)
+        self.run_dut(MT45W8MW16BGX, data_width=16, with_byte_enables=True, generator=generator)
+        self.assertEqual(read, datas)
+
+    def test_benchmark(self):
+        # Sequential 32-bit accesses on the PSRAM (cycles/word).
+        cycles = {}
+        clock  = {"cycles": 0}
+        @passive
+        def counter():
+            while True:
+                clock["cycles"] += 1
+                yield
+        def generator(dut):
+            for name, burst in [
+                ("write", burst_write(dut.bus, 0, [0]*64)),
+                ("read",  burst_read(dut.bus,  0, 64, [])),
+                ]:
+                start = clock["cycles"]
+                yield from burst
+                cycles[name] = (clock["cycles"] - start)/64
+        pads   = sram_pads(12, 16, True)
+        dut    = AsyncSRAM(pads, MT45W8MW16BGX, 100e6)
+        errors = []
+        run_simulation(dut, [sram_model(pads, MT45W8MW16BGX, 100e6, {}, errors), counter(), generator(dut)])
+        self.assertEqual(errors, [])
+        # Reads: 2 halfword beats per word, only the first beat of a 8-word page pays tAA, + 2 cycles
+        # of bus overhead per word.
+        t = dut.timings
+        self.assertLessEqual(cycles["read"], (t["read"] + 15*t["page_read"])/8 + 2 + 0.25)
+        self.assertLessEqual(cycles["write"], 2*t["write"] + 2 + 0.25)
+
+if __name__ == "__main__":
+    unittest.main()
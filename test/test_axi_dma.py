@@ -0,0 +1,350 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import math
+import unittest
+
+from migen import *
+
+from litex.soc.interconnect import axi
+
+from litex_boards.cores.axi_dma import AXIDMAWriter, AXIDMAReader
+
+# AXI Memory Model ---------------------------------------------------------------------------------
+
+class AXIMemory:
+    def __init__(self, bus, mem=None, w_stall_every=0, a_stall=None):
+        self.bus           = bus
+        self.mem           = {} if mem is None else mem
+        self.w_stall_every = w_stall_every
+        self.a_stall       = [False] if a_stall is None else a_stall # AW/AR not ready when set.
+        self.bursts        = []
+        self.aw_count      = 0
+        self.ar_count      = 0
+        self.w_count       = 0
+        self.errors        = []
+
+    @passive
+    def a_checker(self, a):
+        # AXI: once asserted, VALID must stay asserted (with a stable address) until READY.
+        last = None
+        while True:
+            if last is not None and not (yield a.valid):
+                self.errors.append("VALID dropped before READY")
+            if last is not None and (yield a.valid) and (yield a.addr) != last:
+                self.errors.append("address changed before READY")
+            last = None
+            if (yield a.valid) and not (yield a.ready):
+                last = (yield a.addr)
+            yield
+
+    @passive
+    def aw_handler(self):
+        self.aw_queue = []
+        while True:
+            yield self.bus.aw.ready.eq(not self.a_stall[0])
+            yield
+            if (yield self.bus.aw.valid) and (yield self.bus.aw.ready):
+                self.aw_queue.append(((yield self.bus.aw.addr), (yield self.bus.aw.len) + 1))
+                self.aw_count += 1
+
+    @passive
+    def w_handler(self):
+        self.b_queue = []
+        bytes_per_word = self.bus.data_width//8
+        beat  = 0
+        cycle = 0
+        while True:
+            stall = self.w_stall_every and (cycle % self.w_stall_every) == 0
+            yield self.bus.w.ready.eq(0 if stall else 1)
+            yield
+            cycle += 1
+            if (yield self.bus.w.valid) and (yield self.bus.w.ready):
+                addr, length = self.aw_queue[0]
+                self.mem[addr + beat*bytes_per_word] = (yield self.bus.w.data)
+                self.w_count += 1
+                beat += 1
+                if (yield self.bus.w.last):
+                    assert beat == length
+                    self.bursts.append((addr, length))
+                    self.aw_queue.pop(0)
+                    self.b_queue.append(1)
+                    beat = 0
+
+    @passive
+    def b_handler(self):
+        while True:
+            if len(self.b_queue):
+                self.b_queue.pop(0)
+                yield self.bus.b.valid.eq(1)
+                yield
+                yield self.bus.b.valid.eq(0)
+            yield
+
+    @passive
+    def ar_handler(self):
+        self.ar_queue = []
+        while True:
+            yield self.bus.ar.ready.eq(not self.a_stall[0])
+            yield
+            if (yield self.bus.ar.valid) and (yield self.bus.ar.ready):
+                self.ar_queue.append(((yield self.bus.ar.addr), (yield self.bus.ar.len) + 1))
+                self.ar_count += 1
+
+    @passive
+    def r_handler(self):
+        bytes_per_word = self.bus.data_width//8
+        while True:
+            if len(self.ar_queue):
+                addr, length = self.ar_queue.pop(0)
+                for beat in range(length):
+                    yield self.bus.r.valid.eq(1)
+                    yield self.bus.r.data.eq(self.mem.get(addr + beat*bytes_per_word, 0))
+                    yield self.bus.r.last.eq(beat == (length - 1))
+                    yield
+                yield self.bus.r.valid.eq(0)
+                yield self.bus.r.last.eq(0)
+            yield
+
+    def generators(self):
+        return [
+            self.aw_handler(), self.w_handler(), self.b_handler(), self.ar_handler(), self.r_handler(),
+            self.a_checker(self.bus.aw), self.a_checker(self.bus.ar),
+        ]
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def sine_words(n, amplitude=8000, period=37):
+    # Synthetic ADC waveform: 4x 16-bit samples packed per 64-bit word.
+    words = []
+    for i in range(n):
+        word = 0
+        for j in range(4):
+            sample = int(amplitude*math.sin(2*math.pi*(4*i + j)/period)) & 0xffff
+            word |= sample << (16*j)
+        words.append(word)
+    return words
+
+# Test AXI DMA -------------------------------------------------------------------------------------
+
+class TestAXIDMA(unittest.TestCase):
+    def test_writer_ring_buffer(self):
+        bus    = axi.AXIInterface(data_width=64, address_width=32, id_width=6, version="axi3")
+        dut    = AXIDMAWriter(bus, burst_length=16)
+        memory = AXIMemory(bus, w_stall_every=5)
+        base   = 0x1000
+        length = 4*16*8 # 4 bursts.
+        words  = sine_words(6*16) # 6 bursts: Ring wraps once.
+
+        def generator():
+            yield dut.base.eq(base)
+            yield dut.length.eq(length)
+            yield dut.loop.eq(1)
+            yield dut.enable.eq(1)
+            yield
+            for word in words:
+                yield dut.sink.valid.eq(1)
+                yield dut.sink.data.eq(word)
+                yield
+                while not (yield dut.sink.ready):
+                    yield
+            yield dut.sink.valid.eq(0)
+            for i in range(256):
+                yield
+            self.assertEqual((yield dut.offset), 2*16)
+
+        run_simulation(dut, [generator()] + memory.generators())
+
+        # Bursts are full, aligned and stay in the ring.
+        self.assertEqual(len(memory.bursts), 6)
+        for addr, burst_length in memory.bursts:
+            self.assertEqual(burst_length, 16)
+            self.assertTrue(base <= addr < base + length)
+        # Ring contains the 2 last bursts followed by the 2 oldest ones not overwritten.
+        expected = words[4*16:6*16] + words[2*16:4*16]
+        for i, word in enumerate(expected):
+            self.assertEqual(memory.mem[base + 8*i], word)
+
+    def test_writer_done(self):
+        bus    = axi.AXIInterface(data_width=64, address_width=32, id_width=6, version="axi3")
+        dut    = AXIDMAWriter(bus, burst_length=8)
+        memory = AXIMemory(bus)
+        words  = sine_words(2*8)
+
+        def generator():
+            yield dut.base.eq(0)
+            yield dut.length.eq(2*8*8)
+            yield dut.enable.eq(1)
+            yield
+            self.assertEqual((yield dut.done), 0)
+            for word in words:
+                yield dut.sink.valid.eq(1)
+                yield dut.sink.data.eq(word)
+                yield
+                while not (yield dut.sink.ready):
+                    yield
+            yield dut.sink.valid.eq(0)
+            for i in range(64):
+                yield
+            self.assertEqual((yield dut.done), 1)
+
+        run_simulation(dut, [generator()] + memory.generators())
+        self.assertEqual([memory.mem[8*i] for i in range(len(words))], words)
+
+    def test_writer_disable_mid_burst(self):
+        bus    = axi.AXIInterface(data_width=64, address_width=32, id_width=6, version="axi3")
+        dut    = AXIDMAWriter(bus, burst_length=16)
+        memory = AXIMemory(bus, w_stall_every=2)
+        words  = sine_words(4*16)
+
+        def send(words):
+            for word in words:
+                yield dut.sink.valid.eq(1)
+                yield dut.sink.data.eq(word)
+                yield
+                while not (yield dut.sink.ready):
+                    yield
+            yield dut.sink.valid.eq(0)
+
+        def generator():
+            yield dut.base.eq(0x1000)
+            yield dut.length.eq(4*16*8)
+            yield dut.loop.eq(1)
+            yield dut.enable.eq(1)
+            yield
+            yield from send(words[:2*16])
+            # Disable while the W beats of the second burst are being sent.
+            while not (memory.aw_count == 2 and (memory.w_count % 16) != 0):
+                yield
+            yield dut.enable.eq(0)
+            yield from send(words[2*16:]) # Discarded.
+            for i in range(128):
+                yield
+            self.assertEqual((memory.aw_count, memory.w_count), (2, 2*16))
+            # Re-enable: restarts at base.
+            yield dut.enable.eq(1)
+            yield
+            yield from send(words[:16])
+            for i in range(128):
+                yield
+            self.assertEqual((yield dut.offset), 16)
+
+        run_simulation(dut, [generator()] + memory.generators())
+
+        # Every accepted AW got its full W burst.
+        self.assertEqual(memory.aw_count, 3)
+        self.assertEqual(memory.w_count, 3*16)
+        self.assertEqual(memory.bursts, [(0x1000, 16), (0x1000 + 16*8, 16), (0x1000, 16)])
+
+    def test_writer_disable_aw_pending(self):
+        bus     = axi.AXIInterface(data_width=64, address_width=32, id_width=6, version="axi3")
+        dut     = AXIDMAWriter(bus, burst_length=16)
+        a_stall = [True]
+        memory  = AXIMemory(bus, a_stall=a_stall)
+        words   = sine_words(2*16)
+
+        def generator():
+            yield dut.base.eq(0x1000)
+            yield dut.length.eq(4*16*8)
+            yield dut.enable.eq(1)
+            yield
+            for word in words[:16]:
+                yield dut.sink.valid.eq(1)
+                yield dut.sink.data.eq(word)
+                yield
+                while not (yield dut.sink.ready):
+                    yield
+            yield dut.sink.valid.eq(0)
+            # Disable (and change base) while AWVALID waits for AWREADY.
+            while not (yield bus.aw.valid):
+                yield
+            yield dut.enable.eq(0)
+            yield dut.base.eq(0x8000)
+            for i in range(16):
+                yield
+            a_stall[0] = False
+            for i in range(128):
+                yield
+            self.assertEqual((memory.aw_count, memory.w_count), (1, 16))
+            # Re-enable: new base.
+            yield dut.enable.eq(1)
+            yield
+            for word in words[16:]:
+                yield dut.sink.valid.eq(1)
+                yield dut.sink.data.eq(word)
+                yield
+                while not (yield dut.sink.ready):
+                    yield
+            yield dut.sink.valid.eq(0)
+            for i in range(128):
+                yield
+
+        run_simulation(dut, [generator()] + memory.generators())
+        self.assertEqual(memory.errors, [])
+        self.assertEqual(memory.bursts, [(0x1000, 16), (0x8000, 16)])
+        self.assertEqual([memory.mem[0x1000 + 8*i] for i in range(16)], words[:16])
+        self.assertEqual([memory.mem[0x8000 + 8*i] for i in range(16)], words[16:])
+
+    def test_reader_loop(self):
+        bus    = axi.AXIInterface(data_width=64, address_width=32, id_width=6, version="axi3")
+        dut    = AXIDMAReader(bus, burst_length=16)
+        words  = sine_words(2*16)
+        memory = AXIMemory(bus, mem={0x2000 + 8*i: word for i, word in enumerate(words)})
+        datas  = []
+
+        def generator():
+            yield dut.base.eq(0x2000)
+            yield dut.length.eq(len(words)*8)
+            yield dut.loop.eq(1)
+            yield dut.enable.eq(1)
+            yield dut.source.ready.eq(1)
+            while len(datas) < 3*len(words):
+                if (yield dut.source.valid):
+                    datas.append((yield dut.source.data))
+                yield
+
+        run_simulation(dut, [generator()] + memory.generators())
+        self.assertEqual(memory.errors, [])
+        self.assertEqual(datas, 3*words)
+
+    def test_reader_disable(self):
+        bus     = axi.AXIInterface(data_width=64, address_width=32, id_width=6, version="axi3")
+        dut     = AXIDMAReader(bus, burst_length=16)
+        words   = sine_words(4*16)
+        a_stall = [False]
+        memory  = AXIMemory(bus, mem={0x2000 + 8*i: word for i, word in enumerate(words)}, a_stall=a_stall)
+        datas   = []
+
+        def generator():
+            yield dut.base.eq(0x2000)
+            yield dut.length.eq(len(words)*8)
+            yield dut.enable.eq(1)
+            # Let bursts go in flight, then stall AR with ARVALID asserted.
+            while memory.ar_count < 2:
+                yield
+            a_stall[0] = True
+            while not (yield bus.ar.valid):
+                yield
+            # Disable with bursts in flight and ARVALID pending, re-enable before they are received.
+            yield dut.enable.eq(0)
+            yield
+            yield dut.enable.eq(1)
+            yield dut.base.eq(0x2000 + 2*16*8)
+            for i in range(8):
+                yield
+            a_stall[0] = False
+            yield dut.source.ready.eq(1)
+            while len(datas) < 2*16:
+                if (yield dut.source.valid):
+                    datas.append((yield dut.source.data))
+                yield
+
+        run_simulation(dut, [generator()] + memory.generators())
+        self.assertEqual(memory.errors, [])
+        # Only datas from bursts issued after the re-enable (from the new base).
+        self.assertEqual(datas, words[2*16:])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect import axi
+
+from litex_boards.cores.axi_monitor import AXIPortMonitor
+
+# Helpers ------------------------------------------------------------------------------------------
+
+class MonitorDUT(LiteXModule):
+    def __init__(self, clock_domain="sys"):
+        self.bus     = axi.AXIInterface(data_width=64, address_width=32, id_width=4)
+        self.monitor = AXIPortMonitor(self.bus, clock_domain=clock_domain, qos_width=1)
+        if clock_domain != "sys":
+            self.cd_cpu = ClockDomain()
+
+def traffic(bus, cycles=200):
+    """Drive AXI handshakes on bus, return the expected counters."""
+    expected = {"read_beats": 0, "write_beats": 0, "read_wait": 0, "write_wait": 0}
+    for i in range(cycles):
+        events = {
+            "r"  : (1,     i % 2 == 0),
+            "w"  : (i % 3 != 0, i % 5 != 0),
+            "ar" : (i < 40, i % 4 == 0),
+            "aw" : (i >= 100, i % 7 == 0),
+        }
+        for name, (valid, ready) in events.items():
+            yield getattr(bus, name).valid.eq(valid)
+            yield getattr(bus, name).ready.eq(ready)
+        expected["read_beats"]  += events["r"][0]  & events["r"][1]
+        expected["write_beats"] += events["w"][0]  & events["w"][1]
+        expected["read_wait"]   += events["ar"][0] & (not events["ar"][1])
+        expected["write_wait"]  += events["aw"][0] & (not events["aw"][1])
+        yield
+    for name in ["r", "w", "ar", "aw"]:
+        yield getattr(bus, name).valid.eq(0)
+    return expected
+
+def read_counters(monitor):
+    counters = {}
+    for name in ["read_beats", "write_beats", "read_wait", "write_wait", "cycles"]:
+        counters[name] = (yield getattr(monitor, f"_{name}").status)
+    return counters
+
+# Test AXI Monitor ---------------------------------------------------------------------------------
+
+class TestAXIMonitor(unittest.TestCase):
+    def test_counters(self):
+        status = {}
+        dut    = MonitorDUT()
+        def generator():
+            # Counters disabled: nothing counted.
+            yield from traffic(dut.bus, cycles=20)
+            status["disabled"] = (yield from read_counters(dut.monitor))
+            # Counters enabled.
+            yield dut.monitor._control.fields.enable.eq(1)
+            yield
+            expected = yield from traffic(dut.bus)
+            yield dut.monitor._control.fields.enable.eq(0)
+            yield
+            # Frozen while disabled.
+            yield from traffic(dut.bus, cycles=20)
+            status["expected"] = expected
+            status["counters"] = (yield from read_counters(dut.monitor))
+            # Clear.
+            yield dut.monitor._control.fields.clear.eq(1)
+            yield
+            yield dut.monitor._control.fields.clear.eq(0)
+            yield
+            status["cleared"] = (yield from read_counters(dut.monitor))
+        run_simulation(dut, generator())
+
+        self.assertEqual(set(status["disabled"].values()), {0})
+        self.assertEqual(status["counters"], {**status["expected"], "cycles": 201})
+        self.assertEqual(set(status["cleared"].values()), {0})
+
+    def test_counters_cdc(self):
+        status = {}
+        dut    = MonitorDUT(clock_domain="cpu")
+        def sys_generator():
+            yield dut.monitor._control.fields.enable.eq(1)
+            for i in range(10):
+                yield
+            status["start"] = True
+            while "expected" not in status:
+                yield
+            for i in range(10):
+                yield
+            yield dut.monitor._control.fields.enable.eq(0)
+            for i in range(10):
+                yield
+            status["counters"] = (yield from read_counters(dut.monitor))
+        def cpu_generator():
+            while "start" not in status:
+                yield
+            status["expected"] = yield from traffic(dut.bus)
+        run_simulation(dut, {"sys": sys_generator(), "cpu": cpu_generator()}, clocks={"sys": 10, "cpu": 7})
+
+        counters = status["counters"]
+        self.assertGreater(counters.pop("cycles"), 200)
+        self.assertEqual(counters, status["expected"])
+
+    def test_qos(self):
+        qos = {}
+        dut = MonitorDUT()
+        def generator():
+            yield dut.bus.ar.qos.eq(1)
+            yield dut.bus.aw.qos.eq(0)
+            yield
+            qos["master"] = ((yield dut.monitor.ar_qos), (yield dut.monitor.aw_qos))
+            yield dut.monitor._qos.fields.override.eq(1)
+            yield dut.monitor._qos.fields.ar_qos.eq(0)
+            yield dut.monitor._qos.fields.aw_qos.eq(1)
+            yield
+            qos["override"] = ((yield dut.monitor.ar_qos), (yield dut.monitor.aw_qos))
+        run_simulation(dut, generator())
+
+        self.assertEqual(qos, {"master": (1, 0), "override": (0, 1)})
+
+if __name__ == "__main__":
+    unittest.main()
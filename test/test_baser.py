@@ -0,0 +1,170 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import random
+import unittest
+
+from migen import *
+
+from litex.gen import *
+
+from liteeth.phy.xgmii import LiteEthPHYXGMIITX, LiteEthPHYXGMIIRX
+
+from liteiclink.serdes.gty_ultrascale import GTYQuadPLL
+
+from litex_boards.cores.baser import BASERPCSTX, BASERPCSRX, get_quad_pll_channels
+
+# Helpers ------------------------------------------------------------------------------------------
+
+PREAMBLE = [0x55]*7 + [0xd5]
+
+class LoopbackDUT(LiteXModule):
+    """(XGMII TX) -> PCS TX -> (serial link model) -> PCS RX -> (XGMII RX)."""
+    def __init__(self, with_xgmii=True):
+        self.pcs_tx = BASERPCSTX()
+        self.pcs_rx = BASERPCSRX()
+        if not with_xgmii:
+            return
+        xgmii = Record([("tx_data", 64), ("tx_ctl", 8), ("rx_data", 64), ("rx_ctl", 8)])
+        self.tx = LiteEthPHYXGMIITX(pads=xgmii, dw=64, dic=False)
+        self.rx = LiteEthPHYXGMIIRX(pads=xgmii, dw=64)
+        self.comb += [
+            self.pcs_tx.xgmii_d.eq(xgmii.tx_data),
+            self.pcs_tx.xgmii_c.eq(xgmii.tx_ctl),
+            xgmii.rx_data.eq(self.pcs_rx.xgmii_d),
+            xgmii.rx_ctl.eq(self.pcs_rx.xgmii_c),
+        ]
+
+@passive
+def link_model(dut, offset, stats):
+    """Serial link (66-bit blocks, LSB-first) with a bit offset and gearbox slips."""
+    bits = []
+    pos  = offset
+    while True:
+        header = (yield dut.pcs_tx.header)
+        data   = (yield dut.pcs_tx.data)
+        bits  += [(header >> i) & 1 for i in range(2)] + [(data >> i) & 1 for i in range(64)]
+        if len(bits) >= pos + 66:
+            block = bits[pos:pos + 66]
+            pos  += 66
+            yield dut.pcs_rx.header.eq(block[0] | (block[1] << 1))
+            yield dut.pcs_rx.data.eq(sum(b << i for i, b in enumerate(block[2:])))
+        if (yield dut.pcs_rx.slip):
+            stats["slips"] += 1
+            pos += 1
+        yield
+
+def send_frames(dut, frames):
+    while not (yield dut.pcs_rx.lock):
+        yield
+    for frame in frames:
+        words = [frame[i:i + 8] for i in range(0, len(frame), 8)]
+        for n, word in enumerate(words):
+            yield dut.tx.sink.valid.eq(1)
+            yield dut.tx.sink.data.eq(sum(b << 8*i for i, b in enumerate(word)))
+            yield dut.tx.sink.last.eq(n == len(words) - 1)
+            yield dut.tx.sink.last_be.eq(1 << (len(word) - 1))
+            yield
+            while not (yield dut.tx.sink.ready):
+                yield
+        yield dut.tx.sink.valid.eq(0)
+    for i in range(64):
+        yield
+
+@passive
+def receive_frames(dut, received):
+    frame = []
+    while True:
+        if (yield dut.rx.source.valid):
+            data    = (yield dut.rx.source.data)
+            nbytes  = 8
+            if (yield dut.rx.source.last):
+                nbytes = (yield dut.rx.source.last_be).bit_length()
+            frame += [(data >> 8*i) & 0xff for i in range(nbytes)]
+            if (yield dut.rx.source.last):
+                received.append(frame)
+                frame = []
+        yield
+
+def xgmii_words(n):
+    """Random XGMII words sequence: idles, frames starting on lane 0/4 and ending on any lane."""
+    words = []
+    while len(words) < n:
+        words += [(0xff, 0x0707070707070707)]*random.randrange(1, 3)
+        lanes = [(1, 0x07)]*random.choice([0, 4]) + [(1, 0xfb)] + [(0, random.randrange(256)) for _ in range(random.randrange(8, 64))]
+        lanes += [(1, 0xfd)] + [(1, 0x07)]*(-(len(lanes) + 1) % 8)
+        for i in range(0, len(lanes), 8):
+            words.append((sum(c << j for j, (c, d) in enumerate(lanes[i:i + 8])), sum(d << 8*j for j, (c, d) in enumerate(lanes[i:i + 8]))))
+    return words
+
+# Test 10GBASE-R PCS -------------------------------------------------------------------------------
+
+class TestBASER(unittest.TestCase):
+    def check_loopback(self, offset):
+        random.seed(offset)
+        dut      = LoopbackDUT()
+        frames   = [PREAMBLE + [random.randrange(256) for _ in range(random.randrange(60, 200))] for _ in range(8)]
+        received = []
+        stats    = {"slips": 0}
+        run_simulation(dut, [
+            link_model(dut, offset, stats),
+            send_frames(dut, frames),
+            receive_frames(dut, received),
+        ])
+        # Block lock found the block boundary.
+        self.assertEqual(stats["slips"] % 66, (66 - offset) % 66)
+        # Frames (without start character) are received unchanged.
+        self.assertEqual(len(received), len(frames))
+        for frame, rx_frame in zip(frames, received):
+            self.assertEqual(rx_frame[1:], frame[1:])
+
+    def test_blocks(self):
+        random.seed(0)
+        dut   = LoopbackDUT(with_xgmii=False)
+        words = xgmii_words(512)
+        rx    = []
+        stats = {"slips": 0}
+        def generator():
+            while not (yield dut.pcs_rx.lock):
+                yield
+            for c, d in words + [(0xff, 0x0707070707070707)]*8:
+                yield dut.pcs_tx.xgmii_c.eq(c)
+                yield dut.pcs_tx.xgmii_d.eq(d)
+                yield
+                rx.append(((yield dut.pcs_rx.xgmii_c), (yield dut.pcs_rx.xgmii_d)))
+        run_simulation(dut, [link_model(dut, 11, stats), generator()])
+        # XGMII words are received unchanged (after PCS latency).
+        first = next(i for i, (c, d) in enumerate(words) if c != 0xff)
+        start = rx.index(words[first]) - first
+        self.assertEqual(rx[start:start + len(words)], words)
+
+    def test_aligned(self):
+        self.check_loopback(offset=0)
+
+    def test_misaligned(self):
+        self.check_loopback(offset=23)
+
+    def test_quad_pll_channels(self):
+        pll = GTYQuadPLL(Signal(), 156.25e6, 10.3125e9)
+        channels, pll_reset = get_quad_pll_channels(pll, 4)
+        for channel in channels:
+            self.assertIsInstance(channel, GTYQuadPLL)
+            self.assertEqual(channel.config, pll.config)
+            self.assertIs(channel.lock, pll.lock)
+        # PLL reset requested by any of the transceivers.
+        resets = {}
+        def generator():
+            for i in range(len(channels) + 1):
+                for n, channel in enumerate(channels):
+                    yield channel.reset.eq(n == i)
+                yield
+                resets[i] = (yield pll.reset)
+        dut = LiteXModule()
+        dut.comb += pll_reset
+        run_simulation(dut, generator())
+        self.assertEqual(resets, {0: 1, 1: 1, 2: 1, 3: 1, 4: 0})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from litex_boards.tools.board_sim import get_board_config, BoardSimSoC
+
+# Test Board Simulation ----------------------------------------------------------------------------
+
+class TestBoardSim(unittest.TestCase):
+    def check_replay(self, soc, **kwargs):
+        config  = get_board_config(soc, **kwargs)
+        sim_soc = BoardSimSoC(config)
+        # Memory map and clock of the board are kept.
+        self.assertEqual(sim_soc.sys_clk_freq, config.sys_clk_freq)
+        for name, region in sim_soc.bus.regions.items():
+            self.assertEqual(region.origin, config.mem_map[name])
+        return config, sim_soc
+
+    def test_sdram_ethernet(self):
+        from litex_boards.targets.digilent_arty import BaseSoC
+        soc = BaseSoC(cpu_type=None, with_ethernet=True, remote_ip="192.168.1.100")
+        config, sim_soc = self.check_replay(soc)
+        self.assertEqual(len(config.sdram), 1)
+        self.assertEqual(config.ethernet[0][0], "add_ethernet")
+        self.assertEqual(config.ethernet[0][1]["local_ip"],  "192.168.1.50")
+        self.assertEqual(config.ethernet[0][1]["remote_ip"], "192.168.1.100")
+        self.assertEqual(sim_soc.sdram.controller.settings.geom.rowbits, soc.sdram.controller.settings.geom.rowbits)
+        self.assertEqual(sim_soc.sdram.controller.settings.timing.tRFC, soc.sdram.controller.settings.timing.tRFC)
+        self.assertEqual(sim_soc.bus.regions["main_ram"].size, 256*1024*1024)
+        self.assertEqual(sim_soc.constants["CONFIG_L2_SIZE"], 8192)
+        self.assertTrue(hasattr(sim_soc, "ethmac"))
+
+    def test_etherbone(self):
+        from litex_boards.targets.digilent_arty import BaseSoC
+        soc = BaseSoC(cpu_type=None, with_etherbone=True, eth_ip="192.168.1.60")
+        config, sim_soc = self.check_replay(soc, eth_ip="192.168.1.60")
+        self.assertEqual(config.ethernet, [("add_etherbone", {"with_ethmac": False, "ip_address": "192.168.1.60"})])
+        self.assertTrue(hasattr(sim_soc, "etherbone"))
+
+    def test_l2_stats(self):
+        from litex_boards.targets.digilent_arty import BaseSoC
+        soc = BaseSoC(cpu_type=None, with_l2_stats=True, l2_stats_trace_depth=256)
+        config, sim_soc = self.check_replay(soc)
+        self.assertEqual(config.l2_stats_trace_depth, 256)
+        self.assertEqual(sim_soc.l2_stats.trace_depth, 256)
+        for name in ["L2_STATS_TRACE_DEPTH", "L2_STATS_DATA_WIDTH", "L2_STATS_PORT_DATA_WIDTH"]:
+            self.assertEqual(sim_soc.constants[name], soc.constants[name])
+
+    def test_spi_flash(self):
+        from litex_boards.targets.icebreaker import BaseSoC
+        soc = BaseSoC(bios_flash_offset=0x40000, cpu_type=None)
+        config, sim_soc = self.check_replay(soc)
+        self.assertEqual(config.spiflash[0]["module"].name, "w25q128jv")
+        self.assertEqual(config.spiflash[0]["mode"], "4x")
+        self.assertFalse(config.spiflash[0]["with_master"])
+        self.assertIn("spiflash", sim_soc.bus.slaves)
+        self.assertIn("rom", sim_soc.bus.regions)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+import threading
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect import wishbone
+
+from litex_boards.cores.bone_block import Stream2WishboneBlock
+from litex_boards.tools.bone_block import *
+
+# Helpers ------------------------------------------------------------------------------------------
+
+class BridgeDUT(LiteXModule):
+    def __init__(self, init, clk_freq=1e6, **kwargs):
+        self.bridge = Stream2WishboneBlock(clk_freq=clk_freq, **kwargs)
+        self.sram   = wishbone.SRAM(4*1024, init=init)
+        self.comb += self.bridge.wishbone.connect(self.sram.bus)
+
+def run_bridge(commands, init=[], response_length=0, ready_period=1, max_cycles=20000, **kwargs):
+    """Send commands (bytes) to the bridge, return the response bytes and SRAM content."""
+    dut      = BridgeDUT(init, **kwargs)
+    response = []
+    content  = []
+    def send():
+        for byte in commands:
+            yield dut.bridge.sink.valid.eq(1)
+            yield dut.bridge.sink.data.eq(byte)
+            yield
+            while not (yield dut.bridge.sink.ready):
+                yield
+        yield dut.bridge.sink.valid.eq(0)
+    def receive():
+        cycle = 0
+        while (len(response) < response_length) and (cycle < max_cycles):
+            ready = (cycle % ready_period) == 0
+            yield dut.bridge.source.ready.eq(ready)
+            yield
+            if ready and (yield dut.bridge.source.valid):
+                response.append((yield dut.bridge.source.data))
+            cycle += 1
+        for i in range(64):
+            yield
+        for i in range(512):
+            content.append((yield dut.sram.mem[i]))
+    run_simulation(dut, [send(), receive()])
+    return bytes(response), content
+
+def words_to_bytes(words):
+    return b"".join(w.to_bytes(4, "big") for w in words)
+
+class SimPort:
+    """Serial port connected to a simulated bridge (see run_host)."""
+    def __init__(self):
+        self.rx        = bytearray() # Host -> Bridge.
+        self.tx        = bytearray() # Bridge -> Host.
+        self.condition = threading.Condition()
+
+    def write(self, data):
+        data = bytes(data) # As pyserial (ValueError on values > 255).
+        with self.condition:
+            self.rx += data
+        return len(data)
+
+    def read(self, length):
+        with self.condition:
+            assert self.condition.wait_for(lambda: len(self.tx) >= length, timeout=60)
+            data = bytes(self.tx[:length])
+            del self.tx[:length]
+        return data
+
+    def inWaiting(self):
+        return len(self.tx)
+
+    def close(self):
+        pass
+
+def run_host(init, fn, **kwargs):
+    """Run fn(comm) with a CommUARTBlock connected to a simulated bridge, return its result."""
+    dut  = BridgeDUT(init)
+    port = SimPort()
+    comm = CommUARTBlock("loop://", **kwargs)
+    comm.port.close()
+    comm.port = port
+    result = {}
+    def host():
+        try:
+            result["value"] = fn(comm)
+        except Exception as e:
+            result["error"] = e
+    thread = threading.Thread(target=host)
+    def generator():
+        thread.start()
+        yield dut.bridge.source.ready.eq(1)
+        while thread.is_alive():
+            with port.condition:
+                byte = port.rx[0] if len(port.rx) else None
+            yield dut.bridge.sink.valid.eq(byte is not None)
+            yield dut.bridge.sink.data.eq(byte or 0)
+            yield
+            with port.condition:
+                if (byte is not None) and (yield dut.bridge.sink.ready):
+                    del port.rx[0]
+                if (yield dut.bridge.source.valid):
+                    port.tx.append((yield dut.bridge.source.data))
+                    port.condition.notify_all()
+    run_simulation(dut, generator())
+    thread.join()
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+# Test Bone Block ----------------------------------------------------------------------------------
+
+class TestBoneBlock(unittest.TestCase):
+    def test_uartbone_commands(self):
+        # Legacy UARTBone read/write commands are kept.
+        init     = [0x1000 + i for i in range(16)]
+        commands = bytes([CMD_WRITE_BURST_INCR, 2]) + (8).to_bytes(4, "big") + words_to_bytes([0xcafe, 0xbeef])
+        commands += bytes([CMD_READ_BURST_INCR, 4]) + (6).to_bytes(4, "big")
+        commands += bytes([CMD_READ_BURST_FIXED, 2]) + (1).to_bytes(4, "big")
+        response, content = run_bridge(commands, init, response_length=4*6)
+        self.assertEqual(content[8:10], [0xcafe, 0xbeef])
+        self.assertEqual(response, words_to_bytes([0x1006, 0x1007, 0xcafe, 0xbeef, 0x1001, 0x1001]))
+
+    def test_block_write_read(self):
+        # Pipelined block commands (queued while the response is sent, slow host).
+        data     = [(i*0x01010101) & 0xffffffff for i in range(300)]
+        commands = pack_command(CMD_WRITE_BURST_INCR, 300, 0) + words_to_bytes(data)
+        commands += pack_command(CMD_READ_BURST_INCR, 300, 0)
+        commands += pack_command(CMD_READ_BURST_INCR, 20,  4*100)
+        response, content = run_bridge(commands, response_length=4*320, ready_period=3)
+        self.assertEqual(content[:300], data)
+        self.assertEqual(response, words_to_bytes(data + data[100:120]))
+
+    def test_block_read_rle(self):
+        init     = [0]*100 + [1, 2, 2] + [3]*300
+        commands = pack_command(CMD_READ_BURST_INCR | CMD_RLE, 403, 0)
+        commands += pack_command(CMD_READ_BURST_INCR | CMD_RLE, 2, 4*101)
+        tokens   = [(100, 0), (1, 1), (2, 2), (256, 3), (44, 3), (2, 2)]
+        response, content = run_bridge(commands, init, response_length=5*len(tokens))
+        self.assertEqual(response, b"".join(bytes([n - 1]) + w.to_bytes(4, "big") for n, w in tokens))
+        # Host decoding.
+        buffer = bytearray(response)
+        def read(n):
+            r = bytes(buffer[:n])
+            del buffer[:n]
+            return r
+        self.assertEqual(decode_rle(read, 403), init)
+        self.assertEqual(decode_rle(read, 2), [2, 2])
+
+    def test_timeout(self):
+        # Host stalled (command parser waiting on the full response FIFO): after the timeout, the
+        # parser, response FIFO and encoder are reset and the next command is served alone.
+        init = [0x1000 + i for i in range(16)]
+        dut  = BridgeDUT(init, clk_freq=1e3, tx_fifo_depth=2) # 100 cycles timeout.
+        response = []
+        def generator():
+            for byte in bytes([CMD_READ_BURST_INCR, 8]) + (0).to_bytes(4, "big"):
+                yield dut.bridge.sink.valid.eq(1)
+                yield dut.bridge.sink.data.eq(byte)
+                yield
+            yield dut.bridge.sink.valid.eq(0)
+            for i in range(300):
+                yield
+            for byte in bytes([CMD_READ_BURST_INCR, 1]) + (4).to_bytes(4, "big"):
+                yield dut.bridge.sink.valid.eq(1)
+                yield dut.bridge.sink.data.eq(byte)
+                yield
+            yield dut.bridge.sink.valid.eq(0)
+            yield dut.bridge.source.ready.eq(1)
+            for i in range(256):
+                yield
+                if (yield dut.bridge.source.valid):
+                    response.append((yield dut.bridge.source.data))
+        run_simulation(dut, generator())
+        self.assertEqual(bytes(response), words_to_bytes([0x1004]))
+
+    def test_slow_host_no_timeout(self):
+        # Response bytes sent to a slow host are activity: no timeout while the response is read.
+        init = [0x1000 + i for i in range(16)]
+        commands = bytes([CMD_READ_BURST_INCR, 8]) + (0).to_bytes(4, "big")
+        response, _ = run_bridge(commands, init, response_length=4*8, ready_period=40,
+            clk_freq=1e3, tx_fifo_depth=2)
+        self.assertEqual(response, words_to_bytes(init[:8]))
+
+    def test_host_client(self):
+        init = [0]*100 + [0x1000 + i for i in range(200)] + [5]*100
+        def fn(comm):
+            # Block commands split (max_length) and in flight.
+            self.assertEqual(comm.read(4*10, 150), init[10:160])
+            self.assertEqual(comm.read(4*100), 0x1000)
+            # Benchmark (>= 1KB: UARTBone commands of more than 255 words, raw/RLE block reads).
+            bench(comm, 0, 1024)
+        run_host(init, fn, max_length=64, outstanding=2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,344 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import json
+import tempfile
+import unittest
+
+from litex_boards.tools.build_db import parse_build, normalize_options, get_soc_config, BuildDB
+
+# Reports ------------------------------------------------------------------------------------------
+
+vivado_utilization = """\
+Copyright 1986-2022 Xilinx, Inc. All Rights Reserved.
+---------------------------------------------------------------------------------------------------------------------------------------------
+| Tool Version : Vivado v.2022.2 (lin64) Build 3671981 Fri Oct 14 04:59:54 MDT 2022
+| Date         : Mon Jan  9 10:12:31 2023
+| Host         : build running 64-bit Ubuntu 22.04.1 LTS
+| Command      : report_utilization -file digilent_arty_utilization_place.rpt
+| Design       : digilent_arty
+| Device       : 7a35ticsg324-1L
+| Speed File   : -1L
+| Design State : Fully Placed
+---------------------------------------------------------------------------------------------------------------------------------------------
+
+Utilization Design Information
+
+Table of Contents
+-----------------
+1. Slice Logic
+1.1 Summary of Registers by Type
+2. Slice Logic Distribution
+3. Memory
+4. DSP
+5. IO and GT Specific
+6. Clocking
+7. Specific Feature
+8. Primitives
+9. Black Boxes
+10. Instantiated Netlists
+
+1. Slice Logic
+--------------
+
++----------------------------+------+-------+------------+-----------+-------+
+|          Site Type         | Used | Fixed | Prohibited | Available | Util% |
++----------------------------+------+-------+------------+-----------+-------+
+| Slice LUTs                 | 1939 |     0 |          0 |     20800 |  9.32 |
+|   LUT as Logic             | 1795 |     0 |          0 |     20800 |  8.63 |
+|   LUT as Memory            |  144 |     0 |          0 |      9600 |  1.50 |
+|     LUT as Distributed RAM |  144 |     0 |            |           |       |
+|     LUT as Shift Register  |    0 |     0 |            |           |       |
+| Slice Registers            | 2100 |     0 |          0 |     41600 |  5.05 |
+|   Register as Flip Flop    | 2100 |     0 |          0 |     41600 |  5.05 |
+|   Register as Latch        |    0 |     0 |          0 |     41600 |  0.00 |
+| F7 Muxes                   |   54 |     0 |          0 |     16300 |  0.33 |
+| F8 Muxes                   |    0 |     0 |          0 |      8150 |  0.00 |
++----------------------------+------+-------+------------+-----------+-------+
+
+
+1.1 Summary of Registers by Type
+--------------------------------
+
++-------+--------------+-------------+--------------+
+| Total | Clock Enable | Synchronous | Asynchronous |
++-------+--------------+-------------+--------------+
+| 0     |            _ |           - |            - |
+| 0     |            _ |           - |          Set |
+| 0     |            _ |           - |        Reset |
+| 0     |            _ |         Set |            - |
+| 0     |            _ |       Reset |            - |
+| 0     |          Yes |           - |            - |
+| 10    |          Yes |           - |          Set |
+| 40    |          Yes |           - |        Reset |
+| 150   |          Yes |         Set |            - |
+| 1900  |          Yes |       Reset |            - |
++-------+--------------+-------------+--------------+
+
+
+2. Slice Logic Distribution
+---------------------------
+
++--------------------------------------------+------+-------+------------+-----------+-------+
+|                  Site Type                 | Used | Fixed | Prohibited | Available | Util% |
++--------------------------------------------+------+-------+------------+-----------+-------+
+| Slice                                      |  812 |     0 |          0 |      8150 |  9.96 |
+|   SLICEL                                   |  560 |     0 |            |           |       |
+|   SLICEM                                   |  252 |     0 |            |           |       |
+| LUT as Logic                               | 1795 |     0 |          0 |     20800 |  8.63 |
+|   using O5 output only                     |    0 |       |            |           |       |
+|   using O6 output only                     | 1400 |       |            |           |       |
+|   using O5 and O6                          |  395 |       |            |           |       |
+| LUT as Memory                              |  144 |     0 |          0 |      9600 |  1.50 |
+|   LUT as Distributed RAM                   |  144 |     0 |            |           |       |
+|     using O5 output only                   |    0 |       |            |           |       |
+|     using O6 output only                   |    0 |       |            |           |       |
+|     using O5 and O6                        |  144 |       |            |           |       |
+|   LUT as Shift Register                    |    0 |     0 |            |           |       |
+| Slice Registers                            | 2100 |     0 |          0 |     41600 |  5.05 |
+|   Register driven from within the Slice    | 1100 |       |            |           |       |
+|   Register driven from outside the Slice   | 1000 |       |            |           |       |
+|     LUT in front of the register is unused |  600 |       |            |           |       |
+|     LUT in front of the register is used   |  400 |       |            |           |       |
+| Unique Control Sets                        |  120 |       |          0 |      8150 |  1.47 |
++--------------------------------------------+------+-------+------------+-----------+-------+
+* * Note: Available Control Sets calculated as Slice * 1, Review the Control Sets Report for more information regarding control sets.
+
+
+3. Memory
+---------
+
++-------------------+------+-------+------------+-----------+-------+
+|     Site Type     | Used | Fixed | Prohibited | Available | Util% |
++-------------------+------+-------+------------+-----------+-------+
+| Block RAM Tile    |    8 |     0 |          0 |        50 | 16.00 |
+|   RAMB36/FIFO*    |    7 |     0 |          0 |        50 | 14.00 |
+|     RAMB36E1 only |    7 |       |            |           |       |
+|   RAMB18          |    2 |     0 |          0 |       100 |  2.00 |
+|     RAMB18E1 only |    2 |       |            |           |       |
++-------------------+------+-------+------------+-----------+-------+
+* Note: Each Block RAM Tile only has one FIFO. The FIFO will share a Block RAM Tile with a RAMB18.
+
+
+4. DSP
+------
+
++----------------+------+-------+------------+-----------+-------+
+|    Site Type   | Used | Fixed | Prohibited | Available | Util% |
++----------------+------+-------+------------+-----------+-------+
+| DSPs           |    4 |     0 |          0 |        90 |  4.44 |
+|   DSP48E1 only |    4 |       |            |           |       |
++----------------+------+-------+------------+-----------+-------+
+
+
+5. IO and GT Specific
+---------------------
+
++-----------------------------+------+-------+------------+-----------+-------+
+|          Site Type          | Used | Fixed | Prohibited | Available | Util% |
++-----------------------------+------+-------+------------+-----------+-------+
+| Bonded IOB                  |   42 |    42 |          0 |       210 | 20.00 |
+|   IOB Master Pads           |   20 |       |            |           |       |
+|   IOB Slave Pads            |   20 |       |            |           |       |
+| Bonded IPADs                |    0 |     0 |          0 |         2 |  0.00 |
+| PHY_CONTROL                 |    1 |     0 |          0 |         5 | 20.00 |
+| PHASER_REF                  |    1 |     0 |          0 |         5 | 20.00 |
+| OUT_FIFO                    |    4 |     0 |          0 |        20 | 20.00 |
+|   OUT_FIFO_BYTE_SELECTED    |    4 |     0 |            |           |       |
+| IN_FIFO                     |    2 |     0 |          0 |        20 | 10.00 |
+| IDELAYCTRL                  |    1 |     0 |          0 |         5 | 20.00 |
+| IBUFDS                      |    0 |     0 |          0 |       202 |  0.00 |
+| PHASER_OUT/PHASER_OUT_PHY   |    4 |     0 |          0 |        20 | 20.00 |
+| PHASER_IN/PHASER_IN_PHY     |    2 |     0 |          0 |        20 | 10.00 |
+| IDELAYE2/IDELAYE2_FINEDELAY |   16 |     0 |          0 |       250 |  6.40 |
+|   IDELAYE2 only             |   16 |     0 |            |           |       |
+| ILOGIC                      |   16 |    16 |          0 |       210 |  7.62 |
+|   ISERDES                   |   16 |    16 |          0 |       210 |       |
+| OLOGIC                      |   44 |    44 |          0 |       210 | 20.95 |
+|   OUTFF_ODDR_Register       |    3 |     3 |            |           |       |
+|   OSERDES                   |   41 |    41 |          0 |       210 |       |
++-----------------------------+------+-------+------------+-----------+-------+
+
+
+6. Clocking
+-----------
+
++------------+------+-------+------------+-----------+-------+
+|  Site Type | Used | Fixed | Prohibited | Available | Util% |
++------------+------+-------+------------+-----------+-------+
+| BUFGCTRL   |    7 |     0 |          0 |        32 | 21.88 |
+| BUFIO      |    0 |     0 |          0 |        20 |  0.00 |
+| MMCME2_ADV |    0 |     0 |          0 |         5 |  0.00 |
+| PLLE2_ADV  |    1 |     0 |          0 |         5 | 20.00 |
+| BUFMRCE    |    0 |     0 |          0 |        10 |  0.00 |
+| BUFHCE     |    1 |     0 |          0 |        72 |  1.39 |
+| BUFR       |    0 |     0 |          0 |        20 |  0.00 |
++------------+------+-------+------------+-----------+-------+
+
+
+7. Specific Feature
+-------------------
+
++-------------+------+-------+------------+-----------+-------+
+|  Site Type  | Used | Fixed | Prohibited | Available | Util% |
++-------------+------+-------+------------+-----------+-------+
+| BSCANE2     |    0 |     0 |          0 |         4 |  0.00 |
+| CAPTUREE2   |    0 |     0 |          0 |         1 |  0.00 |
+| DNA_PORT    |    0 |     0 |          0 |         1 |  0.00 |
+| EFUSE_USR   |    0 |     0 |          0 |         1 |  0.00 |
+| FRAME_ECCE2 |    0 |     0 |          0 |         1 |  0.00 |
+| ICAPE2      |    0 |     0 |          0 |         2 |  0.00 |
+| PCIE_2_1    |    0 |     0 |          0 |         1 |  0.00 |
+| STARTUPE2   |    0 |     0 |          0 |         1 |  0.00 |
+| XADC        |    0 |     0 |          0 |         1 |  0.00 |
++-------------+------+-------+------------+-----------+-------+
+
+
+8. Primitives
+-------------
+
++--------------------------+------+---------------------+
+|         Ref Name         | Used | Functional Category |
++--------------------------+------+---------------------+
+| FDRE                     | 1900 |        Flop & Latch |
+| LUT6                     |  800 |                 LUT |
+| LUT4                     |  400 |                 LUT |
+| OSERDESE2                |   41 |                  IO |
+| RAMD32                   |  216 |  Distributed Memory |
+| CARRY4                   |  120 |          CarryLogic |
+| ISERDESE2                |   16 |                  IO |
+| RAMB36E1                 |    7 |        Block Memory |
+| DSP48E1                  |    4 |    Block Arithmetic |
+| PLLE2_ADV                |    1 |               Clock |
++--------------------------+------+---------------------+
+
+
+9. Black Boxes
+--------------
+
++----------+------+
+| Ref Name | Used |
++----------+------+
+
+
+10. Instantiated Netlists
+-------------------------
+
++----------+------+
+| Ref Name | Used |
++----------+------+
+
+
+"""
+
+vivado_timing = """\
+------------------------------------------------------------------------------------------------
+| Design Timing Summary
+| ---------------------
+------------------------------------------------------------------------------------------------
+
+    WNS(ns)      TNS(ns)  TNS Failing Endpoints  TNS Total Endpoints      WHS(ns)      THS(ns)
+    -------      -------  ---------------------  -------------------      -------      -------
+      1.250        0.000                      0                 5000        0.050        0.000
+
+
+------------------------------------------------------------------------------------------------
+| Clock Summary
+| -------------
+------------------------------------------------------------------------------------------------
+
+Clock        Waveform(ns)       Period(ns)      Frequency(MHz)
+-----        ------------       ----------      --------------
+crg_clkin    {0.000 5.000}      10.000          100.000
+  sys_clk    {0.000 5.000}      10.000          100.000
+
+
+------------------------------------------------------------------------------------------------
+| Intra Clock Table
+| -----------------
+------------------------------------------------------------------------------------------------
+
+Clock             WNS(ns)      TNS(ns)  TNS Failing Endpoints  TNS Total Endpoints
+-----             -------      -------  ---------------------  -------------------
+sys_clk             1.250        0.000                      0                 5000
+
+"""
+
+nextpnr_log = """\
+Info: Device utilisation:
+Info: 	          TRELLIS_IO:    10/  365     2%
+Info: 	        TRELLIS_COMB:  1000/24288     4%
+Info: 	          TRELLIS_FF:   600/24288     2%
+Info: Max frequency for clock '$glbnet$crg_clkout': 40.00 MHz (PASS at 25.00 MHz)
+Info: Device utilisation:
+Info: 	          TRELLIS_IO:    10/  365     2%
+Info: 	        TRELLIS_COMB:  1200/24288     4%
+Info: 	          TRELLIS_FF:   600/24288     2%
+Info: 	               DP16KD:    12/   56    21%
+Info: Max frequency for clock '$glbnet$crg_clkout': 50.00 MHz (PASS at 25.00 MHz)
+"""
+
+# Test Build DB ------------------------------------------------------------------------------------
+
+class TestBuildDB(unittest.TestCase):
+    def write(self, path, content):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+
+    def test_vivado(self):
+        with tempfile.TemporaryDirectory() as d:
+            self.write(os.path.join(d, "gateware", "top_utilization_place.rpt"), vivado_utilization)
+            self.write(os.path.join(d, "gateware", "top_timing.rpt"),            vivado_timing)
+            report = parse_build(os.path.join(d, "gateware"))
+            self.assertEqual(report.toolchain, "vivado")
+            self.assertEqual(report.device, "7a35ticsg324-1L")
+            self.assertEqual(report.resources["Slice LUTs"], (1939, 20800))
+            self.assertEqual(report.resources["Block RAM Tile"], (8, 50))
+            self.assertEqual(report.resources["Bonded IOB"], (42, 210))
+            # Sub-rows, Slice Logic Distribution rows and ILOGIC/OLOGIC are not collected.
+            self.assertEqual(set(report.resources), {"Slice LUTs", "Slice Registers", "Block RAM Tile",
+                "DSPs", "Bonded IOB", "MMCME2_ADV", "PLLE2_ADV"})
+            db = BuildDB(os.path.join(d, "builds.sqlite"))
+            metrics = db.get_metrics(db.add("arty", "abc", "", {}, report, d))
+            self.assertEqual((metrics["LUT"], metrics["FF"], metrics["BRAM"], metrics["DSP"]), (1939, 2100, 8, 4))
+            self.assertEqual(report.wns, 1.25)
+            fmax, constraint, slack = report.clocks["sys_clk"]
+            self.assertAlmostEqual(fmax, 1e9/8.75)
+
+    def test_nextpnr(self):
+        with tempfile.TemporaryDirectory() as d:
+            self.write(os.path.join(d, "build.log"), nextpnr_log)
+            os.makedirs(os.path.join(d, "gateware"))
+            report = parse_build(os.path.join(d, "gateware"))
+            self.assertEqual(report.toolchain, "nextpnr")
+            self.assertEqual(report.resources["TRELLIS_COMB"], (1200, 24288))
+            self.assertEqual(report.resources["DP16KD"], (12, 56))
+            self.assertEqual(report.clocks["$glbnet$crg_clkout"][0], 50e6)
+
+    def test_db(self):
+        with tempfile.TemporaryDirectory() as d:
+            self.write(os.path.join(d, "build.log"), nextpnr_log)
+            self.write(os.path.join(d, "csr.json"), json.dumps({"constants": {
+                "config_cpu_type_vexriscv": None, "config_l2_size": 8192}}))
+            os.makedirs(os.path.join(d, "gateware"))
+            report  = parse_build(os.path.join(d, "gateware"))
+            options = normalize_options("--build --with-ethernet --cpu-type=vexriscv --output-dir=x")
+            self.assertEqual(options, "--cpu-type=vexriscv --with-ethernet")
+            config  = get_soc_config(d)
+            self.assertEqual(config, {"cpu_type": "vexriscv", "l2_size": 8192})
+            db = BuildDB(os.path.join(d, "builds.sqlite"))
+            db.add("board", "abc", options, config, report, d)
+            build_id = db.add("board", "abc", options, config, report, d) # Replaces.
+            self.assertEqual(len(db.query()), 1)
+            metrics = db.get_metrics(build_id)
+            self.assertEqual(metrics["LUT"],  1200)
+            self.assertEqual(metrics["FF"],   600)
+            self.assertEqual(metrics["BRAM"], 12)
+            self.assertEqual(metrics["fmax"], 50e6)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import random
+import unittest
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect import wishbone
+
+from litex_boards.cores.can_dma import *
+
+# Helpers ------------------------------------------------------------------------------------------
+
+class CANDMADUT(LiteXModule):
+    def __init__(self):
+        self.dma  = CANRXDMA(sys_clk_freq=100e6, nfilters=2)
+        self.sram = wishbone.SRAM(4096, bus=self.dma.bus)
+
+def random_frames(n, seed=0):
+    """CAN FD frames as read from the CTU CAN FD RX buffer (FRAME_FORMAT_W, IDENTIFIER_W, timestamp, data)."""
+    random.seed(seed)
+    lengths = {0: 0, 4: 4, 8: 8, 12: 9, 16: 10, 20: 11, 24: 12, 32: 13, 48: 14, 64: 15}
+    frames  = []
+    for i in range(n):
+        ide    = random.random() < 0.5
+        can_id = random.choice([0x123, 0x1ab, 0x7ff]) if not ide else random.choice([0x1234567, 0x0abcdef])
+        length = random.choice(list(lengths.keys()))
+        nwords = (length + 3)//4
+        fmt    = lengths[length] | (ide << 6) | (1 << 7) | ((3 + nwords) << 11)
+        ident  = can_id if ide else (can_id << 18)
+        frames.append([fmt, ident, i, 0] + [random.getrandbits(32) for _ in range(nwords)])
+    return frames
+
+def frame_accepted(frame):
+    fmt, ident = frame[:2]
+    if fmt & (1 << 6):
+        return ident == 0x1234567     # Filter 1: extended id 0x1234567.
+    return (ident >> 18) & 0x700 == 0x100 # Filter 0: base ids 0x100-0x1ff.
+
+class CTUCANFDModel:
+    """CTU CAN FD memory interface/RX buffer model (frames received every period cycles)."""
+    def __init__(self, bus, frames, period, rx_buffer_size=64):
+        self.bus            = bus
+        self.frames         = list(frames)
+        self.period         = period
+        self.rx_buffer_size = rx_buffer_size
+        self.rx_buffer      = []
+        self.dor            = 0
+        self.dropped        = 0
+
+    @passive
+    def generator(self):
+        cycle = 0
+        ack   = 0
+        while True:
+            # Frame reception.
+            if self.frames and (cycle % self.period) == 0:
+                frame = self.frames.pop(0)
+                if (self.rx_buffer_size - sum(len(f) for f in self.rx_buffer)) >= len(frame):
+                    self.rx_buffer.append(list(frame))
+                else:
+                    self.dor      = 1
+                    self.dropped += 1
+            # Memory interface (2-cycle accesses).
+            if (yield self.bus.cyc) & (yield self.bus.stb) and not ack:
+                adr = (yield self.bus.adr) << 2
+                dat = 0
+                if (yield self.bus.we):
+                    if adr == CTUCANFD_COMMAND and ((yield self.bus.dat_w) & COMMAND_CDO):
+                        self.dor = 0
+                elif adr == CTUCANFD_STATUS:
+                    dat = STATUS_DOR if self.dor else 0
+                elif adr == CTUCANFD_RX_STATUS:
+                    dat = (len(self.rx_buffer) << 4) | (len(self.rx_buffer) == 0)
+                elif adr == CTUCANFD_RX_DATA:
+                    dat = self.rx_buffer[0].pop(0)
+                    if not self.rx_buffer[0]:
+                        self.rx_buffer.pop(0)
+                yield self.bus.dat_r.eq(dat)
+                yield self.bus.ack.eq(1)
+                ack = 1
+            else:
+                yield self.bus.ack.eq(0)
+                ack = 0
+            cycle += 1
+            yield
+
+def read_slot(dut, slot):
+    words = []
+    for i in range(SLOT_WORDS):
+        words.append((yield dut.sram.mem[slot*SLOT_WORDS + i]))
+    return words[:1 + ((words[0] >> 11) & 0x1f)] # FRAME_FORMAT_W + RWCNT words.
+
+# Test CAN DMA -------------------------------------------------------------------------------------
+
+class TestCANDMA(unittest.TestCase):
+    def test_ring_filters(self):
+        frames   = random_frames(200)
+        received = []
+        status   = {}
+        dut      = CANDMADUT()
+        model    = CTUCANFDModel(dut.dma.ctrl, frames, period=100)
+        def generator():
+            yield dut.dma._slots.storage.eq(8)
+            yield dut.dma._filter0_id.storage.eq(0x100)
+            yield dut.dma._filter0_mask.storage.eq((1 << 29) | 0x700)
+            yield dut.dma._filter1_id.storage.eq((1 << 29) | 0x1234567)
+            yield dut.dma._filter1_mask.storage.eq(2**30 - 1)
+            yield dut.dma._filter_enable.storage.eq(0b11)
+            yield dut.dma._control.fields.enable.eq(1)
+            # Consume the ring buffer.
+            read_index = 0
+            for i in range(200*100 + 1000):
+                write_index = (yield dut.dma._write_index.status)
+                while read_index < write_index:
+                    received.append((yield from read_slot(dut, read_index % 8)))
+                    read_index += 1
+                yield dut.dma._read_index.storage.eq(read_index)
+                yield
+            for name in ["frames", "filtered", "overruns", "core_overruns"]:
+                status[name] = (yield getattr(dut.dma, f"_{name}").status)
+        run_simulation(dut, [generator(), model.generator()])
+
+        accepted = [f for f in frames if frame_accepted(f)]
+        self.assertGreater(len(accepted), 0)
+        self.assertEqual(received, accepted)
+        self.assertEqual(status, dict(frames=len(accepted), filtered=len(frames) - len(accepted), overruns=0, core_overruns=0))
+
+    def test_overrun_irq(self):
+        frames = random_frames(10)
+        events = {"rx": 0, "overrun": 0}
+        status = {}
+        dut    = CANDMADUT()
+        model  = CTUCANFDModel(dut.dma.ctrl, frames, period=100)
+        def generator():
+            yield dut.dma._slots.storage.eq(4)
+            yield dut.dma._irq_threshold.storage.eq(2)
+            yield dut.dma._control.fields.enable.eq(1)
+            # Ring buffer never consumed: 4 frames written, 6 dropped.
+            for i in range(10*100 + 1000):
+                for name in events.keys():
+                    events[name] += (yield getattr(dut.dma.ev, name).trigger)
+                yield
+            for name in ["frames", "overruns"]:
+                status[name] = (yield getattr(dut.dma, f"_{name}").status)
+            status["write_index"] = (yield dut.dma._write_index.status)
+            status["frame0"]      = (yield from read_slot(dut, 0))
+        run_simulation(dut, [generator(), model.generator()])
+
+        self.assertEqual(status, dict(frames=4, overruns=6, write_index=4, frame0=frames[0]))
+        self.assertEqual(events, dict(rx=2, overrun=6))
+
+    def test_core_overrun(self):
+        # Frames received faster than the RX engine drains the core's RX buffer: the core drops frames,
+        # the RX engine counts/clears DOR and keeps up afterwards.
+        frames = random_frames(40)
+        status = {}
+        dut    = CANDMADUT()
+        model  = CTUCANFDModel(dut.dma.ctrl, frames, period=2, rx_buffer_size=32)
+        def generator():
+            yield dut.dma._slots.storage.eq(64)
+            yield dut.dma._control.fields.enable.eq(1)
+            for i in range(3000):
+                yield
+            for name in ["frames", "core_overruns"]:
+                status[name] = (yield getattr(dut.dma, f"_{name}").status)
+        run_simulation(dut, [generator(), model.generator()])
+
+        self.assertGreater(model.dropped, 0)
+        self.assertGreater(status["core_overruns"], 0)
+        self.assertEqual(status["frames"], len(frames) - model.dropped)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import sys
+import unittest
+from unittest import mock
+
+from litex.soc.integration.soc import LiteXArgumentParser
+
+from litex_boards.platforms import xilinx_kc705
+from litex_boards.tools.cpu_presets import get_cpu_preset_defaults, add_cpu_preset_argument
+from litex_boards.tools.smp_bench import parse_results
+
+# Test CPU Presets ---------------------------------------------------------------------------------
+
+class TestCPUPresets(unittest.TestCase):
+    def test_defaults(self):
+        defaults = get_cpu_preset_defaults("smp4", dram_data_width=512)
+        self.assertEqual(defaults["cpu_type"], "vexiiriscv")
+        self.assertEqual(defaults["cpu_count"], 4)
+        self.assertEqual(defaults["l2_bytes"], 256*1024)
+        self.assertTrue(defaults["with_coherent_dma"])
+        self.assertIn("--lsu-l1-sets=64", defaults["vexii_args"])
+        self.assertIn("--lsu-l1-mem-data-width-min=128", defaults["vexii_args"])
+        defaults = get_cpu_preset_defaults("smp2", dram_data_width=256)
+        self.assertIn("--fetch-l1-mem-data-width-min=64", defaults["vexii_args"])
+
+    def get_parser_defaults(self, argv):
+        with mock.patch.object(sys, "argv", ["target"] + argv):
+            parser = LiteXArgumentParser(platform=xilinx_kc705.Platform)
+            add_cpu_preset_argument(parser, dram_data_width=512)
+        return parser._args_default
+
+    def test_argument(self):
+        defaults = self.get_parser_defaults(["--cpu-preset=smp2"])
+        self.assertEqual(defaults["cpu_count"], 2)
+        self.assertEqual(defaults["l2_bytes"], 128*1024)
+        # No preset: defaults unchanged.
+        defaults = self.get_parser_defaults([])
+        self.assertNotIn("cpu_count", defaults)
+
+    def test_smp_bench_results(self):
+        output = "\n".join([
+            "smp_bench: cores=2 size=1024",
+            "smp_bench: solo write 0 100",
+            "smp_bench: solo write 1 200",
+            "smp_bench: all write 0 400",
+            "smp_bench: all write 1 400",
+            "smp_bench: done",
+        ])
+        results = parse_results(output, clk_freq=100e6)
+        self.assertEqual(results[("solo", "write")], [1024.0, 512.0])
+        self.assertEqual(results[("all", "write")],  [256.0, 256.0])
+        self.assertEqual(results[("all", "read")],   [None, None])
+        self.assertIsNone(parse_results("", clk_freq=100e6))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import math
+import unittest
+
+from migen import *
+
+from litex_boards.cores.decimator import CICDecimator, HalfBandDecimator
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def to_signed(value, width=16):
+    return value - (1 << width) if value & (1 << (width - 1)) else value
+
+def run_decimator(dut, samples, setup=[]):
+    outputs = []
+    def generator():
+        for signal, value in setup:
+            yield signal.eq(value)
+        yield dut.sink.valid.eq(1)
+        for sample in samples:
+            yield dut.sink.data.eq(sample & 0xffff)
+            yield
+            if (yield dut.source.valid):
+                outputs.append(to_signed((yield dut.source.data)))
+    run_simulation(dut, generator())
+    return outputs
+
+def sine(n, amplitude, period):
+    return [int(amplitude*math.sin(2*math.pi*i/period)) for i in range(n)]
+
+def peak(samples):
+    return max(abs(s) for s in samples)
+
+# Test Decimators ----------------------------------------------------------------------------------
+
+class TestDecimator(unittest.TestCase):
+    def test_cic_bypass(self):
+        dut     = CICDecimator(order=3, max_rate=64)
+        samples = sine(64, 10000, 16)
+        outputs = run_decimator(dut, samples)
+        self.assertEqual(outputs, samples[:len(outputs)])
+
+    def test_cic_dc_gain(self):
+        dut     = CICDecimator(order=3, max_rate=64)
+        outputs = run_decimator(dut, [-1234]*512, setup=[(dut.rate, 16), (dut.shift, 3*4)])
+        self.assertEqual(len(outputs), 512//16 - 1)
+        self.assertEqual(outputs[-8:], [-1234]*8)
+
+    def test_cic_anti_aliasing(self):
+        # Tone at the decimated Nyquist frequency (alias band) is strongly attenuated, in-band tone passes.
+        dut     = CICDecimator(order=3, max_rate=64)
+        in_band = run_decimator(dut, sine(4096, 10000, 512), setup=[(dut.rate, 8), (dut.shift, 3*3)])
+        dut     = CICDecimator(order=3, max_rate=64)
+        alias   = run_decimator(dut, sine(4096, 10000, 8), setup=[(dut.rate, 8), (dut.shift, 3*3)])
+        self.assertGreater(peak(in_band[8:]), 9000)
+        self.assertLess(peak(alias[8:]), 100)
+
+    def test_halfband(self):
+        dut     = HalfBandDecimator()
+        in_band = run_decimator(dut, sine(1024, 10000, 64))
+        dut     = HalfBandDecimator()
+        stop    = run_decimator(dut, sine(1024, 10000, 2.5))
+        self.assertAlmostEqual(len(in_band), 1024//2, delta=2)
+        self.assertGreater(peak(in_band[16:]), 9500)
+        self.assertLess(peak(stop[16:]), 1500)
+
+    def test_halfband_bypass(self):
+        dut     = HalfBandDecimator()
+        samples = sine(64, 10000, 16)
+        outputs = run_decimator(dut, samples, setup=[(dut.enable, 0)])
+        self.assertEqual(outputs, samples[:len(outputs)])
+
+if __name__ == "__main__":
+    unittest.main()
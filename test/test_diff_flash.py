@@ -0,0 +1,93 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from litex_boards.tools.diff_flash import DiffFlash, get_runs
+
+# Helpers ------------------------------------------------------------------------------------------
+
+class FlashProgrammer:
+    """Programmer writing to an in-memory flash (flash() only, no read back)."""
+    def __init__(self, size=0x100000):
+        self.mem    = bytearray(b"\xff"*size)
+        self.writes = []
+
+    def flash(self, address, data_file):
+        with open(data_file, "rb") as f:
+            data = f.read()
+        self.mem[address:address + len(data)] = data
+        self.writes.append((address, len(data)))
+
+class OpenFPGALoader:
+    def __init__(self, cmd):
+        self.cmd = cmd
+
+# Test Diff Flash ----------------------------------------------------------------------------------
+
+class TestDiffFlash(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        patcher = mock.patch.dict(os.environ, {"LITEX_BOARDS_CACHE": self.tmpdir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def image(self, data):
+        filename = os.path.join(self.tmpdir.name, "image.bin")
+        with open(filename, "wb") as f:
+            f.write(data)
+        return filename
+
+    def test_runs(self):
+        self.assertEqual(get_runs([]), [])
+        self.assertEqual(get_runs([1, 2, 3, 7, 9, 10]), [(1, 3), (7, 1), (9, 2)])
+
+    def test_changed_sectors(self):
+        ss   = 0x1000
+        prog = FlashProgrammer()
+        data = bytearray(os.urandom(8*ss + 100))
+        # First programming: everything written (padded to a sector).
+        flash = DiffFlash(prog, device="board0", sector_size=ss)
+        self.assertEqual(flash.flash(2*ss, self.image(data)), 9*ss)
+        self.assertEqual(prog.writes, [(2*ss, 9*ss)])
+        self.assertEqual(bytes(prog.mem[2*ss:2*ss + len(data)]), bytes(data))
+        self.assertEqual(bytes(prog.mem[2*ss + len(data):11*ss]), b"\xff"*(9*ss - len(data)))
+        # Sectors 1, 2 and 6 of the image changed: 2 runs.
+        prog.writes.clear()
+        data[1*ss] ^= 1
+        data[2*ss + 10] ^= 1
+        data[6*ss + 20] ^= 1
+        self.assertEqual(flash.flash(2*ss, self.image(data)), 3*ss)
+        self.assertEqual(prog.writes, [(3*ss, 2*ss), (8*ss, ss)])
+        self.assertEqual(bytes(prog.mem[2*ss:2*ss + len(data)]), bytes(data))
+        # Unchanged: nothing written. Another board has its own cache.
+        prog.writes.clear()
+        self.assertEqual(flash.flash(2*ss, self.image(data)), 0)
+        self.assertEqual(DiffFlash(prog, device="board1", sector_size=ss).flash(2*ss, self.image(data)), 9*ss)
+        # Full: everything rewritten.
+        self.assertEqual(DiffFlash(prog, device="board0", sector_size=ss, full=True).flash(2*ss, self.image(data)), 9*ss)
+        with self.assertRaises(ValueError):
+            flash.flash(ss//2, self.image(data))
+
+    def test_readback_not_supported(self):
+        flash = DiffFlash(FlashProgrammer(), device="board0", sector_size=0x1000, readback=True)
+        with self.assertRaises(NotImplementedError):
+            flash.flash(0, self.image(b"\x00"*0x1000))
+
+    def test_device(self):
+        # No device ID: cable serial, else error.
+        flash = DiffFlash(OpenFPGALoader(["openFPGALoader", "--ftdi-serial", "FT1234"]))
+        self.assertEqual(os.path.basename(flash.cache), "cable_FT1234.json")
+        with self.assertRaises(ValueError):
+            DiffFlash(OpenFPGALoader(["openFPGALoader"]))
+        with self.assertRaises(ValueError):
+            DiffFlash(FlashProgrammer())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+from litex.build.openfpgaloader import OpenFPGALoader
+
+from litex_boards.tools.fleet_loader import load_manifest, get_cable_keys, select_device
+
+# Helpers ------------------------------------------------------------------------------------------
+
+class EfinixProgrammer:
+    def __init__(self, cable_name=""):
+        self.cable_name = cable_name # Ignored by the Efinix programmer.
+
+def arty(name, **kwargs):
+    return dict(name=name, platform="digilent_arty", bitstream=f"{name}.bit", **kwargs)
+
+# Test Fleet Loader --------------------------------------------------------------------------------
+
+class TestFleetLoader(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def load(self, *boards):
+        filename = os.path.join(self.tmpdir.name, "fleet.json")
+        with open(filename, "w") as f:
+            json.dump({"boards": list(boards)}, f)
+        return load_manifest(filename)
+
+    def test_cable_keys(self):
+        boards = self.load(
+            arty("arty0", serial="210319A8C17A"),
+            arty("arty1", serial="210319A8C17B"),
+            arty("arty2", usb_path="1-2.3", action="flash"),
+            dict(name="de10lite0", platform="terasic_de10lite", bitstream="de10lite0.sof"),
+        )
+        self.assertEqual([b["programmer"] for b in boards], 3*["OpenOCD"] + ["USBBlaster"])
+        self.assertEqual(boards[0]["bitstream"], os.path.join(self.tmpdir.name, "arty0.bit"))
+        self.assertEqual(get_cable_keys(boards), {
+            "arty0"     : "serial:210319A8C17A",
+            "arty1"     : "serial:210319A8C17B",
+            "arty2"     : "usb:1-2.3",
+            "de10lite0" : "default:USBBlaster",
+        })
+
+    def test_cable_keys_no_selection(self):
+        # Boards without selection would use the same (first) cable: configuration error.
+        boards = self.load(arty("arty0"), arty("arty1", serial="210319A8C17B"))
+        with self.assertRaises(ValueError):
+            get_cable_keys(boards)
+        # Alone on its programmer: OK.
+        self.assertEqual(get_cable_keys(boards[:1]), {"arty0": "default:OpenOCD"})
+
+    def test_unsupported_selection(self):
+        # Efinix programmer ignores the cable name (platform needs the Efinity database).
+        with mock.patch("litex_boards.tools.fleet_loader.create_programmer", lambda board: EfinixProgrammer()):
+            with self.assertRaisesRegex(ValueError, "serial selection not supported with EfinixProgrammer"):
+                self.load(dict(platform="efinix_titanium_ti60_f225_dev_kit", bitstream="ti60.hex", serial="FT1234"))
+        # UJProg: no selection.
+        with self.assertRaisesRegex(ValueError, "usb_path selection not supported with UJProg"):
+            self.load(dict(platform="radiona_ulx3s", bitstream="ulx3s.bit", usb_path="001:012"))
+        # USBBlaster: no flash.
+        with self.assertRaisesRegex(ValueError, "not supported with USBBlaster \\(flash\\)"):
+            self.load(dict(platform="terasic_de10lite", bitstream="de10lite.sof", serial="1", action="flash"))
+        # Unknown platform.
+        with self.assertRaisesRegex(ValueError, "unable to create unknown_board programmer"):
+            self.load(dict(platform="unknown_board", bitstream="unknown.bit"))
+
+    def test_select_device(self):
+        prog = select_device(OpenFPGALoader(cable="ft2232"), serial="FT1234", usb_path="001:012")
+        self.assertEqual(prog.cmd[-4:], ["--ftdi-serial", "FT1234", "--busdev-num", "001:012"])
+        with self.assertRaises(ValueError):
+            select_device(object(), serial="FT1234")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from litex_boards.tools.fmax_sweep import parse_nextpnr_timing, parse_freqs, summarize
+
+# Helpers ------------------------------------------------------------------------------------------
+
+# nextpnr-ecp5 log excerpt: timing estimate after placement, then final report after routing.
+nextpnr_log = """\
+Info: Device utilisation:
+Info: 	          TRELLIS_IO:    52/  365    14%
+Info:        TRELLIS_SLICE:  4242/41820    10%
+Info: Running timing analysis...
+Info: Max frequency for clock '$glbnet$crg_clkout': 63.21 MHz (PASS at 50.00 MHz)
+Info: Max frequency for clock   '$glbnet$eth_rx_clk': 130.50 MHz (PASS at 125.00 MHz)
+Info: Max delay <async>                      -> posedge $glbnet$crg_clkout: 3.52 ns
+Info: Routing..
+Info: Critical path report for clock '$glbnet$crg_clkout' (posedge -> posedge):
+Info: curr total
+Info:  0.52  0.52  Source main_basesoc_vexriscv_dbus_ack.Q
+Info: 19.02 19.54    Setup main_basesoc_vexriscv_dbus_ack.DI
+Warning: Max frequency for clock '$glbnet$crg_clkout': 48.98 MHz (FAIL at 50.00 MHz)
+Info: Max frequency for clock   '$glbnet$eth_rx_clk': 127.03 MHz (PASS at 125.00 MHz)
+Info: Max delay posedge $glbnet$eth_rx_clk -> posedge $glbnet$crg_clkout: 5.04 ns
+Info: Program finished normally.
+"""
+
+def result(target, freq, seed, passed, fmax):
+    return {
+        "target" : target,
+        "config" : "",
+        "freq"   : freq,
+        "seed"   : seed,
+        "clocks" : {"sys": (fmax, freq, passed)},
+        "passed" : passed,
+    }
+
+# Test Fmax Sweep ----------------------------------------------------------------------------------
+
+class TestFmaxSweep(unittest.TestCase):
+    def test_parse_nextpnr_timing(self):
+        # Final (post-route) report kept.
+        self.assertEqual(parse_nextpnr_timing(nextpnr_log), {
+            "$glbnet$crg_clkout" : (48.98e6,  50e6,  False),
+            "$glbnet$eth_rx_clk" : (127.03e6, 125e6, True),
+        })
+        # nextpnr-ice40 clock names, no report (failed build).
+        ice40_log = "Info: Max frequency for clock 'clk12$SB_IO_IN_$glb_clk': 72.19 MHz (PASS at 12.00 MHz)\n"
+        self.assertEqual(parse_nextpnr_timing(ice40_log), {"clk12$SB_IO_IN_$glb_clk": (72.19e6, 12e6, True)})
+        self.assertEqual(parse_nextpnr_timing("ERROR: Failed to route design.\n"), {})
+
+    def test_parse_freqs(self):
+        self.assertEqual(parse_freqs("50e6:60e6:5e6"), [50e6, 55e6, 60e6])
+        self.assertEqual(parse_freqs("12e6,24e6"),     [12e6, 24e6])
+
+    def test_summarize(self):
+        summary = summarize([
+            result("ulx3s", 50e6, 0, True,  55e6),
+            result("ulx3s", 60e6, 0, False, 58e6),
+            result("ulx3s", 60e6, 1, True,  61e6),
+            result("ulx3s", 60e6, 2, True,  63e6),
+            result("i5",    50e6, 0, False, 45e6),
+        ])
+        self.assertEqual(summary[("ulx3s", "")], {"freq": 60e6, "seed": 2, "fmax": 63e6, "builds": 4})
+        self.assertEqual(summary[("i5",    "")], {"freq": None, "seed": None, "fmax": 0, "builds": 1})
+
+if __name__ == "__main__":
+    unittest.main()
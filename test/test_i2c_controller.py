@@ -0,0 +1,203 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from migen import *
+
+from litex_boards.cores.i2c_controller import *
+
+# Helpers ------------------------------------------------------------------------------------------
+
+class I2CSlaveModel:
+    """I2C slave with 8-bit register pointer (ex LM75/EEPROM), stretching SCL after each ACK."""
+    def __init__(self, dut, addr, regs, stretch=0):
+        self.dut     = dut
+        self.addr    = addr
+        self.regs    = regs
+        self.stretch = stretch
+        self.starts  = 0
+        self.stops   = 0
+
+    @passive
+    def generator(self):
+        dut      = self.dut
+        scl_prev = 1
+        sda_prev = 1
+        scl_hold = 0
+        sda_low  = 0
+        state    = "idle"
+        while True:
+            scl = (not (yield dut.scl_oe)) and (scl_hold == 0)
+            sda = (not (yield dut.sda_oe)) and (not sda_low)
+            yield dut.scl_in.eq(scl)
+            yield dut.sda_in.eq(sda)
+            scl_hold = max(scl_hold - 1, 0)
+            if scl and scl_prev and sda_prev and not sda:
+                # (Repeated) START.
+                self.starts += 1
+                state, first, bits, shift = "rx", True, 0, 0
+            elif scl and scl_prev and not sda_prev and sda:
+                # STOP.
+                self.stops += 1
+                state = "idle"
+            elif scl and not scl_prev:
+                # SCL rising: sample.
+                if state == "rx":
+                    shift = (shift << 1) | sda
+                    bits += 1
+                elif state == "tx_ack":
+                    acked = not sda
+            elif not scl and scl_prev:
+                # SCL falling: drive.
+                if state == "rx" and bits == 8:
+                    if first:
+                        first = False
+                        rw    = shift & 0b1
+                        state = "ack" if (shift >> 1) == self.addr else "idle"
+                        ptr_w = not rw
+                    elif ptr_w:
+                        ptr_w    = False
+                        self.ptr = shift
+                        state    = "ack"
+                    else:
+                        self.regs[self.ptr] = shift
+                        self.ptr += 1
+                        state = "ack"
+                    sda_low = (state == "ack")
+                elif state == "ack":
+                    sda_low  = 0
+                    scl_hold = self.stretch
+                    if rw:
+                        state, bits, byte = "tx", 0, self.regs[self.ptr]
+                        self.ptr += 1
+                        sda_low = not (byte & 0x80)
+                    else:
+                        state, bits, shift = "rx", 0, 0
+                elif state == "tx":
+                    bits += 1
+                    if bits == 8:
+                        sda_low = 0
+                        state   = "tx_ack"
+                    else:
+                        sda_low = not ((byte >> (7 - bits)) & 1)
+                elif state == "tx_ack":
+                    if acked:
+                        state, bits, byte = "tx", 0, self.regs[self.ptr]
+                        self.ptr += 1
+                        sda_low = not (byte & 0x80)
+                    else:
+                        state = "idle"
+            scl_prev, sda_prev = scl, sda
+            yield
+
+def push(dut, *cmds):
+    for cmd in cmds:
+        yield dut._cmd.storage.eq(cmd)
+        yield dut._cmd.re.eq(1)
+        yield
+        yield dut._cmd.re.eq(0)
+
+def control(dut, value):
+    yield dut._control.storage.eq(value)
+    yield dut._control.re.eq(1)
+    yield
+    yield dut._control.re.eq(0)
+    yield
+
+def wait_idle(dut, events):
+    yield
+    while not (yield dut._status.fields.idle):
+        for name in events.keys():
+            events[name] += (yield getattr(dut.ev, name).trigger)
+        yield
+    for i in range(8):
+        yield
+
+def read_rx(dut):
+    data = []
+    while not (yield dut._status.fields.rx_empty):
+        data.append((yield from dut._rx_data.read()))
+        yield
+    return data
+
+def write_transaction(addr, reg, data):
+    cmds  = [I2C_CMD_START | I2C_CMD_WRITE | (addr << 1), I2C_CMD_WRITE | reg]
+    cmds += [I2C_CMD_WRITE | d for d in data]
+    cmds[-1] |= I2C_CMD_STOP
+    return cmds
+
+def read_transaction(addr, reg, n):
+    cmds  = [I2C_CMD_START | I2C_CMD_WRITE | (addr << 1), I2C_CMD_WRITE | reg]
+    cmds += [I2C_CMD_START | I2C_CMD_WRITE | (addr << 1) | 1] # Repeated START.
+    cmds += [I2C_CMD_READ]*(n - 1) + [I2C_CMD_READ | I2C_CMD_NACK | I2C_CMD_STOP]
+    return cmds
+
+# Test I2C Controller ------------------------------------------------------------------------------
+
+class TestI2CController(unittest.TestCase):
+    def test_write_read(self):
+        regs   = list(range(0x80, 0x100))
+        events = {"done": 0, "error": 0}
+        rx     = []
+        dut    = I2CController(pads=None, sys_clk_freq=100e6, i2c_freq=1e6)
+        slave  = I2CSlaveModel(dut, addr=0x48, regs=regs, stretch=200)
+        def generator():
+            yield from push(dut, *write_transaction(0x48, 0x10, [0xaa, 0x55]))
+            yield from push(dut, *read_transaction(0x48, 0x0e, 4))
+            yield from wait_idle(dut, events)
+            rx.extend((yield from read_rx(dut)))
+        run_simulation(dut, [generator(), slave.generator()])
+
+        self.assertEqual(regs[0x10:0x12], [0xaa, 0x55])
+        self.assertEqual(rx, [0x8e, 0x8f, 0xaa, 0x55])
+        self.assertEqual((slave.starts, slave.stops), (3, 2))
+        self.assertEqual(events, {"done": 1, "error": 0})
+
+    def test_nack(self):
+        regs   = list(range(256))
+        events = {"done": 0, "error": 0}
+        status = {}
+        dut    = I2CController(pads=None, sys_clk_freq=100e6, i2c_freq=1e6)
+        slave  = I2CSlaveModel(dut, addr=0x48, regs=regs)
+        def generator():
+            # No device at 0x50: STOP after the address, rest of the transaction skipped.
+            yield from push(dut, *read_transaction(0x50, 0x00, 2))
+            yield from push(dut, *read_transaction(0x48, 0x20, 2))
+            yield from wait_idle(dut, events)
+            status["nack"] = (yield dut._status.fields.nack)
+            status["rx"]   = (yield from read_rx(dut))
+        run_simulation(dut, [generator(), slave.generator()])
+
+        self.assertEqual(status, {"nack": 1, "rx": [0x20, 0x21]})
+        self.assertEqual((slave.starts, slave.stops), (3, 2))
+        self.assertEqual(events["error"], 1)
+
+    def test_script(self):
+        regs   = list(range(256))
+        events = {"done": 0, "error": 0}
+        rx     = []
+        dut    = I2CController(pads=None, sys_clk_freq=100e6, i2c_freq=1e6)
+        slave  = I2CSlaveModel(dut, addr=0x48, regs=regs, stretch=50)
+        def generator():
+            # Script polling 2 sensors registers, run twice.
+            yield from control(dut, 0b001)
+            yield from push(dut, *read_transaction(0x48, 0x00, 2))
+            yield from push(dut, *read_transaction(0x48, 0x40, 1))
+            for i in range(100):
+                yield
+            self.assertEqual(slave.starts, 0)
+            for i in range(2):
+                yield from control(dut, 0b011)
+                yield from wait_idle(dut, events)
+                regs[0x00] = 0xf0
+            rx.extend((yield from read_rx(dut)))
+        run_simulation(dut, [generator(), slave.generator()])
+
+        self.assertEqual(rx, [0x00, 0x01, 0x40, 0xf0, 0x01, 0x40])
+        self.assertEqual(events, {"done": 2, "error": 0})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import random
+import unittest
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect import wishbone
+
+from litex_boards.cores.l2_stats import L2CacheStats
+from litex_boards.tools.l2_advisor import L2CacheModel, load_vcd_trace, evaluate, recommend, l2_bram_blocks
+
+# Helpers ------------------------------------------------------------------------------------------
+
+class L2DUT(LiteXModule):
+    """32-bit bus -> L2 (256B, 128-bit) -> 4KB SRAM."""
+    def __init__(self, trace_depth):
+        self.bus   = wishbone.Interface(data_width=32,  address_width=32, addressing="word")
+        slave      = wishbone.Interface(data_width=128, address_width=32, addressing="word")
+        self.cache = wishbone.Cache(cachesize=256//4, master=self.bus, slave=slave)
+        self.sram  = wishbone.SRAM(4096, bus=slave)
+        self.stats = L2CacheStats(self.cache, trace_depth=trace_depth)
+
+def random_trace(n, seed=0):
+    random.seed(seed)
+    return [(random.random() < 0.3, 4*random.randrange(4096//4)) for _ in range(n)]
+
+# Test L2 Stats ------------------------------------------------------------------------------------
+
+class TestL2Stats(unittest.TestCase):
+    def test_counters_trace(self):
+        trace    = random_trace(256)
+        counters = {}
+        recorded = []
+        dut      = L2DUT(trace_depth=64)
+        def generator():
+            for we, addr in trace:
+                if we:
+                    yield from dut.bus.write(addr//4, addr)
+                else:
+                    yield from dut.bus.read(addr//4)
+            yield
+            for name in ["reads", "writes", "misses", "evictions"]:
+                counters[name] = (yield getattr(dut.stats, f"_{name}").status)
+            for i in range((yield dut.stats._trace_count.status)):
+                yield dut.stats._trace_index.storage.eq(i)
+                yield
+                yield
+                data = (yield dut.stats._trace_data.status)
+                recorded.append((bool(data & 0b1), 4*(data >> 1)))
+        run_simulation(dut, generator())
+
+        # Hardware counters match the advisor's model of the L2.
+        model = L2CacheModel(256, 128)
+        for we, addr in trace:
+            model.access(we, addr)
+        self.assertEqual(counters, dict(reads=model.reads, writes=model.writes, misses=model.misses, evictions=model.evictions))
+        self.assertGreater(model.evictions, 0)
+        # Trace buffer holds the first accesses.
+        self.assertEqual(recorded, trace[:64])
+
+    def test_recommend(self):
+        # 4KB working set read in loop: 4KB L2 only misses on warmup, wider lines halve these misses.
+        trace   = [(False, 0x40000000 + 4*i) for i in range(1024)]*8
+        results = evaluate(trace, sizes=[0, 1024, 2048, 4096, 8192, 16384], widths=[128, 256], port_data_width=128)
+        r = recommend(results)
+        self.assertEqual((r["size"], r["data_width"], r["misses"]), (4096, 256, 128))
+        # Cheaper narrower lines when accepting more cycles/access.
+        r = recommend(results, tolerance=0.5)
+        self.assertEqual((r["size"], r["data_width"], r["misses"]), (4096, 128, 256))
+        self.assertEqual(r["brams"], min(x["brams"] for x in results if x["size"] == 4096))
+        # Block RAM budget.
+        self.assertLessEqual(recommend(results, bram_budget=8)["brams"], 8)
+        # Byte-wide data memories (l2_cache_full_memory_we) cost more Block RAMs.
+        self.assertGreater(l2_bram_blocks(8192, 128, full_memory_we=True), l2_bram_blocks(8192, 128, full_memory_we=False))
+
+    def test_vcd(self):
+        vcd = "\n".join([
+            "$scope module TOP $end",
+            "$var wire 1 ! sys_clk $end",
+            "$var wire 1 # main_l2_stats_l2_trace_valid $end",
+            "$var wire 1 $ l2_trace_we $end",
+            "$var wire 30 b l2_trace_adr [29:0] $end",
+            "$upscope $end",
+            "$enddefinitions $end",
+            "#0", "0!", "1#", "0$", "b100 b",
+            "#1", "1!",                         # Sampled: read  0x10.
+            "#2", "0!", "1$", "b101 b",
+            "#3", "1!",                         # Sampled: write 0x14.
+            "#4", "0!", "0#",
+            "#5", "1!",
+        ])
+        self.assertEqual(load_vcd_trace(vcd), [(False, 0x10), (True, 0x14)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from litepcie.phy.s7pciephy import S7PCIEPHY
+from litepcie.phy.uspciephy import USPCIEPHY
+from litepcie.phy.usppciephy import USPPCIEPHY
+
+from litex_boards.cores.pcie import get_pcie_datapath
+
+# Test PCIe Datapath -------------------------------------------------------------------------------
+
+class TestPCIeDatapath(unittest.TestCase):
+    def test_widths(self):
+        self.assertEqual(get_pcie_datapath(S7PCIEPHY,  4, "gen2", 125e6), (128, 128, 1024))
+        self.assertEqual(get_pcie_datapath(USPCIEPHY,  8, "gen3", 250e6), (256, 256, 2048))
+        self.assertEqual(get_pcie_datapath(USPPCIEPHY, 16, "gen3", 250e6), (512, 512, 4096))
+
+    def test_sys_clk_check(self):
+        with self.assertLogs("PCIe", level="WARNING"):
+            data_width, _, _ = get_pcie_datapath(USPPCIEPHY, 16, "gen3", 125e6)
+        self.assertEqual(data_width, 512)
+
+    def test_unsupported(self):
+        with self.assertRaises(ValueError):
+            get_pcie_datapath(USPPCIEPHY, 16, "gen4", 250e6)
+        with self.assertRaises(ValueError):
+            get_pcie_datapath(USPCIEPHY, 4, "gen4", 250e6)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect import stream
+
+from litex_boards.cores.pcie_usb_bridge import PCIeUSBBridge
+
+# Helpers ------------------------------------------------------------------------------------------
+
+class Endpoints:
+    def __init__(self, data_width):
+        self.sink   = stream.Endpoint([("data", data_width)])
+        self.source = stream.Endpoint([("data", data_width)])
+
+class BridgeDUT(LiteXModule):
+    def __init__(self):
+        self.pcie_dma = Endpoints(64) # LitePCIe DMA: source from Host, sink to Host.
+        self.usb_phy  = Endpoints(32) # FT601: sink to USB Host, source from USB Host.
+        self.bridge   = PCIeUSBBridge(self.pcie_dma, self.usb_phy, pcie_data_width=64, bram_depth=64)
+
+def send(endpoint, words):
+    for word in words:
+        yield endpoint.valid.eq(1)
+        yield endpoint.data.eq(word)
+        yield
+        while not (yield endpoint.ready):
+            yield
+    yield endpoint.valid.eq(0)
+
+@passive
+def receive(endpoint, words, stall_every=0, enable=None):
+    cycle = 0
+    while True:
+        ready = not (stall_every and (cycle % stall_every) == 0) and (enable is None or enable[0])
+        yield endpoint.ready.eq(ready)
+        yield
+        cycle += 1
+        if ready and (yield endpoint.valid):
+            words.append((yield endpoint.data))
+
+def snapshot(monitor):
+    yield monitor.update.re.eq(1)
+    yield
+    yield monitor.update.re.eq(0)
+    yield
+    return {
+        "bytes_in"  : (yield monitor.bytes_in.status),
+        "bytes_out" : (yield monitor.bytes_out.status),
+        "latency"   : (yield monitor.latency.status),
+    }
+
+# Test PCIe <-> USB3 Bridge ------------------------------------------------------------------------
+
+class TestPCIeUSBBridge(unittest.TestCase):
+    def test_bridge(self):
+        dut      = BridgeDUT()
+        h2u      = [0x0123456789abcdef + i for i in range(128)]
+        u2h      = [0x55aa0000 + i for i in range(256)]
+        usb_out  = []
+        pcie_out = []
+        status   = {}
+        enable   = [False]
+
+        def generator():
+            # Outputs stalled first: data buffered.
+            yield from send(dut.pcie_dma.source, h2u[:32])
+            yield from send(dut.usb_phy.source,  u2h[:64])
+            status["buffered"] = (yield from snapshot(dut.bridge.h2u))
+            enable[0] = True
+            yield from send(dut.pcie_dma.source, h2u[32:])
+            yield from send(dut.usb_phy.source,  u2h[64:])
+            for i in range(256):
+                yield
+            status["h2u"] = (yield from snapshot(dut.bridge.h2u))
+            status["u2h"] = (yield from snapshot(dut.bridge.u2h))
+
+        run_simulation(dut, [generator(),
+            receive(dut.usb_phy.sink,  usb_out,  stall_every=3, enable=enable),
+            receive(dut.pcie_dma.sink, pcie_out, enable=enable),
+        ])
+
+        # Data goes through in order, 64-bit <-> 32-bit conversion.
+        self.assertEqual(usb_out, [(w >> 32*n) & 0xffffffff for w in h2u for n in range(2)])
+        self.assertEqual(pcie_out, [u2h[2*i] | (u2h[2*i + 1] << 32) for i in range(len(u2h)//2)])
+
+        # Monitors.
+        self.assertEqual(status["buffered"]["bytes_in"],  32*8)
+        self.assertEqual(status["buffered"]["bytes_out"], 0)
+        self.assertEqual((status["h2u"]["bytes_in"], status["h2u"]["bytes_out"]), (128*8, 128*8))
+        self.assertEqual((status["u2h"]["bytes_in"], status["u2h"]["bytes_out"]), (128*8, 128*8))
+        self.assertTrue(status["h2u"]["latency"] > 0)
+
+    def test_traffic(self):
+        # Control fields driven directly (no CSR bank).
+        dut     = BridgeDUT()
+        traffic = dut.bridge.h2u_traffic
+        usb_out = []
+        status  = {}
+
+        def generator():
+            # Generator only: pattern sent to the output (USB3), PCIe DMA stalled.
+            yield dut.pcie_dma.source.valid.eq(1)
+            yield traffic.control.fields.generator.eq(1)
+            for i in range(64):
+                yield
+            status["stalled"] = not (yield dut.pcie_dma.source.ready)
+            # Loopback: generator/checker, output idle.
+            yield dut.pcie_dma.source.valid.eq(0)
+            yield traffic.control.fields.checker.eq(1)
+            yield
+            status["usb_out"] = len(usb_out)
+            for i in range(256):
+                yield
+            status["words"]   = (yield traffic.words.status)
+            status["errors"]  = (yield traffic.errors.status)
+            status["monitor"] = (yield from snapshot(dut.bridge.h2u))
+            # Pattern restarted by the generator: discontinuity detected.
+            yield traffic.control.fields.generator.eq(0)
+            yield
+            yield traffic.control.fields.generator.eq(1)
+            for i in range(256):
+                yield
+            status["error"] = (yield traffic.errors.status)
+
+        run_simulation(dut, [generator(), receive(dut.usb_phy.sink, usb_out)])
+
+        self.assertTrue(status["stalled"])
+        self.assertTrue(len(usb_out) > 0)
+        self.assertEqual(usb_out[:8], [0, 0, 1, 0, 2, 0, 3, 0])
+        self.assertEqual(len(usb_out), status["usb_out"])
+        self.assertTrue(status["words"] > 128)
+        self.assertEqual(status["errors"], 0)
+        self.assertTrue(status["monitor"]["bytes_out"] >= status["words"]*8)
+        self.assertEqual(status["error"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from migen import *
+
+from litedram.common import LiteDRAMNativePort
+
+from litex_boards.cores.scope import *
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def pack(samples, sample_width=8):
+    return sum(s << (sample_width*n) for n, s in enumerate(samples))
+
+def unpack(word, nsamples, sample_width=8):
+    return [(word >> (sample_width*n)) & (2**sample_width - 1) for n in range(nsamples)]
+
+@passive
+def dram_writer(port, mem):
+    # Native write port: commands and write datas always accepted.
+    addrs = []
+    yield port.cmd.ready.eq(1)
+    yield port.wdata.ready.eq(1)
+    while True:
+        yield
+        if (yield port.cmd.valid):
+            addrs.append((yield port.cmd.addr))
+        if (yield port.wdata.valid):
+            mem[addrs.pop(0)] = (yield port.wdata.data)
+
+# Test Scope ---------------------------------------------------------------------------------------
+
+class TestScope(unittest.TestCase):
+    def test_trigger(self):
+        # 2 interleaved channels, 2 samples per channel per word, trigger on channel 1.
+        dut = ScopeTrigger(nsamples=4, sample_width=8, nchannels=2)
+        results = []
+
+        def generator():
+            yield dut.level.eq(100)
+            yield dut.source.eq(1)
+            for mode, words in [
+                (TRIGGER_RISING,  [[200,  10, 200,  20], [0, 150, 0,  50], [0,  60, 0, 120]]),
+                (TRIGGER_FALLING, [[  0, 150,   0, 120], [0, 110, 0,  99], [0,  50, 0,  40]]),
+                (TRIGGER_ABOVE,   [[255,  10, 255,  20], [0,  20, 0, 100]]),
+                (TRIGGER_BELOW,   [[  0, 200,   0, 200], [0,  99, 0, 200]]),
+                (TRIGGER_FORCE,   [[  0,   0,   0,   0]]),
+            ]:
+                yield dut.mode.eq(mode)
+                for word in words:
+                    yield dut.data.eq(pack(word))
+                    yield
+                    results.append((mode, (yield dut.match), (yield dut.index)))
+                    yield dut.update.eq(1)
+                    yield
+                    yield dut.update.eq(0)
+
+        run_simulation(dut, generator())
+        self.assertEqual(results, [
+            # Rising: channel 1 crosses in 2nd word (sample 1), then in 3rd word (sample 3).
+            (TRIGGER_RISING,  0, 0), (TRIGGER_RISING,  1, 1), (TRIGGER_RISING,  1, 3),
+            # Falling: through previous word (sample 3), then not crossing again.
+            (TRIGGER_FALLING, 0, 0), (TRIGGER_FALLING, 1, 3), (TRIGGER_FALLING, 0, 0),
+            (TRIGGER_ABOVE,   0, 0), (TRIGGER_ABOVE,   1, 3),
+            (TRIGGER_BELOW,   0, 0), (TRIGGER_BELOW,   1, 1),
+            # Force: first sample of the channel.
+            (TRIGGER_FORCE,   1, 1),
+        ])
+
+    def test_decimator(self):
+        # 2 interleaved channels, 4 sample periods per word.
+        nwords  = 64
+        samples = [n & 0xff for n in range(8*nwords)]
+        for rate in [0, 1, 2, 3, 5]:
+            dut     = ScopeDecimator(nsamples=8, sample_width=8, nchannels=2, max_rate=6)
+            outputs = []
+
+            def generator():
+                yield dut.rate.eq(rate)
+                yield dut.source.ready.eq(1)
+                for n in range(nwords):
+                    yield dut.sink.valid.eq(1)
+                    yield dut.sink.data.eq(pack(samples[8*n:8*(n + 1)]))
+                    yield
+                    while not (yield dut.sink.ready):
+                        yield
+                yield dut.sink.valid.eq(0)
+                for i in range(4):
+                    yield
+
+            @passive
+            def monitor():
+                while True:
+                    if (yield dut.source.valid) and (yield dut.source.ready):
+                        outputs.extend(unpack((yield dut.source.data), 8))
+                    yield
+
+            run_simulation(dut, [generator(), monitor()])
+            expected = []
+            for period in range(0, len(samples)//2, 2**rate):
+                expected += samples[2*period:2*period + 2]
+            self.assertEqual(outputs, expected[:len(outputs)])
+            self.assertEqual(len(outputs), 8*(nwords >> rate))
+
+    def test_recorder(self):
+        # 128-bit DRAM words (16 samples), 64 words ring buffer, decimation by 4.
+        port   = LiteDRAMNativePort("write", address_width=24, data_width=128)
+        dut    = ScopeRecorder(port, base=0x1000, size=0x400, sample_width=8, nsamples=8)
+        mem    = {}
+        status = {}
+
+        def generator():
+            yield dut._mode.storage.eq(TRIGGER_RISING)
+            yield dut._level.storage.eq(200)
+            yield dut._pre.storage.eq(20) # More than a ramp period: trigger only accepted after.
+            yield dut._post.storage.eq(4)
+            yield dut._decimation.storage.eq(2)
+            yield dut._arm.re.eq(1)
+            yield
+            yield dut._arm.re.eq(0)
+            # Ramp, sent with gaps.
+            sample = 0
+            cycle  = 0
+            while not (yield dut._status.fields.done):
+                valid = (cycle % 3) != 0
+                yield dut.sink.valid.eq(valid)
+                yield dut.sink.data.eq(pack([(sample + n) & 0xff for n in range(8)]))
+                sample += 8 if valid else 0
+                cycle  += 1
+                yield
+            yield dut.sink.valid.eq(0)
+            for i in range(32): # Writes in flight.
+                yield
+            for name in ["trigger_offset", "trigger_sample", "record_start", "record_length", "overflows"]:
+                status[name] = (yield getattr(dut, f"_{name}").status)
+
+        run_simulation(dut, [generator(), dram_writer(port, mem)])
+
+        # Record position in the ring.
+        self.assertEqual(status["record_length"], 20 + 4 + 1)
+        self.assertEqual(status["record_start"], (status["trigger_offset"] - 20) % 64)
+        self.assertEqual(status["overflows"], 0)
+        self.assertTrue(all(0x100 <= addr < 0x100 + 64 for addr in mem))
+
+        # Record: contiguous decimated ramp, trigger sample crossing the level.
+        record = []
+        for n in range(status["record_length"]):
+            record += unpack(mem[0x100 + (status["record_start"] + n) % 64], 16)
+        index = 20*16 + status["trigger_sample"]
+        self.assertTrue(record[index - 1] < 200 <= record[index])
+        for n in range(1, len(record)):
+            self.assertEqual((record[n] - record[n - 1]) & 0xff, 4)
+
+if __name__ == "__main__":
+    unittest.main()
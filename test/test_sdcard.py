@@ -0,0 +1,130 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect import wishbone
+
+from litesdcard.frontend.dma import SDBlock2MemDMA, SDMem2BlockDMA
+
+from litex_boards.cores.sdcard import SDDMACounters, get_sdcard_clk_freq
+from litex_boards.tools.sdcard_bench import parse_switch_status
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def new_bus():
+    return wishbone.Interface(data_width=32, adr_width=30, addressing="word")
+
+def enable(dma, base, length, loop):
+    yield dma._enable.storage.eq(0)
+    yield dma._base.storage.eq(base)
+    yield dma._length.storage.eq(length)
+    yield dma._loop.storage.eq(loop)
+    yield
+    yield dma._enable.storage.eq(1)
+    yield
+
+class Block2MemDUT(LiteXModule):
+    def __init__(self):
+        self.dma   = SDBlock2MemDMA(new_bus(), endianness="little")
+        self.stats = SDDMACounters(self.dma)
+        self.sram  = wishbone.SRAM(1024, bus=self.dma.bus)
+
+class Mem2BlockDUT(LiteXModule):
+    def __init__(self, init):
+        self.dma   = SDMem2BlockDMA(new_bus(), endianness="little")
+        self.stats = SDDMACounters(self.dma)
+        self.sram  = wishbone.SRAM(4096, bus=self.dma.bus, init=init)
+
+def words_to_bytes(words):
+    return [(w >> 8*i) & 0xff for w in words for i in range(4)]
+
+# Test SDCard --------------------------------------------------------------------------------------
+
+class TestSDCard(unittest.TestCase):
+    def test_block2mem_ring(self):
+        # Multi-block transfer 3x larger than the ring (loop mode), with card stalls.
+        data   = [(7*i + 3) % 256 for i in range(3*256)]
+        status = {}
+        dut    = Block2MemDUT()
+        def generator():
+            yield from enable(dut.dma.dma, base=0x100, length=256, loop=1)
+            for i in range(16): # Command latency, not counted.
+                yield
+            for i, d in enumerate(data):
+                yield dut.dma.sink.valid.eq(1)
+                yield dut.dma.sink.first.eq(i == 0)
+                yield dut.dma.sink.data.eq(d)
+                yield
+                while not (yield dut.dma.sink.ready):
+                    yield
+                yield dut.dma.sink.valid.eq(0)
+                if i % 13 == 0:
+                    yield
+            for i in range(512): # Converter/writes, 5 cycles per word.
+                yield
+            status["bytes"]  = (yield dut.stats._bytes.status)
+            status["cycles"] = (yield dut.stats._cycles.status)
+            status["mem"]    = []
+            for i in range(256):
+                status["mem"].append((yield dut.sram.mem[i]))
+            # Disable: counters cleared.
+            yield dut.dma.dma._enable.storage.eq(0)
+            yield
+            yield
+            status["cleared"] = (yield dut.stats._bytes.status), (yield dut.stats._cycles.status)
+        run_simulation(dut, generator())
+
+        mem = words_to_bytes(status["mem"])
+        self.assertEqual(mem[0x100:0x200], data[2*256:])
+        self.assertEqual(status["bytes"], len(data))
+        self.assertTrue(len(data) < status["cycles"] < 2*len(data))
+        self.assertEqual(status["cleared"], (0, 0))
+
+    def test_mem2block(self):
+        init   = [(0x01010101*i) ^ 0xa5a5a5a5 for i in range(1024)]
+        mem    = words_to_bytes(init)
+        data   = []
+        lasts  = []
+        status = {}
+        dut    = Mem2BlockDUT(init)
+        def generator():
+            yield from enable(dut.dma.dma, base=0x800, length=1024, loop=0)
+            for i in range(5000):
+                yield dut.dma.source.ready.eq(i % 3 != 0)
+                yield
+                if (yield dut.dma.source.valid) & (yield dut.dma.source.ready):
+                    data.append((yield dut.dma.source.data))
+                    if (yield dut.dma.source.last):
+                        lasts.append(len(data))
+            status["bytes"] = (yield dut.stats._bytes.status)
+        run_simulation(dut, generator())
+
+        self.assertEqual(data, mem[0x800:0xc00])
+        self.assertEqual(lasts, [512, 1024])
+        self.assertEqual(status["bytes"], 1024)
+
+    def test_clk_freq(self):
+        self.assertEqual(get_sdcard_clk_freq(100e6, 50e6), 50e6)
+        self.assertEqual(get_sdcard_clk_freq(125e6, 50e6), 31.25e6)
+        self.assertEqual(get_sdcard_clk_freq(150e6, 25e6), 18.75e6)
+
+    def test_switch_status(self):
+        # CMD6 status: 200mA, group 1 function 1 (High-Speed) selected.
+        status = bytearray(64)
+        status[0:2] = (200).to_bytes(2, "big")
+        status[16]  = 0x01
+        self.assertEqual(parse_switch_status(bytes(status)), 1)
+        # Function not supported (0xf) / error (0mA).
+        status[16] = 0x0f
+        self.assertEqual(parse_switch_status(bytes(status)), 0xf)
+        self.assertEqual(parse_switch_status(bytes(64)), 0xf)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import tempfile
+import unittest
+
+from litedram.modules import MT8JTF12864, MTA18ASF2G72PZ
+
+from litex_boards.tools.spd_db import load_spd, write_spd_hexdump, get_spd_info, SPDDatabase, get_sdram_module
+
+# SPDs ---------------------------------------------------------------------------------------------
+
+def ddr3_sodimm_spd():
+    """DDR3-1600 SO-DIMM, 1 rank of 8 x 4Gb x8 (4GB)."""
+    b = [0]*256
+    b[2], b[3]   = 0x0b, 0x03   # DDR3, SO-DIMM.
+    b[4], b[5]   = 0x04, 0x21   # 8 banks, 4Gb / 16 rows bits, 10 cols bits.
+    b[7], b[8]   = 0x01, 0x03   # 1 rank, x8 / 64-bit.
+    b[9]         = 0x11         # FTB: 1ps.
+    b[10], b[11] = 1, 8         # MTB: 0.125ns.
+    b[12]        = 10           # tCK: 1.25ns (DDR3-1600).
+    b[16:21]     = [110, 120, 110, 48, 110]     # tAA/tWR/tRCD/tRRD/tRP.
+    b[21:24]     = [0x11, 0x18, 0x2c]           # tRAS: 35ns, tRC: 48.75ns.
+    b[24:30]     = [0x00, 0x0d, 60, 60, 0x00, 0xf0] # tRFC: 260ns, tWTR/tRTP: 7.5ns, tFAW: 30ns.
+    b[128:146]   = list(b"MT8KTF51264HZ-1G6 ")
+    return b
+
+def ddr4_rdimm_spd():
+    """DDR4-2400 RDIMM, 2 ranks of 18 x 8Gb x4 (32GB + ECC)."""
+    b = [0]*512
+    b[2], b[3]   = 0x0c, 0x01   # DDR4, RDIMM.
+    b[4], b[5]   = 0x85, 0x29   # 4 bank groups, 4 banks, 8Gb / 17 rows bits, 10 cols bits.
+    b[12], b[13] = 0x08, 0x0b   # 2 ranks, x4 / 64-bit + ECC.
+    b[18], b[125] = 7, 0xd6     # tCK: 0.875ns - 42ps (DDR4-2400).
+    b[24:30]     = [110, 110, 110, 0x11, 0x00, 0x6e] # tAA/tRCD/tRP, tRAS: 32ns, tRC: 45.75ns.
+    b[30:36]     = [0xf0, 0x0a, 0x20, 0x08, 0x00, 0x05] # tRFC1/2/4: 350/260/160ns.
+    b[36:46]     = [0x00, 0x68, 27, 40, 40, 0x00, 120, 0x00, 20, 60] # tFAW/tRRD_S/L/tCCD_L/tWR/tWTR_S/L.
+    b[329:349]   = list(b"36ASF4G72PZ-2G3B1   ")
+    return b
+
+# Test SPD DB --------------------------------------------------------------------------------------
+
+class TestSPDDB(unittest.TestCase):
+    def test_info(self):
+        info = get_spd_info(ddr3_sodimm_spd())
+        self.assertEqual(info["module_type"], "SO-DIMM")
+        self.assertEqual(info["size"], 4*2**30)
+        self.assertEqual(info["speedgrade"], "1600")
+        self.assertEqual((info["nbanks"], info["nrows"], info["ncols"]), (8, 65536, 1024))
+        self.assertEqual(info["part_number"], "MT8KTF51264HZ-1G6")
+        info = get_spd_info(ddr4_rdimm_spd())
+        self.assertTrue(info["registered"])
+        self.assertEqual(info["size"], 32*2**30)
+        self.assertEqual(info["bus_width"], 72)
+        self.assertEqual(info["speedgrade"], "2400")
+
+    def test_db(self):
+        with tempfile.TemporaryDirectory() as d:
+            # Binary dump added to the library (stored in BIOS spdread format).
+            dump = os.path.join(d, "dimm.bin")
+            with open(dump, "wb") as f:
+                f.write(bytes(ddr4_rdimm_spd()))
+            db   = SPDDatabase(os.path.join(d, "spd"))
+            name = db.add(dump)
+            self.assertEqual(name, "36ASF4G72PZ-2G3B1")
+            self.assertEqual(db.names(), [name])
+            self.assertEqual(db.get(name), ddr4_rdimm_spd())
+            # Hexdump round-trip.
+            hexdump = os.path.join(d, "dimm.txt")
+            write_spd_hexdump(hexdump, ddr3_sodimm_spd())
+            self.assertEqual(load_spd(hexdump), ddr3_sodimm_spd())
+
+    def test_sdram_module(self):
+        with tempfile.TemporaryDirectory() as d:
+            dump = os.path.join(d, "dimm.txt")
+            write_spd_hexdump(dump, ddr3_sodimm_spd())
+            # Default module.
+            default = MT8JTF12864(125e6, "1:4")
+            self.assertIs(get_sdram_module(default, 125e6), default)
+            # Module from SPD: geometry from the DIMM (4GB instead of the default 1GB).
+            module = get_sdram_module(default, 125e6, spd_dump=dump)
+            self.assertEqual(module.nrows, 65536)
+            self.assertEqual(module.get("tRP").ns, 13.75)
+            self.assertEqual(module._spd_data, ddr3_sodimm_spd())
+            # Memory type mismatch.
+            with self.assertRaises(ValueError):
+                get_sdram_module(MTA18ASF2G72PZ(125e6, "1:4"), 125e6, spd_dump=dump)
+            # DDR4 RDIMM.
+            write_spd_hexdump(dump, ddr4_rdimm_spd())
+            module = get_sdram_module(MTA18ASF2G72PZ(125e6, "1:4"), 125e6, spd_dump=dump)
+            self.assertTrue(module.registered)
+            self.assertEqual((module.ngroups, module.ngroupbanks, module.nrows), (4, 4, 131072))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import sys
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+from migen import *
+
+from litex_boards.tools import stage_cache
+
+# Helpers ------------------------------------------------------------------------------------------
+
+copy_command = [sys.executable, "-c", "import shutil; shutil.copyfile('in.v', 'out.json')"]
+
+# Test Stage Cache ---------------------------------------------------------------------------------
+
+class TestStageCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        patcher = mock.patch.dict(os.environ, {"LITEX_BOARDS_CACHE": os.path.join(self.tmpdir.name, "cache")})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(stage_cache, "get_tool_version", lambda tool: f"{os.path.basename(tool)} 1.0")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Stages run from the build directory.
+        self.build_dir = os.path.join(self.tmpdir.name, "build")
+        os.makedirs(self.build_dir)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.build_dir)
+
+    def write(self, filename, contents):
+        with open(filename, "w") as f:
+            f.write(contents)
+
+    def test_stage_key(self):
+        body = "module top(); // " + os.path.join(os.getcwd(), "top.init") + "\n"
+        self.write("top.v", "// Auto-Generated by LiteX on 2024-01-01 10:00:00.\n" + body)
+        key, items = stage_cache.get_stage_key(["yosys", "top.ys"], [os.path.abspath("top.v")])
+        self.assertEqual(set(items), {"command", "tool", "file:top.v"})
+        # Generation date/build directory ignored.
+        self.write("top.v", "// Auto-Generated by LiteX on 2024-06-01 12:00:00.\n" + body)
+        self.assertEqual(stage_cache.get_stage_key(["yosys", "top.ys"], ["top.v"])[0], key)
+        # Contents, command line and tool version keyed.
+        self.write("top.v", "// Auto-Generated by LiteX on 2024-06-01 12:00:00.\nmodule top(clk);\n")
+        self.assertNotEqual(stage_cache.get_stage_key(["yosys", "top.ys"], ["top.v"])[0], key)
+        self.write("top.v", "// Auto-Generated by LiteX on 2024-06-01 12:00:00.\n" + body)
+        self.assertNotEqual(stage_cache.get_stage_key(["yosys", "-q", "top.ys"], ["top.v"])[0], key)
+        with mock.patch.object(stage_cache, "get_tool_version", lambda tool: "yosys 2.0"):
+            self.assertNotEqual(stage_cache.get_stage_key(["yosys", "top.ys"], ["top.v"])[0], key)
+
+    def test_run_stage(self):
+        manifest = {"stages": {"synth": {"inputs": ["in.v"], "outputs": ["out.json"]}}, "results": {}}
+        self.write("top_stage_cache.json", json.dumps(manifest))
+        def run():
+            self.assertEqual(stage_cache.run_stage("top_stage_cache.json", "synth", copy_command), 0)
+            with open("out.json") as f:
+                output = f.read()
+            return stage_cache.get_results(".", "top")["synth"], output
+
+        # Miss: stage run and stored.
+        self.write("in.v", "module a();")
+        result, output = run()
+        self.assertEqual((result["status"], result["changed"], output), ("miss", [], "module a();"))
+        # Hit: outputs restored.
+        os.remove("out.json")
+        result, output = run()
+        self.assertEqual((result["status"], result["changed"], output), ("hit", [], "module a();"))
+        # Input changed: miss, reported.
+        self.write("in.v", "module b();")
+        result, output = run()
+        self.assertEqual((result["status"], result["changed"], output), ("miss", ["file:in.v"], "module b();"))
+        self.assertEqual(stage_cache.report({"synth": result}), "Stage cache: synth miss (file:in.v changed).")
+        # Back to first input: hit.
+        self.write("in.v", "module a();")
+        result, output = run()
+        self.assertEqual((result["status"], output), ("hit", "module a();"))
+        self.assertEqual(len(os.listdir(os.path.join(stage_cache.stages_dir(), "synth"))), 2)
+
+        # Failing stage: not stored.
+        self.write("in.v", "module c();")
+        self.assertNotEqual(stage_cache.run_stage("top_stage_cache.json", "synth", [sys.executable, "-c", "exit(1)"]), 0)
+        self.assertEqual(len(os.listdir(os.path.join(stage_cache.stages_dir(), "synth"))), 2)
+
+    def test_build_script(self):
+        from litex_boards.platforms import radiona_ulx3s
+        platform = radiona_ulx3s.Platform()
+        module   = Module()
+        module.comb += platform.request("user_led", 0).eq(1)
+        platform.build(module, build_dir=self.build_dir, run=False)
+        stage_cache.add_stage_cache(self.build_dir, "top")
+        # Already run through the cache: unchanged.
+        stage_cache.add_stage_cache(self.build_dir, "top")
+
+        # Yosys/nextpnr calls run through the cache, packing not.
+        with open(os.path.join(self.build_dir, "build_top.sh")) as f:
+            script = f.read().splitlines()
+        runner = "-m litex_boards.tools.stage_cache --run top_stage_cache.json"
+        self.assertEqual(len([l for l in script if f"{runner} synth -- yosys" in l]), 1)
+        self.assertEqual(len([l for l in script if f"{runner} pnr -- nextpnr-ecp5" in l]), 1)
+        self.assertEqual(len([l for l in script if l.startswith("ecppack")]), 1)
+
+        # Stages inputs/outputs.
+        with open(os.path.join(self.build_dir, "top_stage_cache.json")) as f:
+            stages = json.load(f)["stages"]
+        self.assertEqual(stages["synth"]["inputs"],  [os.path.join(self.build_dir, "top.v"), "top.ys"])
+        self.assertEqual(stages["synth"]["outputs"], ["top.json", "top.rpt"])
+        self.assertEqual(stages["pnr"],              {"inputs": ["top.json", "top.lpf"], "outputs": ["top.config"]})
+
+    def test_stages(self):
+        # Gowin (Apicula): constraints passed as nextpnr-himbaechel option.
+        self.write("top.ys", "read_verilog top.v\nsynth_gowin -top top\nwrite_json  top.json")
+        stages = stage_cache.get_stages("yosys  -l top.rpt top.ys",
+            "nextpnr-himbaechel --json top.json --report top.report --write top_routed.json --vopt cst=top.cst --seed 1")
+        self.assertEqual(stages["synth"], {"inputs": ["top.v", "top.ys"], "outputs": ["top.json", "top.rpt"]})
+        self.assertEqual(stages["pnr"],   {"inputs": ["top.json", "top.cst"], "outputs": ["top.report", "top_routed.json"]})
+
+if __name__ == "__main__":
+    unittest.main()
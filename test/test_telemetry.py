@@ -0,0 +1,125 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect import wishbone
+from litex.soc.cores.pwm import PWM
+
+from litex_boards.cores.telemetry import Telemetry, FanController, sysmon_temperature_raw
+from litex_boards.tools.telemetry import decode_records
+
+# Test Telemetry -----------------------------------------------------------------------------------
+
+class TelemetryDUT(LiteXModule):
+    def __init__(self):
+        self.a         = Signal(12)
+        self.b         = Signal(16)
+        self.telemetry = Telemetry([("a", self.a), ("b", self.b)], sys_clk_freq=1e6, base=0, size=8*32, sample_rate=1e5)
+        self.sram      = wishbone.SRAM(1024, bus=self.telemetry.bus)
+
+class FanDUT(LiteXModule):
+    def __init__(self):
+        self.temperature = Signal(12)
+        self.tach        = Signal()
+        self.pwm         = PWM(with_csr=False, default_enable=1, default_period=1000, default_width=200)
+        self.fan         = FanController(self.pwm, self.temperature, sys_clk_freq=1000, tach=self.tach,
+            target    = 100,
+            kp        = 4*256,
+            ki        = 0,
+            min_width = 200,
+        )
+
+class TestTelemetry(unittest.TestCase):
+    def test_records(self):
+        samples = []
+        status  = {}
+        dut     = TelemetryDUT()
+        def generator():
+            yield dut.telemetry._decimation.storage.eq(2)
+            for i in range(12*4*10 + 20):
+                if (yield dut.telemetry.sample):
+                    samples.append(((yield dut.a), (yield dut.b)))
+                yield dut.a.eq((i*37) % 4096)
+                yield dut.b.eq(65535 - (i*1021) % 65536)
+                yield
+            status["records"]  = (yield dut.telemetry._records.status)
+            status["overruns"] = (yield dut.telemetry._overruns.status)
+            status["words"]    = []
+            for i in range(8*8):
+                status["words"].append((yield dut.sram.mem[i]))
+        run_simulation(dut, generator())
+
+        # 12 records written, last 8 in the ring buffer.
+        self.assertEqual((status["records"], status["overruns"]), (12, 0))
+        history = decode_records(status["words"], ["a", "b"], 8, status["records"])
+        self.assertEqual([entry["record"] for entry in history], list(range(4, 12)))
+        for entry in history:
+            window = samples[4*entry["record"]:4*entry["record"] + 4]
+            for i, name in enumerate(["a", "b"]):
+                values = [s[i] for s in window]
+                self.assertEqual(entry[f"{name}_min"],  min(values))
+                self.assertEqual(entry[f"{name}_max"],  max(values))
+                self.assertEqual(entry[f"{name}_avg"],  sum(values)//4)
+                self.assertEqual(entry[f"{name}_last"], values[-1])
+
+    def test_fan_controller(self):
+        widths = {}
+        dut    = FanDUT()
+        def tach_generator():
+            # 25 pulses per second.
+            while True:
+                yield dut.tach.eq(1)
+                for i in range(20):
+                    yield
+                yield dut.tach.eq(0)
+                for i in range(20):
+                    yield
+        tach_generator = passive(tach_generator)
+        def generator():
+            for temperature in [50, 150, 500]:
+                yield dut.temperature.eq(temperature)
+                for i in range(200):
+                    yield
+                widths[temperature] = (yield dut.pwm.width)
+            # Integral term: width increasing until full speed at constant temperature.
+            yield dut.fan._ki.storage.eq(256)
+            yield dut.temperature.eq(110)
+            for i in range(200):
+                yield
+            widths["integral0"] = (yield dut.pwm.width)
+            for i in range(1000):
+                yield
+            widths["integral1"] = (yield dut.pwm.width)
+            for i in range(10000):
+                yield
+            widths["integral2"] = (yield dut.pwm.width)
+            # Manual mode.
+            yield dut.fan._control.fields.auto.eq(0)
+            yield dut.fan._manual_width.storage.eq(321)
+            yield
+            yield
+            widths["manual"] = (yield dut.pwm.width)
+            widths["tach"]   = (yield dut.fan._tach.status)
+        run_simulation(dut, [generator(), tach_generator()])
+
+        # Proportional term: min_width + 4*(temperature - target), clamped.
+        self.assertEqual((widths[50], widths[150], widths[500]), (200, 400, 1000))
+        self.assertGreater(widths["integral1"], widths["integral0"])
+        self.assertEqual(widths["integral2"], 1000)
+        self.assertEqual(widths["manual"], 321)
+        self.assertEqual(widths["tach"], 25)
+
+    def test_sysmon_temperature(self):
+        # 70°C: XADC (12-bit) / Zynq US+ SysMon (10-bit) raw values.
+        self.assertEqual(sysmon_temperature_raw("s7", 70),  2788)
+        self.assertEqual(sysmon_temperature_raw("usp", 70), 704)
+
+if __name__ == "__main__":
+    unittest.main()
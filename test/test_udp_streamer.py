@@ -0,0 +1,103 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import random
+import unittest
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect import stream
+
+from liteeth.common import eth_udp_user_description
+
+from litex_boards.cores.udp_streamer import UDPCapture, UDPReplay
+
+# Helpers ------------------------------------------------------------------------------------------
+
+class UDPPort:
+    def __init__(self, dw):
+        self.source = stream.Endpoint(eth_udp_user_description(dw))
+        self.sink   = stream.Endpoint(eth_udp_user_description(dw))
+
+class CaptureReplayDUT(LiteXModule):
+    """UDP port source -> Capture -> (records) -> Replay -> UDP port sink."""
+    def __init__(self, dw):
+        self.port    = port = UDPPort(dw)
+        self.capture = UDPCapture(port, dw=dw, fifo_depth=256, max_packet_size=256)
+        self.replay  = UDPReplay(port, dw=dw)
+        self.comb += [
+            self.capture.enable.eq(1),
+            self.replay.enable.eq(1),
+            self.capture.source.connect(self.replay.sink),
+        ]
+
+def send_packets(dut, dw, packets):
+    for ip_address, src_port, dst_port, payload in packets:
+        words = [payload[i:i + dw//8] for i in range(0, len(payload), dw//8)]
+        for n, word in enumerate(words):
+            yield dut.port.source.valid.eq(1)
+            yield dut.port.source.data.eq(sum(b << 8*i for i, b in enumerate(word)))
+            yield dut.port.source.last.eq(n == len(words) - 1)
+            yield dut.port.source.last_be.eq(1 << (len(word) - 1))
+            yield dut.port.source.length.eq(len(payload))
+            yield dut.port.source.ip_address.eq(ip_address)
+            yield dut.port.source.src_port.eq(src_port)
+            yield dut.port.source.dst_port.eq(dst_port)
+            yield
+            while not (yield dut.port.source.ready):
+                yield
+        yield dut.port.source.valid.eq(0)
+    for i in range(256):
+        yield
+
+@passive
+def receive_packets(dut, dw, received):
+    payload = []
+    while True:
+        yield dut.port.sink.ready.eq(random.randrange(4) != 0)
+        yield
+        if (yield dut.port.sink.valid) and (yield dut.port.sink.ready):
+            data    = (yield dut.port.sink.data)
+            nbytes  = dw//8
+            if (yield dut.port.sink.last):
+                nbytes = (yield dut.port.sink.last_be).bit_length()
+            payload += [(data >> 8*i) & 0xff for i in range(nbytes)]
+            if (yield dut.port.sink.last):
+                assert (yield dut.port.sink.length) == len(payload)
+                received.append((
+                    (yield dut.port.sink.ip_address),
+                    (yield dut.port.sink.src_port),
+                    (yield dut.port.sink.dst_port),
+                    payload))
+                payload = []
+
+# Test UDP Streamer --------------------------------------------------------------------------------
+
+class TestUDPStreamer(unittest.TestCase):
+    def check_capture_replay(self, dw):
+        random.seed(dw)
+        dut     = CaptureReplayDUT(dw)
+        packets = [(
+            random.randrange(2**32),
+            random.randrange(2**16),
+            random.randrange(2**16),
+            [random.randrange(256) for _ in range(random.randrange(1, 256))]) for _ in range(16)]
+        received = []
+        run_simulation(dut, [
+            send_packets(dut, dw, packets),
+            receive_packets(dut, dw, received),
+        ])
+        self.assertEqual(received, packets)
+
+    def test_capture_replay_64(self):
+        self.check_capture_replay(dw=64)
+
+    def test_capture_replay_128(self):
+        self.check_capture_replay(dw=128)
+
+if __name__ == "__main__":
+    unittest.main()
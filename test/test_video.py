@@ -0,0 +1,164 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.cores.video import VideoTimingGenerator
+
+from litedram.common import LiteDRAMNativePort
+
+from litex_boards.cores.video import VideoTripleBuffer
+
+# Helpers ------------------------------------------------------------------------------------------
+
+HRES = 16
+VRES = 4
+
+timings = {
+    "pix_clk"       : 1e6,
+    "h_active"      : HRES,
+    "h_blanking"    : 8,
+    "h_sync_offset" : 2,
+    "h_sync_width"  : 2,
+    "v_active"      : VRES,
+    "v_blanking"    : 4,
+    "v_sync_offset" : 1,
+    "v_sync_width"  : 1,
+}
+
+class DUT(LiteXModule):
+    def __init__(self):
+        self.port = LiteDRAMNativePort("read", address_width=24, data_width=32)
+        self.vtg  = VideoTimingGenerator(default_video_timings=timings)
+        self.vfb  = VideoTripleBuffer(self.port, hres=HRES, vres=VRES, base=0, burst_length=4, fifo_depth=16)
+        self.comb += self.vtg.source.connect(self.vfb.vtg_sink)
+
+def pixel(buffer, n):
+    # RGB565 pixel n of a buffer.
+    return (buffer << 12) | n
+
+@passive
+def memory(port, latency=6, stall=None):
+    # Buffers are 4KB (1024 words) apart, each word holds 2 pixels.
+    pending = []
+    cycle   = 0
+    while True:
+        yield port.cmd.ready.eq(not (stall and stall[0]))
+        yield port.rdata.valid.eq(0)
+        if pending and pending[0][0] <= cycle:
+            addr = pending.pop(0)[1]
+            buffer, word = addr >> 10, addr & 0x3ff
+            yield port.rdata.valid.eq(1)
+            yield port.rdata.data.eq(pixel(buffer, 2*word) | (pixel(buffer, 2*word + 1) << 16))
+        yield
+        cycle += 1
+        if (yield port.cmd.valid) and (yield port.cmd.ready):
+            pending.append((cycle + latency, (yield port.cmd.addr)))
+
+@passive
+def monitor(source, frames):
+    # Collect displayed frames (RGB565 pixels).
+    pixels = []
+    while True:
+        if (yield source.valid) and (yield source.de):
+            r, g, b = (yield source.r), (yield source.g), (yield source.b)
+            pixels.append(((r >> 3) << 11) | ((g >> 2) << 5) | (b >> 3))
+            if len(pixels) == HRES*VRES:
+                frames.append(pixels)
+                pixels = []
+        yield
+
+def wait_frames(dut, n):
+    start = (yield dut.vfb._frames.status)
+    while (yield dut.vfb._frames.status) < (start + n):
+        yield
+
+def commit(dut):
+    yield dut.vfb._commit.re.eq(1)
+    yield
+    yield dut.vfb._commit.re.eq(0)
+    yield
+    yield
+
+# Test Video Triple Buffer -------------------------------------------------------------------------
+
+class TestVideoTripleBuffer(unittest.TestCase):
+    def test_triple_buffer(self):
+        dut    = DUT()
+        frames = []
+        status = {}
+
+        def generator():
+            yield from wait_frames(dut, 2)
+            # Commit: displayed from the next frame.
+            self.assertEqual((yield dut.vfb._render_base.status), 0x2000)
+            yield from commit(dut)
+            self.assertEqual((yield dut.vfb._render_base.status), 0x1000)
+            yield from wait_frames(dut, 2)
+            # 2 commits in a frame: first one dropped.
+            yield from commit(dut)
+            yield from commit(dut)
+            yield from wait_frames(dut, 2)
+            for name in ["frames", "repeated", "dropped", "underruns", "render_base", "display_base"]:
+                status[name] = (yield getattr(dut.vfb, f"_{name}").status)
+
+        run_simulation(dut, [generator(), memory(dut.port), monitor(dut.vfb.source, frames)])
+
+        self.assertEqual(status, {
+            "frames"       : 6,
+            "repeated"     : 4,
+            "dropped"      : 1,
+            "underruns"    : 0,
+            "render_base"  : 0x1000,
+            "display_base" : 0x0000,
+        })
+        buffers = [0, 0, 0, 2, 2, 0]
+        self.assertEqual(frames, [[pixel(b, n) for n in range(HRES*VRES)] for b in buffers])
+
+    def test_underrun(self):
+        dut    = DUT()
+        frames = []
+        stall  = [False]
+        status = {}
+
+        def generator():
+            yield from wait_frames(dut, 2)
+            # Stall memory during a frame: black pixels, then realigned on the next frame.
+            stall[0] = True
+            for i in range(150):
+                yield
+            stall[0] = False
+            yield from wait_frames(dut, 3)
+            status["underruns"] = (yield dut.vfb._underruns.status)
+
+        run_simulation(dut, [generator(), memory(dut.port, stall=stall), monitor(dut.vfb.source, frames)])
+
+        self.assertEqual(status["underruns"], 1)
+        frame = [pixel(0, n) for n in range(HRES*VRES)]
+        self.assertEqual([f == frame for f in frames], [True, True, False, True, True])
+        self.assertIn(0, frames[2][1:])
+
+# Test Analog Pocket Video Clock -------------------------------------------------------------------
+
+class TestAnalogPocketVideoClock(unittest.TestCase):
+    def test_pix_clk(self):
+        from litex_boards.platforms import analog_pocket
+        from litex_boards.targets.analog_pocket import _CRG, get_video_timings
+        # Default VGA timings at 25MHz.
+        self.assertEqual(get_video_timings("640x480@60Hz")["pix_clk"], 25e6)
+        for sdram_rate in ["1:1", "1:2"]:
+            for name in ["640x480@60Hz", "400x360@60Hz"]:
+                pix_clk = get_video_timings(name)["pix_clk"]
+                crg     = _CRG(analog_pocket.Platform(), 50e6, sdram_rate, video_pix_clk=pix_clk)
+                config  = crg.pll.compute_config()
+                n       = [n for n, (clk, f, phase, margin) in crg.pll.clkouts.items() if (f, phase) == (pix_clk, 0)][0]
+                self.assertAlmostEqual(config[f"clk{n}_freq"]/pix_clk, 1.0, delta=1e-3)
+
+if __name__ == "__main__":
+    unittest.main()
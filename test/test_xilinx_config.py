@@ -0,0 +1,103 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import tempfile
+import unittest
+
+from migen import *
+
+from litex.build.generic_platform import Pins, IOStandard
+from litex.build.xilinx import Xilinx7SeriesPlatform
+
+from litex_boards.platforms import digilent_arty, xilinx_alveo_u280
+from litex_boards.tools.xilinx_config import XilinxConfigProfile, XilinxConfigPlatform
+
+# Helpers ------------------------------------------------------------------------------------------
+
+class FinalizePlatform(XilinxConfigPlatform, Xilinx7SeriesPlatform):
+    """Platform adding its configuration commands in do_finalize (as Alveo/FK33/ADRV2CRR)."""
+    default_clk_name   = "clk100"
+    default_clk_period = 1e9/100e6
+
+    def __init__(self):
+        Xilinx7SeriesPlatform.__init__(self, "xc7a35ticsg324-1L", [
+            ("clk100",   0, Pins("E3"), IOStandard("LVCMOS33")),
+            ("user_led", 0, Pins("H5"), IOStandard("LVCMOS33")),
+        ], toolchain="vivado")
+
+    def do_finalize(self, fragment):
+        Xilinx7SeriesPlatform.do_finalize(self, fragment)
+        self.add_platform_command("set_property BITSTREAM.CONFIG.SPI_BUSWIDTH 4 [current_design]")
+        self.add_platform_command("set_property BITSTREAM.CONFIG.CONFIGRATE 50 [current_design]")
+        self.add_platform_command("set_property BITSTREAM.CONFIG.EXTMASTERCCLK_EN disable [current_design]")
+
+class Blink(Module):
+    def __init__(self, platform):
+        counter = Signal(8)
+        self.sync += counter.eq(counter + 1)
+        self.comb += platform.request("user_led").eq(counter[-1])
+
+def build_script(platform, **kwargs):
+    with tempfile.TemporaryDirectory() as build_dir:
+        platform.build(Blink(platform), build_dir=build_dir, build_name="top", run=False, **kwargs)
+        with open(os.path.join(build_dir, "top.tcl")) as f:
+            return f.read()
+
+# Test Xilinx Config -------------------------------------------------------------------------------
+
+class TestXilinxConfig(unittest.TestCase):
+    def test_from_commands(self):
+        profile = XilinxConfigProfile.from_commands([
+            "set_property BITSTREAM.CONFIG.SPI_BUSWIDTH 4 [current_design]",
+            "set_property BITSTREAM.CONFIG.CONFIGRATE 66 [current_design]",
+            "set_property BITSTREAM.CONFIG.SPI_FALL_EDGE YES [current_design]",
+            "write_cfgmem -force -format bin -interface spix4 -size 16 -loadbit \"up 0x0 top.bit\" -file top.bin",
+        ])
+        self.assertEqual((profile.spi_width, profile.configrate, profile.flash_size), (4, 66.0, 16))
+        self.assertTrue(profile.fall_edge)
+        self.assertIsNone(profile.ext_cclk_div)
+        self.assertAlmostEqual(profile.estimate_config_time(4*66e6), 1.0)
+
+    def test_ext_cclk(self):
+        profile = XilinxConfigProfile.from_commands(["set_property BITSTREAM.CONFIG.EXTMASTERCCLK_EN div-2 [current_design]"])
+        self.assertEqual(profile.ext_cclk_div, 2)
+        self.assertIsNone(profile.cclk_freq)
+        self.assertIn("EXTMASTERCCLK_EN div-2", " ".join(profile.fast().bitstream_commands()))
+        profile.ext_cclk = 100
+        self.assertEqual(profile.cclk_freq, 50e6)
+        profile = XilinxConfigProfile.from_commands(["set_property BITSTREAM.CONFIG.EXTMASTERCCLK_EN disable [current_design]"])
+        self.assertIsNone(profile.ext_cclk_div)
+
+    def test_fast_boot_finalize(self):
+        platform = FinalizePlatform()
+        script   = build_script(platform, fast_boot=True)
+        profile  = platform._finalized_config_profile
+        self.assertEqual((profile.spi_width, profile.configrate, profile.compress), (4, 50, True))
+        self.assertEqual(script.count("BITSTREAM.CONFIG.SPI_BUSWIDTH"), 1)
+        self.assertIn("BITSTREAM.CONFIG.SPI_BUSWIDTH 4", script)
+        self.assertIn("BITSTREAM.CONFIG.CONFIGRATE 50", script)
+        self.assertIn("BITSTREAM.GENERAL.COMPRESS TRUE", script)
+
+    def test_declared_profile(self):
+        platform = digilent_arty.Platform()
+        script   = build_script(platform)
+        self.assertEqual(script.count("BITSTREAM.CONFIG.SPI_BUSWIDTH 4"), 1)
+        self.assertEqual(script.count("write_cfgmem"), 1)
+        self.assertIn("-format bin -interface spix4 -size 16", script)
+        # Declared profile not modified by the build.
+        self.assertEqual(digilent_arty.Platform.config_profile.fast_configrate, None)
+        profile = XilinxConfigProfile(spi_width=4, flash_size=16, cfgmem_format="mcs").fast()
+        self.assertEqual(profile.cfgmem_command("top"),
+            "write_cfgmem -force -format mcs -interface spix4 -size 16 -loadbit \"up 0x0 top.bit\" -file top.mcs")
+
+    def test_alveo_u280(self):
+        platform = xilinx_alveo_u280.Platform()
+        platform.finalize(Module().get_fragment())
+        profile = platform.get_config_profile(fast_boot=True)
+        self.assertEqual((profile.spi_width, profile.configrate), (4, 85.0))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import random
+import unittest
+
+from migen import *
+
+from litex.soc.interconnect import wishbone
+
+from litex_boards.cores.xip_cache import XIPCache
+
+# Helpers ------------------------------------------------------------------------------------------
+
+FLASH_WORDS = 64*1024
+
+def flash_data(adr):
+    return (adr*0x9e3779b1 + 0x1234567) & 0xffffffff
+
+@passive
+def flash_model(bus, stats, first_latency=96, seq_latency=16, timeout=256):
+    """SPI Flash MMAP model: non-sequential accesses pay the command/address phase, sequential
+    ones (within timeout) only the data phase (ex Quad SPI at sys_clk/2)."""
+    next_adr = None
+    idle     = timeout
+    while True:
+        if (yield bus.cyc) and (yield bus.stb):
+            adr     = (yield bus.adr)
+            latency = seq_latency if (adr == next_adr and idle < timeout) else first_latency
+            stats["commands"] += (latency == first_latency)
+            for _ in range(latency):
+                yield
+            yield bus.dat_r.eq(flash_data(adr))
+            yield bus.ack.eq(1)
+            yield
+            yield bus.ack.eq(0)
+            stats["accesses"] += 1
+            next_adr = adr + 1
+            idle     = 0
+        else:
+            idle += 1
+        yield
+
+def cpu_fetches(bus, trace, stats, errors):
+    """CPU instruction fetch model (one fetch in flight, 1 cycle between fetches)."""
+    for adr in trace:
+        yield bus.adr.eq(adr)
+        yield bus.cyc.eq(1)
+        yield bus.stb.eq(1)
+        yield bus.we.eq(0)
+        yield bus.sel.eq(0b1111)
+        yield
+        while not (yield bus.ack):
+            yield
+        if (yield bus.dat_r) != flash_data(adr):
+            errors.append(adr)
+        yield bus.cyc.eq(0)
+        yield bus.stb.eq(0)
+        yield
+    stats["cycles"] = (yield stats["timer"])
+
+def firmware_trace(seed=0, length=20000):
+    """Instruction fetch trace: linear code, loops and calls to functions."""
+    prng      = random.Random(seed)
+    functions = [prng.randrange(0, FLASH_WORDS - 256) for _ in range(32)]
+    trace     = []
+    pc        = 0x100
+    while len(trace) < length:
+        kind = prng.random()
+        if kind < 0.5:
+            # Linear code.
+            n = prng.randrange(16, 128)
+            trace += range(pc, pc + n)
+            pc += n
+        elif kind < 0.8:
+            # Loop.
+            n = prng.randrange(8, 48)
+            for _ in range(prng.randrange(4, 32)):
+                trace += range(pc, pc + n)
+            pc += n
+        else:
+            # Function call.
+            f = prng.choice(functions)
+            trace += range(f, f + prng.randrange(16, 96))
+        pc %= FLASH_WORDS - 256
+    return trace[:length]
+
+class _Timer(Module):
+    def __init__(self):
+        self.count = Signal(32)
+        self.sync += self.count.eq(self.count + 1)
+
+def run_fetches(trace, cache=None, control=None, first_latency=96, seq_latency=16):
+    stats  = {"accesses": 0, "commands": 0}
+    errors = []
+    timer  = _Timer()
+    stats["timer"] = timer.count
+    if cache is None:
+        bus = wishbone.Interface(data_width=32, address_width=32, addressing="word")
+        dut = timer
+        cpu_bus, flash_bus = bus, bus
+    else:
+        dut = cache
+        dut.submodules.timer = timer
+        cpu_bus, flash_bus = cache.bus, cache.mem_bus
+    def setup():
+        if control is not None:
+            yield from cache._control.write(control)
+    def generator():
+        yield from setup()
+        yield from cpu_fetches(cpu_bus, trace, stats, errors)
+        if cache is not None:
+            for name in ["hits", "misses", "prefetches", "stalls"]:
+                stats[name] = (yield getattr(cache, f"_{name}").status)
+    run_simulation(dut, [generator(), flash_model(flash_bus, stats, first_latency, seq_latency)])
+    return stats, errors
+
+# Test XIP Cache -----------------------------------------------------------------------------------
+
+class TestXIPCache(unittest.TestCase):
+    def test_sequential(self):
+        cache = XIPCache(size=1024, line_bytes=32)
+        trace = list(range(0x40, 0x40 + 256))
+        stats, errors = run_fetches(trace, cache)
+        self.assertEqual(errors, [])
+        # Lines following the first demand refill are prefetched in a single SPI burst.
+        self.assertEqual(stats["misses"], 1)
+        self.assertGreaterEqual(stats["prefetches"], 256//8 - 1)
+        self.assertEqual(stats["commands"], 1)
+
+    def test_loop_hits(self):
+        cache = XIPCache(size=1024, line_bytes=32, prefetch=False)
+        trace = list(range(0x80, 0x80 + 32))*8
+        stats, errors = run_fetches(trace, cache)
+        self.assertEqual(errors, [])
+        # Only first iteration misses (once per line).
+        self.assertEqual(stats["accesses"], 32)
+        self.assertEqual(stats["misses"],   4)
+        self.assertEqual(stats["hits"],     len(trace))
+
+    def test_bypass(self):
+        cache = XIPCache(size=1024, line_bytes=32)
+        trace = list(range(0x80, 0x80 + 32))*2
+        stats, errors = run_fetches(trace, cache, control=0b00)
+        self.assertEqual(errors, [])
+        self.assertEqual(stats["accesses"], 64)
+
+    def test_firmware_benchmark(self):
+        # CPU fetch throughput on a firmware-like trace: direct SPI Flash vs cache vs cache+prefetch.
+        trace = firmware_trace(length=8000)
+        results = {}
+        for name, cache in [
+            ("direct",         None),
+            ("cache",          XIPCache(size=4096, line_bytes=32, prefetch=False)),
+            ("cache+prefetch", XIPCache(size=4096, line_bytes=32, prefetch=True)),
+            ]:
+            stats, errors = run_fetches(trace, cache)
+            self.assertEqual(errors, [])
+            results[name] = stats["cycles"]
+        for name, cycles in results.items():
+            print(f"XIP {name:<16}: {cycles:8d} cycles, {len(trace)/cycles:.3f} fetches/cycle.")
+        self.assertLess(results["cache"],          results["direct"]/2)
+        self.assertLess(results["cache+prefetch"], results["cache"])
+
+if __name__ == "__main__":
+    unittest.main()